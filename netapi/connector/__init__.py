@@ -1,18 +1,24 @@
 from netapi.connector.eos import pyeapier
 from netapi.connector.linux import subprocesser, paramikoer
+from netapi.connector.replay import replayer
+from netapi.connector.snmp import getbulker
 
 
 class DeviceBuilder:
     """
     Helper class used to create device objects by passing a device the `net_os` and
     `provider` implementations.
+
+    The `REPLAY` implementation does not need a `provider`, like:
+    `create_device("replay", host="lab01", path="/tmp/recordings")`
+
+    The SNMP connector is `create_device("snmp", "getbulk", host="lab01")`
     """
 
-    def create_device(self, net_os, provider, **kwargs):
+    def create_device(self, net_os, provider=None, **kwargs):
         # Instantiate builder
-        return device_factory.get_connector(
-            f"{net_os.upper()}-{provider.upper()}", **kwargs
-        )
+        key = f"{net_os.upper()}-{provider.upper()}" if provider else net_os.upper()
+        return device_factory.get_connector(key, **kwargs)
 
 
 class ObjectFactory:
@@ -24,10 +30,13 @@ class ObjectFactory:
     def register_connector(self, key, connector):
         self._connectors[key] = connector
 
-    def create(self, key, **kwargs):
-        connector = self._connectors.get(key)
-        if not connector:
+    def create(self, key, sub_key="entity", **kwargs):
+        connector_dict = self._connectors.get(key)
+        if not connector_dict:
             raise NotImplementedError(key)
+        connector = connector_dict.get(sub_key)
+        if not connector:
+            raise NotImplementedError(f"{sub_key} not implemented for {key}")
         return connector(**kwargs)
 
 
@@ -42,3 +51,5 @@ device_factory = DeviceFactory()
 device_factory.register_connector("EOS-PYEAPI", {"entity": pyeapier.Device})
 device_factory.register_connector("LINUX-SUBPROCESS", {"entity": subprocesser.Device})
 device_factory.register_connector("LINUX-PARAMIKO", {"entity": paramikoer.Device})
+device_factory.register_connector("REPLAY", {"entity": replayer.Device})
+device_factory.register_connector("SNMP-GETBULK", {"entity": getbulker.Device})
@@ -36,6 +36,7 @@ class Device(DeviceBase):
             transport=self.transport,
             username=self.username,
             password=self.password,
+            port=self.port,
         )
         self.connector = pyeapi.client.Node(_conn)
 
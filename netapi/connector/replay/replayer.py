@@ -0,0 +1,231 @@
+"""
+Record and Replay Implementation of Device object.
+
+It is composed of a `Recorder`, which wraps any connector object and stores on disk the
+raw outputs returned by its `run()` method, and a replay `Device` that serves those
+outputs back without the need of a network device. This allows the parsers and builders
+to be profiled and regression-tested offline with production data sizes.
+
+The outputs are stored per device on a `RecordStore` directory:
+
+- `<device>.rec`: Concatenated zlib compressed JSON records. It is opened with `mmap`
+so only the records being replayed are read and decompressed.
+- `<device>.idx`: JSON lines index with the `command`, `timestamp`, `offset` and
+`length` of each record, plus the `implementation` of the recorded connector.
+
+**Example:**
+
+```python
+from netapi.connector.eos.pyeapier import Device
+from netapi.connector.replay.replayer import Recorder, Device as ReplayDevice
+from netapi.net import VlanBuilder
+
+recorder = Recorder(Device(host="lab01", ...), path="/tmp/recordings")
+VlanBuilder().get(recorder, entity=False)
+
+replay = ReplayDevice(host="lab01", path="/tmp/recordings", latency=0.05)
+vlans = VlanBuilder().get(replay, entity=False)
+print(vlans)
+# Vlans(1, 70, 177)
+```
+"""
+import re
+import json
+import mmap
+import time
+import zlib
+import random
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Optional, List, Any
+from netapi.connector.device import DeviceBase, DevicesBase
+
+
+def device_key(name):
+    "Returns a file system safe name for the device records"
+    return re.sub(r"[^\w.-]", "_", str(name))
+
+
+class RecordStore:
+    """
+    Directory based storage of the raw outputs of the devices.
+
+    Attributes:
+
+    - `path`: (Path) Directory where the `.rec` and `.idx` files of each device live
+    - `compression`: (int) zlib compression level used on new records
+    """
+
+    def __init__(self, path, compression=6):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+
+    def _files(self, device):
+        key = device_key(device)
+        return self.path / f"{key}.rec", self.path / f"{key}.idx"
+
+    def write(self, device, command, output, timestamp=None, implementation=None):
+        "Appends the raw output of a command to the records of the device"
+        rec_file, idx_file = self._files(device)
+        payload = zlib.compress(
+            json.dumps(output, default=str).encode("utf-8"), self.compression
+        )
+        with open(rec_file, "ab") as f:
+            offset = f.tell()
+            f.write(payload)
+
+        entry = dict(
+            command=command,
+            timestamp=time.time() if timestamp is None else timestamp,
+            offset=offset,
+            length=len(payload),
+            implementation=implementation,
+        )
+        with open(idx_file, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+        return entry
+
+    def index(self, device):
+        "Returns the index entries of the device sorted by timestamp"
+        _, idx_file = self._files(device)
+        if not idx_file.is_file():
+            raise ValueError(f"No recordings found for device: {device}")
+        with open(idx_file, "r") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+
+        return sorted(entries, key=lambda x: x["timestamp"])
+
+    def open(self, device):
+        "Returns a read-only memory map of the records of the device"
+        rec_file, _ = self._files(device)
+        with open(rec_file, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def load(records, entry):
+        "Decompress and load the output of an index entry from the memory map"
+        payload = records[entry["offset"] : entry["offset"] + entry["length"]]
+        return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+class Recorder:
+    """
+    Wraps any connector object and records the outputs of each `run()` execution.
+
+    Any other attribute is looked up on the wrapped connector, so the `Recorder` can be
+    passed to the builders and network objects as if it were the connector itself.
+
+    Attributes:
+
+    - `device`: Connector object being recorded
+    - `store`: (RecordStore) Storage of the outputs
+    - `name`: (str) Key of the device on the store. By default is the `host` value
+    """
+
+    def __init__(self, device, path, name=None, compression=6):
+        self.device = device
+        self.store = RecordStore(path, compression=compression)
+        self.name = name or device.host
+
+    def __getattr__(self, attr):
+        return getattr(self.device, attr)
+
+    def run(self, commands, silent=False, **kwargs):
+        "Run the commands on the wrapped connector and records its outputs"
+        result = self.device.run(commands, silent=silent, **kwargs)
+        timestamp = time.time()
+        for command, output in result.items():
+            self.store.write(
+                self.name,
+                command,
+                output,
+                timestamp=timestamp,
+                implementation=self.device.metadata.implementation,
+            )
+        return result
+
+
+class ReplayNode:
+    """
+    Stand-in of the client libraries objects (like `pyeapi.client.Node`). There are no
+    configuration APIs offline so `api()` always returns None
+    """
+
+    def api(self, name):
+        return None
+
+
+class Devices(DevicesBase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metadata.implementation = "REPLAY"
+
+
+@dataclass
+class Device(DeviceBase):
+    """
+    Serves the outputs recorded for the `host` device.
+
+    Attributes:
+
+    - `path`: (str) Directory of the `RecordStore`
+    - `latency`: (float) Seconds added to each `run()` execution
+    - `jitter`: (float) Random extra seconds (up to this value) added to the latency
+    - `loop`: (bool) When all the recordings of a command have been served start over
+    from the first one. If False the last recording is served from then on
+    - `implementation`: (str) Implementation to impersonate. By default is the one
+    of the recorded connector, so the builders use the same objects and parsers
+    """
+
+    path: Optional[str] = None
+    latency: float = 0.0
+    jitter: float = 0.0
+    loop: bool = True
+    implementation: Optional[str] = None
+    net_os: str = field(init=False, default="replay")
+
+    def __post_init__(self, **_ignore):
+        super().__post_init__(**_ignore)
+        store = RecordStore(self.path)
+        entries = store.index(self.host)
+        self._records = store.open(self.host)
+        self._index = {}
+        for entry in entries:
+            self._index.setdefault(entry["command"], []).append(entry)
+        self._cursors = {x: 0 for x in self._index}
+        self.metadata.implementation = self.implementation or next(
+            (x["implementation"] for x in entries if x.get("implementation")),
+            "REPLAY",
+        )
+        self.connector = ReplayNode()
+
+    @property
+    def commands(self) -> List[str]:
+        "Commands with recorded outputs"
+        return list(self._index)
+
+    def _next_output(self, command) -> Any:
+        entries = self._index[command]
+        position = self._cursors[command]
+        if position >= len(entries):
+            position = 0 if self.loop else len(entries) - 1
+        self._cursors[command] = position + 1
+        return RecordStore.load(self._records, entries[position])
+
+    def run(self, commands: Optional[List[str]] = str, silent: bool = False, **kwargs):
+        "Run method that returns the recorded outputs of the commands passed to it"
+        if isinstance(commands, str):
+            commands = [commands]
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+        self._cache = {x: None for x in commands}
+        for command in commands:
+            if command not in self._index:
+                if silent:
+                    continue
+                raise ValueError(f"No recording for command: {command}")
+            self._cache[command] = self._next_output(command)
+
+        return self._cache
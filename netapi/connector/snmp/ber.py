@@ -0,0 +1,315 @@
+"""
+Minimal BER codec of the SNMPv2c messages (RFC 3416), enough to run GET, GETNEXT and
+GETBULK requests without an SNMP library.
+
+The OIDs are tuples of integers (`oid_tuple()` accepts the dotted strings) and the
+values are decoded to python types:
+
+- `INTEGER`: int
+- `OCTET STRING`: bytes
+- `OBJECT IDENTIFIER`: tuple
+- `IpAddress`: `IpAddress` (str)
+- `Counter32`, `Gauge32`, `TimeTicks` and `Counter64`: int subclasses of the same name,
+so they are encoded back with their type
+- `NULL`: None
+- `noSuchObject`, `noSuchInstance` and `endOfMibView`: the `NO_SUCH_OBJECT`,
+`NO_SUCH_INSTANCE` and `END_OF_MIB_VIEW` markers
+"""
+from collections import namedtuple
+
+
+__all__ = [
+    "Counter32",
+    "Counter64",
+    "Gauge32",
+    "IpAddress",
+    "TimeTicks",
+    "Message",
+    "decode_message",
+    "encode_message",
+    "oid_str",
+    "oid_tuple",
+]
+
+# Universal and application types
+INTEGER = 0x02
+OCTET_STRING = 0x04
+NULL = 0x05
+OBJECT_IDENTIFIER = 0x06
+SEQUENCE = 0x30
+IP_ADDRESS = 0x40
+COUNTER32 = 0x41
+GAUGE32 = 0x42
+TIMETICKS = 0x43
+OPAQUE = 0x44
+COUNTER64 = 0x46
+
+# PDU types
+GET = 0xA0
+GET_NEXT = 0xA1
+RESPONSE = 0xA2
+SET = 0xA3
+GET_BULK = 0xA5
+
+# Error status of the responses
+ERROR_STATUS = {
+    0: "noError",
+    1: "tooBig",
+    2: "noSuchName",
+    3: "badValue",
+    4: "readOnly",
+    5: "genErr",
+}
+TOO_BIG = 1
+
+VERSION_2C = 1
+
+
+class Counter32(int):
+    tag = COUNTER32
+
+
+class Gauge32(int):
+    tag = GAUGE32
+
+
+class TimeTicks(int):
+    tag = TIMETICKS
+
+
+class Counter64(int):
+    tag = COUNTER64
+
+
+class IpAddress(str):
+    tag = IP_ADDRESS
+
+
+class Unavailable:
+    "Marker of the exceptions of a variable binding (no value)"
+
+    __slots__ = ("name", "tag")
+
+    def __init__(self, name, tag):
+        self.name = name
+        self.tag = tag
+
+    def __repr__(self):
+        return self.name
+
+
+NO_SUCH_OBJECT = Unavailable("noSuchObject", 0x80)
+NO_SUCH_INSTANCE = Unavailable("noSuchInstance", 0x81)
+END_OF_MIB_VIEW = Unavailable("endOfMibView", 0x82)
+UNAVAILABLE = {x.tag: x for x in (NO_SUCH_OBJECT, NO_SUCH_INSTANCE, END_OF_MIB_VIEW)}
+UNSIGNED = {x.tag: x for x in (Counter32, Gauge32, TimeTicks, Counter64)}
+
+Message = namedtuple(
+    "Message",
+    [
+        "version",
+        "community",
+        "pdu_type",
+        "request_id",
+        "error_status",
+        "error_index",
+        "varbinds",
+    ],
+)
+Message.__doc__ = """
+SNMP message. On the GETBULK requests `error_status` is the number of non repeaters and
+`error_index` the max repetitions. `varbinds` is the list of `(oid, value)`
+"""
+
+
+def oid_tuple(oid):
+    "Returns the tuple of an OID (dotted str, with or without the leading dot)"
+    if isinstance(oid, str):
+        return tuple(int(x) for x in oid.strip(".").split("."))
+    return tuple(oid)
+
+
+def oid_str(oid):
+    "Returns the dotted str of an OID tuple"
+    return ".".join(str(x) for x in oid)
+
+
+# Encoding
+def encode_length(length):
+    if length < 0x80:
+        return bytes((length,))
+    payload = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes((0x80 | len(payload),)) + payload
+
+
+def encode_tlv(tag, payload):
+    return bytes((tag,)) + encode_length(len(payload)) + payload
+
+
+def encode_integer(value, tag=INTEGER):
+    "Two's complement integer. The unsigned types get a leading zero when needed"
+    value = int(value)
+    bits = value.bit_length() if value >= 0 else (~value).bit_length()
+    return encode_tlv(tag, value.to_bytes(bits // 8 + 1, "big", signed=True))
+
+
+def encode_oid(oid):
+    oid = oid_tuple(oid)
+    if len(oid) < 2:
+        raise ValueError(f"Invalid OID: {oid}")
+    if max(oid[2:], default=0) < 0x80:
+        # Single byte arcs, the most common
+        return encode_tlv(OBJECT_IDENTIFIER, bytes((oid[0] * 40 + oid[1], *oid[2:])))
+    payload = bytearray((oid[0] * 40 + oid[1],))
+    for arc in oid[2:]:
+        chunk = [arc & 0x7F]
+        arc >>= 7
+        while arc:
+            chunk.append(0x80 | (arc & 0x7F))
+            arc >>= 7
+        payload.extend(reversed(chunk))
+    return encode_tlv(OBJECT_IDENTIFIER, bytes(payload))
+
+
+def encode_value(value):
+    "Encodes a python value with its SNMP type (see the module documentation)"
+    if value is None:
+        return encode_tlv(NULL, b"")
+    if isinstance(value, Unavailable):
+        return encode_tlv(value.tag, b"")
+    if isinstance(value, IpAddress):
+        return encode_tlv(IP_ADDRESS, bytes(int(x) for x in value.split(".")))
+    if isinstance(value, tuple(UNSIGNED.values())):
+        return encode_integer(value, value.tag)
+    if isinstance(value, int):
+        return encode_integer(value)
+    if isinstance(value, str):
+        return encode_tlv(OCTET_STRING, value.encode())
+    if isinstance(value, (bytes, bytearray)):
+        return encode_tlv(OCTET_STRING, bytes(value))
+    if isinstance(value, tuple):
+        return encode_oid(value)
+    raise TypeError(f"Value can not be encoded: {value!r}")
+
+
+def encode_message(
+    community, pdu_type, request_id, varbinds, error_status=0, error_index=0
+):
+    """
+    Returns the bytes of a SNMPv2c message. `varbinds` is a list of `(oid, value)`,
+    the values of the requests are None
+    """
+    if isinstance(community, str):
+        community = community.encode()
+    bindings = b"".join(
+        encode_tlv(SEQUENCE, encode_oid(oid) + encode_value(value))
+        for oid, value in varbinds
+    )
+    pdu = encode_tlv(
+        pdu_type,
+        encode_integer(request_id)
+        + encode_integer(error_status)
+        + encode_integer(error_index)
+        + encode_tlv(SEQUENCE, bindings),
+    )
+    return encode_tlv(
+        SEQUENCE,
+        encode_integer(VERSION_2C) + encode_tlv(OCTET_STRING, community) + pdu,
+    )
+
+
+# Decoding
+def decode_tlv(data, offset=0):
+    "Returns the `(tag, payload, end)` of the TLV at the offset"
+    try:
+        tag = data[offset]
+        length = data[offset + 1]
+        offset += 2
+        if length & 0x80:
+            size = length & 0x7F
+            length = int.from_bytes(data[offset : offset + size], "big")
+            offset += size
+    except IndexError:
+        raise ValueError("Truncated BER data")
+    end = offset + length
+    if end > len(data):
+        raise ValueError("Truncated BER data")
+    return tag, data[offset:end], end
+
+
+def decode_oid(payload):
+    if not payload:
+        raise ValueError("Empty OID")
+    first = payload[0]
+    head = (min(first // 40, 2), first - 40 * min(first // 40, 2))
+    arcs = payload[1:]
+    if not arcs or max(arcs) < 0x80:
+        # Single byte arcs, the most common
+        return head + tuple(arcs)
+    oid = list(head)
+    arc = 0
+    for byte in arcs:
+        arc = (arc << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            oid.append(arc)
+            arc = 0
+    return tuple(oid)
+
+
+def decode_value(tag, payload):
+    "Returns the python value of a TLV (see the module documentation)"
+    if tag == INTEGER:
+        return int.from_bytes(payload, "big", signed=True)
+    if tag in UNSIGNED:
+        return UNSIGNED[tag](int.from_bytes(payload, "big"))
+    if tag in (OCTET_STRING, OPAQUE):
+        return bytes(payload)
+    if tag == OBJECT_IDENTIFIER:
+        return decode_oid(payload)
+    if tag == IP_ADDRESS:
+        return IpAddress(".".join(str(x) for x in payload))
+    if tag == NULL:
+        return None
+    if tag in UNAVAILABLE:
+        return UNAVAILABLE[tag]
+    raise ValueError(f"Unknown BER type: {tag:#x}")
+
+
+def decode_sequence(payload):
+    "Yields the `(tag, payload)` of the items of a constructed type"
+    offset = 0
+    while offset < len(payload):
+        tag, item, offset = decode_tlv(payload, offset)
+        yield tag, item
+
+
+def decode_message(data):
+    "Returns the `Message` of the bytes of a SNMPv2c message"
+    tag, payload, _ = decode_tlv(bytes(data))
+    if tag != SEQUENCE:
+        raise ValueError("Not a SNMP message")
+    items = list(decode_sequence(payload))
+    if len(items) != 3:
+        raise ValueError("Not a SNMP message")
+    (_, version), (_, community), (pdu_type, pdu) = items
+    fields = list(decode_sequence(pdu))
+    if len(fields) != 4:
+        raise ValueError("Invalid PDU")
+    request_id, error_status, error_index = (decode_value(x, y) for x, y in fields[:3])
+    varbinds = []
+    bindings = fields[3][1]
+    offset = 0
+    while offset < len(bindings):
+        _, binding, offset = decode_tlv(bindings, offset)
+        _, oid, end = decode_tlv(binding)
+        value_tag, value, _ = decode_tlv(binding, end)
+        varbinds.append((decode_oid(oid), decode_value(value_tag, value)))
+    return Message(
+        decode_value(INTEGER, version),
+        bytes(community).decode(errors="replace"),
+        pdu_type,
+        request_id,
+        error_status,
+        error_index,
+        varbinds,
+    )
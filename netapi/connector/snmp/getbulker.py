@@ -0,0 +1,286 @@
+"""
+SNMP GETBULK Implementation of Device object.
+
+Lightweight alternative to the CLI/API connectors for the high frequency polls of the
+interface counters and status, also available on the old platforms. The commands run
+are the OIDs of MIB tables or columns (i.e. `1.3.6.1.2.1.31.1.1.1.6`, `ifHCInOctets`)
+which are walked with SNMPv2c GETBULK requests, all the columns of a `run()` on the
+same requests. The output of each command is a dict of the instance (suffix of the OID
+after the command, i.e. the `ifIndex`) -> value, see `netapi.connector.snmp.ber` for
+the value types. With the `instance` passed to `run()` only that row of the columns is
+read, with a single GET request.
+
+The requests are sent with `asyncio`, so `run_many()` walks the commands of many
+devices concurrently on a single event loop.
+
+**Example:**
+
+```python
+from netapi.connector.snmp.getbulker import Device, run_many
+from netapi.net import InterfaceBuilder
+
+device = Device(host="lab01", community="public")
+interfaces = InterfaceBuilder().get(device, entity=False, fields={"counters"})
+
+outputs = run_many([(x, ["1.3.6.1.2.1.31.1.1.1.6"]) for x in devices])
+```
+"""
+import random
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Optional, List
+from netapi.connector.device import DeviceBase, DevicesBase
+from netapi.connector.snmp.ber import (
+    END_OF_MIB_VIEW,
+    ERROR_STATUS,
+    GET,
+    GET_BULK,
+    TOO_BIG,
+    Unavailable,
+    decode_message,
+    encode_message,
+    oid_str,
+    oid_tuple,
+)
+
+
+class SnmpError(Exception):
+    "Error status returned by the agent"
+
+    def __init__(self, status, index=0):
+        self.status = status
+        self.index = index
+        super().__init__(f"SNMP error: {ERROR_STATUS.get(status, status)} ({index})")
+
+
+class _Protocol(asyncio.DatagramProtocol):
+    "Socket of a device, dispatches the responses to the requests by request id"
+
+    def __init__(self):
+        self.transport = None
+        self.pending = {}
+        self.request_ids = itertools.count(random.randint(1, 2**30))
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        try:
+            message = decode_message(data)
+        except ValueError:
+            # Not a SNMP message, the request is retried on timeout
+            return
+        future = self.pending.pop(message.request_id, None)
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    def error_received(self, exc):
+        # i.e. ICMP port unreachable
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        self.pending.clear()
+
+
+async def _request(protocol, device, varbinds, repetitions, pdu_type=GET_BULK):
+    "Sends a GETBULK (or GET) request with retries. Returns the response `Message`"
+    loop = asyncio.get_running_loop()
+    for _ in range(device.retries + 1):
+        request_id = next(protocol.request_ids)
+        future = loop.create_future()
+        protocol.pending[request_id] = future
+        protocol.transport.sendto(
+            encode_message(
+                device.community,
+                pdu_type,
+                request_id,
+                varbinds,
+                error_status=0,
+                error_index=repetitions,
+            )
+        )
+        try:
+            return await asyncio.wait_for(future, device.timeout)
+        except asyncio.TimeoutError:
+            protocol.pending.pop(request_id, None)
+    raise TimeoutError(f"No SNMP response from {device.host}:{device.port}")
+
+
+async def _walk(protocol, device, commands):
+    """
+    Walks the OID subtrees of the commands with GETBULK requests of all the subtrees
+    not finished yet. The max repetitions are halved when the response is too big
+    """
+    roots = {x: oid_tuple(x) for x in commands}
+    outputs = {x: {} for x in commands}
+    current = dict(roots)
+    repetitions = device.max_repetitions
+    while current:
+        columns = list(current)
+        response = await _request(
+            protocol, device, [(current[x], None) for x in columns], repetitions
+        )
+        if response.error_status == TOO_BIG and repetitions > 1:
+            repetitions //= 2
+            continue
+        if response.error_status:
+            raise SnmpError(response.error_status, response.error_index)
+        if not response.varbinds:
+            raise SnmpError(5)
+
+        finished = set()
+        for position, (oid, value) in enumerate(response.varbinds):
+            column = columns[position % len(columns)]
+            if column in finished:
+                continue
+            root = roots[column]
+            if (
+                value is END_OF_MIB_VIEW
+                or oid[: len(root)] != root
+                or oid <= current[column]
+            ):
+                # Out of the subtree (or not increasing, a broken agent)
+                finished.add(column)
+                continue
+            outputs[column][oid_str(oid[len(root) :])] = value
+            current[column] = oid
+        for column in finished:
+            del current[column]
+    return outputs
+
+
+async def _get(protocol, device, commands, instance):
+    """
+    Reads the `instance` of the columns of the commands with a GET request. The
+    columns without it have an empty output
+    """
+    suffix = oid_tuple(str(instance))
+    response = await _request(
+        protocol, device, [(oid_tuple(x) + suffix, None) for x in commands], 0, GET
+    )
+    if response.error_status:
+        raise SnmpError(response.error_status, response.error_index)
+    if len(response.varbinds) != len(commands):
+        raise SnmpError(5)
+    instance = oid_str(suffix)
+    return {
+        command: {} if isinstance(value, Unavailable) else {instance: value}
+        for command, (_, value) in zip(commands, response.varbinds)
+    }
+
+
+async def _session(device, function, *args):
+    "Runs the coroutine function with the socket of the device (`protocol`)"
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(
+        _Protocol, remote_addr=(device.host, device.port)
+    )
+    try:
+        return await function(protocol, device, *args)
+    finally:
+        transport.close()
+
+
+async def walk(device, commands):
+    "Coroutine of the GETBULK walks of the commands on the device, see `Device.run()`"
+    return await _session(device, _walk, commands)
+
+
+async def get(device, commands, instance):
+    "Coroutine of the GET of the `instance` of the commands, see `Device.run()`"
+    return await _session(device, _get, commands, instance)
+
+
+def _run_loop(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def run_many(jobs, concurrency=100):
+    """
+    Walks the commands of many devices concurrently on a single event loop, with up
+    to `concurrency` devices at a time. `jobs` are `(device, commands)` pairs. Returns
+    the list of outputs (like `Device.run()`) in the order of the jobs, or the exception
+    raised for the device
+    """
+    jobs = [
+        (device, [commands] if isinstance(commands, str) else commands)
+        for device, commands in jobs
+    ]
+
+    async def _all():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _job(device, commands):
+            async with semaphore:
+                return await walk(device, commands)
+
+        return await asyncio.gather(
+            *(_job(x, y) for x, y in jobs), return_exceptions=True
+        )
+
+    return _run_loop(_all())
+
+
+class Devices(DevicesBase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metadata.implementation = "SNMP-GETBULK"
+
+
+@dataclass
+class Device(DeviceBase):
+    """
+    SNMPv2c agent of a device.
+
+    Attributes:
+
+    - `port`: (int) UDP port of the agent
+    - `community`: (str) Read community
+    - `timeout`: (float) Seconds to wait for each response
+    - `retries`: (int) Retries of each request when there is no response
+    - `max_repetitions`: (int) Rows requested on each GETBULK
+    """
+
+    port: int = 161
+    community: str = field(repr=False, default="public")
+    timeout: float = 2.0
+    retries: int = 1
+    max_repetitions: int = 25
+    net_os: str = field(init=False, default="snmp")
+
+    def __post_init__(self, **_ignore):
+        super().__post_init__(**_ignore)
+        self.metadata.implementation = "SNMP-GETBULK"
+        self.connector = None
+
+    def run(
+        self,
+        commands: Optional[List[str]] = str,
+        silent: bool = False,
+        instance: Optional[Any] = None,
+        **kwargs,
+    ):
+        """
+        Walks the OIDs passed. Returns a dict of command -> instance -> value. With
+        `instance` (i.e. the `ifIndex` of an interface) only that instance of the
+        columns is read. With `silent` the error status of the agent (not the
+        timeouts) returns None outputs
+        """
+        if isinstance(commands, str):
+            commands = [commands]
+        commands = list(dict.fromkeys(commands))
+        try:
+            if instance is None:
+                self._cache = _run_loop(walk(self, commands))
+            else:
+                self._cache = _run_loop(get(self, commands, instance))
+        except SnmpError:
+            if not silent:
+                raise
+            self._cache = {x: None for x in commands}
+        return self._cache
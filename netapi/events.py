@@ -0,0 +1,154 @@
+"""
+State change events of the collections.
+
+The collections compute a single diff on each `refresh()` (the `ChangeSet` of
+`EntityCollections.merge`) and publish it as typed `Event` objects to all their
+subscribers, so any number of consumers cost one diff:
+
+- `interface_status`: `status_up` transitions of the interfaces
+- `vrrp_state`: VRRP state changes (i.e. `backup` -> `master`)
+- `vlan_status`: VLAN status changes (i.e. `active` -> `suspended`)
+- `route_added` and `route_withdrawn`: Routes present or no longer present
+
+The events of each collection are declared on its `EVENT_ATTRIBUTES`, `EVENT_ADDED`
+and `EVENT_REMOVED` attributes.
+
+**Example:**
+
+```python
+interfaces = InterfaceBuilder().get(connector, entity=False)
+interfaces.subscribe(print, types={"interface_status"})
+interfaces.refresh()
+# Event(type='interface_status', device='leaf1', key='Ethernet1', old=True, new=False)
+
+# Async consumers
+async for event in interfaces.stream():
+    ...
+```
+"""
+import asyncio
+import time
+
+
+__all__ = ["Event", "Subscription", "EventStream"]
+
+
+class Event:
+    """
+    State change of an entity of a collection.
+
+    - `type`: Type of event (i.e. `interface_status`)
+    - `device`: Host of the connector of the collection (if any)
+    - `key`: Key of the entity on the collection
+    - `attribute`: Attribute changed, None for the added/removed entities
+    - `old`: Previous value of the attribute
+    - `new`: Current value of the attribute
+    - `entity`: Entity of the key (None when it was removed)
+    - `timestamp`: Epoch seconds when the change was detected
+    """
+
+    __slots__ = (
+        "type",
+        "device",
+        "key",
+        "attribute",
+        "old",
+        "new",
+        "entity",
+        "timestamp",
+    )
+
+    def __init__(
+        self,
+        type,
+        key,
+        attribute=None,
+        old=None,
+        new=None,
+        entity=None,
+        device=None,
+        timestamp=None,
+    ):
+        self.type = type
+        self.key = key
+        self.attribute = attribute
+        self.old = old
+        self.new = new
+        self.entity = entity
+        self.device = device
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def __eq__(self, other):
+        if not isinstance(other, Event):
+            return NotImplemented
+        return all(
+            getattr(self, x) == getattr(other, x)
+            for x in self.__slots__
+            if x not in ("entity", "timestamp")
+        )
+
+    def __repr__(self):
+        return (
+            f"Event(type={self.type!r}, device={self.device!r}, key={self.key!r}, "
+            f"old={self.old!r}, new={self.new!r})"
+        )
+
+
+class Subscription:
+    """
+    Subscription of a callback to the events of a collection, optionally filtered by
+    the event `types`. `cancel()` removes it
+    """
+
+    __slots__ = ("callback", "types", "_subscribers")
+
+    def __init__(self, callback, types, subscribers):
+        self.callback = callback
+        self.types = frozenset(types) if types is not None else None
+        self._subscribers = subscribers
+
+    def __call__(self, event):
+        if self.types is None or event.type in self.types:
+            self.callback(event)
+
+    @property
+    def active(self):
+        return self in self._subscribers
+
+    def cancel(self):
+        if self in self._subscribers:
+            self._subscribers.remove(self)
+
+
+class EventStream:
+    """
+    Async iterator of the events of a collection. The events published (from any
+    thread) are queued on the event loop where the stream was created, until they are
+    consumed. `close()` ends the iteration once the queued events are consumed
+    """
+
+    _CLOSED = object()
+
+    def __init__(self, subscribe, types=None):
+        self._loop = asyncio.get_event_loop()
+        self._queue = asyncio.Queue()
+        self._closed = False
+        self.subscription = subscribe(self._publish, types)
+
+    def _publish(self, event):
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self.subscription.cancel()
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, self._CLOSED)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self._queue.get()
+        if event is self._CLOSED:
+            raise StopAsyncIteration
+        return event
@@ -1,42 +1,228 @@
+import json
+import time
+from datetime import timedelta
 import uuid
 import reprlib
+import threading
+from hashlib import blake2b
+from copy import copy
 import pendulum
-from collections import ChainMap
-from dataclasses import asdict
-from pydantic import validator
-from pydantic.dataclasses import dataclass
-from typing import Optional, Any
+from collections import namedtuple
+from collections.abc import MutableMapping
+from dataclasses import asdict, fields, MISSING
+from pydantic import ValidationError
+from pydantic.class_validators import make_generic_validator
+from typing import Dict, Optional, Tuple
+from netapi.events import Event, Subscription, EventStream
 
 
 class DataConfig:
     validate_assignment = True
 
 
-@dataclass(config=DataConfig)  # type: ignore
+# Reference to convert the monotonic clock readings to wall clock timestamps
+_WALL_OFFSET = time.time() - time.monotonic()
+# Index value of the lazy attributes not loaded yet (see `EntityCollections.index`)
+_NOT_LOADED = object()
+_SHARED_METADATA = {}
+SharedMetadata = namedtuple("SharedMetadata", ["name", "type", "implementation"])
+
+
+def shared_metadata(name, type, implementation=None):
+    "Returns the (unique) shared record of metadata values for the parameters passed"
+    key = (name, type, implementation)
+    if key not in _SHARED_METADATA:
+        _SHARED_METADATA[key] = SharedMetadata(*key)
+    return _SHARED_METADATA[key]
+
+
+def monotonic_to_datetime(value):
+    "Converts a `time.monotonic()` reading to a pendulum DateTime on local timezone"
+    return pendulum.from_timestamp(_WALL_OFFSET + value, tz=pendulum.local_timezone())
+
+
 class Metadata:
-    name: str
-    type: str
-    implementation: Optional[str] = None
-    created_at: Optional[Any] = None
-    id: Optional[Any] = None
-    updated_at: Optional[Any] = None
-    collection_count: int = 0
-    parent: Optional[str] = None
+    """
+    Metadata of the entities and collections.
+
+    Attributes:
+
+    - `name`: (str) Name of the object type. For example `interface` or `interfaces`
+    - `type`: (str) `entity` or `collection`
+    - `implementation`: (str) Implementation of the object. For example `EOS-PYEAPI`
+    - `created_at`: (DateTime) Creation time of the object
+    - `id`: (UUID) Unique ID of the object
+    - `updated_at`: (DateTime) Last time the object data was updated
+    - `collection_count`: (int) Number of data collections performed
+    - `parent`: Parent object reference (if any)
+
+    It is created for every single object, so it is kept lightweight: `name`, `type`
+    and `implementation` are a record shared among all the objects with the same values,
+    the timestamps are stored as `time.monotonic()` readings and converted to DateTime
+    on first access, and the `id` is only generated when it is first accessed.
+    """
+
+    __slots__ = (
+        "_shared",
+        "_created",
+        "_created_at",
+        "_id",
+        "_updated",
+        "_updated_at",
+        "collection_count",
+        "parent",
+    )
+
+    def __init__(
+        self,
+        name,
+        type,
+        implementation=None,
+        created_at=None,
+        id=None,
+        updated_at=None,
+        collection_count=0,
+        parent=None,
+    ):
+        self._shared = shared_metadata(name, type, implementation)
+        self._created = time.monotonic()
+        self._created_at = created_at
+        self._id = id
+        self._updated = None
+        self._updated_at = updated_at
+        self.collection_count = collection_count
+        self.parent = parent
+
+    @property
+    def name(self):
+        return self._shared.name
+
+    @name.setter
+    def name(self, value):
+        self._shared = shared_metadata(value, self.type, self.implementation)
+
+    @property
+    def type(self):
+        return self._shared.type
+
+    @type.setter
+    def type(self, value):
+        self._shared = shared_metadata(self.name, value, self.implementation)
+
+    @property
+    def implementation(self):
+        return self._shared.implementation
+
+    @implementation.setter
+    def implementation(self, value):
+        self._shared = shared_metadata(self.name, self.type, value)
+
+    @property
+    def created_at(self):
+        if self._created_at is None:
+            self._created_at = monotonic_to_datetime(self._created)
+        return self._created_at
 
-    @validator("id", pre=True, always=True)
-    def valid_id(cls, v):
-        return uuid.uuid4()
+    @property
+    def id(self):
+        if self._id is None:
+            self._id = uuid.uuid4()
+        return self._id
 
-    @validator("created_at", pre=True, always=True)
-    def valid_created_at(cls, v):
-        return pendulum.now()
+    @property
+    def updated_at(self):
+        if self._updated_at is None and self._updated is not None:
+            self._updated_at = monotonic_to_datetime(self._updated)
+        return self._updated_at
 
+    @updated_at.setter
+    def updated_at(self, value):
+        self._updated = None
+        self._updated_at = value
 
-class EntityCollections(ChainMap):
+    def touch(self):
+        "Sets the update time of the object to now"
+        self._updated = time.monotonic()
+        self._updated_at = None
+
+    def to_dict(self):
+        return dict(
+            name=self.name,
+            type=self.type,
+            implementation=self.implementation,
+            created_at=str(self.created_at),
+            id=str(self.id),
+            updated_at=None if self.updated_at is None else str(self.updated_at),
+            collection_count=self.collection_count,
+            parent=self.parent,
+        )
+
+    def __repr__(self):
+        return (
+            f"Metadata(name={self.name!r}, type={self.type!r}, "
+            f"implementation={self.implementation!r}, created_at={self.created_at!r}, "
+            f"id={self.id!r}, updated_at={self.updated_at!r}, "
+            f"collection_count={self.collection_count!r}, parent={self.parent!r})"
+        )
+
+
+def output_fingerprint(raw_data):
+    """
+    Returns a digest of the outputs of the commands (a `run()` result). The same
+    commands with the same outputs, on the same order, have the same digest
+    """
+    digest = blake2b(digest_size=16)
+    for command, output in raw_data.items():
+        digest.update(command.encode())
+        digest.update(b"\0")
+        digest.update(json.dumps(output, default=str).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ChangeSet:
+    """
+    Changes of an incremental refresh of a collection (see `EntityCollections.merge`)
+
+    - `added`: Keys of the new entities
+    - `removed`: Keys of the entities no longer present
+    - `modified`: Dict of key -> `{attribute: (old, new)}` of the entities updated
+    """
+
+    __slots__ = ("added", "removed", "modified")
+
+    def __init__(self, added=None, removed=None, modified=None):
+        self.added = added or []
+        self.removed = removed or []
+        self.modified = modified or {}
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified)
+
+    def __eq__(self, other):
+        if not isinstance(other, ChangeSet):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def to_dict(self):
+        return dict(added=self.added, removed=self.removed, modified=self.modified)
+
+    def __repr__(self):
+        return (
+            f"ChangeSet(added={len(self.added)}, removed={len(self.removed)}, "
+            f"modified={len(self.modified)})"
+        )
+
+
+class EntityCollections(MutableMapping):
     """
     Main entity collection object. Used for fast lookup and higher level wrapper.
     Should not be instantiated directly
 
+    The entities are stored on a single flat dict, so lookups, `len()` and iteration
+    do not depend on how the collection was built. When the same key is present on
+    more than one of the mappings passed, the first one takes precedence.
+
     This allows Objects to be created and accessed like:
     >>> repr(vl177)
     Vlan(id=177, name='NATIVE', ... metadata=Metadata(name='vlan', ... parent=None))
@@ -54,14 +240,64 @@ class EntityCollections(ChainMap):
 
     >>> len(vlan_collection)
     2
+
+    Secondary indexes can be declared on the `INDEXES` attribute of the collection.
+    They are built on first use and maintained when entities are added or removed:
+    >>> vlan_collection.find(status="active")
+    [Vlan(id=177, ...), Vlan(id=178, ...)]
+
+    >>> vlan_collection.index("status")
+    {'active': [177, 178]}
+
+    Entities changed in place (not replaced on the collection) are not re-indexed
+    until `reindex()` is called. The lazy attributes (see `lazy_attributes()`) are
+    not loaded to index the entities, the ones not loaded yet are loaded for all the
+    entities at once with `fetch_fields()` when the index is used.
+
+    `merge()` updates the collection in place with the data of a new collection (i.e.
+    a refresh of the implementations with `refresh()`) and returns the `ChangeSet`.
+
+    `fingerprint` is the `output_fingerprint()` of the outputs the entities were built
+    from. The refreshes of the implementations skip the parsing when the outputs have
+    the same fingerprint. It is cleared when entities are added or removed.
+
+    The `ChangeSet` of each merge is published as typed events (see `netapi.events`)
+    to the callbacks registered with `subscribe()` and to the async iterators of
+    `stream()`. The events are declared on `EVENT_ATTRIBUTES` (attribute -> event type
+    of its changes), `EVENT_ADDED` and `EVENT_REMOVED`:
+    >>> vlan_collection.subscribe(print)
+    >>> vlan_collection.refresh()
+    Event(type='vlan_status', device='leaf1', key=177, old='active', new='suspended')
+
+    The exceptions raised by the callbacks are kept on `errors`, the rest of the
+    callbacks still receive the events.
+
+    The changes of the collection (`merge()`, `apply_updates()`, `refresh_entity()`,
+    adding and removing entities) and the index lookups hold its `lock` (reentrant),
+    so the polls can run while the streaming telemetry and the syslog triggers update
+    it from their threads
     """
 
+    INDEXES: Tuple[str, ...] = ()
+    EVENT_ATTRIBUTES: Dict[str, str] = {}
+    EVENT_ADDED: Optional[str] = None
+    EVENT_REMOVED: Optional[str] = None
+
     def __init__(self, *args, entity=None, **kwargs):
-        "Initializing ChainMap object and verifying values"
+        "Initializing the entities mapping and verifying values"
+        self._entities = {}
+        self._indexes = {}
+        self._snapshots = {}
+        self._subscribers = []
+        self.errors = []
+        self.lock = threading.RLock()
+        self.fingerprint = None
         for arg in args:
-            for value in arg.values():
+            for key, value in arg.items():
+                if key in self._entities:
+                    continue
                 self._attr_verify(value, entity)
-        super().__init__(*args, **kwargs)
+                self._entities[key] = value
 
     def _attr_verify(self, attribute, expected_type):
         "Verify that each value inserted are of the expected type"
@@ -73,15 +309,338 @@ class EntityCollections(ChainMap):
         except AttributeError:
             raise ValueError(f"{attribute} -> It is not a valid {expected_type} object")
 
+    def __getitem__(self, key):
+        return self._entities[key]
+
+    def __contains__(self, key):
+        return key in self._entities
+
+    def __iter__(self):
+        return iter(self._entities)
+
+    def __len__(self):
+        return len(self._entities)
+
+    def get(self, key, default=None):
+        return self._entities.get(key, default)
+
     def __setitem__(self, *args, entity=None, **kwargs):
         "Verifying values when updating"
-        value = args[-1]
+        key, value = args
         self._attr_verify(value, entity)
-        super().__setitem__(*args, **kwargs)
+        with self.lock:
+            if key in self._entities:
+                self._unindex(key)
+            self._snapshots.pop(key, None)
+            self.fingerprint = None
+            self._entities[key] = value
+            self._index_entity(key, value)
 
         # Update the metadata timestamp if possible
         if hasattr(self, "metadata"):
-            self.metadata.updated_at = pendulum.now()
+            self.metadata.touch()
+
+    def __delitem__(self, key):
+        with self.lock:
+            self._unindex(key)
+            self._snapshots.pop(key, None)
+            self.fingerprint = None
+            del self._entities[key]
+
+    def copy(self):
+        "New collection with the same entities"
+        return self.__class__(self._entities)
+
+    # Secondary indexes
+    @staticmethod
+    def _index_value(value, attr):
+        "Value of the attribute of an entity, `_NOT_LOADED` for lazy ones not loaded"
+        if attr in getattr(value, "LAZY_FIELDS", ()) and attr not in value.__dict__:
+            return _NOT_LOADED
+        return getattr(value, attr, None)
+
+    def _index_entity(self, key, value):
+        for attr, index in self._indexes.items():
+            index.setdefault(self._index_value(value, attr), {})[key] = None
+
+    @staticmethod
+    def _drop_index_key(index, key, attr_value):
+        keys = index.get(attr_value, {})
+        keys.pop(key, None)
+        if not keys:
+            index.pop(attr_value, None)
+
+    def _unindex(self, key):
+        value = self._entities[key]
+        for attr, index in self._indexes.items():
+            # Lazy attributes loaded after the entity was indexed
+            self._drop_index_key(index, key, _NOT_LOADED)
+            self._drop_index_key(index, key, self._index_value(value, attr))
+
+    def _get_index(self, attr):
+        if attr not in self._indexes:
+            if attr not in self.INDEXES:
+                raise ValueError(f"Attribute not indexed: {attr}")
+            index = {}
+            for key, value in self._entities.items():
+                index.setdefault(self._index_value(value, attr), {})[key] = None
+            self._indexes[attr] = index
+        index = self._indexes[attr]
+        if _NOT_LOADED in index:
+            # A single load of the lazy attribute for all the entities
+            keys = list(index.pop(_NOT_LOADED))
+            sources = {type(self._entities[x]).LAZY_FIELDS[attr] for x in keys}
+            self.fetch_fields(sources, keys)
+            for key in keys:
+                value = getattr(self._entities[key], attr, None)
+                index.setdefault(value, {})[key] = None
+        return index
+
+    def _move_index(self, key, attr, old, new):
+        "Moves the key between values of an attribute index (if it is built)"
+        index = self._indexes.get(attr)
+        if index is None:
+            return
+        self._drop_index_key(index, key, _NOT_LOADED)
+        self._drop_index_key(index, key, old)
+        index.setdefault(new, {})[key] = None
+
+    def fetch_fields(self, fields, keys):
+        """
+        Loads the lazy attributes of the `fields` passed of the entities of `keys` at
+        once. Implementation specific, by default each entity loads them on first read
+        """
+
+    def index(self, attr):
+        "Returns the keys of the entities grouped by the value of an indexed attribute"
+        with self.lock:
+            return {value: list(keys) for value, keys in self._get_index(attr).items()}
+
+    def reindex(self):
+        "Drops the secondary indexes so they are rebuilt on the next use"
+        with self.lock:
+            self._indexes = {}
+
+    def find(self, **conditions):
+        """
+        Returns the entities whose attributes match all the conditions. Indexed
+        attributes are resolved with their index, the rest are checked on each entity
+        """
+        matched = []
+        scanned = {}
+        with self.lock:
+            for attr, value in conditions.items():
+                if attr in self.INDEXES:
+                    matched.append(self._get_index(attr).get(value, {}))
+                else:
+                    scanned[attr] = value
+
+            if matched:
+                matched.sort(key=len)
+                entities = [
+                    self._entities[x]
+                    for x in matched[0]
+                    if all(x in keys for keys in matched[1:])
+                ]
+            else:
+                entities = list(self._entities.values())
+        return [
+            x
+            for x in entities
+            if all(getattr(x, k, None) == v for k, v in scanned.items())
+        ]
+
+    def refresh(self, **kwargs):
+        "Incremental `get()` of the implementations. Returns the `ChangeSet`"
+        return self.get(incremental=True, **kwargs)
+
+    def merge(self, items, constructor):
+        """
+        Incremental update of the collection with the `(key, data)` pairs of all its
+        entities (the output of the parsers, i.e. `iter_parse()`). Returns the
+        `ChangeSet`.
+
+        - The new keys are created with `constructor(**data)`
+        - The keys not present are removed
+        - The data of each key is compared with the one of the previous merge. Only
+        when it differs the entity is updated in place with `apply()` (so only the
+        changed attributes are validated). Entities without `apply()` (i.e. the
+        compact ones) are replaced when any attribute differs
+
+        The data of the last merge is kept on the collection, so the cost of a merge
+        depends on the entities that changed and not on the validation of all of them
+        """
+        changes = ChangeSet()
+        with self.lock:
+            snapshots = self._snapshots
+            seen = set()
+            for key, data in items:
+                seen.add(key)
+                current = self._entities.get(key)
+                if current is None:
+                    self[key] = constructor(**data)
+                    changes.added.append(key)
+                elif snapshots.get(key) != data:
+                    delta = self._merge_entity(key, current, data, constructor)
+                    if delta:
+                        changes.modified[key] = delta
+                snapshots[key] = data
+
+            for key in [x for x in self._entities if x not in seen]:
+                del self[key]
+                changes.removed.append(key)
+        self.publish(changes)
+        return changes
+
+    def apply_updates(self, updates):
+        """
+        Updates in place the entities of a dict of key -> partial data (i.e. from
+        streaming telemetry) with their `apply()`, keeping the indexes updated and
+        publishing the events. Keys not present on the collection are ignored. Returns
+        the `ChangeSet`
+        """
+        changes = ChangeSet()
+        with self.lock:
+            for key, data in updates.items():
+                entity = self._entities.get(key)
+                if entity is None or not hasattr(entity, "apply"):
+                    continue
+                delta = entity.apply(data)
+                if not delta:
+                    continue
+                for attr in self._indexes:
+                    if attr in delta:
+                        self._move_index(key, attr, *delta[attr])
+                # The entity no longer matches the outputs of the last collection
+                self._snapshots.pop(key, None)
+                self.fingerprint = None
+                changes.modified[key] = delta
+        self.publish(changes)
+        return changes
+
+    def refresh_entity(self, key):
+        """
+        Targeted refresh of a single entity (i.e. triggered by a syslog message),
+        instead of the collection. Only the `fields` of the collection are collected,
+        with the `fetch_fields()` of the entity (so its lazy attributes not loaded yet
+        are not loaded), and all of them with its `get()` when there are no `fields`.
+        Entities without `get()` (i.e. the compact ones) are refreshed with the
+        collection (`refresh()`). The indexes are kept updated and the changes of the
+        `EVENT_ATTRIBUTES` are published. Returns the `ChangeSet`
+        """
+        with self.lock:
+            entity = self._entities[key]
+            if not hasattr(entity, "get"):
+                return self.refresh()
+            # The entities of the collections are built without connector
+            connector = getattr(self, "connector", None)
+            if getattr(entity, "connector", None) is None and connector is not None:
+                entity.connector = connector
+            watched = set(self.EVENT_ATTRIBUTES).union(self._indexes)
+            before = {x: self._index_value(entity, x) for x in watched}
+            fields = getattr(self, "fields", None)
+            if fields is None:
+                entity.get()
+            else:
+                entity.fetch_fields(fields)
+            delta = {}
+            for attr, old_value in before.items():
+                new_value = self._index_value(entity, attr)
+                if new_value is _NOT_LOADED or new_value == old_value:
+                    continue
+                # The lazy attributes loaded now had no previous value
+                if old_value is not _NOT_LOADED:
+                    delta[attr] = (old_value, new_value)
+                self._move_index(key, attr, old_value, new_value)
+            # The entity no longer matches the outputs of the last collection
+            self._snapshots.pop(key, None)
+            self.fingerprint = None
+        changes = ChangeSet(modified={key: delta} if delta else None)
+        self.publish(changes)
+        return changes
+
+    # Events
+    def subscribe(self, callback, types=None):
+        """
+        Calls `callback(event)` with each event of the merges (optionally only of the
+        event `types`). Returns the `Subscription`, `cancel()` removes it
+        """
+        subscription = Subscription(callback, types, self._subscribers)
+        self._subscribers.append(subscription)
+        return subscription
+
+    def stream(self, types=None):
+        "Returns an `EventStream`, async iterator of the events of the merges"
+        return EventStream(self.subscribe, types)
+
+    def events(self, changes):
+        "Returns the `Event` objects of a `ChangeSet` of the collection"
+        device = getattr(getattr(self, "connector", None), "host", None)
+        timestamp = time.time()
+        events = []
+        if self.EVENT_ADDED:
+            events.extend(
+                Event(
+                    self.EVENT_ADDED,
+                    x,
+                    entity=self._entities.get(x),
+                    device=device,
+                    timestamp=timestamp,
+                )
+                for x in changes.added
+            )
+        if self.EVENT_REMOVED:
+            events.extend(
+                Event(self.EVENT_REMOVED, x, device=device, timestamp=timestamp)
+                for x in changes.removed
+            )
+        if self.EVENT_ATTRIBUTES:
+            for key, delta in changes.modified.items():
+                for attr, event_type in self.EVENT_ATTRIBUTES.items():
+                    if attr in delta:
+                        events.append(
+                            Event(
+                                event_type,
+                                key,
+                                attr,
+                                *delta[attr],
+                                entity=self._entities.get(key),
+                                device=device,
+                                timestamp=timestamp,
+                            )
+                        )
+        return events
+
+    def publish(self, changes):
+        "Publishes the events of the `ChangeSet` to the subscribers (computed once)"
+        if not self._subscribers or not changes:
+            return
+        events = self.events(changes)
+        for subscription in list(self._subscribers):
+            for event in events:
+                try:
+                    subscription(event)
+                except Exception as error:
+                    self.errors.append(error)
+
+    def _merge_entity(self, key, current, data, constructor):
+        "Updates an entity with the data passed, returns the changed attributes"
+        if hasattr(current, "apply"):
+            delta = current.apply(data)
+            for attr in self._indexes:
+                if attr in delta:
+                    self._move_index(key, attr, *delta[attr])
+            return delta
+
+        new = constructor(**data)
+        delta = {}
+        for attr in type(current).__slots__:
+            old_value, new_value = getattr(current, attr), getattr(new, attr)
+            if old_value != new_value:
+                delta[attr] = (old_value, new_value)
+        if delta:
+            self[key] = new
+        return delta
 
     @reprlib.recursive_repr()
     def __repr__(self):
@@ -89,6 +648,343 @@ class EntityCollections(ChainMap):
         return f"{self.__class__.__name__}(" + ", ".join(map(repr, self)) + ")"
 
 
+_FIELDS_PLANS = {}
+
+
+def fields_plan(cls):
+    """
+    Returns (and caches) for each field of the pydantic dataclass a tuple with:
+    `(name, default, default_factory, converters, nested, model_field)`.
+
+    The `converters` are the `@validator` functions of the field, and `nested` is the
+    pydantic dataclass of the field (if any)
+    """
+    if cls in _FIELDS_PLANS:
+        return _FIELDS_PLANS[cls]
+
+    plan = []
+    model_fields = cls.__pydantic_model__.__fields__
+    for _field in fields(cls):
+        model_field = model_fields[_field.name]
+        converters = [
+            make_generic_validator(x.func)
+            for x in model_field.class_validators.values()
+            if not x.whole
+        ]
+        inner = model_field.sub_fields[0] if model_field.sub_fields else model_field
+        nested = inner.type_ if hasattr(inner.type_, "__pydantic_model__") else None
+        plan.append(
+            (
+                _field.name,
+                _field.default,
+                _field.default_factory,  # type: ignore
+                converters,
+                nested,
+                model_field,
+            )
+        )
+
+    _FIELDS_PLANS[cls] = plan
+    return plan
+
+
+def _with_defaults(cls, data):
+    "Returns the data with the default values of the fields not present"
+    result = {}
+    for name, default, default_factory, _, _, _ in fields_plan(cls):
+        if name in data:
+            result[name] = data[name]
+        elif default is not MISSING:
+            result[name] = default
+        elif default_factory is not MISSING:
+            result[name] = default_factory()
+    return result
+
+
+def trusted_construct(cls, values):
+    """
+    Creates an object of a pydantic dataclass from data that is known to be correct,
+    like the one built by the parsers or the output of `to_dict()`.
+
+    The type checks and coercions of pydantic are skipped. Only the `@validator`
+    conversions of each field are applied (i.e. `interface_converter`, `unit_validator`
+    or the status conversions), and nested dataclasses passed as dict are built the same
+    way. The original `__post_init__` of the class and the `_implementation_setup()`
+    hook (if defined) are executed as with a normal instantiation.
+    """
+    obj = cls.__new__(cls)
+    plan = fields_plan(cls)
+    data = _with_defaults(cls, values)
+    for name, *_ in plan:
+        if name not in data:
+            raise TypeError(f"{cls.__name__} missing required argument: {name}")
+
+    for name, _, _, converters, nested, model_field in plan:
+        value = data[name]
+        if value is None:
+            continue
+        if nested is not None:
+            if isinstance(value, dict):
+                value = trusted_construct(nested, value)
+            elif isinstance(value, list):
+                value = [
+                    trusted_construct(nested, x) if isinstance(x, dict) else x
+                    for x in value
+                ]
+        for converter in converters:
+            value = converter(cls, value, data, model_field, model_field.model_config)
+        data[name] = value
+
+    object.__setattr__(obj, "__dict__", data)
+    post_init = getattr(cls, "__post_init_original__", None)
+    if post_init is not None:
+        post_init(obj)
+    if hasattr(obj, "_implementation_setup"):
+        obj._implementation_setup()
+    object.__setattr__(obj, "__initialised__", True)
+    return obj
+
+
+class LazyAttribute:
+    """
+    Descriptor of a dataclass attribute that can be loaded on demand.
+
+    The values are stored on the instance `__dict__` as usual, which takes precedence
+    over the descriptor, so reading a loaded attribute costs the same. When the value
+    is missing (objects built with `lazy_construct()`) the first read calls the
+    `fetch_fields()` method of the object with the `source` field of the attribute,
+    and the value loaded is cached on the object. If nothing is loaded the default of
+    the field is cached instead
+    """
+
+    def __init__(self, name, source, default=MISSING, default_factory=MISSING):
+        self.name = name
+        self.source = source
+        self.default = default
+        self.default_factory = default_factory
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if self.name not in obj.__dict__:
+            obj.fetch_fields({self.source})
+        # NOTE: The updates replace the `__dict__` of the object
+        values = obj.__dict__
+        if self.name not in values:
+            self.load_default(obj)
+        return values[self.name]
+
+    def load_default(self, obj):
+        "Caches the default of the field on the object (nothing was loaded)"
+        values = obj.__dict__
+        values.pop("_fingerprint", None)
+        values[self.name] = (
+            self.default if self.default_factory is MISSING else self.default_factory()
+        )
+
+
+def lazy_attributes(cls):
+    """
+    Installs a `LazyAttribute` on the pydantic dataclass for each field of its
+    `LAZY_FIELDS` mapping (attribute -> field that provides it, i.e. `status_up` is
+    provided by `status`)
+    """
+    for name, default, default_factory, *_ in fields_plan(cls):
+        if name in cls.LAZY_FIELDS:
+            setattr(
+                cls,
+                name,
+                LazyAttribute(name, cls.LAZY_FIELDS[name], default, default_factory),
+            )
+    return cls
+
+
+def lazy_construct(cls, values):
+    """
+    Creates an object with `trusted_construct()` where only the attributes provided by
+    `values` are loaded. The lazy attributes (see `lazy_attributes()`) whose source
+    field is not present are loaded the first time they are read
+    """
+    obj = trusted_construct(cls, values)
+    for name, source in cls.LAZY_FIELDS.items():
+        if source not in values:
+            del obj.__dict__[name]
+    return obj
+
+
+def load_lazy(obj, loaded, fields):
+    """
+    Loads the lazy attributes of the `fields` passed not loaded yet on the object from
+    `loaded`, an object of the same class built with them (or None). The attributes
+    not present on it get their defaults, as when nothing is loaded on first read
+    """
+    values = obj.__dict__
+    for name, source in type(obj).LAZY_FIELDS.items():
+        if source not in fields or name in values:
+            continue
+        if loaded is not None and name in loaded.__dict__:
+            values.pop("_fingerprint", None)
+            values[name] = loaded.__dict__[name]
+        else:
+            getattr(type(obj), name).load_default(obj)
+
+
+def loaded_repr(obj):
+    """
+    Returns the same representation of the dataclass `repr`, but without loading the
+    lazy attributes not loaded yet (shown as `<not loaded>`)
+    """
+    values = ", ".join(
+        f"{x.name}={obj.__dict__[x.name]!r}"
+        if x.name in obj.__dict__
+        else f"{x.name}=<not loaded>"
+        for x in fields(obj)
+        if x.repr
+    )
+    return f"{type(obj).__qualname__}({values})"
+
+
+_SEMANTIC_FIELDS = {}
+
+
+def semantic_fields(cls):
+    """
+    Returns (and caches) the names of the fields with the content of the entity class.
+    All of them except `connector`, `metadata`, `get_cmd` and the API objects
+    """
+    if cls not in _SEMANTIC_FIELDS:
+        _SEMANTIC_FIELDS[cls] = tuple(
+            x.name
+            for x in fields(cls)
+            if x.name not in ("connector", "metadata", "get_cmd")
+            and not x.name.endswith("_api")
+        )
+    return _SEMANTIC_FIELDS[cls]
+
+
+def _canonical(value):
+    "Returns the value as JSON serializable data with a stable representation"
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, "__dataclass_fields__"):
+        return [
+            [x, _canonical(getattr(value, x))] for x in semantic_fields(type(value))
+        ]
+    if isinstance(value, timedelta):
+        # The `str` of pendulum durations is in words, and slow
+        return value.total_seconds()
+    if isinstance(value, (list, tuple)):
+        return [_canonical(x) for x in value]
+    if isinstance(value, dict):
+        return sorted([str(k), _canonical(v)] for k, v in value.items())
+    return str(value)
+
+
+def entity_fingerprint(obj):
+    """
+    Returns the digest of the semantic attributes of the entity (see
+    `semantic_fields()`), the same on any process for the same content. It is cached
+    on the object until an attribute is assigned or changed with `apply_changes()`.
+
+    The lazy attributes not loaded yet are not part of it, and the changes in place of
+    the nested objects (i.e. `intf.physical.mtu = 1500`) are not detected
+    """
+    values = obj.__dict__
+    fingerprint = values.get("_fingerprint")
+    if fingerprint is None:
+        content = [
+            [name, _canonical(values[name])]
+            for name in semantic_fields(type(obj))
+            if name in values
+        ]
+        fingerprint = blake2b(json.dumps(content).encode(), digest_size=16).hexdigest()
+        values["_fingerprint"] = fingerprint
+    return fingerprint
+
+
+def fingerprinted(cls):
+    """
+    Adds the `fingerprint` property (see `entity_fingerprint()`) to the pydantic
+    dataclass of an entity, and uses it as hash. The attribute assignments invalidate
+    the cached value.
+
+    Equal objects have the same semantic attributes, so the hash stays consistent with
+    the equality while it does not walk every field on each call
+    """
+    setattr_ = cls.__setattr__
+
+    def __setattr__(self, name, value):
+        setattr_(self, name, value)
+        self.__dict__.pop("_fingerprint", None)
+
+    def __hash__(self):
+        return hash(entity_fingerprint(self))
+
+    cls.__setattr__ = __setattr__
+    cls.__hash__ = __hash__
+    cls.fingerprint = property(entity_fingerprint)
+    return cls
+
+
+def _equal(current, value):
+    "Equality of attribute values (the bitmath objects fail when compared to None)"
+    if current is value:
+        return True
+    if current is None or value is None:
+        return False
+    return current == value
+
+
+def apply_changes(obj, data):
+    """
+    Bulk update of a pydantic dataclass object.
+
+    Only the attributes whose value differ from the current one are validated, all of
+    them against the same copy of the object attributes (so validators that set other
+    attributes, like the status conversions, are executed once). Nested objects passed
+    as dict are updated the same way on a copy of the current ones.
+
+    If any of them fails a `ValidationError` with all the errors is raised and the
+    object is left untouched, otherwise the changes are applied at once.
+
+    Returns a dict with the `(old, new)` values of the attributes that changed.
+    """
+    model_fields = obj.__pydantic_model__.__fields__
+    current = obj.__dict__
+    values = dict(current)
+    errors = []
+    for name, value in data.items():
+        if name in current and _equal(current[name], value):
+            continue
+        if isinstance(value, dict) and hasattr(current.get(name), "__pydantic_model__"):
+            # Nested objects are updated on a copy, so only their changes are validated
+            nested = copy(current[name])
+            if apply_changes(nested, _with_defaults(type(nested), value)):
+                values[name] = nested
+            continue
+        model_field = model_fields.get(name)
+        if model_field is not None:
+            value, error = model_field.validate(value, values, loc=name, cls=type(obj))
+            if error:
+                errors.append(error)
+                continue
+        values[name] = value
+
+    if errors:
+        raise ValidationError(errors, type(obj))
+
+    changes = {
+        key: (current.get(key), value)
+        for key, value in values.items()
+        # Identity first, some API objects (i.e. pyeapi ones) are costly to compare
+        if key not in current or not _equal(current[key], value)
+    }
+    if changes:
+        values.pop("_fingerprint", None)
+        object.__setattr__(obj, "__dict__", values)
+    return changes
+
+
 def custom_asdict(obj, api_attribute):
     """
     Performs `asdict` functionality from dataclasses.
@@ -128,7 +1024,9 @@ class HidePrivateAttrs(dict):
     ]
 
     def hide_attrs(self, raw_value):
-        if any(x in str(type(raw_value)) for x in HidePrivateAttrs.KNOWN_CLASSES):
+        if isinstance(raw_value, Metadata):
+            return raw_value.to_dict()
+        elif any(x in str(type(raw_value)) for x in HidePrivateAttrs.KNOWN_CLASSES):
             return str(raw_value)
         elif "bitmath.Byte" in str(type(raw_value)):
             return raw_value.bytes
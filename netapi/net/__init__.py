@@ -22,10 +22,20 @@ print(facts_dev)
 # Facts(hostname='lab01', os_version='4.21.5F', ...)
 ```
 """
+from functools import partial
 from netapi.net.eos import pyeapier
-from .interface import InterfaceBase, InterfaceIP
+from netapi.net.snmp import getbulker
+from netapi.net.nxos import nxapier
+from netapi.net.ios import netmikoer as ios_netmikoer
+from netapi.net.xe import netmikoer as xe_netmikoer
+from netapi.net.xr import netmikoer as xr_netmikoer
+from netapi.exceptions import NetApiParseError
+from netapi.metadata import output_fingerprint
+from .interface import InterfaceBase, InterfaceIP, interface_converter, interface_range
+from .compact import compact_class
+from .route_table import RouteTable
 
-__all__ = ["InterfaceBase", "InterfaceIP"]
+__all__ = ["InterfaceBase", "InterfaceIP", "RouteTable"]
 
 
 class ObjectFactory:
@@ -57,45 +67,140 @@ class ObjectFactory:
         return parser
 
 
+def chunked(keys, size, max_bytes, commands):
+    """
+    Splits the keys in chunks of up to `size` keys and `max_bytes` of the text of
+    their commands (a chunk has at least one key)
+    """
+    chunk, chunk_bytes = [], 0
+    for key in keys:
+        key_bytes = sum(len(x) for x in commands[key])
+        if chunk and (len(chunk) >= size or chunk_bytes + key_bytes > max_bytes):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        chunk.append(key)
+        chunk_bytes += key_bytes
+    if chunk:
+        yield chunk
+
+
 class ObjectBuilder:
     """
     Helper class used to create network objects by passing a device `connector` and the
     remaining parameters.
 
     It is a general builder method that calls the respective command and parser
-    factories to get the registered implementations
+    factories to get the registered implementations.
+
+    All the builders accept the `trusted` flag. When True the entities are created with
+    `from_parsed()` from the output of the parsers, skipping the redundant validation of
+    each attribute. Useful when building large collections (i.e. full routing tables)
+
+    The collections also accept the `compact` flag. When True the entities are stored
+    as compact `__slots__` objects, see `netapi.net.compact`. The same flag is used on
+    the collection `get()` refreshes
+
+    The `lazy` flag builds the entities with `from_partial()` (only on the entities
+    that support it, i.e. interfaces): the attributes not collected are loaded the
+    first time they are read. It is also kept on the collection refreshes
     """
 
+    # Limits of the commands sent on a single run when building many entities
+    RUN_CHUNK_SIZE = 200
+    RUN_CHUNK_BYTES = 32 * 1024
+    RANGE_MAX_LENGTH = 1024
+
+    def run_collection(self, factory, connector, parameters, **objs_params):
+        "Runs the collection command and returns its raw output"
+        obj_key = f"{connector.metadata.implementation}"
+        obj_collector = factory.get_builder(obj_key, sub_key="collection")
+        return connector.run(
+            obj_collector.generate_get_cmd(**objs_params), **parameters
+        )
+
+    def get_parsed(self, factory, connector, parameters, **objs_params):
+        "Runs the collection command and returns the output of its parser"
+        raw_data = self.run_collection(factory, connector, parameters, **objs_params)
+
+        # Parse data
+        obj_parser = factory.get_parser(f"{connector.metadata.implementation}")
+        return obj_parser.collector_parse(raw_data, **objs_params)
+
+    @staticmethod
+    def entity_constructor(
+        obj_entity, connector, trusted=False, compact=False, lazy=False
+    ):
+        "Returns the callable that creates the collection entities for the flags"
+        if compact:
+            return compact_class(obj_entity, connector.metadata.implementation)
+        if lazy:
+            return partial(obj_entity.from_partial, connector=connector)
+        if trusted:
+            return obj_entity.from_parsed
+        return obj_entity
+
     def get_objects(self, factory, connector, parameters, **objs_params):
+        trusted = objs_params.pop("trusted", False)
+        compact = objs_params.pop("compact", False)
+        lazy = objs_params.pop("lazy", False)
+
         # Get Object class and instantiate it
         obj_key = f"{connector.metadata.implementation}"
         obj_collector = factory.get_builder(obj_key, sub_key="collection")
         obj_entity = factory.get_builder(obj_key, sub_key="entity")
 
-        # Execute obj command
-        raw_data = connector.run(
-            obj_collector.generate_get_cmd(**objs_params), **parameters
-        )
-
-        # Parse data and update object
+        raw_data = self.run_collection(factory, connector, parameters, **objs_params)
         obj_parser = factory.get_parser(obj_key)
-
         parsed_data = obj_parser.collector_parse(raw_data, **objs_params)
 
-        # Build the entities
-        collected_data = []
+        # Build the entities on a single mapping
+        constructor = self.entity_constructor(
+            obj_entity, connector, trusted, compact, lazy
+        )
+        collected_data = {}
         for data in parsed_data:
             for key, value in data.items():
-                collected_data.append({key: obj_entity(**value)})
+                if key not in collected_data:
+                    collected_data[key] = constructor(**value)
 
         # Create collection object and attach connector
-        obj = obj_collector(*collected_data)
+        obj = obj_collector(collected_data)
         obj.connector = connector
+        obj.compact = compact
+        obj.lazy = lazy
         obj.__dict__.update(objs_params)
+        # The refreshes with the same outputs skip the parsing
+        obj.fingerprint = output_fingerprint(raw_data)
 
         return obj
 
+    def iter_objects(self, factory, connector, parameters, **objs_params):
+        """
+        Yields the `(key, entity)` pairs of a collection as they are parsed, without
+        creating the collection nor the list of the parsed data. Useful to export
+        large tables (i.e. full routing tables) with flat memory use.
+
+        Accepts the same flags as `get_objects()`. Duplicated keys are yielded again
+        """
+        trusted = objs_params.pop("trusted", False)
+        compact = objs_params.pop("compact", False)
+        lazy = objs_params.pop("lazy", False)
+
+        obj_key = f"{connector.metadata.implementation}"
+        obj_entity = factory.get_builder(obj_key, sub_key="entity")
+        obj_parser = factory.get_parser(obj_key)
+        constructor = self.entity_constructor(
+            obj_entity, connector, trusted, compact, lazy
+        )
+
+        raw_data = self.run_collection(factory, connector, parameters, **objs_params)
+        for key, value in obj_parser.iter_parse(raw_data, **objs_params):
+            yield key, constructor(**value)
+
     def get_object(self, factory, connector, parameters, **obj_params):
+        trusted = obj_params.pop("trusted", False)
+        lazy = obj_params.pop("lazy", False)
+
         # Get Object class to instantiate it
         obj_key = f"{connector.metadata.implementation}"
 
@@ -109,8 +214,56 @@ class ObjectBuilder:
         obj_parser = factory.get_parser(obj_key)
         parsed_data = obj_parser.parse(raw_data, **obj_params)
         parsed_data.update(connector=connector)
+        if lazy:
+            return obj.from_partial(**parsed_data)
+        if trusted:
+            return obj.from_parsed(**parsed_data)
         return obj(**parsed_data)
 
+    def get_many_objects(
+        self, factory, connector, parameters, key_param, keys, **obj_params
+    ):
+        """
+        Creates the entities of many keys (`key_param` values, i.e. many `dest` of
+        routes) running their commands on as few `run()` calls as possible. The
+        commands are sent in chunks of `chunk_size` commands (and up to `chunk_bytes`
+        of commands text) to respect the payload and timeout limits of the
+        transports. Returns a dict of key -> entity.
+
+        With the `silent` run parameter, the keys whose command failed are not
+        returned
+        """
+        trusted = obj_params.pop("trusted", False)
+        chunk_size = obj_params.pop("chunk_size", self.RUN_CHUNK_SIZE)
+        chunk_bytes = obj_params.pop("chunk_bytes", self.RUN_CHUNK_BYTES)
+
+        obj_key = f"{connector.metadata.implementation}"
+        obj = factory.get_builder(obj_key, sub_key="entity")
+        obj_parser = factory.get_parser(obj_key)
+        constructor = obj.from_parsed if trusted else obj
+
+        # Commands of each key
+        commands = {}
+        for key in dict.fromkeys(keys):
+            commands[key] = obj.generate_get_cmd(**{key_param: key}, **obj_params)
+
+        objects = {}
+        for chunk in chunked(list(commands), chunk_size, chunk_bytes, commands):
+            raw_data = connector.run(
+                [x for key in chunk for x in commands[key]], **parameters
+            )
+            for key in chunk:
+                key_data = {x: raw_data.get(x) for x in commands[key]}
+                if any(x is None for x in key_data.values()):
+                    continue
+                parsed_data = obj_parser.parse(
+                    key_data, **{key_param: key}, **obj_params
+                )
+                parsed_data.update(connector=connector)
+                objects[key] = constructor(**parsed_data)
+
+        return objects
+
 
 class InterfaceBuilder(ObjectBuilder):
     """
@@ -129,6 +282,18 @@ class InterfaceBuilder(ObjectBuilder):
     - `interface_range`: (optional) Could be string '1-100' or by default is all
     interfaces
 
+    Both accept `fields` (optional), the set of attributes needed (i.e.
+    `{"status", "counters"}`). Only the commands that provide them are run and the
+    rest of the attributes are not parsed
+
+    With `lazy=True` only the `EAGER_FIELDS` (or the `fields` passed) are collected,
+    the other attributes are loaded on first read with a targeted collection of the
+    interface (i.e. `show interfaces Ethernet1 transceiver` for `optical`) and kept
+    on the object
+
+    The collections accept `timeseries`, a `netapi.net.timeseries.CounterStore` where
+    the counters are appended on the build and each `get()`/`refresh()`
+
     **Example:**
 
     ```python
@@ -143,21 +308,115 @@ class InterfaceBuilder(ObjectBuilder):
 
     print(intf_range['Ethernet1'])
     # Interface(name='Ethernet1', name='EXAMPLE-Interface', ...)
+
+    cheap = interfaces.get(connector, entity=False, lazy=True)
+    print(cheap['Ethernet1'].optical)
+    # InterfaceOptical(tx=-2.1, rx=-3.4, ...)
+
+    uplinks = interfaces.get_many(connector, names=['Eth1', 'Eth2', 'Eth49/1'])
+    print(uplinks)
+    # {'Ethernet1': Interface(name='Ethernet1', ...), 'Ethernet2': ...}
     ```
     """
 
+    # Fields collected by the lazy builds when no `fields` are passed
+    EAGER_FIELDS = ("description", "status")
+
     def get(self, connector, entity=True, parameters={}, **interface_params):
         if "silent" not in parameters:
             parameters["silent"] = True
+        if interface_params.get("lazy"):
+            interface_params.setdefault("fields", set(self.EAGER_FIELDS))
         if not entity:
-            return self.get_objects(
+            timeseries = interface_params.pop("timeseries", None)
+            obj = self.get_objects(
                 interface_factory, connector, parameters, **interface_params
             )
+            if timeseries is not None:
+                obj.timeseries = timeseries
+                obj.record_counters()
+            return obj
         else:
             return self.get_object(
                 interface_factory, connector, parameters, **interface_params
             )
 
+    def iter(self, connector, parameters={}, **interface_params):
+        """
+        Yields the `(name, Interface)` pairs of the collection as they are parsed.
+        Accepts the same parameters as the collections, see
+        `ObjectBuilder.iter_objects`
+        """
+        if "silent" not in parameters:
+            parameters["silent"] = True
+        if interface_params.get("lazy"):
+            interface_params.setdefault("fields", set(self.EAGER_FIELDS))
+        return self.iter_objects(
+            interface_factory, connector, parameters, **interface_params
+        )
+
+    def get_many(self, connector, names, parameters={}, **interface_params):
+        """
+        Returns a dict of name -> `Interface` of the interfaces passed (names on
+        standard format). The names are compressed into range expressions (see
+        `netapi.net.interface.interface_range`), so all of them are collected with the
+        commands of a single collection, and the outputs are merged on a single
+        `data_validation` pass. Interfaces not present on the device are not returned.
+
+        Accepts the `trusted`, `lazy`, `chunk_size` and `chunk_bytes` parameters, see
+        `ObjectBuilder.get_many_objects`. Range expressions longer than
+        `RANGE_MAX_LENGTH` are split
+        """
+        if "silent" not in parameters:
+            parameters["silent"] = True
+        lazy = interface_params.pop("lazy", False)
+        if lazy:
+            interface_params.setdefault("fields", set(self.EAGER_FIELDS))
+        trusted = interface_params.pop("trusted", False)
+        chunk_size = interface_params.pop("chunk_size", self.RUN_CHUNK_SIZE)
+        chunk_bytes = interface_params.pop("chunk_bytes", self.RUN_CHUNK_BYTES)
+
+        obj_key = f"{connector.metadata.implementation}"
+        obj_collector = interface_factory.get_builder(obj_key, sub_key="collection")
+        obj_entity = interface_factory.get_builder(obj_key, sub_key="entity")
+        obj_parser = interface_factory.get_parser(obj_key)
+        if lazy:
+            constructor = obj_entity.from_partial
+        elif trusted:
+            constructor = obj_entity.from_parsed
+        else:
+            constructor = obj_entity
+
+        # Range expressions and their collection commands
+        tokens = {x: [f"{x},"] for x in interface_range(names)}
+        commands = {}
+        for chunk in chunked(tokens, len(tokens), self.RANGE_MAX_LENGTH, tokens):
+            for command in obj_collector.generate_get_cmd(
+                interface_range=",".join(chunk), fields=interface_params.get("fields")
+            ):
+                commands[command] = [command]
+
+        raw_data = {}
+        for chunk in chunked(commands, chunk_size, chunk_bytes, commands):
+            raw_data.update(connector.run(chunk, **parameters))
+
+        try:
+            rdata = obj_parser.data_validation(raw_data, entity=False)
+        except NetApiParseError:
+            return {}
+
+        objects = {}
+        for name in dict.fromkeys(interface_converter(x) for x in names):
+            if name not in rdata:
+                continue
+            parsed_data = obj_parser.data_constructor(
+                name, rdata[name], **interface_params
+            )
+            parsed_data.update(connector=connector)
+            objects[name] = constructor(**parsed_data)
+
+        return objects
+
 
 class InterfaceFactory(ObjectFactory):
     "Registers new implementation for commands to generate interface data"
@@ -210,6 +469,13 @@ class VlanBuilder(ObjectBuilder):
         else:
             return self.get_object(vlan_factory, connector, parameters, **vlan_params)
 
+    def iter(self, connector, parameters={}, **vlan_params):
+        """
+        Yields the `(id, Vlan)` pairs of the collection as they are parsed, see
+        `ObjectBuilder.iter_objects`
+        """
+        return self.iter_objects(vlan_factory, connector, parameters, **vlan_params)
+
 
 class VlanFactory(ObjectFactory):
     "Registers new implementation for commands to generate vlan data"
@@ -263,6 +529,13 @@ class VrrpBuilder(ObjectBuilder):
         else:
             return self.get_object(vrrp_factory, connector, parameters, **vrrp_params)
 
+    def iter(self, connector, parameters={}, **vrrp_params):
+        """
+        Yields the `((group_id, interface), Vrrp)` pairs of the collection as they are
+        parsed, see `ObjectBuilder.iter_objects`
+        """
+        return self.iter_objects(vrrp_factory, connector, parameters, **vrrp_params)
+
 
 class VrrpFactory(ObjectFactory):
     "Registers new implementation for commands to generate vrrp data"
@@ -339,6 +612,30 @@ class RouteBuilder(ObjectBuilder):
     print(routes[('default', '10.1.1.0/24')])
     # Route(dest='10.1.1.1', instance='default', ...)
     ```
+
+    Many routes in batched runs, returning a dict of dest -> Route:
+
+    ```python
+    routes = route.get_many(connector, dests=['10.1.1.1', '10.2.2.2'])
+    print(routes['10.1.1.1'])
+    # Route(dest='10.1.1.1', instance='default', ...)
+    ```
+
+    Columnar route table (see `netapi.net.route_table`), built directly from the
+    parsers output with the same parameters of the collections:
+
+    ```python
+    table = route.get_table(connector, vrf_all=True)
+    print(table.count_by("protocol"))
+    # {'bgp': 801230, 'connected': 12, 'static': 4, 'ospf': 310}
+    ```
+
+    Streaming of the routes as they are parsed, without building the collection:
+
+    ```python
+    for key, r in route.iter(connector, vrf_all=True, trusted=True):
+        exporter.write(r.to_dict())
+    ```
     """
 
     def get(self, connector, entity=True, parameters={}, **route_params):
@@ -349,6 +646,29 @@ class RouteBuilder(ObjectBuilder):
         else:
             return self.get_object(route_factory, connector, parameters, **route_params)
 
+    def iter(self, connector, parameters={}, **route_params):
+        """
+        Yields the `((instance, network), Route)` pairs of the collection as they are
+        parsed, see `ObjectBuilder.iter_objects`
+        """
+        return self.iter_objects(route_factory, connector, parameters, **route_params)
+
+    def get_many(self, connector, dests, parameters={}, **route_params):
+        """
+        Returns a dict of dest -> `Route` of many destinations (on the same
+        `instance`), batching their commands on as few runs as possible. Accepts the
+        `trusted`, `chunk_size` and `chunk_bytes` parameters, see
+        `ObjectBuilder.get_many_objects`
+        """
+        return self.get_many_objects(
+            route_factory, connector, parameters, "dest", dests, **route_params
+        )
+
+    def get_table(self, connector, parameters={}, **route_params):
+        return RouteTable.from_parsed(
+            self.get_parsed(route_factory, connector, parameters, **route_params)
+        )
+
 
 class RouteFactory(ObjectFactory):
     "Registers new implementation for commands to generate data"
@@ -360,11 +680,31 @@ class RouteFactory(ObjectFactory):
         return self.parse(builder, **kwargs)
 
 
+# Implementations parsing the CLI text outputs (see `netapi.net.textparser`)
+CLI_TEXT_MODULES = {
+    "IOS-NETMIKO": ios_netmikoer,
+    "XE-NETMIKO": xe_netmikoer,
+    "XR-NETMIKO": xr_netmikoer,
+}
+
 interface_factory = InterfaceFactory()
 interface_factory.register_builder(
     "EOS-PYEAPI", {"entity": pyeapier.Interface, "collection": pyeapier.Interfaces}
 )
 interface_factory.register_parser("EOS-PYEAPI", pyeapier.ParseInterface)
+interface_factory.register_builder(
+    "SNMP-GETBULK", {"entity": getbulker.Interface, "collection": getbulker.Interfaces}
+)
+interface_factory.register_parser("SNMP-GETBULK", getbulker.ParseInterface)
+interface_factory.register_builder(
+    "NXOS-NXAPI", {"entity": nxapier.Interface, "collection": nxapier.Interfaces}
+)
+interface_factory.register_parser("NXOS-NXAPI", nxapier.ParseInterface)
+for _key, _module in CLI_TEXT_MODULES.items():
+    interface_factory.register_builder(
+        _key, {"entity": _module.Interface, "collection": _module.Interfaces}
+    )
+    interface_factory.register_parser(_key, _module.ParseInterface)
 
 
 vlan_factory = VlanFactory()
@@ -372,6 +712,16 @@ vlan_factory.register_builder(
     "EOS-PYEAPI", {"entity": pyeapier.Vlan, "collection": pyeapier.Vlans}
 )
 vlan_factory.register_parser("EOS-PYEAPI", pyeapier.ParseVlan)
+vlan_factory.register_builder(
+    "NXOS-NXAPI", {"entity": nxapier.Vlan, "collection": nxapier.Vlans}
+)
+vlan_factory.register_parser("NXOS-NXAPI", nxapier.ParseVlan)
+# The XR routers do not have VLANs
+for _key, _module in (("IOS-NETMIKO", ios_netmikoer), ("XE-NETMIKO", xe_netmikoer)):
+    vlan_factory.register_builder(
+        _key, {"entity": _module.Vlan, "collection": _module.Vlans}
+    )
+    vlan_factory.register_parser(_key, _module.ParseVlan)
 
 
 vrrp_factory = VrrpFactory()
@@ -379,6 +729,15 @@ vrrp_factory.register_builder(
     "EOS-PYEAPI", {"entity": pyeapier.Vrrp, "collection": pyeapier.Vrrps}
 )
 vrrp_factory.register_parser("EOS-PYEAPI", pyeapier.ParseVrrp)
+vrrp_factory.register_builder(
+    "NXOS-NXAPI", {"entity": nxapier.Vrrp, "collection": nxapier.Vrrps}
+)
+vrrp_factory.register_parser("NXOS-NXAPI", nxapier.ParseVrrp)
+for _key, _module in CLI_TEXT_MODULES.items():
+    vrrp_factory.register_builder(
+        _key, {"entity": _module.Vrrp, "collection": _module.Vrrps}
+    )
+    vrrp_factory.register_parser(_key, _module.ParseVrrp)
 
 
 facts_factory = FactsFactory()
@@ -391,3 +750,12 @@ route_factory.register_builder(
     "EOS-PYEAPI", {"entity": pyeapier.Route, "collection": pyeapier.Routes}
 )
 route_factory.register_parser("EOS-PYEAPI", pyeapier.ParseRoute)
+route_factory.register_builder(
+    "NXOS-NXAPI", {"entity": nxapier.Route, "collection": nxapier.Routes}
+)
+route_factory.register_parser("NXOS-NXAPI", nxapier.ParseRoute)
+for _key, _module in CLI_TEXT_MODULES.items():
+    route_factory.register_builder(
+        _key, {"entity": _module.Route, "collection": _module.Routes}
+    )
+    route_factory.register_parser(_key, _module.ParseRoute)
@@ -0,0 +1,221 @@
+"""
+Compact entity objects.
+
+Memory efficient representation of the network entities for large tables (i.e. full
+routing tables). The compact entities are `__slots__` objects with the same attribute
+names of the entity they represent, but:
+
+- Only the cheap conversions are applied (names, status, protocol...). Attributes like
+IP networks, MAC addresses or units are kept as their parsed value
+- Nested objects (like `Via` or `InterfacePhysical`) are namedtuples, lists are tuples
+and dicts are read-only mappings. Equal tuples and mappings are shared among the
+entities
+- Strings are interned
+- The `metadata` is a single object shared by all the compact entities of the same class
+
+The full pydantic entity is created on demand with `to_entity()`.
+
+**Example:**
+
+```python
+from netapi.net import RouteBuilder
+
+routes = RouteBuilder().get(connector, entity=False, compact=True, vrf_all=True)
+route = routes[("default", "10.1.1.0/24")]
+print(route)
+# CompactRoute(dest='10.1.1.0/24', instance='default', ...)
+
+print(route.to_entity())
+# Route(dest='10.1.1.0/24', instance='default', network=IPNetwork('10.1.1.0/24'), ...)
+```
+"""
+from sys import intern
+from types import MappingProxyType
+from collections import namedtuple
+from dataclasses import MISSING
+from netapi.metadata import Metadata, entity_fingerprint, fields_plan
+from netapi.net.interface import InterfaceBase
+from netapi.net.route import RouteBase
+from netapi.net.vlan import VlanBase
+from netapi.net.vrrp import VrrpBase
+
+
+# Entities with compact representation: Their metadata name and the attributes that
+# are converted on the compact entities. The rest are kept as parsed
+COMPACT_ENTITIES = {
+    InterfaceBase: ("interface", ("name", "status", "forwarding_model")),
+    RouteBase: ("route", ("protocol",)),
+    VlanBase: ("vlan", ("status",)),
+    VrrpBase: ("vrrp", ("status",)),
+}
+_COMPACT_CLASSES = {}
+_NESTED_RECORDS = {}
+
+
+def _shared(cache, value):
+    "Returns the first equal value stored on the cache (if hashable)"
+    try:
+        return cache.setdefault(value, value)
+    except TypeError:
+        return value
+
+
+def _compact_value(value, cache):
+    if value.__class__ is str:
+        return intern(value)
+    if isinstance(value, list):
+        return _shared(cache, tuple(_compact_value(x, cache) for x in value))
+    if isinstance(value, dict):
+        key = tuple(sorted((k, _compact_value(v, cache)) for k, v in value.items()))
+        try:
+            if key not in cache:
+                cache[key] = MappingProxyType(dict(key))
+            return cache[key]
+        except TypeError:
+            return MappingProxyType(value)
+    return value
+
+
+def _expand_value(value):
+    if isinstance(value, tuple):
+        if hasattr(value, "_asdict"):
+            return {k: _expand_value(v) for k, v in value._asdict().items()}
+        return [_expand_value(x) for x in value]
+    if isinstance(value, MappingProxyType):
+        return {k: _expand_value(v) for k, v in value.items()}
+    return value
+
+
+def nested_record(nested_cls):
+    "Returns the namedtuple class used to represent the nested dataclass"
+    if nested_cls not in _NESTED_RECORDS:
+        plan = fields_plan(nested_cls)
+        record = namedtuple(nested_cls.__name__, [x[0] for x in plan])
+        record.__new__.__defaults__ = tuple(
+            None if x[1] is MISSING else x[1] for x in plan
+        )
+        _NESTED_RECORDS[nested_cls] = record
+    return _NESTED_RECORDS[nested_cls]
+
+
+class CompactEntity:
+    """
+    Base of the compact entities. The classes are created with `compact_class()` for
+    each entity class.
+    """
+
+    __slots__ = ()
+    ENTITY = None
+    metadata = None
+
+    def __init__(self, **data):
+        cls = type(self)
+        values = {**cls._defaults, **data}
+        for name, converter, model_field in cls._conversions:
+            value = values[name]
+            if value is not None:
+                values[name] = converter(
+                    cls.ENTITY, value, values, model_field, model_field.model_config
+                )
+        for name, record in cls._nested:
+            value = values[name]
+            if isinstance(value, dict):
+                values[name] = record(**value)
+            elif isinstance(value, list):
+                values[name] = tuple(
+                    record(**x) if isinstance(x, dict) else x for x in value
+                )
+        cache = cls._cache
+        for name in cls.__slots__:
+            object.__setattr__(self, name, _compact_value(values[name], cache))
+
+    def to_parsed(self):
+        "Returns the attributes as the dict of data returned by the parsers"
+        return {x: _expand_value(getattr(self, x)) for x in self.__slots__}
+
+    def to_entity(self, **kwargs):
+        "Creates the full entity object. `kwargs` take precedence over the attributes"
+        return self.ENTITY.from_parsed(**{**self.to_parsed(), **kwargs})
+
+    def to_dict(self):
+        return self.to_entity().to_dict()
+
+    @property
+    def fingerprint(self):
+        "Same `fingerprint` of the full entity (not cached)"
+        return entity_fingerprint(self.to_entity())
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, x) == getattr(other, x) for x in self.__slots__)
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        attrs = ", ".join(f"{x}={getattr(self, x)!r}" for x in self._repr_fields)
+        return f"{type(self).__name__}({attrs})"
+
+
+def compact_class(entity_cls, implementation=None):
+    """
+    Returns (and caches) the compact class of the entity class passed. It has the same
+    attribute names, except the API ones, `get_cmd` and `metadata` which is shared at
+    class level
+    """
+    if entity_cls in _COMPACT_CLASSES:
+        compact = _COMPACT_CLASSES[entity_cls]
+        if implementation and not compact.metadata.implementation:
+            compact.metadata.implementation = implementation
+        return compact
+
+    try:
+        name, conversions = next(
+            v for k, v in COMPACT_ENTITIES.items() if issubclass(entity_cls, k)
+        )
+    except StopIteration:
+        raise NotImplementedError(f"No compact representation for {entity_cls}")
+
+    plan = [
+        x
+        for x in fields_plan(entity_cls)
+        if x[0] not in ("metadata", "get_cmd") and not x[0].endswith("_api")
+    ]
+    defaults = {}
+    for field_name, default, default_factory, _, _, _ in plan:
+        if default is not MISSING:
+            defaults[field_name] = default
+        elif default_factory is not MISSING:
+            defaults[field_name] = default_factory()
+
+    compact = type(
+        f"Compact{entity_cls.__name__}",
+        (CompactEntity,),
+        dict(
+            __slots__=tuple(x[0] for x in plan),
+            __module__=__name__,
+            __doc__=f"Compact representation of `{entity_cls.__name__}`",
+            ENTITY=entity_cls,
+            metadata=Metadata(name=name, type="entity", implementation=implementation),
+            _defaults=defaults,
+            _conversions=[
+                (field_name, converter, model_field)
+                for field_name, _, _, converters, _, model_field in plan
+                if field_name in conversions
+                for converter in converters
+            ],
+            _nested=[
+                (field_name, nested_record(nested))
+                for field_name, _, _, _, nested, _ in plan
+                if nested is not None
+            ],
+            _cache={},
+            _repr_fields=[
+                x.name
+                for x in entity_cls.__dataclass_fields__.values()
+                if x.repr and x.name in {y[0] for y in plan}
+            ],
+        ),
+    )
+    _COMPACT_CLASSES[entity_cls] = compact
+    return compact
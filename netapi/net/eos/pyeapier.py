@@ -4,19 +4,32 @@ EOS Pyeapi module.
 Contains the method to create Network Objects for the EOS-PYEAPI implementation.
 """
 import pendulum
+from functools import partial
 from bitmath import kB
 from netapi.net import vlan, vrrp, interface, facts, route
+from netapi.net.compact import compact_class
+from netapi.metadata import ChangeSet, output_fingerprint
 from netapi.exceptions import NetApiParseError
 
 
 def update_attrs(obj, data_dict):
-    "Updates object attributes based on data from dictionary"
-    for key, value in data_dict.items():
-        setattr(obj, key, value)
-
-
-def update_container_attrs(obj, list_of_dict, entity):
-    "Updates collections based on data from dictionary contained in list"
+    "Updates object attributes based on data from dictionary. Returns the changes"
+    return obj.apply(data_dict)
+
+
+def update_container_attrs(obj, list_of_dict, entity, incremental=False):
+    """
+    Updates collections based on data from dictionary contained in list. When
+    `incremental` the collection is merged in place and the `ChangeSet` returned
+    """
+    if getattr(obj, "compact", False):
+        entity = compact_class(entity, obj.metadata.implementation)
+    elif getattr(obj, "lazy", False):
+        entity = partial(entity.from_partial, connector=obj.connector)
+    if incremental:
+        return obj.merge(
+            (item for data_dict in list_of_dict for item in data_dict.items()), entity
+        )
     for data_dict in list_of_dict:
         for key, value in data_dict.items():
             obj[key] = entity(**value)
@@ -41,8 +54,12 @@ class Vlans(vlan.VlansBase):
         else:
             return ["show vlan"]
 
-    def get(self, **_ignore):
-        "Automatic trigger a data collection. A connector object has to be passed"
+    def get(self, incremental=False, **_ignore):
+        """
+        Automatic trigger a data collection. A connector object has to be passed.
+        With `incremental` the entities are updated in place and the `ChangeSet` is
+        returned, see `refresh()`
+        """
         if self.connector.metadata.implementation != "EOS-PYEAPI":
             raise ValueError(
                 "Connector is not of the correct implementation: EOS-PYEAPI"
@@ -52,19 +69,27 @@ class Vlans(vlan.VlansBase):
         if not self.get_cmd:
             self.get_cmd = self.generate_get_cmd(self.vlan_range)
 
-        parsed_data = ParseVlan.collector_parse(
-            self.connector.run(self.get_cmd), **_ignore
-        )
-
-        update_container_attrs(self, parsed_data, Vlan)
-        self.metadata.updated_at = pendulum.now()
+        raw_data = self.connector.run(self.get_cmd)
+        fingerprint = output_fingerprint(raw_data)
+        if fingerprint == self.fingerprint:
+            # Same outputs of the previous collection, nothing to parse
+            changes = ChangeSet()
+        else:
+            parsed_data = ParseVlan.collector_parse(raw_data, **_ignore)
+            changes = update_container_attrs(self, parsed_data, Vlan, incremental)
+            self.fingerprint = fingerprint
+        self.metadata.touch()
         self.metadata.collection_count += 1
-        return True
+        return changes if incremental else True
 
 
 class Vlan(vlan.VlanBase):
     def __post_init__(self, **_ignore):
         super().__post_init__(**_ignore)
+        self._implementation_setup()
+
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
         self.metadata.implementation = "EOS-PYEAPI"
         self._vlan_api_generator()
 
@@ -98,11 +123,8 @@ class Vlan(vlan.VlanBase):
         # Update the attributes
         update_attrs(self, parsed_data)
 
-        # Do extra work for the status
-        self.status, self.status_up = vlan.status_conversion(parsed_data["status"])
-
         # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+        self.metadata.touch()
         self.metadata.collection_count += 1
         return True
 
@@ -173,18 +195,23 @@ class ParseVlan:
         return vlan_data
 
     @staticmethod
-    def collector_parse(raw_data, **kwargs):
+    def iter_parse(raw_data, **kwargs):
         """
-        Returns list of dictionaries of each entity parsed
+        Yields the key and data of each entity as it is parsed
         """
         rdata = ParseVlan.data_validation(raw_data, entity=False, **kwargs)
 
-        vlans_container = []
         for _vlan_id, _vlan_data in rdata.items():
-            _parsed_data = ParseVlan.data_constructor(_vlan_id, _vlan_data, **kwargs)
-            vlans_container.append({int(_vlan_id): _parsed_data})
+            yield int(_vlan_id), ParseVlan.data_constructor(
+                _vlan_id, _vlan_data, **kwargs
+            )
 
-        return vlans_container
+    @staticmethod
+    def collector_parse(raw_data, **kwargs):
+        """
+        Returns list of dictionaries of each entity parsed
+        """
+        return [{k: v} for k, v in ParseVlan.iter_parse(raw_data, **kwargs)]
 
 
 class Vrrps(vrrp.VrrpsBase):
@@ -205,8 +232,12 @@ class Vrrps(vrrp.VrrpsBase):
         else:
             return [f"show vrrp all"]
 
-    def get(self, **_ignore):
-        "Automatic trigger a data collection. A connector object has to be passed"
+    def get(self, incremental=False, **_ignore):
+        """
+        Automatic trigger a data collection. A connector object has to be passed.
+        With `incremental` the entities are updated in place and the `ChangeSet` is
+        returned, see `refresh()`
+        """
         if self.connector.metadata.implementation != "EOS-PYEAPI":
             raise ValueError(
                 "Connector is not of the correct implementation: EOS-PYEAPI"
@@ -216,20 +247,27 @@ class Vrrps(vrrp.VrrpsBase):
         if not self.get_cmd:
             self.get_cmd = self.generate_get_cmd(self.instance, self.interface)
 
-        parsed_data = ParseVrrp.collector_parse(
-            self.connector.run(self.get_cmd), **_ignore
-        )
-
-        update_container_attrs(self, parsed_data, Vrrp)
-
-        self.metadata.updated_at = pendulum.now()
+        raw_data = self.connector.run(self.get_cmd)
+        fingerprint = output_fingerprint(raw_data)
+        if fingerprint == self.fingerprint:
+            # Same outputs of the previous collection, nothing to parse
+            changes = ChangeSet()
+        else:
+            parsed_data = ParseVrrp.collector_parse(raw_data, **_ignore)
+            changes = update_container_attrs(self, parsed_data, Vrrp, incremental)
+            self.fingerprint = fingerprint
+        self.metadata.touch()
         self.metadata.collection_count += 1
-        return True
+        return changes if incremental else True
 
 
 class Vrrp(vrrp.VrrpBase):
     def __post_init__(self, **_ignore):
         super().__post_init__(**_ignore)
+        self._implementation_setup()
+
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
         self.metadata.implementation = "EOS-PYEAPI"
         self._vrrp_api_generator()
 
@@ -270,11 +308,8 @@ class Vrrp(vrrp.VrrpBase):
         # Update the attributes
         update_attrs(self, parsed_data)
 
-        # Do extra work for the status
-        self.status, self.status_up = vrrp.status_conversion(parsed_data["status"])
-
         # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+        self.metadata.touch()
         self.metadata.collection_count += 1
         return True
 
@@ -362,71 +397,135 @@ class ParseVrrp:
         return vrrp_data
 
     @staticmethod
-    def collector_parse(raw_data, **kwargs):
+    def iter_parse(raw_data, **kwargs):
         """
-        Returns list of dictionaries of each entity parsed
+        Yields the key and data of each entity as it is parsed
         """
         rdata = ParseVrrp.data_validation(raw_data, entity=False, **kwargs)
 
-        vrrps_container = []
         for vrrp_data in rdata:
-            # Placeholder
             _parsed_data = ParseVrrp.data_constructor(vrrp_data, **kwargs)
-            vrrps_container.append(
-                {(_parsed_data["group_id"], _parsed_data["interface"]): _parsed_data}
-            )
+            yield (_parsed_data["group_id"], _parsed_data["interface"]), _parsed_data
+
+    @staticmethod
+    def collector_parse(raw_data, **kwargs):
+        """
+        Returns list of dictionaries of each entity parsed
+        """
+        return [{k: v} for k, v in ParseVrrp.iter_parse(raw_data, **kwargs)]
+
+
+# Commands of the interface fields (`{}` is replaced by the interface range), as
+# alternatives ordered by preference: the smaller commands first, `show interfaces`
+# provides most of the fields at once
+SHOW_INTERFACES = ["show interfaces{}"]
+INTERFACE_FIELD_COMMANDS = {
+    "description": [["show interfaces{} status"], SHOW_INTERFACES],
+    "status": [["show interfaces{} status"], SHOW_INTERFACES],
+    "counters": [
+        [
+            "show interfaces{} counters",
+            "show interfaces{} counters errors",
+            "show interfaces{} counters rates",
+        ],
+        SHOW_INTERFACES,
+    ],
+    "instance": [["show ip interface{}"]],
+    "addresses": [["show ip interface{}"]],
+    "optical": [["show interfaces{} transceiver"]],
+    "forwarding_model": [SHOW_INTERFACES],
+    "last_status_change": [SHOW_INTERFACES],
+    "last_clear": [SHOW_INTERFACES],
+    "number_status_changes": [SHOW_INTERFACES],
+    "update_interval": [SHOW_INTERFACES],
+    "members": [SHOW_INTERFACES],
+    "physical": [SHOW_INTERFACES],
+}
+
+
+def interface_commands(interface_range=None, fields=None):
+    """
+    Returns the commands to collect the interfaces of the range. When `fields` are
+    passed only the minimal set of commands that provide them are returned
+    """
+    if fields is None:
+        templates = [
+            "show interfaces{}",
+            "show ip interface{}",
+            "show interfaces{} transceiver",
+        ]
+    else:
+        templates = interface.field_commands(INTERFACE_FIELD_COMMANDS, fields)
+
+    interface_range = f" {interface_range}" if interface_range is not None else ""
+    return [x.format(interface_range) for x in templates]
 
-        return vrrps_container
+
+def interface_fields(fields):
+    "Returns all the fields provided by the commands that collect the `fields` passed"
+    return interface.commands_fields(
+        INTERFACE_FIELD_COMMANDS,
+        interface.field_commands(INTERFACE_FIELD_COMMANDS, fields),
+    )
 
 
 class Interfaces(interface.InterfacesBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.interface_range = None
+        self.fields = None
         self.get_cmd = None
         self.metadata.implementation = "EOS-PYEAPI"
 
     @staticmethod
-    def generate_get_cmd(interface_range=None):
-        "Returns commands necessary to build the collection of entities"
+    def generate_get_cmd(interface_range=None, fields=None):
+        """
+        Returns commands necessary to build the collection of entities. With `fields`
+        (i.e. `{"status", "counters"}`) only the commands that provide them
+        """
         if isinstance(interface_range, list):
             raise ValueError("Must pass a str (i.e. Eth1 - 10) or None to collect all")
-        if interface_range is not None:
-            return [
-                f"show interfaces {interface_range}",
-                f"show ip interface {interface_range}",
-                f"show interfaces {interface_range} transceiver",
-            ]
-        else:
-            return [
-                "show interfaces",
-                "show ip interface",
-                "show interfaces transceiver",
-            ]
+        return interface_commands(interface_range, fields)
 
-    def get(self, **_ignore):
-        "Automatic trigger a data collection. A connector object has to be passed"
+    def get(self, incremental=False, **_ignore):
+        """
+        Automatic trigger a data collection. A connector object has to be passed.
+        With `incremental` the entities are updated in place and the `ChangeSet` is
+        returned, see `refresh()`. The counters are appended to the `timeseries`
+        store, when attached
+        """
         if self.connector.metadata.implementation != "EOS-PYEAPI":
             raise ValueError(
                 "Connector is not of the correct implementation: EOS-PYEAPI"
             )
         # Verify show command
         if not self.get_cmd:
-            self.get_cmd = self.generate_get_cmd(self.interface_range)
+            self.get_cmd = self.generate_get_cmd(self.interface_range, self.fields)
 
-        parsed_data = ParseInterface.collector_parse(
-            self.connector.run(self.get_cmd), **_ignore
-        )
-
-        update_container_attrs(self, parsed_data, Interface)
-        self.metadata.updated_at = pendulum.now()
+        raw_data = self.connector.run(self.get_cmd)
+        fingerprint = output_fingerprint(raw_data)
+        if fingerprint == self.fingerprint:
+            # Same outputs of the previous collection, nothing to parse
+            changes = ChangeSet()
+        else:
+            parsed_data = ParseInterface.collector_parse(
+                raw_data, **{"fields": self.fields, **_ignore}
+            )
+            changes = update_container_attrs(self, parsed_data, Interface, incremental)
+            self.fingerprint = fingerprint
+        self.record_counters()
+        self.metadata.touch()
         self.metadata.collection_count += 1
-        return True
+        return changes if incremental else True
 
 
 class Interface(interface.InterfaceBase):
     def __post_init__(self, **_ignore):
         super().__post_init__(**_ignore)
+        self._implementation_setup()
+
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
         self.metadata.implementation = "EOS-PYEAPI"
         self._interface_api_generator()
 
@@ -442,13 +541,29 @@ class Interface(interface.InterfaceBase):
             return False
 
     @staticmethod
-    def generate_get_cmd(name):
-        "Returns commands necessary to build the entity"
-        return [
-            f"show interfaces {name}",
-            f"show ip interface {name}",
-            f"show interfaces {name} transceiver",
-        ]
+    def generate_get_cmd(name, fields=None):
+        "Returns commands necessary to build the entity (or only its `fields`)"
+        return interface_commands(name, fields)
+
+    def fetch_fields(self, fields):
+        """
+        Loads the attributes of a lazy object running only the commands that provide
+        the `fields` passed. The rest of the fields provided by those commands are
+        loaded too. Returns the changes, nothing is loaded without connector or when
+        the commands have no output
+        """
+        if self.connector is None:
+            return {}
+        fields = interface_fields(fields)
+        raw_data = self.connector.run(
+            self.generate_get_cmd(self.name, fields), silent=True
+        )
+        try:
+            parsed_data = ParseInterface.parse(raw_data, fields=fields)
+        except NetApiParseError:
+            # Not available for the interface (i.e. `show ip interface` of a switchport)
+            return {}
+        return update_attrs(self, parsed_data)
 
     def get(self, **_ignore):
         "Automatic trigger a data collection by running get_cmd"
@@ -466,13 +581,8 @@ class Interface(interface.InterfaceBase):
         # Update the attributes
         update_attrs(self, parsed_data)
 
-        # Do extra work for the status
-        self.status, self.status_up, self.enabled = interface.status_conversion(
-            parsed_data["status"]
-        )
-
         # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+        self.metadata.touch()
         self.metadata.collection_count += 1
         return True
 
@@ -491,26 +601,90 @@ class Interface(interface.InterfaceBase):
         return self.interface_api.set_shutdown(self.name, disable=False)
 
 
+def _interface_status(value):
+    return {
+        intf: dict(
+            description=x.get("description"), interfaceStatus=x.get("linkStatus")
+        )
+        for intf, x in value.get("interfaceStatuses", {}).items()
+    }
+
+
+def _interface_counters(value):
+    return {
+        intf: dict(interfaceCounters=x)
+        for intf, x in value.get("interfaces", {}).items()
+    }
+
+
+def _interface_counters_errors(value):
+    return {
+        intf: dict(
+            interfaceCounters=dict(
+                totalInErrors=x.get("inErrors", 0.0),
+                totalOutErrors=x.get("outErrors", 0.0),
+                inputErrorsDetail=dict(
+                    fcsErrors=x.get("fcsErrors", 0.0),
+                    alignmentErrors=x.get("alignmentErrors", 0.0),
+                    symbolErrors=x.get("symbolErrors", 0.0),
+                    runtFrames=x.get("frameTooShorts", 0.0),
+                    giantFrames=x.get("frameTooLongs", 0.0),
+                ),
+            )
+        )
+        for intf, x in value.get("interfaceErrorCounters", {}).items()
+    }
+
+
+def _interface_counters_rates(value):
+    return {
+        intf: dict(
+            interfaceStatistics=dict(
+                updateInterval=x.get("interval"),
+                inBitsRate=x.get("inBpsRate", 0.0),
+                inPktsRate=x.get("inPktsRate", 0.0),
+                outBitsRate=x.get("outBpsRate", 0.0),
+                outPktsRate=x.get("outPktsRate", 0.0),
+            )
+        )
+        for intf, x in value.get("interfaces", {}).items()
+    }
+
+
+# Normalizers of the outputs (by command suffix) to the `show interfaces` format
+INTERFACE_NORMALIZERS = [
+    (" status", _interface_status),
+    (" counters errors", _interface_counters_errors),
+    (" counters rates", _interface_counters_rates),
+    (" counters", _interface_counters),
+]
+
+
 class ParseInterface:
     @staticmethod
-    def data_constructor(intf_name, data, **kwargs):
+    def data_constructor(intf_name, data, fields=None, **kwargs):
         # If no data is passed a known error
         if not data:
             raise NetApiParseError("No data to be parsed")
 
         statistics = data.get("interfaceStatistics", {})
+        # Only the sections of the fields requested are parsed
+        requested = partial(interface.field_requested, fields=fields)
 
         # Physical bit
-        physical = dict(
-            mac=data.get("physicalAddress"),
-            mtu=data.get("mtu", 0),
-            duplex=data.get("duplex"),
-            bandwidth=data.get("bandwidth", 0),
-        )
+        if not requested("physical"):
+            physical = None
+        else:
+            physical = dict(
+                mac=data.get("physicalAddress"),
+                mtu=data.get("mtu", 0),
+                duplex=data.get("duplex"),
+                bandwidth=data.get("bandwidth", 0),
+            )
 
         # Addresses bit
         addr_info = data.get("interfaceAddress")
-        if not addr_info:
+        if not addr_info or not requested("addresses"):
             addresses = None
         else:
             addresses = dict(dhcp=addr_info.get("dhcp"), secondary_ipv4=[])
@@ -525,7 +699,7 @@ class ParseInterface:
 
         # Counters bit
         counter_info = data.get("interfaceCounters", {})
-        if not counter_info:
+        if not counter_info or not requested("counters"):
             counters = None
         else:
             counters = dict(
@@ -575,20 +749,23 @@ class ParseInterface:
                 )
 
         # Optical bit
-        optical = dict(
-            tx=data.get("txPower"),
-            rx=data.get("rxPower"),
-            serial_number=data.get("vendorSn"),
-            media_type=data.get("mediaType"),
-        )
-
-        if optical.get("tx") is not None and optical.get("rx") is not None:
-            optical["status"] = interface.light_levels_alert(
-                tx_power=optical["tx"], rx_power=optical["rx"], net_os="eos"
+        if not requested("optical"):
+            optical = None
+        else:
+            optical = dict(
+                tx=data.get("txPower"),
+                rx=data.get("rxPower"),
+                serial_number=data.get("vendorSn"),
+                media_type=data.get("mediaType"),
             )
 
-        if not any(optical.values()):
-            optical = None
+            if optical.get("tx") is not None and optical.get("rx") is not None:
+                optical["status"] = interface.light_levels_alert(
+                    tx_power=optical["tx"], rx_power=optical["rx"], net_os="eos"
+                )
+
+            if not any(optical.values()):
+                optical = None
 
         parsed_data = dict(
             name=intf_name,
@@ -607,7 +784,8 @@ class ParseInterface:
             counters=counters,
         )
 
-        return parsed_data
+        # Skip the fields not requested
+        return interface.project_fields(parsed_data, fields)
 
     @staticmethod
     def data_validation(raw_data, entity=True, **kwargs):
@@ -615,12 +793,26 @@ class ParseInterface:
         rdata = {}
         try:
             # Merge the results off al the commands into each interface found
-            for value in raw_data.values():
+            for command, value in raw_data.items():
                 if not value:
                     continue
-                for intf, intf_data in value.get("interfaces", {}).items():
+                interfaces = value.get("interfaces", {})
+                for suffix, normalizer in INTERFACE_NORMALIZERS:
+                    if command.endswith(suffix):
+                        interfaces = normalizer(value)
+                        break
+                for intf, intf_data in interfaces.items():
                     if rdata.get(intf):
-                        rdata[intf] = {**rdata[intf], **intf_data}
+                        rdata[intf] = {
+                            **rdata[intf],
+                            **{
+                                k: {**rdata[intf][k], **v}
+                                if isinstance(v, dict)
+                                and isinstance(rdata[intf].get(k), dict)
+                                else v
+                                for k, v in intf_data.items()
+                            },
+                        }
                     else:
                         rdata[intf] = intf_data
         except Exception as err:
@@ -651,23 +843,30 @@ class ParseInterface:
         return interface_data
 
     @staticmethod
-    def collector_parse(raw_data, **kwargs):
+    def iter_parse(raw_data, **kwargs):
         """
-        Returns list of dictionaries of each entity parsed
+        Yields the key and data of each entity as it is parsed
         """
         rdata = ParseInterface.data_validation(raw_data, entity=False, **kwargs)
 
-        intf_container = []
         for _intf, _intf_data in rdata.items():
-            _parsed_data = ParseInterface.data_constructor(_intf, _intf_data, **kwargs)
-            intf_container.append({_intf: _parsed_data})
+            yield _intf, ParseInterface.data_constructor(_intf, _intf_data, **kwargs)
 
-        return intf_container
+    @staticmethod
+    def collector_parse(raw_data, **kwargs):
+        """
+        Returns list of dictionaries of each entity parsed
+        """
+        return [{k: v} for k, v in ParseInterface.iter_parse(raw_data, **kwargs)]
 
 
 class Facts(facts.FactsBase):
     def __post_init__(self, **_ignore):
         super().__post_init__(**_ignore)
+        self._implementation_setup()
+
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
         self.metadata.implementation = "EOS-PYEAPI"
         # NOTE: No self.facts_api since this is a custom net object
 
@@ -691,7 +890,7 @@ class Facts(facts.FactsBase):
         update_attrs(self, parsed_data)
 
         # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+        self.metadata.touch()
         self.metadata.collection_count += 1
         return True
 
@@ -759,8 +958,12 @@ class Routes(route.RoutesBase):
         else:
             return ["show ip route"] if not vrf_all else ["show ip route vrf all"]
 
-    def get(self, **_ignore):
-        "Automatic trigger a data collection. A connector object has to be passed"
+    def get(self, incremental=False, **_ignore):
+        """
+        Automatic trigger a data collection. A connector object has to be passed.
+        With `incremental` the entities are updated in place and the `ChangeSet` is
+        returned, see `refresh()`
+        """
         if self.connector.metadata.implementation != "EOS-PYEAPI":
             raise ValueError(
                 "Connector is not of the correct implementation: EOS-PYEAPI"
@@ -772,19 +975,27 @@ class Routes(route.RoutesBase):
                 self.protocol, instance=self.instance, vrf_all=self.vrf_all
             )
 
-        parsed_data = ParseRoute.collector_parse(
-            self.connector.run(self.get_cmd), **_ignore
-        )
-
-        update_container_attrs(self, parsed_data, Route)
-        self.metadata.updated_at = pendulum.now()
+        raw_data = self.connector.run(self.get_cmd)
+        fingerprint = output_fingerprint(raw_data)
+        if fingerprint == self.fingerprint:
+            # Same outputs of the previous collection, nothing to parse
+            changes = ChangeSet()
+        else:
+            parsed_data = ParseRoute.collector_parse(raw_data, **_ignore)
+            changes = update_container_attrs(self, parsed_data, Route, incremental)
+            self.fingerprint = fingerprint
+        self.metadata.touch()
         self.metadata.collection_count += 1
-        return True
+        return changes if incremental else True
 
 
 class Route(route.RouteBase):
     def __post_init__(self, **_ignore):
         super().__post_init__(**_ignore)
+        self._implementation_setup()
+
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
         self.metadata.implementation = "EOS-PYEAPI"
         self._route_api_generator()
 
@@ -827,7 +1038,7 @@ class Route(route.RouteBase):
         update_attrs(self, parsed_data)
 
         # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+        self.metadata.touch()
         self.metadata.collection_count += 1
         return True
 
@@ -909,19 +1120,22 @@ class ParseRoute:
         return route_data
 
     @staticmethod
-    def collector_parse(raw_data, **kwargs):
+    def iter_parse(raw_data, **kwargs):
         """
-        Returns list of dictionaries of each entity parsed
+        Yields the key and data of each entity as it is parsed
         """
         rdata = ParseRoute.data_validation(raw_data, entity=False, **kwargs)
 
-        routes_container = []
         for _instance, _vrfdata in rdata.items():
             _routes_data = _vrfdata.get("routes", {})
             for _route, _route_data in _routes_data.items():
-                _parsed_data = ParseRoute.data_constructor(
+                yield (_instance, _route), ParseRoute.data_constructor(
                     _instance, _route, _route_data, **kwargs
                 )
-                routes_container.append({(_instance, _route): _parsed_data})
 
-        return routes_container
+    @staticmethod
+    def collector_parse(raw_data, **kwargs):
+        """
+        Returns list of dictionaries of each entity parsed
+        """
+        return [{k: v} for k, v in ParseRoute.iter_parse(raw_data, **kwargs)]
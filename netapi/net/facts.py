@@ -9,9 +9,17 @@ from typing import Optional, List, Any
 from pydantic import validator
 from pydantic.dataclasses import dataclass
 from netapi.units import unit_validator
-from netapi.metadata import Metadata, DataConfig, HidePrivateAttrs
+from netapi.metadata import (
+    Metadata,
+    DataConfig,
+    HidePrivateAttrs,
+    trusted_construct,
+    apply_changes,
+    fingerprinted,
+)
 
 
+@fingerprinted
 @dataclass(unsafe_hash=True, config=DataConfig)  # type: ignore
 class FactsBase:
     """
@@ -84,5 +92,21 @@ class FactsBase:
                     f"It is not a valid connector object: {self.connector}"
                 )
 
+    @classmethod
+    def from_parsed(cls, **data):
+        """
+        Fast creation of the object from data already verified, like the one returned
+        by the parsers or by `to_dict()`. See `netapi.metadata.trusted_construct`
+        """
+        return trusted_construct(cls, data)
+
+    def apply(self, data):
+        """
+        Updates the object with the data passed (i.e. from the parsers) validating all
+        the changes at once. Returns the `(old, new)` values of the changed attributes.
+        See `netapi.metadata.apply_changes`
+        """
+        return apply_changes(self, data)
+
     def to_dict(self):
         return asdict(self, dict_factory=HidePrivateAttrs)
@@ -5,11 +5,25 @@ Contains all attributes and hints about the datatype (some attributes have the
 attribute forced when is assigned).
 """
 import re
-from dataclasses import field
+from functools import lru_cache
+from dataclasses import field, fields
 from pydantic import validator
 from pydantic.dataclasses import dataclass
 from typing import Optional, Any, List
-from netapi.metadata import Metadata, EntityCollections, DataConfig, custom_asdict
+from netapi.metadata import (
+    Metadata,
+    EntityCollections,
+    DataConfig,
+    custom_asdict,
+    trusted_construct,
+    apply_changes,
+    lazy_attributes,
+    lazy_construct,
+    load_lazy,
+    loaded_repr,
+    semantic_fields,
+    fingerprinted,
+)
 from netapi.units import unit_validator
 
 
@@ -27,6 +41,10 @@ def forwarding_model_verification(forwarding_model):
         "quiteDataLink": "quiet_data_link",
     }
 
+    # Already verified values (i.e. from `to_dict()`) are returned as is
+    if forwarding_model in forwarding_model_data.values():
+        return forwarding_model
+
     try:
         data = forwarding_model_data[forwarding_model]
     except KeyError:
@@ -35,41 +53,45 @@ def forwarding_model_verification(forwarding_model):
     return data
 
 
+INTERFACE_PATTERN = re.compile(r"^(?P<value>\D+)(?P<remainder>\S+)")
+INTERFACE_NAME_MAP = {
+    "eth": "Ethernet",
+    "ethernet": "Ethernet",
+    "fa": "FastEthernet",
+    "fastethernet": "FastEthernet",
+    "gi": "GigabitEthernet",
+    "ge": "GigabitEthernet",
+    "gigabitethernet": "GigabitEthernet",
+    "te": "TenGigabitEthernet",
+    "tengigabitethernet": "TenGigabitEthernet",
+    "po": "Port-Channel",
+    "port-channel": "Port-Channel",
+    "vl": "Vlan",
+    "vlan": "Vlan",
+    "lo": "Loopback",
+    "loopback": "Loopback",
+    "tu": "Tunnel",
+    "tunnel": "Tunnel",
+}
+
+
+@lru_cache(maxsize=8192)
 def interface_converter(raw_interface):
     """
     Method that reads interface data and returns it on standard name format
     Example:
     raw_interface = Eth0/0
     new_interface = Ethernet0/0
-    """
-    pattern = re.compile(r"^(?P<value>\D+)(?P<remainder>\S+)")
-    name_map = {
-        "eth": "Ethernet",
-        "ethernet": "Ethernet",
-        "fa": "FastEthernet",
-        "fastethernet": "FastEthernet",
-        "gi": "GigabitEthernet",
-        "ge": "GigabitEthernet",
-        "gigabitethernet": "GigabitEthernet",
-        "te": "TenGigabitEthernet",
-        "tengigabitethernet": "TenGigabitEthernet",
-        "po": "Port-Channel",
-        "port-channel": "Port-Channel",
-        "vl": "Vlan",
-        "vlan": "Vlan",
-        "lo": "Loopback",
-        "loopback": "Loopback",
-        "tu": "Tunnel",
-        "tunnel": "Tunnel",
-    }
 
-    match = re.search(pattern, raw_interface)
+    The results are cached since the same names are converted on every collection
+    """
+    match = INTERFACE_PATTERN.search(raw_interface)
     try:
         value = match.group("value").lower()
         remainder = match.group("remainder")
 
-        if value in name_map.keys():
-            new_interface = name_map[value] + remainder
+        if value in INTERFACE_NAME_MAP:
+            new_interface = INTERFACE_NAME_MAP[value] + remainder
 
         else:
             new_interface = raw_interface
@@ -109,6 +131,85 @@ def sort_interface(intf):
     return result["id"], int(number)
 
 
+INTERFACE_RANGE_PATTERN = re.compile(r"^(?P<prefix>[A-Za-z-]+(\d+/)*)(?P<number>\d+)$")
+
+
+def interface_range(interfaces):
+    """
+    Compresses the interface names into range tokens (as used on the EOS range
+    expressions), keeping the names that are not numbered ports as they are.
+    Example:
+    interfaces = ['Eth1', 'Ethernet2', 'Ethernet3', 'Ethernet5', 'Ethernet49/1', 'Lo0']
+    tokens = ['Ethernet1-3', 'Ethernet5', 'Ethernet49/1', 'Loopback0']
+
+    The tokens can be joined with `,` to build a single range expression
+    """
+    groups = {}
+    others = []
+    for name in dict.fromkeys(interface_converter(x) for x in interfaces):
+        match = INTERFACE_RANGE_PATTERN.match(name)
+        if match:
+            groups.setdefault(match.group("prefix"), set()).add(
+                int(match.group("number"))
+            )
+        else:
+            others.append(name)
+
+    tokens = []
+    for prefix, numbers in groups.items():
+        numbers = sorted(numbers)
+        start = end = numbers[0]
+        for number in numbers[1:] + [None]:
+            if number is not None and number == end + 1:
+                end = number
+                continue
+            tokens.append(
+                f"{prefix}{start}-{end}" if end > start else f"{prefix}{start}"
+            )
+            start = end = number
+
+    return tokens + others
+
+
+EXPAND_RANGE_PATTERN = re.compile(
+    r"^(?P<prefix>(?:[A-Za-z-]+)?(?:\d+/)*)(?P<start>\d+)(?:-(?P<end>\d+))?$"
+)
+
+
+def expand_interface_range(expression):
+    """
+    Expands a range expression into the interface names, the reverse of
+    `interface_range()`. The tokens without name use the one of the previous token.
+    Example:
+    expression = 'Gi0/1-3, 5, Lo0'
+    interfaces = [
+        'GigabitEthernet0/1', 'GigabitEthernet0/2', 'GigabitEthernet0/3',
+        'GigabitEthernet0/5', 'Loopback0'
+    ]
+    """
+    interfaces = []
+    name = base = ""
+    for token in expression.replace(" ", "").split(","):
+        if not token:
+            continue
+        match = EXPAND_RANGE_PATTERN.match(token)
+        if match is None:
+            interfaces.append(interface_converter(token))
+            continue
+        prefix = match.group("prefix")
+        if prefix[:1].isalpha():
+            name = re.match(r"[A-Za-z-]+", prefix).group()
+            base = prefix[len(name) :]
+        elif prefix:
+            base = prefix
+        start = int(match.group("start"))
+        end = int(match.group("end") or start)
+        interfaces.extend(
+            interface_converter(f"{name}{base}{x}") for x in range(start, end + 1)
+        )
+    return interfaces
+
+
 def status_conversion(raw_status, interface_conn_status=None):
     """
     Based on a raw (known) status of the interface (line protocol in the case of
@@ -170,6 +271,73 @@ def status_declaration(raw_status):
     return status
 
 
+def line_protocol_status(admin, protocol):
+    """
+    Returns the status of the interface from its admin and line protocol status, as
+    shown by the Cisco `show interfaces` (i.e. `administratively down`, `up`)
+    """
+    if admin == "administratively down":
+        return "disabled"
+    if admin == "deleted":
+        return "notpresent"
+    if protocol == "up":
+        return "connected"
+    if protocol == "dormant":
+        return "dormant"
+    return "down" if admin == "up" else "notconnect"
+
+
+def check_fields(fields, available):
+    """
+    Raises ValueError for the `fields` requested that are not on the `available` ones
+    of the implementation. The `name` is always collected
+    """
+    if fields is not None:
+        unknown = set(fields) - set(available) - {"name"}
+        if unknown:
+            raise ValueError(f"Interface fields not known: {sorted(unknown)}")
+
+
+def field_requested(field, fields):
+    "Returns if the `field` has to be parsed, all of them when `fields` is None"
+    return fields is None or field in fields
+
+
+def project_fields(parsed_data, fields):
+    "Returns the parsed data with only the `fields` requested (and the `name`)"
+    if fields is None:
+        return parsed_data
+    return {k: v for k, v in parsed_data.items() if k == "name" or k in fields}
+
+
+def field_commands(commands_map, fields):
+    """
+    Returns the minimal list of command templates that provide the `fields`, from
+    the `commands_map` of field -> alternatives (lists of templates) ordered by
+    preference. Raises ValueError for the fields not on the map
+    """
+    check_fields(fields, commands_map)
+    # Fields with a single alternative first, then the ones not yet covered
+    templates = []
+    requested = [x for x in commands_map if x in fields]
+    requested.sort(key=lambda x: len(commands_map[x]))
+    for name in requested:
+        alternatives = commands_map[name]
+        if any(all(y in templates for y in x) for x in alternatives):
+            continue
+        templates.extend(x for x in alternatives[0] if x not in templates)
+    return templates
+
+
+def commands_fields(commands_map, templates):
+    "Returns all the fields of the `commands_map` provided by the `templates` passed"
+    return {
+        name
+        for name, alternatives in commands_map.items()
+        if any(all(y in templates for y in x) for x in alternatives)
+    }
+
+
 def light_levels_alert(tx_power, rx_power, net_os=None):
     """
     Returns flag and alert based on light level values and predefined thresholds
@@ -281,6 +449,20 @@ class InterfaceCounters:
     def valid_bytes(cls, value):
         return unit_validator("bitmath.Byte", "Byte", value)
 
+    def apply(self, data):
+        """
+        Updates the counters passed (i.e. from streaming telemetry), the rest are kept.
+        Returns the `(old, new)` values of the changed counters. See
+        `netapi.metadata.apply_changes`
+        """
+        return apply_changes(self, data)
+
+
+# Attributes of `InterfaceCounters` that are cumulative counters (not rates)
+COUNTER_FIELDS = tuple(
+    x.name for x in fields(InterfaceCounters) if not x.name.endswith("_rate")
+)
+
 
 @dataclass(unsafe_hash=True, config=DataConfig)  # type: ignore
 class InterfaceOptical:
@@ -363,6 +545,7 @@ class InterfacePhysical:
         return unit_validator("bitmath.Bit", "Bit", value)
 
 
+@fingerprinted
 @dataclass(unsafe_hash=True, config=DataConfig)  # type: ignore
 class InterfaceBase:
     """
@@ -390,8 +573,31 @@ class InterfaceBase:
     - `connector`: Device object used to perform the necessary connection.
     - `metadata`: Metadata object which contains information about the current object.
     - `get_cmd`: Command to retrieve interface information out of the device
+
+    The objects created with `from_partial()` are lazy: the attributes not collected
+    are loaded the first time they are read, running only the commands that provide
+    them (i.e. `show interfaces <name> transceiver` for `optical`)
     """
 
+    # Attributes that can be loaded on demand, with the field that provides them
+    LAZY_FIELDS = dict(
+        description="description",
+        instance="instance",
+        members="members",
+        enabled="status",
+        status_up="status",
+        status="status",
+        last_status_change="last_status_change",
+        number_status_changes="number_status_changes",
+        last_clear="last_clear",
+        update_interval="update_interval",
+        forwarding_model="forwarding_model",
+        physical="physical",
+        optical="optical",
+        addresses="addresses",
+        counters="counters",
+    )
+
     name: str
     description: Optional[str] = None
     instance: Optional[str] = None
@@ -448,17 +654,104 @@ class InterfaceBase:
                     f"It is not a valid connector object: {self.connector}"
                 )
 
+    @classmethod
+    def from_parsed(cls, **data):
+        """
+        Fast creation of the object from data already verified, like the one returned
+        by the parsers or by `to_dict()`. See `netapi.metadata.trusted_construct`
+        """
+        return trusted_construct(cls, data)
+
+    @classmethod
+    def from_partial(cls, **data):
+        """
+        Creates a lazy object from data already verified that only has some of the
+        attributes (i.e. collected with `fields`). The rest are loaded on first read
+        with `fetch_fields()`. See `netapi.metadata.lazy_construct`
+        """
+        return lazy_construct(cls, data)
+
+    def fetch_fields(self, fields):
+        "Loads the attributes of the `fields` passed. Implementation specific"
+        raise NotImplementedError
+
+    def apply(self, data):
+        """
+        Updates the object with the data passed (i.e. from the parsers) validating all
+        the changes at once. Returns the `(old, new)` values of the changed attributes.
+        See `netapi.metadata.apply_changes`
+        """
+        return apply_changes(self, data)
+
     def to_dict(self):
         # NOTE: Workaround to TypeError: can't pickle SSLContext objects
         return custom_asdict(self, "interface_api")
 
+    def __repr__(self):
+        # Does not trigger the loading of the lazy attributes
+        return loaded_repr(self)
+
+    def __eq__(self, other):
+        """
+        Equal when the same semantic attributes are loaded with the same values, as
+        on the `fingerprint`. Does not trigger the loading of the lazy attributes
+        """
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        values, other_values = self.__dict__, other.__dict__
+        for name in semantic_fields(type(self)):
+            if (name in values) != (name in other_values):
+                return False
+            value, other_value = values.get(name), other_values.get(name)
+            # The bitmath objects fail when compared to None
+            if value is other_value:
+                continue
+            if value is None or other_value is None or value != other_value:
+                return False
+        return True
+
+
+lazy_attributes(InterfaceBase)
+
 
 class InterfacesBase(EntityCollections):
     ENTITY = "interface"
+    INDEXES = ("status", "instance")
+    EVENT_ATTRIBUTES = {"status_up": "interface_status"}
 
     def __init__(self, *args, **kwargs):
         super().__init__(entity=self.ENTITY, *args, **kwargs)
         self.metadata = Metadata(name="interfaces", type="collection")
+        # Counters store (`netapi.net.timeseries.CounterStore`) fed on each collection
+        self.timeseries = None
+
+    def fetch_fields(self, fields, keys):
+        """
+        Loads the lazy attributes of the `fields` of the interfaces of `keys` with a
+        single collection of their range (see `InterfaceBuilder.get_many`) instead of
+        one per interface. The interfaces not collected get the defaults, as with the
+        `fetch_fields()` of the entities
+        """
+        loaded = {}
+        connector = getattr(self, "connector", None)
+        if connector is not None:
+            # The builders import this module
+            from netapi.net import InterfaceBuilder
+
+            try:
+                loaded = InterfaceBuilder().get_many(
+                    connector, keys, lazy=True, fields=set(fields)
+                )
+            except ValueError:
+                # Fields not available on the implementation
+                pass
+        for key in keys:
+            load_lazy(self._entities[key], loaded.get(key), fields)
+
+    def record_counters(self, timestamp=None):
+        "Appends a sample of the counters to the `timeseries` store, when attached"
+        if self.timeseries is not None:
+            self.timeseries.append_interfaces(self, timestamp=timestamp)
 
     def __setitem__(self, *args, **kwargs):
         super().__setitem__(*args, entity=self.ENTITY, **kwargs)
@@ -2,82 +2,39 @@
 IOS Netmikoer module.
 
 Contains the method to create Network Objects for the IOS-NETMIKO implementation.
+
+The text outputs returned by netmiko are parsed with the templates of
+`netapi.net.ios.templates`, on a single pass over their lines, into the same data of
+the `Parse*` objects of the other implementations. The objects can not be configured
+(`enable()` and `disable()`), there is no API for them.
 """
-import pendulum
-from bitmath import kB
-from netapi.net import vlan, vrrp, interface, facts, route
+import re
+from functools import partial
+from netapi.net import vlan, vrrp, interface, route
+from netapi.net.eos.pyeapier import update_attrs, update_container_attrs
+from netapi.net.interface import interface_converter, expand_interface_range
+from netapi.net.ios import templates
+from netapi.net.textparser import output_lines
+from netapi.metadata import ChangeSet, output_fingerprint
 from netapi.exceptions import NetApiParseError
 
 
-def update_attrs(obj, data_dict):
-    "Updates object attributes based on data from dictionary"
-    for key, value in data_dict.items():
-        setattr(obj, key, value)
-
-
-def update_container_attrs(obj, list_of_dict, entity):
-    "Updates collections based on data from dictionary contained in list"
-    for data_dict in list_of_dict:
-        for key, value in data_dict.items():
-            obj[key] = entity(**value)
-
-
-class Vlans(vlan.VlansBase):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.vlan_range = None
-        self.get_cmd = None
-        self.metadata.implementation = "IOS-NETMIKO"
-
-    @staticmethod
-    def generate_get_cmd(vlan_range=None):
-        "Returns commands necessary to build a collection of entities"
-        if isinstance(vlan_range, list):
-            vlan_range = sorted(vlan_range)
-            vlan_range = f"{vlan_range[0]} - {vlan_range[-1]}"
-
-        if vlan_range:
-            return [f"show vlan id {vlan_range}"]
-        else:
-            return ["show vlan"]
-
-    def get(self, **_ignore):
-        "Automatic trigger a data collection. A connector object has to be passed"
-        if self.connector.metadata.implementation != "IOS-NETMIKO":
-            raise ValueError(
-                "Connector is not of the correct implementation: IOS-NETMIKO"
-            )
-
-        # Verify show command
-        if not self.get_cmd:
-            self.get_cmd = self.generate_get_cmd(self.vlan_range)
-
-        parsed_data = ParseVlan.collector_parse(
-            self.connector.run(self.get_cmd), **_ignore
-        )
-
-        update_container_attrs(self, parsed_data, Vlan)
-        self.metadata.updated_at = pendulum.now()
-        self.metadata.collection_count += 1
-        return True
-
-
 class Vlan(vlan.VlanBase):
+    IMPLEMENTATION = "IOS-NETMIKO"
+
     def __post_init__(self, **_ignore):
         super().__post_init__(**_ignore)
-        self.metadata.implementation = "IOS-NETMIKO"
-        self._vlan_api_generator()
+        self._implementation_setup()
 
-    def _vlan_api_generator(self):
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
+        self.metadata.implementation = self.IMPLEMENTATION
         if self.connector is not None:
-            if self.connector.metadata.implementation != "IOS-NETMIKO":
+            if self.connector.metadata.implementation != self.IMPLEMENTATION:
                 raise ValueError(
-                    "Connector is not of the correct implementation: IOS-NETMIKO"
+                    "Connector is not of the correct implementation: "
+                    f"{self.IMPLEMENTATION}"
                 )
-            self.vlan_api = self.connector.connector.api("vlans")
-            return True
-        else:
-            return False
 
     @staticmethod
     def generate_get_cmd(id):
@@ -98,27 +55,73 @@ class Vlan(vlan.VlanBase):
         # Update the attributes
         update_attrs(self, parsed_data)
 
-        # Do extra work for the status
-        self.status, self.status_up = vlan.status_conversion(parsed_data["status"])
-
         # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+        self.metadata.touch()
         self.metadata.collection_count += 1
         return True
 
     def enable(self):
-        "Enable VLAN"
-        if not hasattr(self, "vlan_api"):
-            if not self._vlan_api_generator():
-                raise NotImplementedError("Need to have the connector API defined")
-        return self.vlan_api.set_state(self.id, value="active")
+        raise NotImplementedError(
+            f"Configuration not implemented for {self.IMPLEMENTATION}"
+        )
 
     def disable(self):
-        "Disable VLAN"
-        if not hasattr(self, "vlan_api"):
-            if not self._vlan_api_generator():
-                raise NotImplementedError("Need to have the connector API defined")
-        return self.vlan_api.set_state(self.id, value="suspend")
+        raise NotImplementedError(
+            f"Configuration not implemented for {self.IMPLEMENTATION}"
+        )
+
+
+class Vlans(vlan.VlansBase):
+    IMPLEMENTATION = "IOS-NETMIKO"
+    ENTITY_CLASS = Vlan
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.vlan_range = None
+        self.get_cmd = None
+        self.metadata.implementation = self.IMPLEMENTATION
+
+    @staticmethod
+    def generate_get_cmd(vlan_range=None):
+        "Returns commands necessary to build a collection of entities"
+        if isinstance(vlan_range, list):
+            vlan_range = sorted(vlan_range)
+            vlan_range = f"{vlan_range[0]}-{vlan_range[-1]}"
+
+        if vlan_range:
+            return [f"show vlan id {str(vlan_range).replace(' ', '')}"]
+        else:
+            return ["show vlan"]
+
+    def get(self, incremental=False, **_ignore):
+        """
+        Automatic trigger a data collection. A connector object has to be passed.
+        With `incremental` the entities are updated in place and the `ChangeSet` is
+        returned, see `refresh()`
+        """
+        if self.connector.metadata.implementation != self.IMPLEMENTATION:
+            raise ValueError(
+                f"Connector is not of the correct implementation: {self.IMPLEMENTATION}"
+            )
+
+        # Verify show command
+        if not self.get_cmd:
+            self.get_cmd = self.generate_get_cmd(self.vlan_range)
+
+        raw_data = self.connector.run(self.get_cmd)
+        fingerprint = output_fingerprint(raw_data)
+        if fingerprint == self.fingerprint:
+            # Same outputs of the previous collection, nothing to parse
+            changes = ChangeSet()
+        else:
+            parsed_data = ParseVlan.collector_parse(raw_data, **_ignore)
+            changes = update_container_attrs(
+                self, parsed_data, self.ENTITY_CLASS, incremental
+            )
+            self.fingerprint = fingerprint
+        self.metadata.touch()
+        self.metadata.collection_count += 1
+        return changes if incremental else True
 
 
 class ParseVlan:
@@ -128,14 +131,23 @@ class ParseVlan:
         if not data:
             raise NetApiParseError("No data to be parsed")
 
-        interfaces = data.get("interfaces")
+        # Ports of the vlan line and of the lines they are wrapped to
+        ports = [data["ports"]] if data.get("ports") else []
+        ports.extend(x["ports"] for x in data.get("more_ports", []))
+        interfaces = [
+            interface_converter(y.strip())
+            for x in ports
+            for y in x.split(",")
+            if y.strip()
+        ]
 
         parsed_data = dict(
             id=vlan_id,
             name=data.get("name"),
-            dynamic=data.get("dynamic"),
-            interfaces=list(interfaces.keys()) if interfaces else None,
-            status=data.get("status"),
+            dynamic=False,
+            interfaces=interfaces or None,
+            # i.e. `act/lshut` and `sus/lshut`
+            status="active" if data["status"].startswith("act") else "suspended",
         )
 
         return parsed_data
@@ -144,7 +156,7 @@ class ParseVlan:
     def data_validation(raw_data, entity=True, **kwargs):
         "Returns useful data and performs some initial validations"
         try:
-            rdata = list(raw_data.values())[0].get("vlans")
+            rdata = {x["id"]: x for x in templates.VLANS.parse(output_lines(raw_data))}
         except Exception as err:
             raise NetApiParseError(
                 f"{str(err)}\nCould not retrieve data from: {raw_data}"
@@ -173,86 +185,50 @@ class ParseVlan:
         return vlan_data
 
     @staticmethod
-    def collector_parse(raw_data, **kwargs):
+    def iter_parse(raw_data, **kwargs):
         """
-        Returns list of dictionaries of each entity parsed
+        Yields the key and data of each entity as it is parsed
         """
         rdata = ParseVlan.data_validation(raw_data, entity=False, **kwargs)
 
-        vlans_container = []
         for _vlan_id, _vlan_data in rdata.items():
-            _parsed_data = ParseVlan.data_constructor(_vlan_id, _vlan_data, **kwargs)
-            vlans_container.append({int(_vlan_id): _parsed_data})
-
-        return vlans_container
-
-
-class Vrrps(vrrp.VrrpsBase):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.interface = None
-        self.instance = None
-        self.get_cmd = None
-        self.metadata.implementation = "IOS-NETMIKO"
+            yield _vlan_id, ParseVlan.data_constructor(_vlan_id, _vlan_data, **kwargs)
 
     @staticmethod
-    def generate_get_cmd(instance=None, interface=None):
-        "Returns commands necessary to build a collection of entities"
-        if interface:
-            return [f"show vrrp interface {interface} all"]
-        elif instance:
-            return [f"show vrrp vrf {instance} all"]
-        else:
-            return [f"show vrrp all"]
-
-    def get(self, **_ignore):
-        "Automatic trigger a data collection. A connector object has to be passed"
-        if self.connector.metadata.implementation != "IOS-NETMIKO":
-            raise ValueError(
-                "Connector is not of the correct implementation: IOS-NETMIKO"
-            )
-
-        # Verify show command
-        if not self.get_cmd:
-            self.get_cmd = self.generate_get_cmd(self.instance, self.interface)
-
-        parsed_data = ParseVrrp.collector_parse(
-            self.connector.run(self.get_cmd), **_ignore
-        )
-
-        update_container_attrs(self, parsed_data, Vrrp)
-
-        self.metadata.updated_at = pendulum.now()
-        self.metadata.collection_count += 1
-        return True
+    def collector_parse(raw_data, **kwargs):
+        """
+        Returns list of dictionaries of each entity parsed
+        """
+        return [{k: v} for k, v in ParseVlan.iter_parse(raw_data, **kwargs)]
 
 
 class Vrrp(vrrp.VrrpBase):
+    IMPLEMENTATION = "IOS-NETMIKO"
+
     def __post_init__(self, **_ignore):
         super().__post_init__(**_ignore)
-        self.metadata.implementation = "IOS-NETMIKO"
-        self._vrrp_api_generator()
+        self._implementation_setup()
 
-    def _vrrp_api_generator(self):
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
+        self.metadata.implementation = self.IMPLEMENTATION
         if self.connector is not None:
-            if self.connector.metadata.implementation != "IOS-NETMIKO":
+            if self.connector.metadata.implementation != self.IMPLEMENTATION:
                 raise ValueError(
-                    "Connector is not of the correct implementation: IOS-NETMIKO"
+                    "Connector is not of the correct implementation: "
+                    f"{self.IMPLEMENTATION}"
                 )
-            self.vrrp_api = self.connector.connector.api("vrrp")
-            return True
-        else:
-            return False
 
     @staticmethod
     def generate_get_cmd(group_id, interface=None, instance=None):
-        "Returns commands necessary to build the entity"
+        """
+        Returns commands necessary to build the entity. The group is picked from the
+        output by the parser
+        """
         if interface:
-            return [f"show vrrp group {group_id} interface {interface} all"]
-        elif instance:
-            return [f"show vrrp group {group_id} vrf {instance} all"]
+            return [f"show vrrp interface {interface}"]
         else:
-            return [f"show vrrp group {group_id} vrf all"]
+            return ["show vrrp"]
 
     def get(self, **_ignore):
         "Automatic trigger a data update on the object"
@@ -265,32 +241,85 @@ class Vrrp(vrrp.VrrpBase):
                 self.group_id, self.interface, self.instance
             )
 
-        parsed_data = ParseVrrp.parse(self.connector.run(self.get_cmd), **_ignore)
+        parsed_data = ParseVrrp.parse(
+            self.connector.run(self.get_cmd),
+            **{**_ignore, "group_id": self.group_id, "interface": self.interface},
+        )
 
         # Update the attributes
         update_attrs(self, parsed_data)
 
-        # Do extra work for the status
-        self.status, self.status_up = vrrp.status_conversion(parsed_data["status"])
-
         # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+        self.metadata.touch()
         self.metadata.collection_count += 1
         return True
 
     def enable(self):
-        "Enable VRRP group"
-        if not hasattr(self, "vrrp_api"):
-            if not self._vrrp_api_generator():
-                raise NotImplementedError("Need to have the connector API defined")
-        return self.vrrp_api.set_enable(self.interface, self.group_id, value=True)
+        raise NotImplementedError(
+            f"Configuration not implemented for {self.IMPLEMENTATION}"
+        )
 
     def disable(self):
-        "Disable VRRP group"
-        if not hasattr(self, "vrrp_api"):
-            if not self._vrrp_api_generator():
-                raise NotImplementedError("Need to have the connector API defined")
-        return self.vrrp_api.set_enable(self.interface, self.group_id, value=False)
+        raise NotImplementedError(
+            f"Configuration not implemented for {self.IMPLEMENTATION}"
+        )
+
+
+class Vrrps(vrrp.VrrpsBase):
+    IMPLEMENTATION = "IOS-NETMIKO"
+    ENTITY_CLASS = Vrrp
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.interface = None
+        self.instance = None
+        self.get_cmd = None
+        self.metadata.implementation = self.IMPLEMENTATION
+
+    @staticmethod
+    def generate_get_cmd(instance=None, interface=None):
+        """
+        Returns commands necessary to build a collection of entities. The output
+        does not have the VRF of the groups, `instance` is not used
+        """
+        if interface:
+            return [f"show vrrp interface {interface}"]
+        else:
+            return ["show vrrp"]
+
+    def get(self, incremental=False, **_ignore):
+        """
+        Automatic trigger a data collection. A connector object has to be passed.
+        With `incremental` the entities are updated in place and the `ChangeSet` is
+        returned, see `refresh()`
+        """
+        if self.connector.metadata.implementation != self.IMPLEMENTATION:
+            raise ValueError(
+                f"Connector is not of the correct implementation: {self.IMPLEMENTATION}"
+            )
+
+        # Verify show command
+        if not self.get_cmd:
+            self.get_cmd = self.generate_get_cmd(self.instance, self.interface)
+
+        raw_data = self.connector.run(self.get_cmd)
+        fingerprint = output_fingerprint(raw_data)
+        if fingerprint == self.fingerprint:
+            # Same outputs of the previous collection, nothing to parse
+            changes = ChangeSet()
+        else:
+            parsed_data = ParseVrrp.collector_parse(raw_data, **_ignore)
+            changes = update_container_attrs(
+                self, parsed_data, self.ENTITY_CLASS, incremental
+            )
+            self.fingerprint = fingerprint
+        self.metadata.touch()
+        self.metadata.collection_count += 1
+        return changes if incremental else True
+
+
+# States of the groups -> VRRP status
+VRRP_STATES = {"master": "master", "backup": "backup", "init": "stopped"}
 
 
 class ParseVrrp:
@@ -300,31 +329,36 @@ class ParseVrrp:
         if not data:
             raise NetApiParseError("No data to be parsed")
 
+        # Addresses listed on their own lines (the first one is the primary)
+        virtual_ips = [x["address"] for x in data.get("virtual_ips", [])]
+        preempt = data.get("preempt")
+
         parsed_data = dict(
-            group_id=data.get("groupId"),
-            interface=data.get("interface"),
-            instance=data.get("vrfName"),
+            group_id=data.get("group_id"),
+            interface=interface_converter(data["interface"]),
+            instance=None,
             description=data.get("description"),
-            virtual_mac=data.get("virtualMac"),
-            virtual_ip_secondary=data.get("virtualIpSecondary"),
-            master_ip=data.get("masterAddr"),
-            virtual_ip=data.get("virtualIp"),
+            virtual_mac=data.get("virtual_mac"),
+            virtual_ip_secondary=virtual_ips[1:],
+            master_ip=data.get("master_ip") or data.get("local_ip"),
+            master_priority=data.get("master_priority"),
+            virtual_ip=data.get("virtual_ip") or next(iter(virtual_ips), None),
             priority=data.get("priority"),
-            skew_time=data.get("skewTime"),
-            version=data.get("version"),
-            preempt=data.get("preempt"),
-            preempt_delay=data.get("preemptDelay"),
-            mac_advertisement_interval=data.get("macAddressInterval"),
-            master_interval=data.get("masterInterval"),
-            master_down_interval=float(data.get("masterDownInterval")) / 1000.0,
-            tracked_objects=data.get("trackedObjects"),
-            status=data.get("state"),
+            skew_time=None,
+            # The VRRPv3 groups are shown by address family
+            version=3 if data.get("family") else 2,
+            preempt=preempt in ("enabled", "may preempt") if preempt else None,
+            preempt_delay=data.get("preempt_delay"),
+            mac_advertisement_interval=None,
+            master_interval=data.get("master_interval"),
+            master_down_interval=data.get("master_down_interval"),
+            tracked_objects=[
+                dict(name=x["name"], state=x["tracked_state"], decrement=x["decrement"])
+                for x in data.get("tracked_objects", [])
+            ],
+            status=VRRP_STATES.get(str(data.get("state")).lower()),
             extra_attributes=dict(
-                vrrp_advertisement_interval=data.get("vrrpAdvertInterval"),
-                vrrp_id_disabled=data.get("vrIdDisabled"),
-                vrrp_id_disabled_reason=data.get("vrIdDisabledReason"),
-                bfd_peer_ip=data.get("bfdPeerAddr"),
-                preempt_reload=data.get("preemptReload"),
+                vrrp_advertisement_interval=data.get("advertisement_interval")
             ),
         )
 
@@ -334,7 +368,7 @@ class ParseVrrp:
     def data_validation(raw_data, entity=True, **kwargs):
         "Returns useful data and performs some initial validations"
         try:
-            rdata = list(raw_data.values())[0].get("virtualRouters")
+            rdata = list(templates.VRRPS.parse(output_lines(raw_data)))
         except Exception as err:
             raise NetApiParseError(
                 f"{str(err)}\nCould not retrieve data from: {raw_data}"
@@ -351,104 +385,120 @@ class ParseVrrp:
         return rdata
 
     @staticmethod
-    def parse(raw_data, **kwargs):
+    def parse(raw_data, group_id=None, interface=None, **kwargs):
         """
-        Returns a dictionary with the entity data parsed
+        Returns a dictionary with the entity data parsed, the group (and interface)
+        passed when the output has many
         """
-        rdata = ParseVrrp.data_validation(raw_data, **kwargs)[0]
+        rdata = ParseVrrp.data_validation(raw_data, entity=False, **kwargs)
+        if group_id is not None:
+            rdata = [x for x in rdata if x["group_id"] == int(group_id)]
+        if interface is not None:
+            rdata = [
+                x
+                for x in rdata
+                if interface_converter(x["interface"]) == interface_converter(interface)
+            ]
+        if not rdata:
+            raise NetApiParseError(f"VRRP group not found: {group_id} {interface}")
 
-        vrrp_data = ParseVrrp.data_constructor(rdata, **kwargs)
+        vrrp_data = ParseVrrp.data_constructor(rdata[0], **kwargs)
 
         return vrrp_data
 
     @staticmethod
-    def collector_parse(raw_data, **kwargs):
+    def iter_parse(raw_data, **kwargs):
         """
-        Returns list of dictionaries of each entity parsed
+        Yields the key and data of each entity as it is parsed
         """
         rdata = ParseVrrp.data_validation(raw_data, entity=False, **kwargs)
 
-        vrrps_container = []
         for vrrp_data in rdata:
-            # Placeholder
             _parsed_data = ParseVrrp.data_constructor(vrrp_data, **kwargs)
-            vrrps_container.append(
-                {(_parsed_data["group_id"], _parsed_data["interface"]): _parsed_data}
-            )
-
-        return vrrps_container
-
-
-class Interfaces(interface.InterfacesBase):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.interface_range = None
-        self.get_cmd = None
-        self.metadata.implementation = "IOS-NETMIKO"
+            yield (_parsed_data["group_id"], _parsed_data["interface"]), _parsed_data
 
     @staticmethod
-    def generate_get_cmd(interface_range=None):
-        "Returns commands necessary to build the collection of entities"
-        if isinstance(interface_range, list):
-            raise ValueError("Must pass a str (i.e. Eth1 - 10) or None to collect all")
-        if interface_range is not None:
-            return [
-                f"show interfaces {interface_range}",
-                f"show ip interface {interface_range}",
-                f"show interfaces {interface_range} transceiver",
-            ]
-        else:
-            return [
-                "show interfaces",
-                "show ip interface",
-                "show interfaces transceiver",
-            ]
-
-    def get(self, **_ignore):
-        "Automatic trigger a data collection. A connector object has to be passed"
-        if self.connector.metadata.implementation != "IOS-NETMIKO":
-            raise ValueError(
-                "Connector is not of the correct implementation: IOS-NETMIKO"
-            )
-        # Verify show command
-        if not self.get_cmd:
-            self.get_cmd = self.generate_get_cmd(self.interface_range)
-
-        parsed_data = ParseInterface.collector_parse(
-            self.connector.run(self.get_cmd), **_ignore
-        )
-
-        update_container_attrs(self, parsed_data, Interface)
-        self.metadata.updated_at = pendulum.now()
-        self.metadata.collection_count += 1
-        return True
+    def collector_parse(raw_data, **kwargs):
+        """
+        Returns list of dictionaries of each entity parsed
+        """
+        return [{k: v} for k, v in ParseVrrp.iter_parse(raw_data, **kwargs)]
+
+
+# Fields of the interfaces on the output of `show interfaces`
+INTERFACE_FIELDS = {
+    "description",
+    "status",
+    "last_status_change",
+    "last_clear",
+    "number_status_changes",
+    "update_interval",
+    "members",
+    "physical",
+    "addresses",
+    "counters",
+}
+# Range expressions (i.e. `Gi0/1-3,Gi0/7`), not accepted by `show interfaces`
+RANGE_PATTERN = re.compile(r",|\d-\d|\s")
+
+
+def interface_commands(interface_range=None, fields=None):
+    """
+    Returns the commands to collect the interfaces. `show interfaces` only accepts an
+    interface name, the ranges collect all the interfaces
+    """
+    interface.check_fields(fields, INTERFACE_FIELDS)
+    if interface_range is None or RANGE_PATTERN.search(str(interface_range)):
+        return ["show interfaces"]
+    return [f"show interfaces {interface_range}"]
+
+
+def interface_fields(fields):
+    "Returns the `fields` passed that are available on `show interfaces`"
+    return set(fields) & INTERFACE_FIELDS
 
 
 class Interface(interface.InterfaceBase):
+    IMPLEMENTATION = "IOS-NETMIKO"
+
     def __post_init__(self, **_ignore):
         super().__post_init__(**_ignore)
-        self.metadata.implementation = "IOS-NETMIKO"
-        self._interface_api_generator()
+        self._implementation_setup()
 
-    def _interface_api_generator(self):
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
+        self.metadata.implementation = self.IMPLEMENTATION
         if self.connector is not None:
-            if self.connector.metadata.implementation != "IOS-NETMIKO":
+            if self.connector.metadata.implementation != self.IMPLEMENTATION:
                 raise ValueError(
-                    "Connector is not of the correct implementation: IOS-NETMIKO"
+                    "Connector is not of the correct implementation: "
+                    f"{self.IMPLEMENTATION}"
                 )
-            self.interface_api = self.connector.connector.api("interfaces")
-            return True
-        else:
-            return False
 
     @staticmethod
-    def generate_get_cmd(name):
-        "Returns commands necessary to build the entity"
-        return [
-            f"show interfaces {name}",
-            f"show ip interface {name}",
-            f"show interfaces {name} transceiver",
-        ]
+    def generate_get_cmd(name, fields=None):
+        "Returns commands necessary to build the entity (or only its `fields`)"
+        return interface_commands(name, fields)
+
+    def fetch_fields(self, fields):
+        """
+        Loads the attributes of a lazy object from the output of `show interfaces`
+        of the interface. All its fields are loaded. Returns the changes, nothing is
+        loaded without connector or for the fields not available on the output
+        """
+        fields = interface_fields(fields)
+        if self.connector is None or not fields:
+            return {}
+        raw_data = self.connector.run(
+            self.generate_get_cmd(self.name, fields), silent=True
+        )
+        try:
+            parsed_data = ParseInterface.parse(
+                raw_data, name=self.name, fields=INTERFACE_FIELDS
+            )
+        except NetApiParseError:
+            return {}
+        return update_attrs(self, parsed_data)
 
     def get(self, **_ignore):
         "Automatic trigger a data collection by running get_cmd"
@@ -460,169 +510,204 @@ class Interface(interface.InterfaceBase):
             self.get_cmd = self.generate_get_cmd(self.name)
 
         parsed_data = ParseInterface.parse(
-            self.connector.run(self.get_cmd, silent=True), **_ignore
+            self.connector.run(self.get_cmd, silent=True),
+            **{**_ignore, "name": self.name},
         )
 
         # Update the attributes
         update_attrs(self, parsed_data)
 
-        # Do extra work for the status
-        self.status, self.status_up, self.enabled = interface.status_conversion(
-            parsed_data["status"]
-        )
-
         # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+        self.metadata.touch()
         self.metadata.collection_count += 1
         return True
 
     def enable(self):
-        "Enable Interface"
-        if not hasattr(self, "interface_api"):
-            if not self._interface_api_generator():
-                raise NotImplementedError("Need to have the connector API defined")
-        return self.interface_api.set_shutdown(self.name, disable=True)
+        raise NotImplementedError(
+            f"Configuration not implemented for {self.IMPLEMENTATION}"
+        )
 
     def disable(self):
-        "Disable Interface"
-        if not hasattr(self, "interface_api"):
-            if not self._interface_api_generator():
-                raise NotImplementedError("Need to have the connector API defined")
-        return self.interface_api.set_shutdown(self.name, disable=False)
+        raise NotImplementedError(
+            f"Configuration not implemented for {self.IMPLEMENTATION}"
+        )
+
+
+class Interfaces(interface.InterfacesBase):
+    IMPLEMENTATION = "IOS-NETMIKO"
+    ENTITY_CLASS = Interface
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.interface_range = None
+        self.fields = None
+        self.get_cmd = None
+        self.metadata.implementation = self.IMPLEMENTATION
+
+    @staticmethod
+    def generate_get_cmd(interface_range=None, fields=None):
+        """
+        Returns commands necessary to build the collection of entities. With `fields`
+        (i.e. `{"status", "counters"}`) only those are parsed
+        """
+        if isinstance(interface_range, list):
+            raise ValueError("Must pass a str (i.e. Gi0/1) or None to collect all")
+        return interface_commands(interface_range, fields)
+
+    def get(self, incremental=False, **_ignore):
+        """
+        Automatic trigger a data collection. A connector object has to be passed.
+        With `incremental` the entities are updated in place and the `ChangeSet` is
+        returned, see `refresh()`. The counters are appended to the `timeseries`
+        store, when attached
+        """
+        if self.connector.metadata.implementation != self.IMPLEMENTATION:
+            raise ValueError(
+                f"Connector is not of the correct implementation: {self.IMPLEMENTATION}"
+            )
+        # Verify show command
+        if not self.get_cmd:
+            self.get_cmd = self.generate_get_cmd(self.interface_range, self.fields)
+
+        raw_data = self.connector.run(self.get_cmd)
+        fingerprint = output_fingerprint(raw_data)
+        if fingerprint == self.fingerprint:
+            # Same outputs of the previous collection, nothing to parse
+            changes = ChangeSet()
+        else:
+            parsed_data = ParseInterface.collector_parse(
+                raw_data,
+                **{
+                    "fields": self.fields,
+                    "interface_range": self.interface_range,
+                    **_ignore,
+                },
+            )
+            changes = update_container_attrs(
+                self, parsed_data, self.ENTITY_CLASS, incremental
+            )
+            self.fingerprint = fingerprint
+        self.record_counters()
+        self.metadata.touch()
+        self.metadata.collection_count += 1
+        return changes if incremental else True
+
+
+# Counters captured as they are named on `InterfaceCounters`
+INTERFACE_COUNTERS = (
+    "rx_bytes",
+    "tx_bytes",
+    "rx_broadcast_pkts",
+    "tx_broadcast_pkts",
+    "rx_multicast_pkts",
+    "tx_multicast_pkts",
+    "rx_discards",
+    "tx_discards",
+    "rx_errors_general",
+    "tx_errors_general",
+    "rx_errors_crc",
+    "rx_errors_runt",
+    "rx_errors_giant",
+    "rx_errors_rx_pause",
+    "tx_errors_collisions",
+    "tx_errors_late_collisions",
+    "tx_errors_deferred_transmissions",
+    "tx_errors_tx_pause",
+    "rx_bits_rate",
+    "rx_pkts_rate",
+    "tx_bits_rate",
+    "tx_pkts_rate",
+)
 
 
 class ParseInterface:
     @staticmethod
-    def data_constructor(intf_name, data, **kwargs):
+    def data_constructor(intf_name, data, fields=None, **kwargs):
         # If no data is passed a known error
         if not data:
             raise NetApiParseError("No data to be parsed")
-
-        statistics = data.get("interfaceStatistics", {})
+        # Only the sections of the fields requested are parsed
+        requested = partial(interface.field_requested, fields=fields)
 
         # Physical bit
-        physical = dict(
-            mac=data.get("physicalAddress"),
-            mtu=data.get("mtu", 0),
-            duplex=data.get("duplex"),
-            bandwidth=data.get("bandwidth", 0),
-        )
+        if not requested("physical"):
+            physical = None
+        else:
+            physical = dict(
+                mac=data.get("mac"),
+                mtu=data.get("mtu", 0),
+                duplex=data.get("duplex"),
+                bandwidth=data.get("bandwidth", 0),
+            )
 
         # Addresses bit
-        addr_info = data.get("interfaceAddress")
-        if not addr_info:
+        if not requested("addresses") or not any(
+            x in data for x in ("ipv4", "dhcp", "secondary_ipv4")
+        ):
             addresses = None
         else:
-            addresses = dict(dhcp=addr_info.get("dhcp"), secondary_ipv4=[])
-            for _ip in addr_info.get("secondaryIpsOrderedList", []):
-                addresses["secondary_ipv4"].append(f"{_ip['address']}/{_ip['maskLen']}")
-            if addr_info.get("primaryIp"):
-                _ip = addr_info["primaryIp"]
-                addresses.update(ipv4=f"{_ip['address']}/{_ip['maskLen']}")
-            if addr_info.get("linkLocalIp6"):
-                _ip = addr_info["linkLocalIp6"]
-                addresses.update(ipv6=f"{_ip['address']}/{_ip['maskLen']}")
+            addresses = dict(
+                dhcp="dhcp" in data,
+                secondary_ipv4=[x["address"] for x in data.get("secondary_ipv4", [])],
+            )
+            if data.get("ipv4"):
+                addresses.update(ipv4=data["ipv4"])
 
         # Counters bit
-        counter_info = data.get("interfaceCounters", {})
-        if not counter_info:
+        if not requested("counters") or (
+            "rx_bytes" not in data and "tx_bytes" not in data
+        ):
             counters = None
         else:
-            counters = dict(
-                tx_broadcast_pkts=counter_info.get("outBroadcastPkts", 0.0),
-                rx_broadcast_pkts=counter_info.get("inBroadcastPkts", 0.0),
-                tx_unicast_pkts=counter_info.get("outUcastPkts", 0.0),
-                rx_unicast_pkts=counter_info.get("inUcastPkts", 0.0),
-                tx_multicast_pkts=counter_info.get("outMulticastPkts", 0.0),
-                rx_multicast_pkts=counter_info.get("inMulticastPkts", 0.0),
-                tx_bytes=counter_info.get("outOctets", 0.0),
-                rx_bytes=counter_info.get("inOctets", 0.0),
-                tx_errors_general=counter_info.get("totalOutErrors", 0.0),
-                rx_errors_general=counter_info.get("totalInErrors", 0.0),
-                tx_discards=counter_info.get("outDiscards", 0.0),
-                rx_discards=counter_info.get("inDiscards", 0.0),
+            counters = {x: data[x] for x in INTERFACE_COUNTERS if x in data}
+            # The packets are totals, the unicast ones are the rest
+            counters.update(
+                rx_unicast_pkts=max(
+                    data.get("rx_packets", 0)
+                    - data.get("rx_broadcast_pkts", 0)
+                    - data.get("rx_multicast_pkts", 0),
+                    0,
+                ),
+                tx_unicast_pkts=max(
+                    data.get("tx_packets", 0)
+                    - data.get("tx_broadcast_pkts", 0)
+                    - data.get("tx_multicast_pkts", 0),
+                    0,
+                ),
             )
-            # Tx Errors
-            tx_errors = counter_info.get("outputErrorsDetail")
-            if tx_errors:
-                counters.update(
-                    tx_errors_collisions=tx_errors.get("collisions", 0.0),
-                    tx_errors_deferred_transmissions=tx_errors.get(
-                        "deferredTransmissions", 0.0
-                    ),
-                    tx_errors_tx_pause=tx_errors.get("txPause", 0.0),
-                    tx_errors_late_collisions=tx_errors.get("lateCollisions"),
-                )
-            # Rx Errors
-            rx_errors = counter_info.get("inputErrorsDetail")
-            if rx_errors:
-                counters.update(
-                    rx_errors_runt=rx_errors.get("runtFrames", 0.0),
-                    rx_errors_rx_pause=rx_errors.get("rxPause", 0.0),
-                    rx_errors_fcs=rx_errors.get("fcsErrors", 0.0),
-                    rx_errors_crc=rx_errors.get("alignmentErrors", 0.0),
-                    rx_errors_giant=rx_errors.get("giantFrames", 0.0),
-                    rx_errors_symbol=rx_errors.get("symbolErrors", 0.0),
-                )
-
-            # Statistics
-            if statistics:
-                counters.update(
-                    rx_bits_rate=statistics.get("inBitsRate", 0.0),
-                    rx_pkts_rate=statistics.get("inPktsRate", 0.0),
-                    tx_bits_rate=statistics.get("outBitsRate", 0.0),
-                    tx_pkts_rate=statistics.get("outPktsRate", 0.0),
-                )
 
-        # Optical bit
-        optical = dict(
-            tx=data.get("txPower"),
-            rx=data.get("rxPower"),
-            serial_number=data.get("vendorSn"),
-            media_type=data.get("mediaType"),
-        )
-
-        if optical.get("tx") is not None and optical.get("rx") is not None:
-            optical["status"] = interface.light_levels_alert(
-                tx_power=optical["tx"], rx_power=optical["rx"], net_os="eos"
-            )
-
-        if not any(optical.values()):
-            optical = None
+        members = data.get("members") if requested("members") else None
 
         parsed_data = dict(
             name=intf_name,
-            forwarding_model=data.get("forwardingModel"),
+            forwarding_model=None,
             description=data.get("description"),
-            instance=data.get("vrf"),
-            status=data.get("interfaceStatus"),
-            last_status_change=data.get("lastStatusChangeTimestamp"),
-            last_clear=counter_info.get("lastClear"),
-            number_status_changes=counter_info.get("linkStatusChanges"),
-            update_interval=statistics.get("updateInterval"),
-            members=list(data.get("memberInterfaces", {}).keys()),
+            instance=None,
+            status=interface.line_protocol_status(data["admin"], data["protocol"]),
+            last_status_change=data.get("last_status_change"),
+            last_clear=data.get("last_clear"),
+            number_status_changes=data.get("number_status_changes"),
+            update_interval=data.get("update_interval"),
+            members=[interface_converter(x) for x in members.split()]
+            if members
+            else [],
             physical=physical,
             addresses=addresses,
-            optical=optical,
+            optical=None,
             counters=counters,
         )
 
-        return parsed_data
+        # Skip the fields not requested
+        return interface.project_fields(parsed_data, fields)
 
     @staticmethod
     def data_validation(raw_data, entity=True, **kwargs):
         "Returns useful data and performs some initial validations"
-        rdata = {}
         try:
-            # Merge the results off al the commands into each interface found
-            for value in raw_data.values():
-                if not value:
-                    continue
-                for intf, intf_data in value.get("interfaces", {}).items():
-                    if rdata.get(intf):
-                        rdata[intf] = {**rdata[intf], **intf_data}
-                    else:
-                        rdata[intf] = intf_data
+            rdata = {
+                interface_converter(x["name"]): x
+                for x in templates.INTERFACES.parse(output_lines(raw_data))
+            }
         except Exception as err:
             raise NetApiParseError(
                 f"{str(err)}\nCould not retrieve data from: {raw_data}"
@@ -639,11 +724,17 @@ class ParseInterface:
         return rdata
 
     @staticmethod
-    def parse(raw_data, **kwargs):
+    def parse(raw_data, name=None, **kwargs):
         """
-        Returns a dictionary with the entity data parsed
+        Returns a dictionary with the entity data parsed, the interface `name` when
+        the output has many
         """
-        rdata = ParseInterface.data_validation(raw_data, **kwargs)
+        rdata = ParseInterface.data_validation(raw_data, entity=name is None, **kwargs)
+        if name is not None:
+            name = interface_converter(name)
+            if name not in rdata:
+                raise NetApiParseError(f"Interface not found: {name}")
+            rdata = {name: rdata[name]}
 
         for _name, data in rdata.items():
             interface_data = ParseInterface.data_constructor(_name, data, **kwargs)
@@ -651,101 +742,89 @@ class ParseInterface:
         return interface_data
 
     @staticmethod
-    def collector_parse(raw_data, **kwargs):
+    def iter_parse(raw_data, interface_range=None, **kwargs):
         """
-        Returns list of dictionaries of each entity parsed
+        Yields the key and data of each entity as it is parsed. With `interface_range`
+        only its interfaces, the ranges are collected with all the interfaces
         """
         rdata = ParseInterface.data_validation(raw_data, entity=False, **kwargs)
+        names = (
+            set(expand_interface_range(interface_range))
+            if interface_range is not None
+            else None
+        )
 
-        intf_container = []
         for _intf, _intf_data in rdata.items():
-            _parsed_data = ParseInterface.data_constructor(_intf, _intf_data, **kwargs)
-            intf_container.append({_intf: _parsed_data})
+            if names is not None and _intf not in names:
+                continue
+            yield _intf, ParseInterface.data_constructor(_intf, _intf_data, **kwargs)
 
-        return intf_container
+    @staticmethod
+    def collector_parse(raw_data, **kwargs):
+        """
+        Returns list of dictionaries of each entity parsed
+        """
+        return [{k: v} for k, v in ParseInterface.iter_parse(raw_data, **kwargs)]
 
 
-class Facts(facts.FactsBase):
+class Route(route.RouteBase):
+    IMPLEMENTATION = "IOS-NETMIKO"
+
     def __post_init__(self, **_ignore):
         super().__post_init__(**_ignore)
-        self.metadata.implementation = "IOS-NETMIKO"
-        # NOTE: No self.facts_api since this is a custom net object
+        self._implementation_setup()
+
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
+        self.metadata.implementation = self.IMPLEMENTATION
+        if self.connector is not None:
+            if self.connector.metadata.implementation != self.IMPLEMENTATION:
+                raise ValueError(
+                    "Connector is not of the correct implementation: "
+                    f"{self.IMPLEMENTATION}"
+                )
 
     @staticmethod
-    def generate_get_cmd():
+    def generate_get_cmd(dest, instance=None):
         "Returns commands necessary to build the entity"
-        return ["show hostname", "show version", "show interfaces"]
+        if instance:
+            return [f"show ip route vrf {instance} {dest}"]
+        else:
+            return [f"show ip route {dest}"]
 
     def get(self, **_ignore):
-        "Automatic trigger a data collection"
+        "Automatic trigger a data collection by running the get_cmd"
         if self.connector is None:
             raise NotImplementedError("Need to have the connector defined")
 
         # Generate get command
         if not self.get_cmd:
-            self.get_cmd = self.generate_get_cmd()
+            self.get_cmd = self.generate_get_cmd(self.dest, self.instance)
 
-        parsed_data = ParseFacts.parse(self.connector.run(self.get_cmd), **_ignore)
+        parsed_data = ParseRoute.parse(
+            self.connector.run(self.get_cmd), dest=self.dest, instance=self.instance
+        )
 
         # Update the attributes
         update_attrs(self, parsed_data)
 
         # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+        self.metadata.touch()
         self.metadata.collection_count += 1
         return True
 
 
-class ParseFacts:
-    @staticmethod
-    def data_constructor(hostname, version, interfaces, **kwargs):
-        # If no data is passed a known error
-        if not hostname and not version and not interfaces:
-            raise NetApiParseError("No data to be parsed")
-
-        raw_interfaces = list(interfaces.get("interfaces", {}).keys())
-
-        parsed_data = dict(
-            hostname=hostname.get("hostname"),
-            os_version=version.get("version"),
-            model=version.get("modelName"),
-            serial_number=version.get("serialNumber"),
-            uptime=pendulum.duration(seconds=version["uptime"]),
-            up_since=pendulum.from_timestamp(version["bootupTimestamp"]),
-            system_mac=version.get("systemMacAddress"),
-            available_memory=kB(version.get("memFree")).Byte,
-            total_memory=kB(version.get("memTotal")).Byte,
-            os_arch=version.get("architecture"),
-            hw_revision=version.get("hardwareRevision"),
-            interfaces=sorted(
-                [interface.interface_converter(x) for x in raw_interfaces],
-                key=interface.sort_interface,
-            ),
-        )
-
-        return parsed_data
-
-    @staticmethod
-    def parse(raw_data, **kwargs):
-        hostname = raw_data.get("show hostname", {})
-        version = raw_data.get("show version", {})
-        interfaces = raw_data.get("show interfaces", {})
-
-        facts_data = ParseFacts.data_constructor(
-            hostname, version, interfaces, **kwargs
-        )
-
-        return facts_data
-
-
 class Routes(route.RoutesBase):
+    IMPLEMENTATION = "IOS-NETMIKO"
+    ENTITY_CLASS = Route
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.protocol = None
         self.instance = None
         self.vrf_all = False
         self.get_cmd = None
-        self.metadata.implementation = "IOS-NETMIKO"
+        self.metadata.implementation = self.IMPLEMENTATION
 
     @staticmethod
     def generate_get_cmd(protocol=None, instance=None, vrf_all=False):
@@ -757,13 +836,17 @@ class Routes(route.RoutesBase):
         elif protocol:
             return [f"show ip route {protocol}"]
         else:
-            return ["show ip route"] if not vrf_all else ["show ip route vrf all"]
+            return ["show ip route"] if not vrf_all else ["show ip route vrf *"]
 
-    def get(self, **_ignore):
-        "Automatic trigger a data collection. A connector object has to be passed"
-        if self.connector.metadata.implementation != "IOS-NETMIKO":
+    def get(self, incremental=False, **_ignore):
+        """
+        Automatic trigger a data collection. A connector object has to be passed.
+        With `incremental` the entities are updated in place and the `ChangeSet` is
+        returned, see `refresh()`
+        """
+        if self.connector.metadata.implementation != self.IMPLEMENTATION:
             raise ValueError(
-                "Connector is not of the correct implementation: IOS-NETMIKO"
+                f"Connector is not of the correct implementation: {self.IMPLEMENTATION}"
             )
 
         # Verify show command
@@ -772,93 +855,75 @@ class Routes(route.RoutesBase):
                 self.protocol, instance=self.instance, vrf_all=self.vrf_all
             )
 
-        parsed_data = ParseRoute.collector_parse(
-            self.connector.run(self.get_cmd), **_ignore
-        )
-
-        update_container_attrs(self, parsed_data, Route)
-        self.metadata.updated_at = pendulum.now()
-        self.metadata.collection_count += 1
-        return True
-
-
-class Route(route.RouteBase):
-    def __post_init__(self, **_ignore):
-        super().__post_init__(**_ignore)
-        self.metadata.implementation = "IOS-NETMIKO"
-        self._route_api_generator()
-
-    def _route_api_generator(self):
-        if self.connector is not None:
-            if self.connector.metadata.implementation != "IOS-NETMIKO":
-                raise ValueError(
-                    "Connector is not of the correct implementation: IOS-NETMIKO"
-                )
-            self.route_api = self.connector.connector.api("staticroute")
-            return True
-        else:
-            return False
-
-    @staticmethod
-    def generate_get_cmd(dest, instance=None):
-        """
-        Returns commands necessary to build the entity.
-
-        NOTE: This is preferred over the original `get(name)` method of pyeapi because
-        it provides with much more info
-        """
-        if instance:
-            return [f"show ip route vrf {instance} {dest} detail"]
+        raw_data = self.connector.run(self.get_cmd)
+        fingerprint = output_fingerprint(raw_data)
+        if fingerprint == self.fingerprint:
+            # Same outputs of the previous collection, nothing to parse
+            changes = ChangeSet()
         else:
-            return [f"show ip route {dest} detail"]
-
-    def get(self, **_ignore):
-        "Automatic trigger a data collection by running the get_cmd"
-        if self.connector is None:
-            raise NotImplementedError("Need to have the connector defined")
-
-        # Generate get command
-        if not self.get_cmd:
-            self.get_cmd = self.generate_get_cmd(self.dest, self.instance)
-
-        parsed_data = ParseRoute.parse(self.connector.run(self.get_cmd), dest=self.dest)
-
-        # Update the attributes
-        update_attrs(self, parsed_data)
-
-        # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+            parsed_data = ParseRoute.collector_parse(
+                raw_data, **{"instance": self.instance, **_ignore}
+            )
+            changes = update_container_attrs(
+                self, parsed_data, self.ENTITY_CLASS, incremental
+            )
+            self.fingerprint = fingerprint
+        self.metadata.touch()
         self.metadata.collection_count += 1
-        return True
+        return changes if incremental else True
+
+
+# Codes of the routing table -> protocol
+ROUTE_CODES = {
+    "C": "connected",
+    "L": "connected",
+    "S": "static",
+    "O": "ospf",
+    "B": "bgp",
+    "D": "eigrp",
+    "R": "rip",
+    "i": "is-is",
+}
+# Protocols of the single route outputs (`Known via "ospf 1"`)
+ROUTE_PROTOCOLS = {
+    "connected": "connected",
+    "static": "static",
+    "ospf": "ospf",
+    "ospfv3": "ospfv3",
+    "bgp": "bgp",
+    "eigrp": "eigrp",
+    "rip": "rip",
+    "isis": "is-is",
+}
 
 
 class ParseRoute:
     @staticmethod
     def data_constructor(_instance, _route, data, **kwargs):
-        active = (
-            True
-            if data.get("hardwareProgrammed") or data.get("kernelProgrammed")
-            else False
-        )
-
-        # Vias
+        # The first next hop is on the route line, the rest are items
+        hops = [data] if "next_hop" in data or "interface" in data else []
         vias = [
-            dict(interface=x.get("interface"), next_hop=x.get("nexthopAddr"))
-            for x in data.get("vias", [])
+            dict(interface=x.get("interface"), next_hop=x.get("next_hop"))
+            for x in hops + data.get("vias", [])
         ]
 
+        if "code" in data:
+            protocol = ROUTE_CODES.get(data["code"])
+        else:
+            protocol = ROUTE_PROTOCOLS.get(data.get("protocol"))
+
         # Extra attributes
         extra_attributes = dict(
-            route_action=data.get("routeAction"), route_leaked=data.get("routeLeaked")
+            route_code=data.get("code"), route_type=data.get("route_type")
         )
 
         parsed_data = dict(
             dest=kwargs["dest"] if "dest" in kwargs else _route,
             instance=_instance,
             network=_route,
-            active=active,
+            active=True,
             inactive_reason=None,
-            protocol=data.get("routeType"),
+            protocol=protocol,
             metric=data.get("metric"),
             preference=data.get("preference"),
             vias=vias,
@@ -868,23 +933,29 @@ class ParseRoute:
         return parsed_data
 
     @staticmethod
-    def data_validation(raw_data, entity=True, **kwargs):
-        "Returns useful data and performs some initial validations"
+    def data_validation(raw_data, entity=True, instance=None, **kwargs):
+        """
+        Returns useful data and performs some initial validations. The routes are
+        keyed by instance (default one without VRF) and network
+        """
+        template = templates.ROUTE_DETAIL if entity else templates.ROUTES
+        rdata = {}
         try:
-            rdata = list(raw_data.values())[0].get("vrfs")
+            for record in template.parse(output_lines(raw_data)):
+                network = record["network"]
+                if "prefix_length" in record:
+                    network = f"{network}/{record['prefix_length']}"
+                _instance = record.get("instance", instance or "default")
+                rdata.setdefault(_instance, {})[network] = record
         except Exception as err:
             raise NetApiParseError(
                 f"{str(err)}\nCould not retrieve data from: {raw_data}"
             )
 
-        # If no data is passed a known error
-        if not rdata:
+        # A route not found has no data, only the collections must have it
+        if not rdata and not entity:
             raise NetApiParseError("No data to be parsed")
 
-        if entity:
-            if len(rdata) > 1:
-                print("[WARNING]: Multiple entities present")
-
         return rdata
 
     @staticmethod
@@ -893,14 +964,13 @@ class ParseRoute:
         Returns a dictionary with the entity data parsed
         """
         rdata = ParseRoute.data_validation(raw_data, **kwargs)
+        if not rdata:
+            print("No route information collected")
+            return dict(
+                dest=kwargs["dest"], active=False, inactive_reason="Route not found"
+            )
 
-        for _instance, _vrfdata in rdata.items():
-            _routes_data = _vrfdata.get("routes")
-            if not _routes_data:
-                print("No route information collected")
-                return dict(
-                    dest=kwargs["dest"], active=False, inactive_reason="Route not found"
-                )
+        for _instance, _routes_data in rdata.items():
             for _route, _route_data in _routes_data.items():
                 route_data = ParseRoute.data_constructor(
                     _instance, _route, _route_data, **kwargs
@@ -909,19 +979,21 @@ class ParseRoute:
         return route_data
 
     @staticmethod
-    def collector_parse(raw_data, **kwargs):
+    def iter_parse(raw_data, **kwargs):
         """
-        Returns list of dictionaries of each entity parsed
+        Yields the key and data of each entity as it is parsed
         """
         rdata = ParseRoute.data_validation(raw_data, entity=False, **kwargs)
 
-        routes_container = []
-        for _instance, _vrfdata in rdata.items():
-            _routes_data = _vrfdata.get("routes", {})
+        for _instance, _routes_data in rdata.items():
             for _route, _route_data in _routes_data.items():
-                _parsed_data = ParseRoute.data_constructor(
+                yield (_instance, _route), ParseRoute.data_constructor(
                     _instance, _route, _route_data, **kwargs
                 )
-                routes_container.append({(_instance, _route): _parsed_data})
 
-        return routes_container
+    @staticmethod
+    def collector_parse(raw_data, **kwargs):
+        """
+        Returns list of dictionaries of each entity parsed
+        """
+        return [{k: v} for k, v in ParseRoute.iter_parse(raw_data, **kwargs)]
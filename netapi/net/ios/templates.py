@@ -0,0 +1,272 @@
+"""
+IOS templates of the CLI outputs.
+
+Compiled at import into the state machines of `netapi.net.textparser`, so the outputs
+of `show interfaces`, `show ip route`, `show vlan` and `show vrrp` are parsed on a
+single pass over their lines. The IOS-XE outputs are the same ones. The records keep
+the names of the fields of the `Parse*` objects, which build the entity data out of
+them.
+"""
+import re
+import time
+from netapi.net.textparser import Rule, Template
+
+
+__all__ = ["INTERFACES", "ROUTES", "ROUTE_DETAIL", "VLANS", "VRRPS"]
+
+DURATION_PATTERN = re.compile(r"(\d+)([ywdhms])")
+DURATION_UNITS = dict(y=31536000, w=604800, d=86400, h=3600, m=60, s=1)
+
+
+def duration_seconds(value):
+    """
+    Returns the seconds of the durations of the outputs (i.e. `00:01:02`, `1d02h`,
+    `2w3d`). None when `never`
+    """
+    if value == "never":
+        return None
+    if ":" in value:
+        seconds = 0
+        for part in value.split(":"):
+            seconds = seconds * 60 + int(part)
+        return seconds
+    return sum(int(x) * DURATION_UNITS[y] for x, y in DURATION_PATTERN.findall(value))
+
+
+def ago(value):
+    "Returns the epoch timestamp of a duration to the present (i.e. last clear)"
+    seconds = duration_seconds(value)
+    return None if seconds is None else int(time.time()) - seconds
+
+
+def interval_seconds(value):
+    "Returns the seconds of the intervals (i.e. `1.000 sec`, `1000 msec`, `5 minute`)"
+    number, unit = value.split()
+    if unit.startswith("msec"):
+        return float(number) / 1000.0
+    if unit.startswith("minute"):
+        return float(number) * 60
+    return float(number)
+
+
+INTERFACE_TYPES = {
+    "mtu": int,
+    "bandwidth": lambda x: int(x) * 1000,
+    "duplex": str.lower,
+    "number_status_changes": int,
+    "last_status_change": ago,
+    "last_clear": ago,
+    "update_interval": interval_seconds,
+    **{
+        x: int
+        for x in (
+            "rx_packets",
+            "tx_packets",
+            "rx_bits_rate",
+            "rx_pkts_rate",
+            "tx_bits_rate",
+            "tx_pkts_rate",
+            "rx_bytes",
+            "tx_bytes",
+            "rx_broadcast_pkts",
+            "rx_multicast_pkts",
+            "tx_broadcast_pkts",
+            "tx_multicast_pkts",
+            "rx_discards",
+            "tx_discards",
+            "rx_errors_general",
+            "tx_errors_general",
+            "rx_errors_crc",
+            "rx_errors_runt",
+            "rx_errors_giant",
+            "rx_errors_rx_pause",
+            "tx_errors_collisions",
+            "tx_errors_late_collisions",
+            "tx_errors_deferred_transmissions",
+            "tx_errors_tx_pause",
+        )
+    },
+}
+
+# Rules of the lines that start the interfaces and of the physical and address details
+INTERFACE_RULES = [
+    Rule(
+        r"^(?P<name>\S+) is (?P<admin>administratively down|up|down|deleted)[^,]*, "
+        r"line protocol is (?P<protocol>\w+)",
+        record=True,
+    ),
+    Rule(r"^\s+Hardware is [^,]+(?:, address is (?P<mac>[0-9a-fA-F.]+))?"),
+    Rule(r"^\s+Description: (?P<description>.*?)\s*$"),
+    Rule(r"^\s+Internet address is (?P<ipv4>[\d./]+)"),
+    Rule(r"^\s+Internet address will be negotiated using (?P<dhcp>DHCP)"),
+    Rule(r"^\s+Secondary address (?P<address>[\d./]+)", item="secondary_ipv4"),
+    Rule(r"^\s+MTU (?P<mtu>\d+) bytes, BW (?P<bandwidth>\d+) Kbit"),
+    Rule(r"^\s+(?P<duplex>[Ff]ull|[Hh]alf|[Aa]uto)[- ][Dd]uplex"),
+    Rule(r'^\s+Last clearing of "show interface" counters (?P<last_clear>\S+)'),
+    Rule(r"^\s+Members in this channel: (?P<members>.+?)\s*$"),
+]
+
+INTERFACES = Template(
+    {
+        "start": INTERFACE_RULES
+        + [
+            Rule(
+                r"^\s+Input queue: \d+/\d+/(?P<rx_discards>\d+)/\d+.*"
+                r"Total output drops: (?P<tx_discards>\d+)"
+            ),
+            Rule(
+                r"^\s+(?P<update_interval>\d+ minute) input rate (?P<rx_bits_rate>\d+) "
+                r"bits/sec, (?P<rx_pkts_rate>\d+) packets/sec"
+            ),
+            Rule(
+                r"^\s+\d+ minute output rate (?P<tx_bits_rate>\d+) bits/sec, "
+                r"(?P<tx_pkts_rate>\d+) packets/sec"
+            ),
+            Rule(r"^\s+(?P<rx_packets>\d+) packets input, (?P<rx_bytes>\d+) bytes"),
+            Rule(
+                r"^\s+Received (?P<rx_broadcast_pkts>\d+) broadcasts"
+                r"(?: \((?P<rx_multicast_pkts>\d+) (?:IP )?multicasts?\))?"
+            ),
+            Rule(r"^\s+(?P<rx_errors_runt>\d+) runts, (?P<rx_errors_giant>\d+) giants"),
+            Rule(
+                r"^\s+(?P<rx_errors_general>\d+) input errors, "
+                r"(?P<rx_errors_crc>\d+) CRC"
+            ),
+            Rule(r"^\s+.*\b(?P<rx_errors_rx_pause>\d+) pause input"),
+            Rule(r"^\s+(?P<tx_packets>\d+) packets output, (?P<tx_bytes>\d+) bytes"),
+            Rule(
+                r"^\s+(?P<tx_errors_general>\d+) output errors, "
+                r"(?:(?P<tx_errors_collisions>\d+) collisions)?"
+            ),
+            Rule(
+                r"^\s+\d+ babbles, (?P<tx_errors_late_collisions>\d+) late collision, "
+                r"(?P<tx_errors_deferred_transmissions>\d+) deferred"
+            ),
+            Rule(r"^\s+.*\b(?P<tx_errors_tx_pause>\d+) pause output"),
+        ]
+    },
+    types=INTERFACE_TYPES,
+)
+
+ROUTE_TYPES = {"prefix_length": int, "preference": int, "metric": int}
+
+# Code of the route lines, i.e. `O E2`, `S*` or `i L1`
+ROUTE_CODE = (
+    r"^(?P<code>[A-Za-z]{1,2})\*?\s*(?:(?P<route_type>IA|E1|E2|N1|N2|EX|L1|L2|ia|su)"
+    r"\s+)?(?:[+%&]\s+)?(?P<network>\d+\.\d+\.\d+\.\d+)(?:/(?P<prefix_length>\d+))?"
+)
+# Next hop of the route lines and of the next lines of the same route
+ROUTE_VIA = (
+    r"\[(?P<preference>\d+)/(?P<metric>\d+)\]\s+via\s+(?P<next_hop>[\d.]+)"
+    r"(?:,\s+\d[\w:.]*)?(?:,\s+(?P<interface>[A-Za-z]\S*))?"
+)
+ROUTE_RULES = [
+    Rule(r"^Routing Table: (?P<instance>\S+)", context=True),
+    # Classful networks of the routes without length
+    Rule(r"^\s+\S+/(?P<prefix_length>\d+) is subnetted", context=True),
+    Rule(
+        ROUTE_CODE + r"\s+is directly connected,(?:\s+\d[\w:.]*,)?\s+"
+        r"(?P<interface>\S+)",
+        record=True,
+    ),
+    Rule(ROUTE_CODE + r"(?:\s+" + ROUTE_VIA + r")?", record=True),
+    Rule(r"^\s+" + ROUTE_VIA, item="vias"),
+]
+
+ROUTES = Template(
+    {"start": ROUTE_RULES},
+    types=ROUTE_TYPES,
+    items={"vias": ("next_hop", "interface")},
+)
+
+# Output of a single route (`show ip route <prefix>`)
+ROUTE_DETAIL_RULES = [
+    Rule(r"^Routing Table: (?P<instance>\S+)", context=True),
+    Rule(
+        r"^Routing entry for (?P<network>[\d.]+)(?:/(?P<prefix_length>\d+))?",
+        record=True,
+    ),
+    Rule(
+        r'^\s+Known via "(?P<protocol>[\w-]+)[^"]*", distance (?P<preference>\d+), '
+        r"metric (?P<metric>\d+)"
+    ),
+    Rule(r"^\s+\*?\s*directly connected, via (?P<interface>\S+)", item="vias"),
+    Rule(
+        r"^\s+\*?\s*(?P<next_hop>\d+\.\d+\.\d+\.\d+)(?:, from [^,\s]+)?(?:, [^,]+ ago)?"
+        r"(?:, via (?P<interface>\S+))?",
+        item="vias",
+    ),
+]
+
+ROUTE_DETAIL = Template(
+    {"start": ROUTE_DETAIL_RULES},
+    types=ROUTE_TYPES,
+    items={"vias": ("next_hop", "interface")},
+)
+
+VLANS = Template(
+    {
+        "start": [
+            Rule(
+                r"^(?P<id>\d+)\s+(?P<name>\S+)\s+(?P<status>active|suspended|act/\S+|"
+                r"sus/\S+)(?:\s+(?P<ports>\S.*?))?\s*$",
+                record=True,
+            ),
+            # Ports wrapped to the next lines
+            Rule(r"^\s{20,}(?P<ports>\S.*?)\s*$", item="more_ports"),
+            # Type, SAID, MTU... of the vlans: nothing else to parse
+            Rule(r"^VLAN\s+Type", state="end"),
+        ],
+        "end": [],
+    },
+    types={"id": int},
+)
+
+VRRP_TYPES = {
+    "group_id": int,
+    "priority": int,
+    "master_priority": int,
+    "preempt_delay": float,
+    "advertisement_interval": interval_seconds,
+    "master_interval": interval_seconds,
+    "master_down_interval": interval_seconds,
+    "decrement": int,
+}
+
+VRRP_RULES = [
+    Rule(r'^\s+Description is "?(?P<description>.*?)"?\s*$'),
+    Rule(r"^\s+State is (?P<state>\w+)"),
+    Rule(r"^\s+Virtual IP address is (?P<virtual_ip>[\d.]+)"),
+    Rule(r"^\s+Virtual MAC address is (?P<virtual_mac>[0-9a-fA-F.]+)"),
+    Rule(r"^\s+Advertisement interval is (?P<advertisement_interval>[\d.]+ m?sec)"),
+    Rule(
+        r"^\s+Preemption (?P<preempt>enabled|disabled)"
+        r"(?:, delay min (?P<preempt_delay>\d+) secs?)?"
+    ),
+    Rule(r"^\s+Priority is (?P<priority>\d+)"),
+    Rule(
+        r"^\s+Track object (?P<name>\S+) state (?P<tracked_state>\w+) "
+        r"decrement (?P<decrement>\d+)",
+        item="tracked_objects",
+    ),
+    Rule(
+        r"^\s+Master Router is (?P<master_ip>[\d.]+)(?: \(local\))?, "
+        r"priority is (?P<master_priority>\d+)"
+    ),
+    Rule(r"^\s+Master Advertisement interval is (?P<master_interval>[\d.]+ m?sec)"),
+    Rule(r"^\s+Master Down interval is (?P<master_down_interval>[\d.]+ m?sec)"),
+]
+
+VRRPS = Template(
+    {
+        "start": [
+            Rule(
+                r"^(?P<interface>\S+) - Group (?P<group_id>\d+)"
+                r"(?: - Address-Family (?P<family>\S+))?",
+                record=True,
+            )
+        ]
+        + VRRP_RULES
+    },
+    types=VRRP_TYPES,
+)
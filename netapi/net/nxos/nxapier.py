@@ -2,24 +2,40 @@
 NXOS Nxapier module.
 
 Contains the method to create Network Objects for the NXOS-NXAPI implementation.
+
+The NX-API outputs nest their tables as `TABLE_<name>` dicts with the rows on
+`ROW_<name>`: a dict when there is a single row and a list otherwise. The parsers walk
+the rows of the nested tables in place (see `table_rows()`), without normalizing the
+outputs first, so each row is read once to build the same data of the `Parse*` objects
+of the other implementations. The objects can not be configured (`enable()` and
+`disable()`) yet.
 """
-import pendulum
-from bitmath import kB
-from netapi.net import vlan, vrrp, interface, facts, route
+import re
+from functools import partial
+from netapi.net import vlan, vrrp, interface, route
+from netapi.net.eos.pyeapier import update_attrs, update_container_attrs
+from netapi.net.interface import interface_converter
+from netapi.net.ios.templates import ago
+from netapi.metadata import ChangeSet, output_fingerprint
 from netapi.exceptions import NetApiParseError
 
 
-def update_attrs(obj, data_dict):
-    "Updates object attributes based on data from dictionary"
-    for key, value in data_dict.items():
-        setattr(obj, key, value)
+def table_rows(data, table, row):
+    """
+    Returns the rows of the `table` of an NX-API output (i.e. `TABLE_vrf` and
+    `ROW_vrf`). The single rows are wrapped on a tuple, the lists of rows are returned
+    as they are: the rows are never copied
+    """
+    rows = data.get(table)
+    if not rows:
+        return ()
+    rows = rows.get(row, ())
+    return (rows,) if isinstance(rows, dict) else rows
 
 
-def update_container_attrs(obj, list_of_dict, entity):
-    "Updates collections based on data from dictionary contained in list"
-    for data_dict in list_of_dict:
-        for key, value in data_dict.items():
-            obj[key] = entity(**value)
+def command_output(raw_data):
+    "Returns the output of the command run (the only one)"
+    return next(iter(raw_data.values()))
 
 
 class Vlans(vlan.VlansBase):
@@ -34,15 +50,19 @@ class Vlans(vlan.VlansBase):
         "Returns commands necessary to build a collection of entities"
         if isinstance(vlan_range, list):
             vlan_range = sorted(vlan_range)
-            vlan_range = f"{vlan_range[0]} - {vlan_range[-1]}"
+            vlan_range = f"{vlan_range[0]}-{vlan_range[-1]}"
 
         if vlan_range:
-            return [f"show vlan id {vlan_range}"]
+            return [f"show vlan id {str(vlan_range).replace(' ', '')}"]
         else:
-            return ["show vlan"]
+            return ["show vlan brief"]
 
-    def get(self, **_ignore):
-        "Automatic trigger a data collection. A connector object has to be passed"
+    def get(self, incremental=False, **_ignore):
+        """
+        Automatic trigger a data collection. A connector object has to be passed.
+        With `incremental` the entities are updated in place and the `ChangeSet` is
+        returned, see `refresh()`
+        """
         if self.connector.metadata.implementation != "NXOS-NXAPI":
             raise ValueError(
                 "Connector is not of the correct implementation: NXOS-NXAPI"
@@ -52,32 +72,33 @@ class Vlans(vlan.VlansBase):
         if not self.get_cmd:
             self.get_cmd = self.generate_get_cmd(self.vlan_range)
 
-        parsed_data = ParseVlan.collector_parse(
-            self.connector.run(self.get_cmd), **_ignore
-        )
-
-        update_container_attrs(self, parsed_data, Vlan)
-        self.metadata.updated_at = pendulum.now()
+        raw_data = self.connector.run(self.get_cmd)
+        fingerprint = output_fingerprint(raw_data)
+        if fingerprint == self.fingerprint:
+            # Same outputs of the previous collection, nothing to parse
+            changes = ChangeSet()
+        else:
+            parsed_data = ParseVlan.collector_parse(raw_data, **_ignore)
+            changes = update_container_attrs(self, parsed_data, Vlan, incremental)
+            self.fingerprint = fingerprint
+        self.metadata.touch()
         self.metadata.collection_count += 1
-        return True
+        return changes if incremental else True
 
 
 class Vlan(vlan.VlanBase):
     def __post_init__(self, **_ignore):
         super().__post_init__(**_ignore)
-        self.metadata.implementation = "NXOS-NXAPI"
-        self._vlan_api_generator()
+        self._implementation_setup()
 
-    def _vlan_api_generator(self):
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
+        self.metadata.implementation = "NXOS-NXAPI"
         if self.connector is not None:
             if self.connector.metadata.implementation != "NXOS-NXAPI":
                 raise ValueError(
                     "Connector is not of the correct implementation: NXOS-NXAPI"
                 )
-            self.vlan_api = self.connector.connector.api("vlans")
-            return True
-        else:
-            return False
 
     @staticmethod
     def generate_get_cmd(id):
@@ -98,27 +119,39 @@ class Vlan(vlan.VlanBase):
         # Update the attributes
         update_attrs(self, parsed_data)
 
-        # Do extra work for the status
-        self.status, self.status_up = vlan.status_conversion(parsed_data["status"])
-
         # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+        self.metadata.touch()
         self.metadata.collection_count += 1
         return True
 
     def enable(self):
-        "Enable VLAN"
-        if not hasattr(self, "vlan_api"):
-            if not self._vlan_api_generator():
-                raise NotImplementedError("Need to have the connector API defined")
-        return self.vlan_api.set_state(self.id, value="active")
+        raise NotImplementedError("Configuration not implemented for NXOS-NXAPI")
 
     def disable(self):
-        "Disable VLAN"
-        if not hasattr(self, "vlan_api"):
-            if not self._vlan_api_generator():
-                raise NotImplementedError("Need to have the connector API defined")
-        return self.vlan_api.set_state(self.id, value="suspend")
+        raise NotImplementedError("Configuration not implemented for NXOS-NXAPI")
+
+
+# Ports of the vlans, with ranges (i.e. `Ethernet1/1-3`)
+PORT_RANGE_PATTERN = re.compile(r"^(?P<base>\D.*?)(?P<start>\d+)-(?P<end>\d+)$")
+
+
+def vlan_ports(ports):
+    "Returns the interfaces of the ports of a vlan (i.e. `Ethernet1/1-2,Po10`)"
+    interfaces = []
+    for port in ports.split(","):
+        port = port.strip()
+        if not port:
+            continue
+        match = PORT_RANGE_PATTERN.match(port)
+        if match is None:
+            interfaces.append(interface_converter(port))
+            continue
+        base = match.group("base")
+        interfaces.extend(
+            interface_converter(f"{base}{x}")
+            for x in range(int(match.group("start")), int(match.group("end")) + 1)
+        )
+    return interfaces
 
 
 class ParseVlan:
@@ -128,14 +161,17 @@ class ParseVlan:
         if not data:
             raise NetApiParseError("No data to be parsed")
 
-        interfaces = data.get("interfaces")
+        ports = data.get("vlanshowplist-ifidx")
 
         parsed_data = dict(
             id=vlan_id,
-            name=data.get("name"),
-            dynamic=data.get("dynamic"),
-            interfaces=list(interfaces.keys()) if interfaces else None,
-            status=data.get("status"),
+            name=data.get("vlanshowbr-vlanname"),
+            dynamic=False,
+            interfaces=vlan_ports(ports) if ports else None,
+            # i.e. `suspend`, the shutdown ones are active (`act/lshut`)
+            status="active"
+            if data.get("vlanshowbr-vlanstate") == "active"
+            else "suspended",
         )
 
         return parsed_data
@@ -144,7 +180,12 @@ class ParseVlan:
     def data_validation(raw_data, entity=True, **kwargs):
         "Returns useful data and performs some initial validations"
         try:
-            rdata = list(raw_data.values())[0].get("vlans")
+            output = command_output(raw_data)
+            # Table of `show vlan brief` or of `show vlan id`
+            rows = table_rows(
+                output, "TABLE_vlanbriefxbrief", "ROW_vlanbriefxbrief"
+            ) or table_rows(output, "TABLE_vlanbriefid", "ROW_vlanbriefid")
+            rdata = {int(x["vlanshowbr-vlanid"]): x for x in rows}
         except Exception as err:
             raise NetApiParseError(
                 f"{str(err)}\nCould not retrieve data from: {raw_data}"
@@ -173,18 +214,21 @@ class ParseVlan:
         return vlan_data
 
     @staticmethod
-    def collector_parse(raw_data, **kwargs):
+    def iter_parse(raw_data, **kwargs):
         """
-        Returns list of dictionaries of each entity parsed
+        Yields the key and data of each entity as it is parsed
         """
         rdata = ParseVlan.data_validation(raw_data, entity=False, **kwargs)
 
-        vlans_container = []
         for _vlan_id, _vlan_data in rdata.items():
-            _parsed_data = ParseVlan.data_constructor(_vlan_id, _vlan_data, **kwargs)
-            vlans_container.append({int(_vlan_id): _parsed_data})
+            yield _vlan_id, ParseVlan.data_constructor(_vlan_id, _vlan_data, **kwargs)
 
-        return vlans_container
+    @staticmethod
+    def collector_parse(raw_data, **kwargs):
+        """
+        Returns list of dictionaries of each entity parsed
+        """
+        return [{k: v} for k, v in ParseVlan.iter_parse(raw_data, **kwargs)]
 
 
 class Vrrps(vrrp.VrrpsBase):
@@ -197,16 +241,21 @@ class Vrrps(vrrp.VrrpsBase):
 
     @staticmethod
     def generate_get_cmd(instance=None, interface=None):
-        "Returns commands necessary to build a collection of entities"
+        """
+        Returns commands necessary to build a collection of entities. The output
+        does not have the VRF of the groups, `instance` is not used
+        """
         if interface:
-            return [f"show vrrp interface {interface} all"]
-        elif instance:
-            return [f"show vrrp vrf {instance} all"]
+            return [f"show vrrp detail interface {interface}"]
         else:
-            return [f"show vrrp all"]
+            return ["show vrrp detail"]
 
-    def get(self, **_ignore):
-        "Automatic trigger a data collection. A connector object has to be passed"
+    def get(self, incremental=False, **_ignore):
+        """
+        Automatic trigger a data collection. A connector object has to be passed.
+        With `incremental` the entities are updated in place and the `ChangeSet` is
+        returned, see `refresh()`
+        """
         if self.connector.metadata.implementation != "NXOS-NXAPI":
             raise ValueError(
                 "Connector is not of the correct implementation: NXOS-NXAPI"
@@ -216,43 +265,44 @@ class Vrrps(vrrp.VrrpsBase):
         if not self.get_cmd:
             self.get_cmd = self.generate_get_cmd(self.instance, self.interface)
 
-        parsed_data = ParseVrrp.collector_parse(
-            self.connector.run(self.get_cmd), **_ignore
-        )
-
-        update_container_attrs(self, parsed_data, Vrrp)
-
-        self.metadata.updated_at = pendulum.now()
+        raw_data = self.connector.run(self.get_cmd)
+        fingerprint = output_fingerprint(raw_data)
+        if fingerprint == self.fingerprint:
+            # Same outputs of the previous collection, nothing to parse
+            changes = ChangeSet()
+        else:
+            parsed_data = ParseVrrp.collector_parse(raw_data, **_ignore)
+            changes = update_container_attrs(self, parsed_data, Vrrp, incremental)
+            self.fingerprint = fingerprint
+        self.metadata.touch()
         self.metadata.collection_count += 1
-        return True
+        return changes if incremental else True
 
 
 class Vrrp(vrrp.VrrpBase):
     def __post_init__(self, **_ignore):
         super().__post_init__(**_ignore)
-        self.metadata.implementation = "NXOS-NXAPI"
-        self._vrrp_api_generator()
+        self._implementation_setup()
 
-    def _vrrp_api_generator(self):
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
+        self.metadata.implementation = "NXOS-NXAPI"
         if self.connector is not None:
             if self.connector.metadata.implementation != "NXOS-NXAPI":
                 raise ValueError(
                     "Connector is not of the correct implementation: NXOS-NXAPI"
                 )
-            self.vrrp_api = self.connector.connector.api("vrrp")
-            return True
-        else:
-            return False
 
     @staticmethod
     def generate_get_cmd(group_id, interface=None, instance=None):
-        "Returns commands necessary to build the entity"
+        """
+        Returns commands necessary to build the entity. The group is picked from the
+        output by the parser
+        """
         if interface:
-            return [f"show vrrp group {group_id} interface {interface} all"]
-        elif instance:
-            return [f"show vrrp group {group_id} vrf {instance} all"]
+            return [f"show vrrp detail interface {interface}"]
         else:
-            return [f"show vrrp group {group_id} vrf all"]
+            return ["show vrrp detail"]
 
     def get(self, **_ignore):
         "Automatic trigger a data update on the object"
@@ -265,32 +315,28 @@ class Vrrp(vrrp.VrrpBase):
                 self.group_id, self.interface, self.instance
             )
 
-        parsed_data = ParseVrrp.parse(self.connector.run(self.get_cmd), **_ignore)
+        parsed_data = ParseVrrp.parse(
+            self.connector.run(self.get_cmd),
+            **{**_ignore, "group_id": self.group_id, "interface": self.interface},
+        )
 
         # Update the attributes
         update_attrs(self, parsed_data)
 
-        # Do extra work for the status
-        self.status, self.status_up = vrrp.status_conversion(parsed_data["status"])
-
         # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+        self.metadata.touch()
         self.metadata.collection_count += 1
         return True
 
     def enable(self):
-        "Enable VRRP group"
-        if not hasattr(self, "vrrp_api"):
-            if not self._vrrp_api_generator():
-                raise NotImplementedError("Need to have the connector API defined")
-        return self.vrrp_api.set_enable(self.interface, self.group_id, value=True)
+        raise NotImplementedError("Configuration not implemented for NXOS-NXAPI")
 
     def disable(self):
-        "Disable VRRP group"
-        if not hasattr(self, "vrrp_api"):
-            if not self._vrrp_api_generator():
-                raise NotImplementedError("Need to have the connector API defined")
-        return self.vrrp_api.set_enable(self.interface, self.group_id, value=False)
+        raise NotImplementedError("Configuration not implemented for NXOS-NXAPI")
+
+
+# States of the groups -> VRRP status
+VRRP_STATES = {"master": "master", "backup": "backup", "init": "stopped"}
 
 
 class ParseVrrp:
@@ -300,31 +346,35 @@ class ParseVrrp:
         if not data:
             raise NetApiParseError("No data to be parsed")
 
+        preempt = data.get("sh_group_preempt")
+        priority = data.get("sh_priority")
+        adv_interval = data.get("sh_adv_interval")
+
         parsed_data = dict(
-            group_id=data.get("groupId"),
-            interface=data.get("interface"),
-            instance=data.get("vrfName"),
-            description=data.get("description"),
-            virtual_mac=data.get("virtualMac"),
-            virtual_ip_secondary=data.get("virtualIpSecondary"),
-            master_ip=data.get("masterAddr"),
-            virtual_ip=data.get("virtualIp"),
-            priority=data.get("priority"),
-            skew_time=data.get("skewTime"),
-            version=data.get("version"),
-            preempt=data.get("preempt"),
-            preempt_delay=data.get("preemptDelay"),
-            mac_advertisement_interval=data.get("macAddressInterval"),
-            master_interval=data.get("masterInterval"),
-            master_down_interval=float(data.get("masterDownInterval")) / 1000.0,
-            tracked_objects=data.get("trackedObjects"),
-            status=data.get("state"),
+            group_id=int(data["sh_group_id"]),
+            interface=interface_converter(data["sh_if_index"]),
+            instance=None,
+            description=None,
+            virtual_mac=data.get("sh_vmac"),
+            virtual_ip_secondary=[],
+            master_ip=data.get("sh_master_addr"),
+            master_priority=None,
+            virtual_ip=data.get("sh_vip_addr"),
+            priority=int(priority) if priority is not None else None,
+            skew_time=None,
+            # The VRRPv3 groups are on `show vrrpv3`
+            version=2,
+            preempt=preempt.lower() == "enable" if preempt else None,
+            preempt_delay=None,
+            mac_advertisement_interval=None,
+            master_interval=None,
+            master_down_interval=None,
+            tracked_objects=[],
+            status=VRRP_STATES.get(str(data.get("sh_group_state")).lower()),
             extra_attributes=dict(
-                vrrp_advertisement_interval=data.get("vrrpAdvertInterval"),
-                vrrp_id_disabled=data.get("vrIdDisabled"),
-                vrrp_id_disabled_reason=data.get("vrIdDisabledReason"),
-                bfd_peer_ip=data.get("bfdPeerAddr"),
-                preempt_reload=data.get("preemptReload"),
+                vrrp_advertisement_interval=float(adv_interval)
+                if adv_interval is not None
+                else None
             ),
         )
 
@@ -334,7 +384,9 @@ class ParseVrrp:
     def data_validation(raw_data, entity=True, **kwargs):
         "Returns useful data and performs some initial validations"
         try:
-            rdata = list(raw_data.values())[0].get("virtualRouters")
+            rdata = table_rows(
+                command_output(raw_data), "TABLE_vrrp_group", "ROW_vrrp_group"
+            )
         except Exception as err:
             raise NetApiParseError(
                 f"{str(err)}\nCould not retrieve data from: {raw_data}"
@@ -351,104 +403,165 @@ class ParseVrrp:
         return rdata
 
     @staticmethod
-    def parse(raw_data, **kwargs):
+    def parse(raw_data, group_id=None, interface=None, **kwargs):
         """
-        Returns a dictionary with the entity data parsed
+        Returns a dictionary with the entity data parsed, the group (and interface)
+        passed when the output has many
         """
-        rdata = ParseVrrp.data_validation(raw_data, **kwargs)[0]
+        rdata = ParseVrrp.data_validation(raw_data, entity=False, **kwargs)
+        if group_id is not None:
+            rdata = [x for x in rdata if int(x["sh_group_id"]) == int(group_id)]
+        if interface is not None:
+            rdata = [
+                x
+                for x in rdata
+                if interface_converter(x["sh_if_index"])
+                == interface_converter(interface)
+            ]
+        if not rdata:
+            raise NetApiParseError(f"VRRP group not found: {group_id} {interface}")
 
-        vrrp_data = ParseVrrp.data_constructor(rdata, **kwargs)
+        vrrp_data = ParseVrrp.data_constructor(rdata[0], **kwargs)
 
         return vrrp_data
 
     @staticmethod
-    def collector_parse(raw_data, **kwargs):
+    def iter_parse(raw_data, **kwargs):
         """
-        Returns list of dictionaries of each entity parsed
+        Yields the key and data of each entity as it is parsed
         """
         rdata = ParseVrrp.data_validation(raw_data, entity=False, **kwargs)
 
-        vrrps_container = []
         for vrrp_data in rdata:
-            # Placeholder
             _parsed_data = ParseVrrp.data_constructor(vrrp_data, **kwargs)
-            vrrps_container.append(
-                {(_parsed_data["group_id"], _parsed_data["interface"]): _parsed_data}
-            )
+            yield (_parsed_data["group_id"], _parsed_data["interface"]), _parsed_data
+
+    @staticmethod
+    def collector_parse(raw_data, **kwargs):
+        """
+        Returns list of dictionaries of each entity parsed
+        """
+        return [{k: v} for k, v in ParseVrrp.iter_parse(raw_data, **kwargs)]
+
 
-        return vrrps_container
+# Fields of the interfaces on the output of `show interface`
+INTERFACE_FIELDS = {
+    "description",
+    "status",
+    "last_status_change",
+    "last_clear",
+    "update_interval",
+    "members",
+    "physical",
+    "addresses",
+    "counters",
+}
+
+
+def interface_commands(interface_range=None, fields=None):
+    """
+    Returns the commands to collect the interfaces. `show interface` provides all
+    the fields and accepts ranges (i.e. `Ethernet1/1-4, Ethernet1/7`)
+    """
+    interface.check_fields(fields, INTERFACE_FIELDS)
+    if interface_range is None:
+        return ["show interface"]
+    return [f"show interface {interface_range}"]
+
+
+def interface_fields(fields):
+    "Returns the `fields` passed that are available on `show interface`"
+    return set(fields) & INTERFACE_FIELDS
 
 
 class Interfaces(interface.InterfacesBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.interface_range = None
+        self.fields = None
         self.get_cmd = None
         self.metadata.implementation = "NXOS-NXAPI"
 
     @staticmethod
-    def generate_get_cmd(interface_range=None):
-        "Returns commands necessary to build the collection of entities"
+    def generate_get_cmd(interface_range=None, fields=None):
+        """
+        Returns commands necessary to build the collection of entities. With `fields`
+        (i.e. `{"status", "counters"}`) only those are parsed
+        """
         if isinstance(interface_range, list):
-            raise ValueError("Must pass a str (i.e. Eth1 - 10) or None to collect all")
-        if interface_range is not None:
-            return [
-                f"show interfaces {interface_range}",
-                f"show ip interface {interface_range}",
-                f"show interfaces {interface_range} transceiver",
-            ]
-        else:
-            return [
-                "show interfaces",
-                "show ip interface",
-                "show interfaces transceiver",
-            ]
+            raise ValueError("Must pass a str (i.e. Eth1/1-4) or None to collect all")
+        return interface_commands(interface_range, fields)
 
-    def get(self, **_ignore):
-        "Automatic trigger a data collection. A connector object has to be passed"
+    def get(self, incremental=False, **_ignore):
+        """
+        Automatic trigger a data collection. A connector object has to be passed.
+        With `incremental` the entities are updated in place and the `ChangeSet` is
+        returned, see `refresh()`. The counters are appended to the `timeseries`
+        store, when attached
+        """
         if self.connector.metadata.implementation != "NXOS-NXAPI":
             raise ValueError(
                 "Connector is not of the correct implementation: NXOS-NXAPI"
             )
         # Verify show command
         if not self.get_cmd:
-            self.get_cmd = self.generate_get_cmd(self.interface_range)
+            self.get_cmd = self.generate_get_cmd(self.interface_range, self.fields)
 
-        parsed_data = ParseInterface.collector_parse(
-            self.connector.run(self.get_cmd), **_ignore
-        )
-
-        update_container_attrs(self, parsed_data, Interface)
-        self.metadata.updated_at = pendulum.now()
+        raw_data = self.connector.run(self.get_cmd)
+        fingerprint = output_fingerprint(raw_data)
+        if fingerprint == self.fingerprint:
+            # Same outputs of the previous collection, nothing to parse
+            changes = ChangeSet()
+        else:
+            parsed_data = ParseInterface.collector_parse(
+                raw_data, **{"fields": self.fields, **_ignore}
+            )
+            changes = update_container_attrs(self, parsed_data, Interface, incremental)
+            self.fingerprint = fingerprint
+        self.record_counters()
+        self.metadata.touch()
         self.metadata.collection_count += 1
-        return True
+        return changes if incremental else True
 
 
 class Interface(interface.InterfaceBase):
     def __post_init__(self, **_ignore):
         super().__post_init__(**_ignore)
-        self.metadata.implementation = "NXOS-NXAPI"
-        self._interface_api_generator()
+        self._implementation_setup()
 
-    def _interface_api_generator(self):
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
+        self.metadata.implementation = "NXOS-NXAPI"
         if self.connector is not None:
             if self.connector.metadata.implementation != "NXOS-NXAPI":
                 raise ValueError(
                     "Connector is not of the correct implementation: NXOS-NXAPI"
                 )
-            self.interface_api = self.connector.connector.api("interfaces")
-            return True
-        else:
-            return False
 
     @staticmethod
-    def generate_get_cmd(name):
-        "Returns commands necessary to build the entity"
-        return [
-            f"show interfaces {name}",
-            f"show ip interface {name}",
-            f"show interfaces {name} transceiver",
-        ]
+    def generate_get_cmd(name, fields=None):
+        "Returns commands necessary to build the entity (or only its `fields`)"
+        return interface_commands(name, fields)
+
+    def fetch_fields(self, fields):
+        """
+        Loads the attributes of a lazy object from the output of `show interface`
+        of the interface. All its fields are loaded. Returns the changes, nothing is
+        loaded without connector or for the fields not available on the output
+        """
+        fields = interface_fields(fields)
+        if self.connector is None or not fields:
+            return {}
+        raw_data = self.connector.run(
+            self.generate_get_cmd(self.name, fields), silent=True
+        )
+        try:
+            parsed_data = ParseInterface.parse(
+                raw_data, name=self.name, fields=INTERFACE_FIELDS
+            )
+        except NetApiParseError:
+            return {}
+        return update_attrs(self, parsed_data)
 
     def get(self, **_ignore):
         "Automatic trigger a data collection by running get_cmd"
@@ -460,169 +573,159 @@ class Interface(interface.InterfaceBase):
             self.get_cmd = self.generate_get_cmd(self.name)
 
         parsed_data = ParseInterface.parse(
-            self.connector.run(self.get_cmd, silent=True), **_ignore
+            self.connector.run(self.get_cmd, silent=True),
+            **{**_ignore, "name": self.name},
         )
 
         # Update the attributes
         update_attrs(self, parsed_data)
 
-        # Do extra work for the status
-        self.status, self.status_up, self.enabled = interface.status_conversion(
-            parsed_data["status"]
-        )
-
         # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+        self.metadata.touch()
         self.metadata.collection_count += 1
         return True
 
     def enable(self):
-        "Enable Interface"
-        if not hasattr(self, "interface_api"):
-            if not self._interface_api_generator():
-                raise NotImplementedError("Need to have the connector API defined")
-        return self.interface_api.set_shutdown(self.name, disable=True)
+        raise NotImplementedError("Configuration not implemented for NXOS-NXAPI")
 
     def disable(self):
-        "Disable Interface"
-        if not hasattr(self, "interface_api"):
-            if not self._interface_api_generator():
-                raise NotImplementedError("Need to have the connector API defined")
-        return self.interface_api.set_shutdown(self.name, disable=False)
+        raise NotImplementedError("Configuration not implemented for NXOS-NXAPI")
+
+
+# `InterfaceCounters` -> counters of the ethernet interfaces
+INTERFACE_COUNTERS = (
+    ("rx_bytes", "eth_inbytes"),
+    ("tx_bytes", "eth_outbytes"),
+    ("rx_unicast_pkts", "eth_inucast"),
+    ("tx_unicast_pkts", "eth_outucast"),
+    ("rx_broadcast_pkts", "eth_inbcast"),
+    ("tx_broadcast_pkts", "eth_outbcast"),
+    ("rx_multicast_pkts", "eth_inmcast"),
+    ("tx_multicast_pkts", "eth_outmcast"),
+    ("rx_discards", "eth_indiscard"),
+    ("tx_discards", "eth_outdiscard"),
+    ("rx_errors_general", "eth_inerr"),
+    ("tx_errors_general", "eth_outerr"),
+    ("rx_errors_crc", "eth_crc"),
+    ("rx_errors_runt", "eth_runts"),
+    ("rx_errors_giant", "eth_giants"),
+    ("rx_errors_rx_pause", "eth_inpause"),
+    ("tx_errors_collisions", "eth_coll"),
+    ("tx_errors_late_collisions", "eth_latecoll"),
+    ("tx_errors_deferred_transmissions", "eth_deferred"),
+    ("tx_errors_tx_pause", "eth_outpause"),
+    ("rx_bits_rate", "eth_inrate1_bits"),
+    ("rx_pkts_rate", "eth_inrate1_pkts"),
+    ("tx_bits_rate", "eth_outrate1_bits"),
+    ("tx_pkts_rate", "eth_outrate1_pkts"),
+)
+
+
+def _interface_status(data):
+    "Returns the status of the interface from its admin and operational state"
+    if "svi_admin_state" in data:
+        # Routed VLAN interfaces
+        if data["svi_admin_state"] == "down":
+            return "disabled"
+        return "connected" if data.get("svi_line_proto") == "up" else "down"
+    reason = data.get("state_rsn_desc", "")
+    if data.get("admin_state") == "down" or reason == "Administratively down":
+        return "disabled"
+    if data.get("state") == "up":
+        return "connected"
+    # i.e. `XCVR not inserted` and `SFP not inserted`
+    return "notpresent" if reason.endswith("not inserted") else "notconnect"
+
+
+def _number(value):
+    "NX-API returns the numbers as int or str, None when not present"
+    return None if value is None else int(value)
 
 
 class ParseInterface:
     @staticmethod
-    def data_constructor(intf_name, data, **kwargs):
+    def data_constructor(intf_name, data, fields=None, **kwargs):
         # If no data is passed a known error
         if not data:
             raise NetApiParseError("No data to be parsed")
 
-        statistics = data.get("interfaceStatistics", {})
+        # The routed VLAN interfaces have their own fields
+        prefix = "svi_" if "svi_admin_state" in data else "eth_"
+        # Only the sections of the fields requested are parsed
+        requested = partial(interface.field_requested, fields=fields)
 
         # Physical bit
-        physical = dict(
-            mac=data.get("physicalAddress"),
-            mtu=data.get("mtu", 0),
-            duplex=data.get("duplex"),
-            bandwidth=data.get("bandwidth", 0),
-        )
+        if not requested("physical"):
+            physical = None
+        else:
+            physical = dict(
+                mac=data.get("eth_hw_addr") or data.get("svi_mac"),
+                mtu=_number(data.get(f"{prefix}mtu")) or 0,
+                duplex=data.get("eth_duplex"),
+                # Kbit
+                bandwidth=(_number(data.get(f"{prefix}bw")) or 0) * 1000,
+            )
 
         # Addresses bit
-        addr_info = data.get("interfaceAddress")
-        if not addr_info:
+        address = data.get(f"{prefix}ip_addr")
+        if not address or not requested("addresses"):
             addresses = None
         else:
-            addresses = dict(dhcp=addr_info.get("dhcp"), secondary_ipv4=[])
-            for _ip in addr_info.get("secondaryIpsOrderedList", []):
-                addresses["secondary_ipv4"].append(f"{_ip['address']}/{_ip['maskLen']}")
-            if addr_info.get("primaryIp"):
-                _ip = addr_info["primaryIp"]
-                addresses.update(ipv4=f"{_ip['address']}/{_ip['maskLen']}")
-            if addr_info.get("linkLocalIp6"):
-                _ip = addr_info["linkLocalIp6"]
-                addresses.update(ipv6=f"{_ip['address']}/{_ip['maskLen']}")
+            addresses = dict(
+                dhcp=False,
+                secondary_ipv4=[],
+                ipv4=f"{address}/{data[f'{prefix}ip_mask']}",
+            )
 
         # Counters bit
-        counter_info = data.get("interfaceCounters", {})
-        if not counter_info:
+        if not requested("counters") or (
+            "eth_inbytes" not in data and "eth_outbytes" not in data
+        ):
             counters = None
         else:
-            counters = dict(
-                tx_broadcast_pkts=counter_info.get("outBroadcastPkts", 0.0),
-                rx_broadcast_pkts=counter_info.get("inBroadcastPkts", 0.0),
-                tx_unicast_pkts=counter_info.get("outUcastPkts", 0.0),
-                rx_unicast_pkts=counter_info.get("inUcastPkts", 0.0),
-                tx_multicast_pkts=counter_info.get("outMulticastPkts", 0.0),
-                rx_multicast_pkts=counter_info.get("inMulticastPkts", 0.0),
-                tx_bytes=counter_info.get("outOctets", 0.0),
-                rx_bytes=counter_info.get("inOctets", 0.0),
-                tx_errors_general=counter_info.get("totalOutErrors", 0.0),
-                rx_errors_general=counter_info.get("totalInErrors", 0.0),
-                tx_discards=counter_info.get("outDiscards", 0.0),
-                rx_discards=counter_info.get("inDiscards", 0.0),
-            )
-            # Tx Errors
-            tx_errors = counter_info.get("outputErrorsDetail")
-            if tx_errors:
-                counters.update(
-                    tx_errors_collisions=tx_errors.get("collisions", 0.0),
-                    tx_errors_deferred_transmissions=tx_errors.get(
-                        "deferredTransmissions", 0.0
-                    ),
-                    tx_errors_tx_pause=tx_errors.get("txPause", 0.0),
-                    tx_errors_late_collisions=tx_errors.get("lateCollisions"),
-                )
-            # Rx Errors
-            rx_errors = counter_info.get("inputErrorsDetail")
-            if rx_errors:
-                counters.update(
-                    rx_errors_runt=rx_errors.get("runtFrames", 0.0),
-                    rx_errors_rx_pause=rx_errors.get("rxPause", 0.0),
-                    rx_errors_fcs=rx_errors.get("fcsErrors", 0.0),
-                    rx_errors_crc=rx_errors.get("alignmentErrors", 0.0),
-                    rx_errors_giant=rx_errors.get("giantFrames", 0.0),
-                    rx_errors_symbol=rx_errors.get("symbolErrors", 0.0),
-                )
-
-            # Statistics
-            if statistics:
-                counters.update(
-                    rx_bits_rate=statistics.get("inBitsRate", 0.0),
-                    rx_pkts_rate=statistics.get("inPktsRate", 0.0),
-                    tx_bits_rate=statistics.get("outBitsRate", 0.0),
-                    tx_pkts_rate=statistics.get("outPktsRate", 0.0),
-                )
+            counters = {x: int(data[y]) for x, y in INTERFACE_COUNTERS if y in data}
 
-        # Optical bit
-        optical = dict(
-            tx=data.get("txPower"),
-            rx=data.get("rxPower"),
-            serial_number=data.get("vendorSn"),
-            media_type=data.get("mediaType"),
+        members = data.get("eth_members") if requested("members") else None
+        interval = data.get("eth_load_interval1_rx")
+        last_status_change = (
+            data.get("eth_link_flapped") if requested("last_status_change") else None
         )
-
-        if optical.get("tx") is not None and optical.get("rx") is not None:
-            optical["status"] = interface.light_levels_alert(
-                tx_power=optical["tx"], rx_power=optical["rx"], net_os="eos"
-            )
-
-        if not any(optical.values()):
-            optical = None
+        last_clear = data.get("eth_clear_counters") if requested("last_clear") else None
 
         parsed_data = dict(
             name=intf_name,
-            forwarding_model=data.get("forwardingModel"),
-            description=data.get("description"),
-            instance=data.get("vrf"),
-            status=data.get("interfaceStatus"),
-            last_status_change=data.get("lastStatusChangeTimestamp"),
-            last_clear=counter_info.get("lastClear"),
-            number_status_changes=counter_info.get("linkStatusChanges"),
-            update_interval=statistics.get("updateInterval"),
-            members=list(data.get("memberInterfaces", {}).keys()),
+            forwarding_model=None,
+            description=data.get("desc"),
+            instance=None,
+            status=_interface_status(data),
+            last_status_change=ago(last_status_change) if last_status_change else None,
+            last_clear=ago(last_clear) if last_clear else None,
+            number_status_changes=None,
+            update_interval=float(interval) if interval is not None else None,
+            members=[
+                interface_converter(x.strip()) for x in members.split(",") if x.strip()
+            ]
+            if members
+            else [],
             physical=physical,
             addresses=addresses,
-            optical=optical,
+            optical=None,
             counters=counters,
         )
 
-        return parsed_data
+        # Skip the fields not requested
+        return interface.project_fields(parsed_data, fields)
 
     @staticmethod
     def data_validation(raw_data, entity=True, **kwargs):
         "Returns useful data and performs some initial validations"
-        rdata = {}
         try:
-            # Merge the results off al the commands into each interface found
-            for value in raw_data.values():
-                if not value:
-                    continue
-                for intf, intf_data in value.get("interfaces", {}).items():
-                    if rdata.get(intf):
-                        rdata[intf] = {**rdata[intf], **intf_data}
-                    else:
-                        rdata[intf] = intf_data
+            rdata = {
+                interface_converter(x["interface"]): x
+                for x in table_rows(
+                    command_output(raw_data), "TABLE_interface", "ROW_interface"
+                )
+            }
         except Exception as err:
             raise NetApiParseError(
                 f"{str(err)}\nCould not retrieve data from: {raw_data}"
@@ -639,11 +742,17 @@ class ParseInterface:
         return rdata
 
     @staticmethod
-    def parse(raw_data, **kwargs):
+    def parse(raw_data, name=None, **kwargs):
         """
-        Returns a dictionary with the entity data parsed
+        Returns a dictionary with the entity data parsed, the interface `name` when
+        the output has many
         """
-        rdata = ParseInterface.data_validation(raw_data, **kwargs)
+        rdata = ParseInterface.data_validation(raw_data, entity=name is None, **kwargs)
+        if name is not None:
+            name = interface_converter(name)
+            if name not in rdata:
+                raise NetApiParseError(f"Interface not found: {name}")
+            rdata = {name: rdata[name]}
 
         for _name, data in rdata.items():
             interface_data = ParseInterface.data_constructor(_name, data, **kwargs)
@@ -651,91 +760,21 @@ class ParseInterface:
         return interface_data
 
     @staticmethod
-    def collector_parse(raw_data, **kwargs):
+    def iter_parse(raw_data, **kwargs):
         """
-        Returns list of dictionaries of each entity parsed
+        Yields the key and data of each entity as it is parsed
         """
         rdata = ParseInterface.data_validation(raw_data, entity=False, **kwargs)
 
-        intf_container = []
         for _intf, _intf_data in rdata.items():
-            _parsed_data = ParseInterface.data_constructor(_intf, _intf_data, **kwargs)
-            intf_container.append({_intf: _parsed_data})
-
-        return intf_container
-
-
-class Facts(facts.FactsBase):
-    def __post_init__(self, **_ignore):
-        super().__post_init__(**_ignore)
-        self.metadata.implementation = "NXOS-NXAPI"
-        # NOTE: No self.facts_api since this is a custom net object
-
-    @staticmethod
-    def generate_get_cmd():
-        "Returns commands necessary to build the entity"
-        return ["show hostname", "show version", "show interfaces"]
-
-    def get(self, **_ignore):
-        "Automatic trigger a data collection"
-        if self.connector is None:
-            raise NotImplementedError("Need to have the connector defined")
-
-        # Generate get command
-        if not self.get_cmd:
-            self.get_cmd = self.generate_get_cmd()
-
-        parsed_data = ParseFacts.parse(self.connector.run(self.get_cmd), **_ignore)
-
-        # Update the attributes
-        update_attrs(self, parsed_data)
-
-        # Update obj cache
-        self.metadata.updated_at = pendulum.now()
-        self.metadata.collection_count += 1
-        return True
-
-
-class ParseFacts:
-    @staticmethod
-    def data_constructor(hostname, version, interfaces, **kwargs):
-        # If no data is passed a known error
-        if not hostname and not version and not interfaces:
-            raise NetApiParseError("No data to be parsed")
-
-        raw_interfaces = list(interfaces.get("interfaces", {}).keys())
-
-        parsed_data = dict(
-            hostname=hostname.get("hostname"),
-            os_version=version.get("version"),
-            model=version.get("modelName"),
-            serial_number=version.get("serialNumber"),
-            uptime=pendulum.duration(seconds=version["uptime"]),
-            up_since=pendulum.from_timestamp(version["bootupTimestamp"]),
-            system_mac=version.get("systemMacAddress"),
-            available_memory=kB(version.get("memFree")).Byte,
-            total_memory=kB(version.get("memTotal")).Byte,
-            os_arch=version.get("architecture"),
-            hw_revision=version.get("hardwareRevision"),
-            interfaces=sorted(
-                [interface.interface_converter(x) for x in raw_interfaces],
-                key=interface.sort_interface,
-            ),
-        )
-
-        return parsed_data
+            yield _intf, ParseInterface.data_constructor(_intf, _intf_data, **kwargs)
 
     @staticmethod
-    def parse(raw_data, **kwargs):
-        hostname = raw_data.get("show hostname", {})
-        version = raw_data.get("show version", {})
-        interfaces = raw_data.get("show interfaces", {})
-
-        facts_data = ParseFacts.data_constructor(
-            hostname, version, interfaces, **kwargs
-        )
-
-        return facts_data
+    def collector_parse(raw_data, **kwargs):
+        """
+        Returns list of dictionaries of each entity parsed
+        """
+        return [{k: v} for k, v in ParseInterface.iter_parse(raw_data, **kwargs)]
 
 
 class Routes(route.RoutesBase):
@@ -751,7 +790,7 @@ class Routes(route.RoutesBase):
     def generate_get_cmd(protocol=None, instance=None, vrf_all=False):
         "Returns commands necessary to build a collection of entities"
         if protocol and instance:
-            return [f"show ip route vrf {instance} {protocol}"]
+            return [f"show ip route {protocol} vrf {instance}"]
         elif instance:
             return [f"show ip route vrf {instance}"]
         elif protocol:
@@ -759,8 +798,12 @@ class Routes(route.RoutesBase):
         else:
             return ["show ip route"] if not vrf_all else ["show ip route vrf all"]
 
-    def get(self, **_ignore):
-        "Automatic trigger a data collection. A connector object has to be passed"
+    def get(self, incremental=False, **_ignore):
+        """
+        Automatic trigger a data collection. A connector object has to be passed.
+        With `incremental` the entities are updated in place and the `ChangeSet` is
+        returned, see `refresh()`
+        """
         if self.connector.metadata.implementation != "NXOS-NXAPI":
             raise ValueError(
                 "Connector is not of the correct implementation: NXOS-NXAPI"
@@ -772,45 +815,43 @@ class Routes(route.RoutesBase):
                 self.protocol, instance=self.instance, vrf_all=self.vrf_all
             )
 
-        parsed_data = ParseRoute.collector_parse(
-            self.connector.run(self.get_cmd), **_ignore
-        )
-
-        update_container_attrs(self, parsed_data, Route)
-        self.metadata.updated_at = pendulum.now()
+        raw_data = self.connector.run(self.get_cmd)
+        fingerprint = output_fingerprint(raw_data)
+        if fingerprint == self.fingerprint:
+            # Same outputs of the previous collection, nothing to parse
+            changes = ChangeSet()
+        else:
+            parsed_data = ParseRoute.collector_parse(
+                raw_data, **{"instance": self.instance, **_ignore}
+            )
+            changes = update_container_attrs(self, parsed_data, Route, incremental)
+            self.fingerprint = fingerprint
+        self.metadata.touch()
         self.metadata.collection_count += 1
-        return True
+        return changes if incremental else True
 
 
 class Route(route.RouteBase):
     def __post_init__(self, **_ignore):
         super().__post_init__(**_ignore)
-        self.metadata.implementation = "NXOS-NXAPI"
-        self._route_api_generator()
+        self._implementation_setup()
 
-    def _route_api_generator(self):
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
+        self.metadata.implementation = "NXOS-NXAPI"
         if self.connector is not None:
             if self.connector.metadata.implementation != "NXOS-NXAPI":
                 raise ValueError(
                     "Connector is not of the correct implementation: NXOS-NXAPI"
                 )
-            self.route_api = self.connector.connector.api("staticroute")
-            return True
-        else:
-            return False
 
     @staticmethod
     def generate_get_cmd(dest, instance=None):
-        """
-        Returns commands necessary to build the entity.
-
-        NOTE: This is preferred over the original `get(name)` method of pyeapi because
-        it provides with much more info
-        """
+        "Returns commands necessary to build the entity"
         if instance:
-            return [f"show ip route vrf {instance} {dest} detail"]
+            return [f"show ip route {dest} vrf {instance}"]
         else:
-            return [f"show ip route {dest} detail"]
+            return [f"show ip route {dest}"]
 
     def get(self, **_ignore):
         "Automatic trigger a data collection by running the get_cmd"
@@ -821,46 +862,71 @@ class Route(route.RouteBase):
         if not self.get_cmd:
             self.get_cmd = self.generate_get_cmd(self.dest, self.instance)
 
-        parsed_data = ParseRoute.parse(self.connector.run(self.get_cmd), dest=self.dest)
+        parsed_data = ParseRoute.parse(
+            self.connector.run(self.get_cmd), dest=self.dest, instance=self.instance
+        )
 
         # Update the attributes
         update_attrs(self, parsed_data)
 
         # Update obj cache
-        self.metadata.updated_at = pendulum.now()
+        self.metadata.touch()
         self.metadata.collection_count += 1
         return True
 
 
+# Clients of the routes (i.e. `ospf-1`, `bgp-65000`) -> protocol
+ROUTE_PROTOCOLS = {
+    "direct": "connected",
+    "local": "connected",
+    "hsrp": "connected",
+    "vrrp": "connected",
+    "static": "static",
+    "ospf": "ospf",
+    "ospfv3": "ospfv3",
+    "bgp": "bgp",
+    "eigrp": "eigrp",
+    "isis": "is-is",
+    "rip": "rip",
+}
+# Types of the BGP paths -> protocol
+BGP_PROTOCOLS = {"internal": "ibgp", "external": "ebgp"}
+
+
+def _route_protocol(path):
+    "Returns the protocol of the route from the client of its path"
+    client = path.get("clientname", "").split("-", 1)[0]
+    protocol = ROUTE_PROTOCOLS.get(client)
+    if protocol == "bgp":
+        return BGP_PROTOCOLS.get(path.get("type"), protocol)
+    return protocol
+
+
 class ParseRoute:
     @staticmethod
     def data_constructor(_instance, _route, data, **kwargs):
-        active = (
-            True
-            if data.get("hardwareProgrammed") or data.get("kernelProgrammed")
-            else False
-        )
+        paths = table_rows(data, "TABLE_path", "ROW_path")
+        # The attributes of the route are the ones of its best path (the first one)
+        best = paths[0] if paths else {}
 
-        # Vias
         vias = [
-            dict(interface=x.get("interface"), next_hop=x.get("nexthopAddr"))
-            for x in data.get("vias", [])
+            dict(interface=x.get("ifname"), next_hop=x.get("ipnexthop")) for x in paths
         ]
 
         # Extra attributes
         extra_attributes = dict(
-            route_action=data.get("routeAction"), route_leaked=data.get("routeLeaked")
+            client_name=best.get("clientname"), route_type=best.get("type")
         )
 
         parsed_data = dict(
             dest=kwargs["dest"] if "dest" in kwargs else _route,
             instance=_instance,
             network=_route,
-            active=active,
+            active=any(str(x.get("ubest")).lower() == "true" for x in paths),
             inactive_reason=None,
-            protocol=data.get("routeType"),
-            metric=data.get("metric"),
-            preference=data.get("preference"),
+            protocol=_route_protocol(best),
+            metric=_number(best.get("metric")),
+            preference=_number(best.get("pref")),
             vias=vias,
             extra_attributes=extra_attributes,
         )
@@ -869,9 +935,12 @@ class ParseRoute:
 
     @staticmethod
     def data_validation(raw_data, entity=True, **kwargs):
-        "Returns useful data and performs some initial validations"
+        """
+        Returns useful data and performs some initial validations: the rows of the
+        VRFs, their routes are walked by `iter_routes()`
+        """
         try:
-            rdata = list(raw_data.values())[0].get("vrfs")
+            rdata = table_rows(command_output(raw_data), "TABLE_vrf", "ROW_vrf")
         except Exception as err:
             raise NetApiParseError(
                 f"{str(err)}\nCould not retrieve data from: {raw_data}"
@@ -888,40 +957,50 @@ class ParseRoute:
         return rdata
 
     @staticmethod
-    def parse(raw_data, **kwargs):
+    def iter_routes(rdata, instance=None):
+        "Yields the instance, network and row of the routes of the VRFs rows"
+        for _vrf in rdata:
+            _instance = _vrf.get("vrf-name-out", instance or "default")
+            for _addrf in table_rows(_vrf, "TABLE_addrf", "ROW_addrf"):
+                for _prefix in table_rows(_addrf, "TABLE_prefix", "ROW_prefix"):
+                    yield _instance, _prefix["ipprefix"], _prefix
+
+    @staticmethod
+    def parse(raw_data, instance=None, **kwargs):
         """
         Returns a dictionary with the entity data parsed
         """
         rdata = ParseRoute.data_validation(raw_data, **kwargs)
 
-        for _instance, _vrfdata in rdata.items():
-            _routes_data = _vrfdata.get("routes")
-            if not _routes_data:
-                print("No route information collected")
-                return dict(
-                    dest=kwargs["dest"], active=False, inactive_reason="Route not found"
-                )
-            for _route, _route_data in _routes_data.items():
-                route_data = ParseRoute.data_constructor(
-                    _instance, _route, _route_data, **kwargs
-                )
+        route_data = None
+        for _instance, _route, _route_data in ParseRoute.iter_routes(rdata, instance):
+            route_data = ParseRoute.data_constructor(
+                _instance, _route, _route_data, **kwargs
+            )
+
+        if route_data is None:
+            print("No route information collected")
+            return dict(
+                dest=kwargs["dest"], active=False, inactive_reason="Route not found"
+            )
 
         return route_data
 
     @staticmethod
-    def collector_parse(raw_data, **kwargs):
+    def iter_parse(raw_data, instance=None, **kwargs):
         """
-        Returns list of dictionaries of each entity parsed
+        Yields the key and data of each entity as it is parsed
         """
         rdata = ParseRoute.data_validation(raw_data, entity=False, **kwargs)
 
-        routes_container = []
-        for _instance, _vrfdata in rdata.items():
-            _routes_data = _vrfdata.get("routes", {})
-            for _route, _route_data in _routes_data.items():
-                _parsed_data = ParseRoute.data_constructor(
-                    _instance, _route, _route_data, **kwargs
-                )
-                routes_container.append({(_instance, _route): _parsed_data})
+        for _instance, _route, _route_data in ParseRoute.iter_routes(rdata, instance):
+            yield (_instance, _route), ParseRoute.data_constructor(
+                _instance, _route, _route_data, **kwargs
+            )
 
-        return routes_container
+    @staticmethod
+    def collector_parse(raw_data, **kwargs):
+        """
+        Returns list of dictionaries of each entity parsed
+        """
+        return [{k: v} for k, v in ParseRoute.iter_parse(raw_data, **kwargs)]
@@ -0,0 +1,314 @@
+"""
+Interface counter rates.
+
+`RateEngine` keeps the previous counters sample of each interface (of a device or a
+whole fleet) as rows of a NumPy matrix, and computes the rates per second of all of
+them in a single vectorised step on each new sample. It does not depend on the rates
+reported by the devices, which are smoothed over their `update_interval`.
+
+Between two samples of an interface:
+
+- Counters cleared (a newer `last_clear`) are counted from the clear time
+- Counters lower than the previous sample wrapped: on 32 bits when the previous value
+fits on 32 bits, on 64 bits when it was on the upper half of the 64-bit range.
+Otherwise the counters were reset (i.e. a reload) and are counted from zero
+- The utilisation is computed against `physical.bandwidth`
+
+The counters are kept as unsigned 64-bit integers and their deltas computed with
+modular arithmetic, only the rates are floats. The counters of the entities are floats,
+so they are exact up to 2**53: integer counters can be passed to `update_arrays()`.
+
+Requires NumPy.
+
+**Example:**
+
+```python
+from netapi.net import InterfaceBuilder
+from netapi.net.rates import RateEngine
+
+engine = RateEngine()
+interfaces = InterfaceBuilder().get(connector, entity=False)
+engine.update_interfaces(interfaces)
+...
+interfaces.get()
+rates = engine.update_interfaces(interfaces)
+print(rates[connector.host, "Ethernet1"])
+# {'rx_bps': 9812.2, 'tx_bps': 1208.9, ..., 'rx_utilization': 0.1, ...}
+```
+"""
+import time
+from netapi.net.interface import COUNTER_FIELDS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+__all__ = ["RateEngine", "Rates"]
+
+WRAP_32 = 2**32
+WRAP_64 = 2**64
+COLUMNS = {x: i for i, x in enumerate(COUNTER_FIELDS)}
+RX_PACKETS = [COLUMNS[f"rx_{x}_pkts"] for x in ("unicast", "multicast", "broadcast")]
+TX_PACKETS = [COLUMNS[f"tx_{x}_pkts"] for x in ("unicast", "multicast", "broadcast")]
+
+
+def _timestamp(value):
+    "Epoch seconds of a DateTime (or number), NaN when not present"
+    if value is None:
+        return np.nan
+    if hasattr(value, "timestamp"):
+        return value.timestamp()
+    return float(value)
+
+
+def interface_sample(interface):
+    """
+    Returns the counters (in the `COUNTER_FIELDS` order, as int), last clear time and
+    bandwidth of an interface. Counters of interfaces without them are None
+    """
+    counters = interface.counters
+    if counters is None:
+        values = [None] * len(COUNTER_FIELDS)
+    else:
+        values = [
+            None if x is None else min(int(float(x)), WRAP_64 - 1)
+            for x in (getattr(counters, y) for y in COUNTER_FIELDS)
+        ]
+    physical = interface.physical
+    bandwidth = float(physical.bandwidth or 0) if physical is not None else 0.0
+    return values, _timestamp(interface.last_clear), bandwidth or np.nan
+
+
+class Rates:
+    """
+    Rates computed by `RateEngine.update()`, as arrays with an item per key (in the
+    order of `keys`):
+
+    - `values`: Matrix of the rates per second of each counter of `COUNTER_FIELDS`
+    - `elapsed`: Seconds between the samples (since the clear if they were cleared)
+    - `valid`: False for the keys without previous sample, their rates are NaN
+    - `wrapped`: Keys with a counter wrap (32 or 64-bit)
+    - `cleared`: Keys whose counters were cleared or reset
+
+    The properties `rx_bps`, `tx_bps`, `rx_pps`, `tx_pps`, `rx_error_rate`,
+    `tx_error_rate`, `rx_utilization` and `tx_utilization` (percentage of the
+    bandwidth) are derived from them
+    """
+
+    def __init__(self, keys, values, elapsed, valid, wrapped, cleared, bandwidth):
+        self.keys = keys
+        self.values = values
+        self.elapsed = elapsed
+        self.valid = valid
+        self.wrapped = wrapped
+        self.cleared = cleared
+        self.bandwidth = bandwidth
+        self._positions = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def rate(self, field):
+        "Rates per second of a counter of `COUNTER_FIELDS`"
+        return self.values[:, COLUMNS[field]]
+
+    @property
+    def rx_bps(self):
+        return self.rate("rx_bytes") * 8
+
+    @property
+    def tx_bps(self):
+        return self.rate("tx_bytes") * 8
+
+    @property
+    def rx_pps(self):
+        return self.values[:, RX_PACKETS].sum(axis=1)
+
+    @property
+    def tx_pps(self):
+        return self.values[:, TX_PACKETS].sum(axis=1)
+
+    @property
+    def rx_error_rate(self):
+        return self.rate("rx_errors_general")
+
+    @property
+    def tx_error_rate(self):
+        return self.rate("tx_errors_general")
+
+    @property
+    def rx_utilization(self):
+        return self.rx_bps / self.bandwidth * 100
+
+    @property
+    def tx_utilization(self):
+        return self.tx_bps / self.bandwidth * 100
+
+    def __getitem__(self, key):
+        "Returns a dict with the derived rates and flags of a key"
+        if self._positions is None:
+            self._positions = {x: i for i, x in enumerate(self.keys)}
+        position = self._positions[key]
+        result = {
+            x: float(getattr(self, x)[position])
+            for x in (
+                "rx_bps",
+                "tx_bps",
+                "rx_pps",
+                "tx_pps",
+                "rx_error_rate",
+                "tx_error_rate",
+                "rx_utilization",
+                "tx_utilization",
+            )
+        }
+        result.update(
+            elapsed=float(self.elapsed[position]),
+            valid=bool(self.valid[position]),
+            wrapped=bool(self.wrapped[position]),
+            cleared=bool(self.cleared[position]),
+        )
+        return result
+
+
+class RateEngine:
+    """
+    Keeps the previous counters sample of each key (i.e. `(device, interface)`) and
+    computes the rates of the new samples, see the module documentation
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("RateEngine requires NumPy")
+        self.rows = {}
+        self.counters = np.empty((0, len(COUNTER_FIELDS)), dtype=np.uint64)
+        self.present = np.empty((0, len(COUNTER_FIELDS)), dtype=bool)
+        self.timestamps = np.empty(0)
+        self.last_clear = np.empty(0)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _positions(self, keys):
+        "Rows of the keys, new keys are added without previous sample (not present)"
+        new = [x for x in dict.fromkeys(keys) if x not in self.rows]
+        if new:
+            for key in new:
+                self.rows[key] = len(self.rows)
+            shape = (len(new), len(COUNTER_FIELDS))
+            self.counters = np.vstack([self.counters, np.zeros(shape, dtype=np.uint64)])
+            self.present = np.vstack([self.present, np.zeros(shape, dtype=bool)])
+            self.timestamps = np.concatenate(
+                [self.timestamps, np.full(len(new), np.nan)]
+            )
+            self.last_clear = np.concatenate(
+                [self.last_clear, np.full(len(new), np.nan)]
+            )
+        return np.fromiter((self.rows[x] for x in keys), dtype=np.intp, count=len(keys))
+
+    def update(self, samples, timestamp=None):
+        """
+        Records the samples, `(key, interface)` pairs, and returns their `Rates`
+        against the previous ones. `timestamp` (epoch seconds, now by default) can be
+        a number or a sequence with the time of each sample
+        """
+        samples = list(samples)
+        keys = [x[0] for x in samples]
+        if len(set(keys)) != len(keys):
+            raise ValueError("Duplicated keys on the samples")
+        counters, last_clear, bandwidth = [], [], []
+        for _, interface in samples:
+            values, cleared_at, speed = interface_sample(interface)
+            counters.extend(values)
+            last_clear.append(cleared_at)
+            bandwidth.append(speed)
+        shape = (len(keys), len(COUNTER_FIELDS))
+        present = np.fromiter(
+            (x is not None for x in counters), dtype=bool, count=len(counters)
+        )
+        counters = np.fromiter(
+            (0 if x is None else x for x in counters),
+            dtype=np.uint64,
+            count=len(counters),
+        )
+        return self.update_arrays(
+            keys,
+            counters.reshape(shape),
+            time.time() if timestamp is None else timestamp,
+            np.array(last_clear, dtype=float),
+            np.array(bandwidth, dtype=float),
+            present.reshape(shape),
+        )
+
+    def update_interfaces(self, interfaces, device=None, timestamp=None):
+        """
+        Records the interfaces of a collection, with the `(device, name)` keys. The
+        device is the host of the collection connector by default
+        """
+        if device is None:
+            device = getattr(interfaces.connector, "host", None)
+        return self.update(
+            (((device, name), x) for name, x in interfaces.items()), timestamp
+        )
+
+    def update_arrays(
+        self, keys, counters, timestamp, last_clear, bandwidth, present=None
+    ):
+        """
+        Vectorised step of `update()` with the samples as arrays: `counters` matrix
+        of integers (a row per key, in the `COUNTER_FIELDS` order), and the
+        timestamps, last clear times and bandwidth (bps) of each key. `present` is
+        the mask of the counters sampled (all by default). Float matrices, with NaN
+        for the counters not sampled, are accepted too
+        """
+        counters = np.asarray(counters)
+        if counters.dtype.kind == "f":
+            if present is None:
+                present = ~np.isnan(counters)
+            # Floats of the counters close to 2**64 are rounded up to it
+            saturated = present & (counters >= WRAP_64)
+            counters = np.where(present & ~saturated, counters, 0).astype(np.uint64)
+            counters[saturated] = WRAP_64 - 1
+        else:
+            counters = counters.astype(np.uint64)
+        if present is None:
+            present = np.ones(counters.shape, dtype=bool)
+
+        rows = self._positions(keys)
+        timestamps = np.broadcast_to(np.asarray(timestamp, dtype=float), len(keys))
+        previous = self.counters[rows]
+        sampled = present & self.present[rows]
+        elapsed = timestamps - self.timestamps[rows]
+
+        # Modular (64-bit) differences, exact for the 64-bit wraps
+        delta = counters - previous
+        # Cleared after the previous sample, counted from the clear time
+        cleared = last_clear > self.last_clear[rows]
+        since_clear = timestamps - last_clear
+        elapsed = np.where(
+            cleared & (since_clear > 0) & (since_clear < elapsed), since_clear, elapsed
+        )
+        # Counters going back: wraps of 32/64-bit counters or resets
+        back = sampled & (counters < previous) & ~cleared[:, None]
+        wraps_32 = back & (previous < WRAP_32)
+        wraps_64 = back & (previous >= WRAP_64 // 2)
+        wraps = wraps_32 | wraps_64
+        delta = np.where(wraps_32, delta & np.uint64(WRAP_32 - 1), delta)
+        reset = (back & ~wraps).any(axis=1)
+        cleared = cleared | reset
+        delta = np.where(cleared[:, None], counters, delta).astype(float)
+        delta[~np.where(cleared[:, None], present, sampled)] = np.nan
+
+        valid = ~np.isnan(elapsed) & (elapsed > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = delta / np.where(valid, elapsed, np.nan)[:, None]
+
+        self.counters[rows] = counters
+        self.present[rows] = present
+        self.timestamps[rows] = timestamps
+        self.last_clear[rows] = last_clear
+        return Rates(
+            keys, values, elapsed, valid, wraps.any(axis=1), cleared, bandwidth
+        )
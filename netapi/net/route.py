@@ -11,7 +11,16 @@ from pydantic.dataclasses import dataclass
 from netapi.net.interface import interface_converter
 from netapi.units import unit_validator
 from netapi.probe.utils import is_it_valid_ip
-from netapi.metadata import Metadata, DataConfig, EntityCollections, custom_asdict
+from netapi.net.route_index import RouteIndex
+from netapi.metadata import (
+    Metadata,
+    DataConfig,
+    EntityCollections,
+    custom_asdict,
+    trusted_construct,
+    apply_changes,
+    fingerprinted,
+)
 
 
 __all__ = ["RouteBase"]
@@ -74,6 +83,7 @@ class Via:
         return unit_validator("netaddr.ip.IPAddress", "IPAddress", value)
 
 
+@fingerprinted
 @dataclass(unsafe_hash=True, config=DataConfig)  # type: ignore
 class RouteBase:
     """
@@ -153,17 +163,74 @@ class RouteBase:
                     f"It is not a valid connector object: {self.connector}"
                 )
 
+    @classmethod
+    def from_parsed(cls, **data):
+        """
+        Fast creation of the object from data already verified, like the one returned
+        by the parsers or by `to_dict()`. See `netapi.metadata.trusted_construct`
+        """
+        return trusted_construct(cls, data)
+
+    def apply(self, data):
+        """
+        Updates the object with the data passed (i.e. from the parsers) validating all
+        the changes at once. Returns the `(old, new)` values of the changed attributes.
+        See `netapi.metadata.apply_changes`
+        """
+        return apply_changes(self, data)
+
     def to_dict(self):
         # NOTE: Workaround to TypeError: can't pickle SSLContext objects
         return custom_asdict(self, "route_api")
 
 
 class RoutesBase(EntityCollections):
+    """
+    Routes collection. Besides the secondary indexes, it keeps a longest prefix match
+    index (`netapi.net.route_index.RouteIndex`) built on the first lookup and updated
+    when routes are added or removed, so `lookup()`, `covering()` and `covered_by()`
+    are answered without running commands on the device.
+    """
+
     ENTITY = "route"
+    INDEXES = ("instance", "protocol")
+    EVENT_ADDED = "route_added"
+    EVENT_REMOVED = "route_withdrawn"
 
     def __init__(self, *args, **kwargs):
         super().__init__(entity=self.ENTITY, *args, **kwargs)
         self.metadata = Metadata(name="routes", type="collection")
+        self._route_index = None
 
     def __setitem__(self, *args, **kwargs):
         super().__setitem__(*args, entity=self.ENTITY, **kwargs)
+        if self._route_index is not None:
+            self._route_index.add(*args)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        if self._route_index is not None:
+            self._route_index.remove(key)
+
+    def reindex(self):
+        super().reindex()
+        self._route_index = None
+
+    @property
+    def route_index(self):
+        if self._route_index is None:
+            self._route_index = RouteIndex.from_routes(self)
+        return self._route_index
+
+    def lookup(self, address, instance="default"):
+        "Returns the route with the longest prefix containing the address (or None)"
+        key = self.route_index.lookup(address, instance)
+        return None if key is None else self[key]
+
+    def covering(self, prefix, instance="default"):
+        "Returns the routes containing the prefix, from the less specific"
+        return [self[x] for x in self.route_index.covering(prefix, instance)]
+
+    def covered_by(self, prefix, instance="default"):
+        "Returns the routes contained on the prefix, the prefix itself included"
+        return [self[x] for x in self.route_index.covered_by(prefix, instance)]
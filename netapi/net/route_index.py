@@ -0,0 +1,264 @@
+"""
+Longest prefix match index of routes.
+
+`RouteIndex` keeps a path-compressed binary (Patricia) trie per instance and IP
+version, with the keys of the routes of a collection. It answers locally, from a
+snapshot of the routing table, the questions that otherwise need a command on the
+device per destination:
+
+- `lookup(address)`: Best (longest prefix) match of an address
+- `covering(prefix)`: Routes containing the prefix (less specific or equal)
+- `covered_by(prefix)`: Routes contained on the prefix (more specific or equal)
+
+It is normally used through the `Routes` collections, which build it on first use and
+keep it updated when routes are added or removed:
+
+```python
+routes = RouteBuilder().get(connector, entity=False, vrf_all=True)
+print(routes.lookup("10.1.1.1", instance="default"))
+# Route(dest='10.1.1.0/24', instance='default', ...)
+```
+"""
+from socket import inet_pton, AF_INET
+from ipaddress import ip_address, ip_network
+
+
+__all__ = ["RouteIndex"]
+
+_EMPTY = object()
+
+
+class PrefixNode:
+    "Node of the trie. `network` is the integer of the prefix (`prefixlen` bits)"
+
+    __slots__ = ("network", "prefixlen", "value", "children")
+
+    def __init__(self, network, prefixlen, value=_EMPTY):
+        self.network = network
+        self.prefixlen = prefixlen
+        self.value = value
+        self.children = [None, None]
+
+
+class PrefixTrie:
+    """
+    Path-compressed binary trie of the prefixes of an address family. Each prefix
+    stores a value.
+
+    The longest prefix matches are resolved with a hash table of the prefixes per
+    prefix length (probing the lengths present, from the longest), which takes a few
+    dict lookups instead of a walk of the trie nodes in Python
+    """
+
+    def __init__(self, bits):
+        self.bits = bits
+        self.root = PrefixNode(0, 0)
+        self.size = 0
+        self.lengths = {}
+        self._probes = ()
+
+    def _set_length(self, network, prefixlen, value):
+        "Updates the table of prefix length, `_EMPTY` removes the prefix"
+        table = self.lengths.setdefault(prefixlen, {})
+        shift = self.bits - prefixlen
+        if value is _EMPTY:
+            table.pop(network >> shift, None)
+            if not table:
+                del self.lengths[prefixlen]
+        else:
+            table[network >> shift] = value
+        self._probes = tuple(
+            (self.bits - x, self.lengths[x]) for x in sorted(self.lengths, reverse=True)
+        )
+
+    def __len__(self):
+        return self.size
+
+    def _branch(self, network, prefixlen):
+        "Child position (next bit after `prefixlen`) of the network"
+        return (network >> (self.bits - 1 - prefixlen)) & 1
+
+    def insert(self, network, prefixlen, value):
+        if prefixlen not in self.lengths:
+            self._set_length(network, prefixlen, value)
+        else:
+            self.lengths[prefixlen][network >> (self.bits - prefixlen)] = value
+        bits = self.bits
+        node = self.root
+        while True:
+            if node.prefixlen == prefixlen:
+                if node.value is _EMPTY:
+                    self.size += 1
+                node.value = value
+                return
+            branch = self._branch(network, node.prefixlen)
+            child = node.children[branch]
+            if child is None:
+                node.children[branch] = PrefixNode(network, prefixlen, value)
+                self.size += 1
+                return
+
+            # Bits in common with the child
+            common = min(
+                prefixlen,
+                child.prefixlen,
+                bits - (network ^ child.network).bit_length(),
+            )
+            if common == child.prefixlen:
+                node = child
+                continue
+
+            if common == prefixlen:
+                new = PrefixNode(network, prefixlen, value)
+            else:
+                mask = ((1 << common) - 1) << (bits - common)
+                new = PrefixNode(network & mask, common)
+                new.children[self._branch(network, common)] = PrefixNode(
+                    network, prefixlen, value
+                )
+            new.children[self._branch(child.network, common)] = child
+            node.children[branch] = new
+            self.size += 1
+            return
+
+    def _matches(self, node, network, prefixlen):
+        "True if the node contains the network (and it is not more specific)"
+        return (
+            node.prefixlen <= prefixlen
+            and (network ^ node.network) >> (self.bits - node.prefixlen) == 0
+        )
+
+    def remove(self, network, prefixlen):
+        "Removes the value of the prefix. Returns False if it was not present"
+        node = self.root
+        while node is not None and self._matches(node, network, prefixlen):
+            if node.prefixlen == prefixlen:
+                if node.value is _EMPTY:
+                    return False
+                node.value = _EMPTY
+                self.size -= 1
+                self._set_length(network, prefixlen, _EMPTY)
+                return True
+            node = node.children[self._branch(network, node.prefixlen)]
+        return False
+
+    def longest_match(self, address):
+        "Value of the longest prefix containing the address, None if there is no match"
+        for shift, table in self._probes:
+            value = table.get(address >> shift)
+            if value is not None:
+                return value
+        return None
+
+    def covering(self, network, prefixlen):
+        "Values of the prefixes containing the prefix, from the less specific"
+        values = []
+        node = self.root
+        while node is not None and self._matches(node, network, prefixlen):
+            if node.value is not _EMPTY:
+                values.append(node.value)
+            if node.prefixlen == prefixlen:
+                break
+            node = node.children[self._branch(network, node.prefixlen)]
+        return values
+
+    def covered_by(self, network, prefixlen):
+        "Values of the prefixes contained on the prefix (itself included)"
+        bits = self.bits
+        node = self.root
+        while node is not None and node.prefixlen < prefixlen:
+            if not self._matches(node, network, prefixlen):
+                return []
+            node = node.children[self._branch(network, node.prefixlen)]
+        if node is None or (network ^ node.network) >> (bits - prefixlen):
+            return []
+
+        values = []
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            if node.value is not _EMPTY:
+                values.append(node.value)
+            pending.extend(x for x in reversed(node.children) if x is not None)
+        return values
+
+
+def parse_address(address):
+    "Returns the IP version and integer of the address"
+    try:
+        return 4, int.from_bytes(inet_pton(AF_INET, address), "big")
+    except (OSError, TypeError):
+        address = ip_address(str(address))
+        return address.version, int(address)
+
+
+def parse_prefix(prefix):
+    "Returns the IP version, network integer and prefix length of the prefix string"
+    network = ip_network(str(prefix), strict=False)
+    return network.version, int(network.network_address), network.prefixlen
+
+
+class RouteIndex:
+    """
+    Longest prefix match index of route keys (`(instance, dest)`), with a `PrefixTrie`
+    per instance and IP version
+    """
+
+    def __init__(self):
+        self.tries = {}
+        self.prefixes = {}
+
+    @classmethod
+    def from_routes(cls, routes):
+        "Builds the index of a `Routes` collection (or `{key: route}` mapping)"
+        index = cls()
+        for key, route in routes.items():
+            index.add(key, route)
+        return index
+
+    def __len__(self):
+        return len(self.prefixes)
+
+    def _trie(self, instance, version, create=False):
+        trie = self.tries.get((instance, version))
+        if trie is None and create:
+            trie = self.tries[instance, version] = PrefixTrie(
+                32 if version == 4 else 128
+            )
+        return trie
+
+    def add(self, key, route):
+        "Adds (or replaces) the route key, using the `network` or `dest` of the route"
+        if key in self.prefixes:
+            self.remove(key)
+        prefix = parse_prefix(getattr(route, "network", None) or route.dest)
+        self.prefixes[key] = (route.instance, *prefix)
+        self._trie(route.instance, prefix[0], create=True).insert(
+            prefix[1], prefix[2], key
+        )
+
+    def remove(self, key):
+        if key not in self.prefixes:
+            return
+        instance, version, network, prefixlen = self.prefixes.pop(key)
+        self._trie(instance, version).remove(network, prefixlen)
+
+    def lookup(self, address, instance="default"):
+        "Returns the key of the best route to the address, None if there is no route"
+        version, address = parse_address(address)
+        trie = self.tries.get((instance, version))
+        if trie is None:
+            return None
+        return trie.longest_match(address)
+
+    def covering(self, prefix, instance="default"):
+        "Keys of the routes containing the prefix, from the less specific"
+        version, network, prefixlen = parse_prefix(prefix)
+        trie = self._trie(instance, version)
+        return trie.covering(network, prefixlen) if trie else []
+
+    def covered_by(self, prefix, instance="default"):
+        "Keys of the routes contained on the prefix, the prefix itself included"
+        version, network, prefixlen = parse_prefix(prefix)
+        trie = self._trie(instance, version)
+        return trie.covered_by(network, prefixlen) if trie else []
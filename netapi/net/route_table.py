@@ -0,0 +1,525 @@
+"""
+Columnar route tables.
+
+`RouteTable` holds a routing table as typed arrays, one per attribute, instead of a
+`Route` object per prefix. It is meant for analytics over large tables: filters,
+aggregates and comparisons are computed over whole columns (vectorised with NumPy when
+it is installed, with the standard library `array` otherwise).
+
+Columns (one value per route):
+
+- `instance`, `protocol`: codes of the `instances` and `protocols` lists of the table
+- `network`: network address as integer
+- `prefixlen`: prefix length
+- `metric`, `preference`: `NULL` (-1) when not present
+- `active`: 1, 0 or `NULL`
+- `via_offset`: position of the first next hop of the route on the next hop columns.
+It has an additional last item, so the next hops of the route `i` are the items from
+`via_offset[i]` to `via_offset[i + 1]`
+
+Columns (one value per next hop):
+
+- `via_next_hop`: next hop address as integer, 0 when not present
+- `via_interface`: codes of the `interfaces` list of the table, `NULL` when not present
+
+Only IPv4 routes are supported: the routes of other families (IPv6) are skipped when
+the table is built, and the next hops that are not IPv4 addresses (i.e. IPv6 next hops
+of IPv4 routes) are kept as not present.
+
+**Example:**
+
+```python
+from netapi.net import RouteBuilder
+
+table = RouteBuilder().get_table(connector, vrf_all=True)
+print(table.count_by("protocol"))
+# {'bgp': 801230, 'connected': 12, 'static': 4, 'ospf': 310}
+
+print(table.where(next_hop="10.1.1.1", instance="default").keys())
+# [('default', '10.10.0.0/16'), ('default', '10.20.0.0/16')]
+```
+"""
+import socket
+import struct
+from array import array
+from collections import Counter
+from netapi.net.route import protocol_verification
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+__all__ = ["RouteTable"]
+
+NULL = -1
+
+# Array typecodes of the columns, also used as NumPy dtypes
+ROUTE_COLUMNS = {
+    "instance": "i",
+    "network": "I",
+    "prefixlen": "B",
+    "protocol": "h",
+    "metric": "q",
+    "preference": "q",
+    "active": "b",
+}
+VIA_COLUMNS = {"via_next_hop": "I", "via_interface": "i"}
+CATEGORIES = {"instance": "instances", "protocol": "protocols"}
+# Columns with small ranges of values, counted with `bincount`
+SMALL_COLUMNS = {"instance", "protocol", "prefixlen", "active"}
+
+
+def ip_to_int(address):
+    "IPv4 address string to integer"
+    try:
+        return struct.unpack("!I", socket.inet_aton(address))[0]
+    except (OSError, TypeError):
+        raise ValueError(f"Not a valid IPv4 address: {address}")
+
+
+def is_ipv4(network):
+    "True if the network or address string is not of another family (IPv6)"
+    return ":" not in str(network)
+
+
+def int_to_ip(value):
+    "Integer to IPv4 address string"
+    return socket.inet_ntoa(struct.pack("!I", value))
+
+
+def split_network(network):
+    "Returns the network address integer and prefix length of an IPv4 network string"
+    address, _, prefixlen = str(network).partition("/")
+    return ip_to_int(address), int(prefixlen) if prefixlen else 32
+
+
+def _code(categories, index, value):
+    "Returns the code of the value on the categories list, adding it if needed"
+    if value is None:
+        return NULL
+    if value not in index:
+        index[value] = len(categories)
+        categories.append(value)
+    return index[value]
+
+
+def _optional(value):
+    return NULL if value is None else value
+
+
+class RouteTable:
+    """
+    Columnar representation of a routing table. Created from the parsers output with
+    `from_parsed()` or from a collection of routes with `from_routes()`.
+
+    Attributes:
+
+    - `columns`: (Dict) Arrays of the table, see the module documentation
+    - `instances`: (List) Names of the instance codes
+    - `protocols`: (List) Names of the protocol codes
+    - `interfaces`: (List) Names of the next hop interface codes
+    """
+
+    def __init__(self, columns, instances, protocols, interfaces):
+        self.columns = columns
+        self.instances = instances
+        self.protocols = protocols
+        self.interfaces = interfaces
+
+    @property
+    def vectorised(self):
+        "True if the columns are NumPy arrays"
+        return not isinstance(self.columns["network"], array)
+
+    @classmethod
+    def from_parsed(cls, parsed_data):
+        """
+        Builds the table from the routes data returned by the parsers. It accepts the
+        output of `collector_parse()` (a list of `{key: route_data}` dicts) or an
+        iterable of route data dicts. The routes that are not IPv4 are skipped
+        """
+        columns = {k: array(v) for k, v in {**ROUTE_COLUMNS, **VIA_COLUMNS}.items()}
+        columns["via_offset"] = array("q", [0])
+        instances, protocols, interfaces = [], [], []
+        indexes = ({}, {}, {})
+
+        for data in parsed_data:
+            if "network" not in data and "dest" not in data:
+                routes = data.values()
+            else:
+                routes = (data,)
+            for route in routes:
+                network = route.get("network") or route["dest"]
+                if not is_ipv4(network):
+                    continue
+                network, prefixlen = split_network(network)
+                protocol = route.get("protocol")
+                if protocol is not None:
+                    protocol = protocol_verification(str(protocol))
+                active = route.get("active")
+                columns["instance"].append(
+                    _code(instances, indexes[0], route.get("instance"))
+                )
+                columns["network"].append(network)
+                columns["prefixlen"].append(prefixlen)
+                columns["protocol"].append(_code(protocols, indexes[1], protocol))
+                columns["metric"].append(_optional(route.get("metric")))
+                columns["preference"].append(_optional(route.get("preference")))
+                columns["active"].append(NULL if active is None else int(active))
+                for via in route.get("vias") or ():
+                    if not isinstance(via, dict):
+                        via = dict(interface=via.interface, next_hop=via.next_hop)
+                    next_hop = via.get("next_hop")
+                    if next_hop is None or not is_ipv4(next_hop):
+                        next_hop = 0
+                    else:
+                        next_hop = ip_to_int(str(next_hop))
+                    columns["via_next_hop"].append(next_hop)
+                    columns["via_interface"].append(
+                        _code(interfaces, indexes[2], via.get("interface"))
+                    )
+                columns["via_offset"].append(len(columns["via_next_hop"]))
+
+        if np is not None:
+            columns = {
+                k: np.frombuffer(v, dtype=v.typecode) for k, v in columns.items()
+            }
+        return cls(columns, instances, protocols, interfaces)
+
+    @classmethod
+    def from_routes(cls, routes):
+        """
+        Builds the table from `Route` objects (full or compact), or from a `Routes`
+        collection
+        """
+        if hasattr(routes, "values"):
+            routes = routes.values()
+        return cls.from_parsed(
+            dict(
+                network=x.network,
+                dest=x.dest,
+                instance=x.instance,
+                protocol=x.protocol,
+                metric=x.metric,
+                preference=x.preference,
+                active=x.active,
+                vias=x.vias,
+            )
+            for x in routes
+        )
+
+    def __len__(self):
+        return len(self.columns["network"])
+
+    def __iter__(self):
+        return (self[x] for x in range(len(self)))
+
+    def __getitem__(self, position):
+        "Returns the route data (as returned by the parsers) of the position passed"
+        columns = self.columns
+        vias = range(
+            columns["via_offset"][position], columns["via_offset"][position + 1]
+        )
+        return dict(
+            dest=self._network(position),
+            instance=self._category("instances", columns["instance"][position]),
+            network=self._network(position),
+            protocol=self._category("protocols", columns["protocol"][position]),
+            metric=self._value(columns["metric"][position]),
+            preference=self._value(columns["preference"][position]),
+            active=self._value(columns["active"][position], bool),
+            vias=[
+                dict(
+                    interface=self._category("interfaces", columns["via_interface"][x]),
+                    next_hop=int_to_ip(columns["via_next_hop"][x])
+                    if columns["via_next_hop"][x]
+                    else None,
+                )
+                for x in vias
+            ],
+        )
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(routes={len(self)}, "
+            f"instances={self.instances!r}, protocols={self.protocols!r})"
+        )
+
+    def _category(self, categories, code):
+        return None if code == NULL else getattr(self, categories)[code]
+
+    @staticmethod
+    def _value(value, _type=int):
+        return None if value == NULL else _type(value)
+
+    def _network(self, position):
+        network = int_to_ip(self.columns["network"][position])
+        return f"{network}/{self.columns['prefixlen'][position]}"
+
+    def keys(self):
+        "Returns the `(instance, network)` keys of the routes, as on `Routes`"
+        return [
+            (self._category("instances", instance), self._network(position))
+            for position, instance in enumerate(self.columns["instance"])
+        ]
+
+    # Vectorised operations
+    def _via_routes(self):
+        "Position of the route of each next hop"
+        offsets = self.columns["via_offset"]
+        if self.vectorised:
+            return np.repeat(np.arange(len(self)), np.diff(offsets))
+        return [
+            position
+            for position in range(len(self))
+            for _ in range(offsets[position + 1] - offsets[position])
+        ]
+
+    def _equals(self, column, value):
+        if self.vectorised:
+            return self.columns[column] == value
+        return [x == value for x in self.columns[column]]
+
+    def _and(self, mask, other):
+        if self.vectorised:
+            return mask & other
+        return [x and y for x, y in zip(mask, other)]
+
+    def _via_mask(self, column, value):
+        "Routes with at least one next hop matching the value"
+        via_mask = self._equals(column, value)
+        if self.vectorised:
+            mask = np.zeros(len(self), dtype=bool)
+            mask[self._via_routes()[via_mask]] = True
+            return mask
+        mask = [False] * len(self)
+        for position, matched in zip(self._via_routes(), via_mask):
+            if matched:
+                mask[position] = True
+        return mask
+
+    def _within_mask(self, network):
+        address, prefixlen = split_network(network)
+        netmask = (0xFFFFFFFF << (32 - prefixlen)) & 0xFFFFFFFF
+        if self.vectorised:
+            return ((self.columns["network"] & netmask) == address) & (
+                self.columns["prefixlen"] >= prefixlen
+            )
+        return [
+            (x & netmask) == address and y >= prefixlen
+            for x, y in zip(self.columns["network"], self.columns["prefixlen"])
+        ]
+
+    def _nothing(self):
+        if self.vectorised:
+            return np.zeros(len(self), dtype=bool)
+        return [False] * len(self)
+
+    def mask(self, **conditions):
+        """
+        Returns the mask (boolean array or list) of the routes matching all the
+        conditions. Conditions on:
+
+        - `instance`, `protocol`, `prefixlen`, `metric`, `preference`, `active`: Equal
+        values
+        - `next_hop`, `interface`: At least one of the next hops of the route
+        - `within`: Routes contained on the network passed (i.e. `10.0.0.0/8`)
+        """
+        if self.vectorised:
+            mask = np.ones(len(self), dtype=bool)
+        else:
+            mask = [True] * len(self)
+
+        for attr, value in conditions.items():
+            if attr in CATEGORIES or attr == "interface":
+                if attr == "protocol" and value is not None:
+                    value = protocol_verification(value)
+                categories = getattr(self, CATEGORIES.get(attr, "interfaces"))
+                if value is None:
+                    code = NULL
+                elif value in categories:
+                    code = categories.index(value)
+                else:
+                    # Not present on the table
+                    return self._nothing()
+                if attr == "interface":
+                    current = self._via_mask("via_interface", code)
+                else:
+                    current = self._equals(attr, code)
+            elif attr in ("prefixlen", "metric", "preference", "active"):
+                current = self._equals(attr, NULL if value is None else int(value))
+            elif attr == "next_hop":
+                current = self._via_mask("via_next_hop", ip_to_int(str(value)))
+            elif attr == "within":
+                current = self._within_mask(value)
+            else:
+                raise ValueError(f"Not a valid condition: {attr}")
+            mask = self._and(mask, current)
+
+        return mask
+
+    def select(self, mask):
+        "New table with the routes of the mask"
+        columns = self.columns
+        if self.vectorised:
+            mask = np.asarray(mask, dtype=bool)
+            via_mask = mask[self._via_routes()]
+            selected = {k: columns[k][mask] for k in ROUTE_COLUMNS}
+            selected.update({k: columns[k][via_mask] for k in VIA_COLUMNS})
+            counts = np.diff(columns["via_offset"])[mask]
+            selected["via_offset"] = np.concatenate(([0], np.cumsum(counts)))
+            return self.__class__(
+                selected, self.instances, self.protocols, self.interfaces
+            )
+
+        via_mask = [mask[x] for x in self._via_routes()]
+        selected = {
+            k: array(v, (x for x, y in zip(columns[k], mask) if y))
+            for k, v in ROUTE_COLUMNS.items()
+        }
+        selected.update(
+            {
+                k: array(v, (x for x, y in zip(columns[k], via_mask) if y))
+                for k, v in VIA_COLUMNS.items()
+            }
+        )
+        offsets = columns["via_offset"]
+        selected["via_offset"] = array("q", [0])
+        for position, matched in enumerate(mask):
+            if matched:
+                selected["via_offset"].append(
+                    selected["via_offset"][-1]
+                    + offsets[position + 1]
+                    - offsets[position]
+                )
+        return self.__class__(selected, self.instances, self.protocols, self.interfaces)
+
+    def where(self, **conditions):
+        "New table with the routes matching all the conditions. See `mask()`"
+        return self.select(self.mask(**conditions))
+
+    def count_by(self, column):
+        "Returns the number of routes per value of the route column passed"
+        if column not in ROUTE_COLUMNS:
+            raise ValueError(f"Not a valid column: {column}")
+        if self.vectorised and column in SMALL_COLUMNS:
+            # Small ranges of codes (`NULL` included)
+            counts = np.bincount(self.columns[column].astype("q") + 1)
+            counter = [(x - 1, y) for x, y in enumerate(counts.tolist()) if y]
+        elif self.vectorised:
+            values, counts = np.unique(self.columns[column], return_counts=True)
+            counter = zip(values.tolist(), counts.tolist())
+        else:
+            counter = Counter(self.columns[column]).items()
+        if column in CATEGORIES:
+            return {self._category(CATEGORIES[column], k): v for k, v in counter}
+        if column == "active":
+            return {self._value(k, bool): v for k, v in counter}
+        if column == "network":
+            return {int_to_ip(k): v for k, v in counter}
+        return {self._value(k): v for k, v in counter}
+
+    # Comparison
+    def _recode(self, categories, union):
+        """
+        Codes of the categories on the `union` list, indexed by the table codes. The
+        last item is the code of `NULL`
+        """
+        return [union.index(x) for x in getattr(self, categories)] + [union.index(None)]
+
+    def _route_keys(self, union):
+        "Integer key of each route: Instance (code on `union`), network and prefix len"
+        columns = self.columns
+        recode = self._recode("instances", union)
+        if self.vectorised:
+            return (
+                (np.array(recode, dtype="Q")[columns["instance"]] << 40)
+                | (columns["network"].astype("Q") << 8)
+                | columns["prefixlen"]
+            )
+        return [
+            (recode[x] << 40) | (y << 8) | z
+            for x, y, z in zip(
+                columns["instance"], columns["network"], columns["prefixlen"]
+            )
+        ]
+
+    def _route_values(self, keys, union):
+        "Compared values of the routes (protocol, metric, preference and active)"
+        recode = self._recode("protocols", union)
+        columns = self.columns
+        if self.vectorised:
+            protocol = np.array(recode)[columns["protocol"]]
+            return dict(
+                zip(
+                    keys.tolist(),
+                    zip(
+                        protocol.tolist(),
+                        columns["metric"].tolist(),
+                        columns["preference"].tolist(),
+                        columns["active"].tolist(),
+                    ),
+                )
+            )
+        return dict(
+            zip(
+                keys,
+                zip(
+                    (recode[x] for x in columns["protocol"]),
+                    columns["metric"],
+                    columns["preference"],
+                    columns["active"],
+                ),
+            )
+        )
+
+    def _via_records(self, keys, union):
+        "Set of `(route key, next hop, interface code on union)` of the next hops"
+        recode = self._recode("interfaces", union)
+        via_routes = self._via_routes()
+        if self.vectorised:
+            via_routes = keys[via_routes].tolist()
+            interfaces = np.array(recode)[self.columns["via_interface"]].tolist()
+            next_hops = self.columns["via_next_hop"].tolist()
+        else:
+            via_routes = [keys[x] for x in via_routes]
+            interfaces = [recode[x] for x in self.columns["via_interface"]]
+            next_hops = self.columns["via_next_hop"]
+        return set(zip(via_routes, next_hops, interfaces))
+
+    def compare(self, other):
+        """
+        Compares the routes of the table with another. Returns a dict with the keys
+        (`(instance, network)`) of the routes `added` and `removed` on the other table,
+        and the routes present on both with a `changed` protocol, metric, preference,
+        active flag or next hops
+        """
+        instances = list(dict.fromkeys(self.instances + other.instances + [None]))
+        protocols = list(dict.fromkeys(self.protocols + other.protocols + [None]))
+        interfaces = list(dict.fromkeys(self.interfaces + other.interfaces + [None]))
+        keys, other_keys = self._route_keys(instances), other._route_keys(instances)
+        values = self._route_values(keys, protocols)
+        other_values = other._route_values(other_keys, protocols)
+
+        changed = {
+            x
+            for x in values.keys() & other_values.keys()
+            if values[x] != other_values[x]
+        }
+        for route_key, *_ in self._via_records(keys, interfaces) ^ other._via_records(
+            other_keys, interfaces
+        ):
+            if route_key in values and route_key in other_values:
+                changed.add(route_key)
+
+        def decode(key):
+            network = int_to_ip((key >> 8) & 0xFFFFFFFF)
+            return (instances[key >> 40], f"{network}/{key & 0xFF}")
+
+        return dict(
+            added=[decode(x) for x in other_values if x not in values],
+            removed=[decode(x) for x in values if x not in other_values],
+            changed=[decode(x) for x in sorted(changed)],
+        )
@@ -0,0 +1,427 @@
+"""
+SNMP GETBULK module.
+
+Contains the method to create the interfaces Network Objects for the SNMP-GETBULK
+implementation, from the IF-MIB tables (RFC 2863): `ifTable` and `ifXTable` (64-bit
+`ifHC*` counters).
+
+Only the fields available on the IF-MIB are collected: `description` (`ifAlias`),
+`status` (`ifAdminStatus` and `ifOperStatus`), `physical` (`ifMtu`, `ifPhysAddress`
+and `ifHighSpeed`) and `counters`. The interfaces are keyed by `ifName` (or `ifDescr`
+when it is empty).
+
+SNMP walks whole columns, the `interface_range` of the collections is not used to
+filter the interfaces. The entities keep the `ifIndex` of their row (`if_index`), so
+`Interface.get()` and `fetch_fields()` read only that row with a GET request (the
+columns are walked when it is not known yet, or it is now of another interface, i.e.
+after a reload). `collect_many()` and `refresh_many()` poll the collections of
+many devices concurrently, see `netapi.connector.snmp.getbulker.run_many`.
+
+**Example:**
+
+```python
+from netapi.connector.snmp.getbulker import Device
+from netapi.net.snmp.getbulker import collect_many, refresh_many
+
+devices = [Device(host=x, community="public") for x in hosts]
+fleet = collect_many(devices, fields={"status", "counters"})
+...
+changes = refresh_many(fleet)
+```
+"""
+from dataclasses import field
+from typing import Optional
+from pydantic.dataclasses import dataclass
+from netapi.net import interface
+from netapi.net.eos.pyeapier import update_attrs, update_container_attrs
+from netapi.connector.snmp.getbulker import run_many
+from netapi.metadata import ChangeSet, DataConfig, fingerprinted, output_fingerprint
+from netapi.exceptions import NetApiParseError
+
+
+IF_ENTRY = "1.3.6.1.2.1.2.2.1"
+IF_X_ENTRY = "1.3.6.1.2.1.31.1.1.1"
+
+# IF-MIB columns used
+IF_MIB = {
+    "ifDescr": f"{IF_ENTRY}.2",
+    "ifMtu": f"{IF_ENTRY}.4",
+    "ifPhysAddress": f"{IF_ENTRY}.6",
+    "ifAdminStatus": f"{IF_ENTRY}.7",
+    "ifOperStatus": f"{IF_ENTRY}.8",
+    "ifInDiscards": f"{IF_ENTRY}.13",
+    "ifInErrors": f"{IF_ENTRY}.14",
+    "ifOutDiscards": f"{IF_ENTRY}.19",
+    "ifOutErrors": f"{IF_ENTRY}.20",
+    "ifName": f"{IF_X_ENTRY}.1",
+    "ifHCInOctets": f"{IF_X_ENTRY}.6",
+    "ifHCInUcastPkts": f"{IF_X_ENTRY}.7",
+    "ifHCInMulticastPkts": f"{IF_X_ENTRY}.8",
+    "ifHCInBroadcastPkts": f"{IF_X_ENTRY}.9",
+    "ifHCOutOctets": f"{IF_X_ENTRY}.10",
+    "ifHCOutUcastPkts": f"{IF_X_ENTRY}.11",
+    "ifHCOutMulticastPkts": f"{IF_X_ENTRY}.12",
+    "ifHCOutBroadcastPkts": f"{IF_X_ENTRY}.13",
+    "ifHighSpeed": f"{IF_X_ENTRY}.15",
+    "ifAlias": f"{IF_X_ENTRY}.18",
+}
+IF_MIB_NAMES = {y: x for x, y in IF_MIB.items()}
+
+# IF-MIB counters -> `InterfaceCounters`
+COUNTER_OBJECTS = {
+    "ifHCInOctets": "rx_bytes",
+    "ifHCOutOctets": "tx_bytes",
+    "ifHCInUcastPkts": "rx_unicast_pkts",
+    "ifHCOutUcastPkts": "tx_unicast_pkts",
+    "ifHCInMulticastPkts": "rx_multicast_pkts",
+    "ifHCOutMulticastPkts": "tx_multicast_pkts",
+    "ifHCInBroadcastPkts": "rx_broadcast_pkts",
+    "ifHCOutBroadcastPkts": "tx_broadcast_pkts",
+    "ifInDiscards": "rx_discards",
+    "ifOutDiscards": "tx_discards",
+    "ifInErrors": "rx_errors_general",
+    "ifOutErrors": "tx_errors_general",
+}
+# `ifOperStatus` -> status of the interface (`ifAdminStatus` down is `disabled`)
+OPER_STATUS = {
+    1: "connected",
+    2: "notconnect",
+    3: "testing",
+    5: "dormant",
+    6: "notpresent",
+    7: "lowerlayerdown",
+}
+ADMIN_DOWN = 2
+
+INTERFACE_FIELD_OBJECTS = {
+    "description": ["ifAlias"],
+    "status": ["ifAdminStatus", "ifOperStatus"],
+    "physical": ["ifMtu", "ifPhysAddress", "ifHighSpeed"],
+    "counters": list(COUNTER_OBJECTS),
+}
+
+
+def interface_commands(fields=None):
+    """
+    Returns the OIDs of the IF-MIB columns to walk. When `fields` are passed only the
+    columns that provide them (plus the names)
+    """
+    if fields is None:
+        fields = INTERFACE_FIELD_OBJECTS
+    else:
+        interface.check_fields(fields, INTERFACE_FIELD_OBJECTS)
+    objects = ["ifName", "ifDescr"]
+    for name, names in INTERFACE_FIELD_OBJECTS.items():
+        if name in fields:
+            objects.extend(names)
+    return [IF_MIB[x] for x in objects]
+
+
+def interface_fields(fields):
+    "Returns the `fields` passed that are available on the IF-MIB"
+    return set(fields) & set(INTERFACE_FIELD_OBJECTS)
+
+
+def _text(value):
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value
+
+
+def _mac(value):
+    if not isinstance(value, bytes) or len(value) != 6:
+        return None
+    return ":".join(f"{x:02x}" for x in value)
+
+
+class Interfaces(interface.InterfacesBase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.interface_range = None
+        self.fields = None
+        self.get_cmd = None
+        self.metadata.implementation = "SNMP-GETBULK"
+
+    @staticmethod
+    def generate_get_cmd(interface_range=None, fields=None):
+        """
+        Returns the OIDs to walk to build the collection of entities. With `fields`
+        (i.e. `{"status", "counters"}`) only the columns that provide them
+        """
+        return interface_commands(fields)
+
+    def apply_outputs(self, raw_data, incremental=False, **kwargs):
+        """
+        Updates the collection with the outputs of its commands (i.e. walked by
+        `refresh_many()`). Returns the `ChangeSet` when `incremental`
+        """
+        fingerprint = output_fingerprint(raw_data)
+        if fingerprint == self.fingerprint:
+            changes = ChangeSet()
+        else:
+            parsed_data = ParseInterface.collector_parse(
+                raw_data, **{"fields": self.fields, **kwargs}
+            )
+            changes = update_container_attrs(self, parsed_data, Interface, incremental)
+            self.fingerprint = fingerprint
+        self.record_counters()
+        self.metadata.touch()
+        self.metadata.collection_count += 1
+        return changes
+
+    def get(self, incremental=False, **_ignore):
+        """
+        Automatic trigger a data collection. A connector object has to be passed.
+        With `incremental` the entities are updated in place and the `ChangeSet` is
+        returned, see `refresh()`. The counters are appended to the `timeseries`
+        store, when attached
+        """
+        if self.connector.metadata.implementation != "SNMP-GETBULK":
+            raise ValueError(
+                "Connector is not of the correct implementation: SNMP-GETBULK"
+            )
+        if not self.get_cmd:
+            self.get_cmd = self.generate_get_cmd(self.interface_range, self.fields)
+
+        changes = self.apply_outputs(
+            self.connector.run(self.get_cmd), incremental, **_ignore
+        )
+        return changes if incremental else True
+
+
+@fingerprinted
+@dataclass(unsafe_hash=True, eq=False, repr=False, config=DataConfig)  # type: ignore
+class Interface(interface.InterfaceBase):
+    """
+    Interface of the IF-MIB, see `InterfaceBase`. Also has:
+
+    - `if_index`: (int) `ifIndex` of the interface, the row read by `get()`
+    """
+
+    if_index: Optional[int] = field(default=None, repr=False)
+
+    def __post_init__(self, **_ignore):
+        super().__post_init__(**_ignore)
+        self._implementation_setup()
+
+    def _implementation_setup(self):
+        "Implementation specific setup, also executed on trusted constructions"
+        self.metadata.implementation = "SNMP-GETBULK"
+        if self.connector is not None:
+            if self.connector.metadata.implementation != "SNMP-GETBULK":
+                raise ValueError(
+                    "Connector is not of the correct implementation: SNMP-GETBULK"
+                )
+
+    @staticmethod
+    def generate_get_cmd(name, fields=None):
+        "Returns the OIDs of the columns to read to build the entity (or its `fields`)"
+        return interface_commands(fields)
+
+    def _collect(self, commands, **kwargs):
+        """
+        Returns the parsed data of the interface, from the row of its `if_index` or
+        walking the columns of the commands when it is not known or not the same
+        interface anymore
+        """
+        if self.if_index is not None:
+            raw_data = self.connector.run(commands, silent=True, instance=self.if_index)
+            try:
+                return ParseInterface.parse(raw_data, **{**kwargs, "name": self.name})
+            except NetApiParseError:
+                pass
+        return ParseInterface.parse(
+            self.connector.run(commands, silent=True), **{**kwargs, "name": self.name}
+        )
+
+    def fetch_fields(self, fields):
+        """
+        Loads the attributes of a lazy object reading only the columns that provide
+        the `fields` passed. Returns the changes, nothing is loaded without connector
+        or for the fields not available on the IF-MIB
+        """
+        fields = interface_fields(fields)
+        if self.connector is None or not fields:
+            return {}
+        try:
+            parsed_data = self._collect(
+                self.generate_get_cmd(self.name, fields), fields=fields
+            )
+        except NetApiParseError:
+            return {}
+        return update_attrs(self, parsed_data)
+
+    def get(self, **_ignore):
+        "Automatic trigger a data collection by reading the row of get_cmd"
+        if self.connector is None:
+            raise NotImplementedError("Need to have the connector defined")
+
+        if not self.get_cmd:
+            self.get_cmd = self.generate_get_cmd(self.name)
+
+        update_attrs(self, self._collect(self.get_cmd, **_ignore))
+
+        self.metadata.touch()
+        self.metadata.collection_count += 1
+        return True
+
+    def enable(self):
+        raise NotImplementedError("SNMP-GETBULK is a read only implementation")
+
+    def disable(self):
+        raise NotImplementedError("SNMP-GETBULK is a read only implementation")
+
+
+class ParseInterface:
+    @staticmethod
+    def data_constructor(intf_name, data, fields=None, **kwargs):
+        "Converts the IF-MIB objects of an interface (see `data_validation`)"
+        if not data:
+            raise NetApiParseError("No data to be parsed")
+
+        status = None
+        if data.get("ifAdminStatus") == ADMIN_DOWN:
+            status = "disabled"
+        elif "ifOperStatus" in data:
+            status = OPER_STATUS.get(data["ifOperStatus"])
+
+        physical = None
+        if interface.field_requested("physical", fields) and any(
+            x in data for x in INTERFACE_FIELD_OBJECTS["physical"]
+        ):
+            speed = data.get("ifHighSpeed")
+            physical = dict(
+                mtu=data.get("ifMtu", 0),
+                mac=_mac(data.get("ifPhysAddress")),
+                bandwidth=speed * 1000000 if speed is not None else 0,
+            )
+
+        counters = None
+        if interface.field_requested("counters", fields) and any(
+            x in data for x in COUNTER_OBJECTS
+        ):
+            counters = {
+                y: int(data[x]) for x, y in COUNTER_OBJECTS.items() if x in data
+            }
+
+        parsed_data = dict(
+            name=intf_name,
+            description=_text(data.get("ifAlias")) or None,
+            status=status,
+            physical=physical,
+            counters=counters,
+        )
+
+        return dict(
+            interface.project_fields(parsed_data, fields), if_index=data.get("ifIndex")
+        )
+
+    @staticmethod
+    def data_validation(raw_data, entity=True, **kwargs):
+        """
+        Returns the IF-MIB objects (by name, plus the `ifIndex`) of each interface
+        name, from the walked columns
+        """
+        rows = {}
+        try:
+            for command, values in raw_data.items():
+                if not values:
+                    continue
+                name = IF_MIB_NAMES.get(command)
+                if name is None:
+                    continue
+                for index, value in values.items():
+                    rows.setdefault(index, {"ifIndex": int(index)})[name] = value
+
+            rdata = {}
+            for row in rows.values():
+                intf = _text(row.get("ifName")) or _text(row.get("ifDescr"))
+                if intf:
+                    rdata[interface.interface_converter(intf)] = row
+        except Exception as err:
+            raise NetApiParseError(
+                f"{str(err)}\nCould not retrieve data from: {raw_data}"
+            )
+
+        if not rdata:
+            raise NetApiParseError("No data to be parsed")
+
+        return rdata
+
+    @staticmethod
+    def parse(raw_data, name=None, **kwargs):
+        """
+        Returns a dictionary with the data parsed of the entity `name`
+        """
+        rdata = ParseInterface.data_validation(raw_data, **kwargs)
+        if name is not None:
+            name = interface.interface_converter(name)
+        elif len(rdata) == 1:
+            name = next(iter(rdata))
+        if name not in rdata:
+            raise NetApiParseError(f"Interface not found: {name}")
+        return ParseInterface.data_constructor(name, rdata[name], **kwargs)
+
+    @staticmethod
+    def iter_parse(raw_data, **kwargs):
+        """
+        Yields the key and data of each entity as it is parsed
+        """
+        rdata = ParseInterface.data_validation(raw_data, entity=False, **kwargs)
+
+        for _intf, _intf_data in rdata.items():
+            yield _intf, ParseInterface.data_constructor(_intf, _intf_data, **kwargs)
+
+    @staticmethod
+    def collector_parse(raw_data, **kwargs):
+        """
+        Returns list of dictionaries of each entity parsed
+        """
+        return [{k: v} for k, v in ParseInterface.iter_parse(raw_data, **kwargs)]
+
+
+def refresh_many(collections, incremental=True, concurrency=100):
+    """
+    Refreshes the SNMP-GETBULK interfaces collections of many devices, walking their
+    columns concurrently on a single event loop. Returns the list of `ChangeSet` (or
+    the exception raised for the device) in the order of the collections
+    """
+    collections = list(collections)
+    for obj in collections:
+        if not obj.get_cmd:
+            obj.get_cmd = obj.generate_get_cmd(obj.interface_range, obj.fields)
+    outputs = run_many(
+        [(x.connector, x.get_cmd) for x in collections], concurrency=concurrency
+    )
+    results = []
+    for obj, raw_data in zip(collections, outputs):
+        if isinstance(raw_data, Exception):
+            results.append(raw_data)
+            continue
+        try:
+            results.append(obj.apply_outputs(raw_data, incremental))
+        except NetApiParseError as error:
+            results.append(error)
+    return results
+
+
+def collect_many(devices, fields=None, concurrency=100, **collection_params):
+    """
+    Builds the interfaces collections of many SNMP-GETBULK devices concurrently (see
+    `refresh_many()`), with the `fields` passed. `collection_params` are set on the
+    collections, like the `compact` and `lazy` flags or the `timeseries` store. Returns
+    the list of collections in the order of the devices. The collections of the
+    devices that failed are empty, with the exception on `error`
+    """
+    collections = []
+    for device in devices:
+        obj = Interfaces()
+        obj.connector = device
+        obj.fields = fields
+        obj.__dict__.update(collection_params)
+        collections.append(obj)
+    for obj, result in zip(
+        collections, refresh_many(collections, False, concurrency=concurrency)
+    ):
+        obj.error = result if isinstance(result, Exception) else None
+    return collections
@@ -0,0 +1,284 @@
+"""
+Syslog triggered refreshes.
+
+`SyslogListener` receives the syslog messages of the devices (UDP and/or TCP) and
+recognises the EOS/IOS messages of the events that change the state collected by the
+collections:
+
+- Link and line protocol changes (`%LINK-3-UPDOWN`, `%LINEPROTO-5-UPDOWN`) of an
+interface
+- VRRP state changes (`%VRRP-6-STATECHANGE`) of a group
+- Routing adjacency changes (`%BGP-5-ADJCHANGE`, OSPF/IS-IS adjacencies) of a VRF
+
+Each one becomes a `SyslogTrigger` with the affected entity (the interface names
+normalised with `interface_converter`). The triggers are processed by a worker thread
+and debounced: the repeated triggers of the same entity during `debounce` seconds (i.e.
+a flapping link) are coalesced into one.
+
+`SyslogRefresher` is the handler that runs the targeted refresh of the affected entity
+on the collections registered per device (`refresh_entity()` of the interface or VRRP
+group, `refresh()` of the routes), so the subscribers of the collections receive their
+events. The full polls can then run far less often.
+
+**Example:**
+
+```python
+refresher = SyslogRefresher()
+refresher.register("leaf1", interfaces=interfaces, vrrps=vrrps, routes=routes)
+with SyslogListener(refresher, port=5514, protocols=("udp", "tcp")):
+    ...
+```
+"""
+import re
+import time
+import queue
+import threading
+import socketserver
+from collections import namedtuple
+from netapi.net.interface import interface_converter
+
+
+__all__ = ["SyslogListener", "SyslogRefresher", "SyslogTrigger", "parse_message"]
+
+SyslogTrigger = namedtuple("SyslogTrigger", ["kind", "device", "key", "message"])
+SyslogTrigger.__doc__ = """
+Entity affected by a syslog message.
+
+- `kind`: `interface`, `vrrp` or `routes`
+- `device`: Hostname on the message, or the address of the sender when not present
+- `key`: Key of the entity on its collection: interface name, `(group_id, interface)`
+or instance (VRF) of the routes
+- `message`: Text of the message
+"""
+
+# RFC 3164 (`<PRI>Mmm dd hh:mm:ss HOST TAG: MSG`) and RFC 5424 (`<PRI>1 TS HOST ...`)
+HEADER_PATTERNS = [
+    re.compile(
+        r"^<\d{1,3}>(?:\d{1,2}\s+)?[A-Z][a-z]{2}\s+\d{1,2}\s+\d\d:\d\d:\d\d\S*\s+"
+        r"(?P<host>[^\s:]+)\s"
+    ),
+    re.compile(r"^<\d{1,3}>1\s+\S+\s+(?P<host>\S+)\s"),
+]
+MESSAGE_PATTERNS = [
+    (
+        "interface",
+        re.compile(
+            r"%(?:LINK|LINEPROTO)-\d-(?:UPDOWN|CHANGED):\s+(?:Line protocol on )?"
+            r"Interface (?P<interface>[^\s,]+), changed state to"
+        ),
+    ),
+    (
+        "vrrp",
+        re.compile(
+            r"%VRRP-\d-STATECHANGE:\s+(?P<interface>\S+)\s+"
+            r"(?:Grp|vrid)\s+(?P<group>\d+)"
+        ),
+    ),
+    (
+        "routes",
+        re.compile(
+            r"%BGP-\d-ADJCHANGE:\s+(?:peer|neighbor)\s+\S+"
+            r"(?:\s+\(VRF (?P<vrf>[^\s)]+)|\s+vpn vrf (?P<vrf_ios>\S+))?"
+        ),
+    ),
+    (
+        "routes",
+        re.compile(
+            r"%(?:OSPF|OSPF3|OSPFV3|ISIS)-\d-\w*ADJ\w*:.*?(?:vrf (?P<vrf>[^\s,]+)|$)"
+        ),
+    ),
+]
+
+
+def parse_message(message, source=None):
+    """
+    Returns the `SyslogTrigger` of a syslog message, None if it is not recognised.
+    `source` (the address of the sender) is the device when the message has no host
+    """
+    device = source
+    for pattern in HEADER_PATTERNS:
+        match = pattern.match(message)
+        if match:
+            device = match.group("host")
+            break
+
+    for kind, pattern in MESSAGE_PATTERNS:
+        match = pattern.search(message)
+        if not match:
+            continue
+        values = match.groupdict()
+        if kind == "interface":
+            key = interface_converter(values["interface"])
+        elif kind == "vrrp":
+            key = (int(values["group"]), interface_converter(values["interface"]))
+        else:
+            key = values.get("vrf") or values.get("vrf_ios") or "default"
+        return SyslogTrigger(kind, device, key, message)
+    return None
+
+
+class SyslogRefresher:
+    """
+    Handler of the `SyslogTrigger` that refreshes the affected entity on the collections
+    registered for the device. Triggers of devices or entities not registered are
+    ignored
+    """
+
+    def __init__(self):
+        self.devices = {}
+
+    def register(self, device, interfaces=None, vrrps=None, routes=None, aliases=()):
+        """
+        Registers the collections of a device (hostname). `aliases` are other names
+        of the device on the triggers, like the address the messages are sent from
+        """
+        collections = dict(interface=interfaces, vrrp=vrrps, routes=routes)
+        for name in (device, *aliases):
+            self.devices[name] = collections
+
+    def __call__(self, trigger):
+        "Refreshes the entity of the trigger. Returns the `ChangeSet`, None if ignored"
+        collection = self.devices.get(trigger.device, {}).get(trigger.kind)
+        if collection is None:
+            return None
+        if trigger.kind == "routes":
+            return collection.refresh()
+        if trigger.key not in collection:
+            return None
+        return collection.refresh_entity(trigger.key)
+
+
+class _UDPHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        data, _ = self.request
+        self.server.listener.receive(data, self.client_address[0])
+
+
+class _TCPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        "Reads the messages with octet counting or newline framing (RFC 6587)"
+        source = self.client_address[0]
+        while True:
+            data = self.rfile.read(1)
+            if not data:
+                return
+            # Octet counting: `<length> <message>`
+            while data.isdigit():
+                char = self.rfile.read(1)
+                if char == b" ":
+                    data = self.rfile.read(int(data))
+                    break
+                data += char
+                if not char:
+                    break
+            else:
+                data += self.rfile.readline()
+            self.server.listener.receive(data, source)
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SyslogListener:
+    """
+    Local syslog listener. Calls `handler(trigger)` (i.e. a `SyslogRefresher`) from a
+    worker thread with the `SyslogTrigger` of the messages recognised, once per entity
+    every `debounce` seconds.
+
+    - `host` and `port`: Address to listen on. With port 0 a free port is assigned to
+    each protocol, see `addresses`
+    - `protocols`: `udp` and/or `tcp`
+    - `debounce`: Seconds to coalesce the triggers of the same entity
+
+    `errors` keeps the exceptions raised by the handler. Used as a context manager it
+    is started and stopped
+    """
+
+    def __init__(
+        self, handler, host="127.0.0.1", port=514, protocols=("udp",), debounce=1.0
+    ):
+        unknown = set(protocols) - {"udp", "tcp"}
+        if unknown:
+            raise ValueError(f"Unknown protocols: {unknown}")
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.protocols = tuple(protocols)
+        self.debounce = debounce
+        self.addresses = {}
+        self.errors = []
+        self._queue = queue.Queue()
+        self._servers = []
+        self._threads = []
+
+    def receive(self, data, source=None):
+        "Queues a raw message (bytes or str) received from the `source` address"
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", errors="replace")
+        data = data.strip()
+        if data:
+            self._queue.put((data, source))
+
+    def _worker(self):
+        "Parses the messages and calls the handler with the debounced triggers"
+        pending = {}
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0, min(x[1] for x in pending.values()) - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+            if item is None:
+                return
+            if item:
+                trigger = parse_message(*item)
+                if trigger is not None:
+                    entity = trigger[:3]
+                    if entity not in pending:
+                        pending[entity] = (trigger, time.monotonic() + self.debounce)
+
+            now = time.monotonic()
+            for entity in [x for x, y in pending.items() if y[1] <= now]:
+                trigger, _ = pending.pop(entity)
+                try:
+                    self.handler(trigger)
+                except Exception as error:
+                    self.errors.append(error)
+
+    def start(self):
+        for protocol in self.protocols:
+            server_class, handler = (
+                (socketserver.UDPServer, _UDPHandler)
+                if protocol == "udp"
+                else (_TCPServer, _TCPHandler)
+            )
+            server = server_class((self.host, self.port), handler)
+            server.listener = self
+            self.addresses[protocol] = server.server_address
+            self._servers.append(server)
+            self._threads.append(
+                threading.Thread(target=server.serve_forever, daemon=True)
+            )
+        self._threads.append(threading.Thread(target=self._worker, daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._servers, self._threads = [], []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_ignore):
+        self.stop()
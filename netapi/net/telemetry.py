@@ -0,0 +1,294 @@
+"""
+Streaming telemetry of the interfaces.
+
+Push based alternative to polling `show interfaces`: the devices (or a telemetry
+collector) stream the OpenConfig interface state and counters, and the updates are
+applied incrementally to the entities of an `Interfaces` collection with
+`apply_updates()`. The polled and streamed paths share the same entity objects, indexes
+and change events (see `netapi.events`).
+
+The stream is the JSON encoding of the gNMI `SubscribeResponse` messages, one per line
+over TCP (dial-in: the client connects and sends a `SubscribeRequest` line):
+
+```json
+{"update": {"timestamp": 1571478062000000000,
+            "prefix": "/interfaces/interface[name=Ethernet1]/state",
+            "update": [{"path": "counters/in-octets", "val": {"uintVal": "1000"}},
+                       {"path": "oper-status", "val": "DOWN"}]}}
+{"sync_response": true}
+```
+
+Paths can be strings or `{"elem": [{"name": ..., "key": {...}}]}` objects, and values
+raw or typed (`{"uintVal": ...}`). gRPC transports can feed the same messages to
+`TelemetryIngester.ingest()`.
+
+**Example:**
+
+```python
+interfaces = InterfaceBuilder().get(connector, entity=False)
+interfaces.subscribe(print, types={"interface_status"})
+client = TelemetryClient("collector1", 50051, interfaces).start()
+...
+client.stop()
+```
+"""
+import re
+import json
+import socket
+import threading
+from copy import copy
+from netapi.metadata import ChangeSet
+
+
+__all__ = ["TelemetryClient", "TelemetryIngester", "parse_path", "typed_value"]
+
+# OpenConfig `interfaces/interface/state/counters` leaves -> `InterfaceCounters`
+COUNTER_PATHS = {
+    "in-octets": "rx_bytes",
+    "out-octets": "tx_bytes",
+    "in-unicast-pkts": "rx_unicast_pkts",
+    "out-unicast-pkts": "tx_unicast_pkts",
+    "in-multicast-pkts": "rx_multicast_pkts",
+    "out-multicast-pkts": "tx_multicast_pkts",
+    "in-broadcast-pkts": "rx_broadcast_pkts",
+    "out-broadcast-pkts": "tx_broadcast_pkts",
+    "in-discards": "rx_discards",
+    "out-discards": "tx_discards",
+    "in-errors": "rx_errors_general",
+    "out-errors": "tx_errors_general",
+    "in-fcs-errors": "rx_errors_fcs",
+}
+# OpenConfig `oper-status` -> status of the polled interfaces
+OPER_STATUS = {
+    "UP": "connected",
+    "DOWN": "notconnect",
+    "LOWER_LAYER_DOWN": "lowerlayerdown",
+    "NOT_PRESENT": "notpresent",
+    "DORMANT": "dormant",
+    "TESTING": "testing",
+}
+DEFAULT_PATHS = ["/interfaces/interface/state"]
+
+ELEMENT_PATTERN = re.compile(r"([^/\[]+)((?:\[[^\]]*\])*)")
+KEY_PATTERN = re.compile(r"\[([^=\]]+)=([^\]]*)\]")
+
+
+def parse_path(path):
+    "Returns the list of `(name, keys)` of the elements of a gNMI path (str or dict)"
+    if not path:
+        return []
+    if isinstance(path, dict):
+        return [(x["name"], x.get("key", {})) for x in path.get("elem", [])]
+    return [
+        (name, dict(KEY_PATTERN.findall(keys)))
+        for name, keys in ELEMENT_PATTERN.findall(path)
+    ]
+
+
+def typed_value(value):
+    "Returns the value of a gNMI `TypedValue` (i.e. `{'uintVal': '10'}`), or as is"
+    if not isinstance(value, dict) or len(value) != 1:
+        return value
+    ((kind, result),) = value.items()
+    if kind in ("uintVal", "intVal", "uint_val", "int_val"):
+        return int(result)
+    if kind in ("jsonVal", "jsonIetfVal", "json_val", "json_ietf_val"):
+        return json.loads(result) if isinstance(result, str) else result
+    return result
+
+
+def _nanoseconds(value):
+    "Epoch seconds of a gNMI timestamp (nanoseconds)"
+    return int(value) / 1e9
+
+
+class TelemetryIngester:
+    """
+    Applies the gNMI notifications of the OpenConfig interfaces state to a collection.
+    The leaves are converted to the attributes of the entities:
+
+    - `counters/*`: `counters` (see `COUNTER_PATHS`)
+    - `oper-status` and `admin-status`: `status` (and so `status_up` and `enabled`)
+    - `last-change`: `last_status_change`
+    - `counters/last-clear`: `last_clear`
+    - `counters/carrier-transitions`: `number_status_changes`
+
+    `stats` counts the notifications, and the updates converted and ignored (unknown
+    paths). The interfaces not present on the collection are not created
+    """
+
+    def __init__(self, interfaces):
+        self.interfaces = interfaces
+        self.synced = False
+        self.stats = dict(notifications=0, updates=0, ignored=0)
+
+    def _attribute(self, leaf, value, data, status):
+        "Stores the value of an interface leaf, returns False if it is not known"
+        if leaf[:1] == ["counters"] and len(leaf) == 2:
+            name = leaf[1]
+            if name in COUNTER_PATHS:
+                data.setdefault("counters", {})[COUNTER_PATHS[name]] = value
+            elif name == "last-clear":
+                data["last_clear"] = _nanoseconds(value)
+            elif name == "carrier-transitions":
+                data["number_status_changes"] = int(value)
+            else:
+                return False
+        elif leaf == ["oper-status"]:
+            status["oper"] = value
+        elif leaf == ["admin-status"]:
+            status["admin"] = value
+        elif leaf == ["last-change"]:
+            data["last_status_change"] = _nanoseconds(value)
+        else:
+            return False
+        return True
+
+    def notification_updates(self, notification):
+        "Returns the dict of interface name -> data of the updates of a notification"
+        prefix = parse_path(notification.get("prefix"))
+        updates, statuses = {}, {}
+        for update in notification.get("update", []):
+            elements = prefix + parse_path(update.get("path"))
+            names = [x[0] for x in elements]
+            try:
+                position = names.index("interface")
+                name = elements[position][1]["name"]
+            except (ValueError, KeyError):
+                self.stats["ignored"] += 1
+                continue
+            leaf = names[position + 1 :]
+            if leaf[:1] == ["state"]:
+                leaf = leaf[1:]
+            if self._attribute(
+                leaf,
+                typed_value(update.get("val")),
+                updates.setdefault(name, {}),
+                statuses.setdefault(name, {}),
+            ):
+                self.stats["updates"] += 1
+            else:
+                self.stats["ignored"] += 1
+
+        for name, status in statuses.items():
+            if status.get("admin") == "DOWN":
+                updates[name]["status"] = "disabled"
+            elif "oper" in status:
+                oper = status["oper"]
+                updates[name]["status"] = OPER_STATUS.get(oper, str(oper).lower())
+        return {x: y for x, y in updates.items() if y}
+
+    def ingest(self, message):
+        """
+        Applies a `SubscribeResponse` message (or a bare notification) to the
+        collection. Returns the `ChangeSet`
+        """
+        if message.get("sync_response"):
+            self.synced = True
+            return ChangeSet()
+        if "error" in message:
+            raise ConnectionError(f"Telemetry stream error: {message['error']}")
+        notification = message.get("update", message)
+        self.stats["notifications"] += 1
+        updates = self.notification_updates(notification)
+        # The counters merged are not replaced by a poll before they are applied
+        with self.interfaces.lock:
+            for name, data in updates.items():
+                if "counters" not in data or name not in self.interfaces:
+                    continue
+                entity = self.interfaces[name]
+                current = getattr(entity, "__dict__", {}).get("counters")
+                if current is not None:
+                    # Only some counters are streamed, the rest are kept
+                    counters = copy(current)
+                    counters.apply(data["counters"])
+                    data["counters"] = counters
+            return self.interfaces.apply_updates(updates)
+
+
+class TelemetryClient:
+    """
+    Dial-in client of a JSON lines gNMI stream (see the module documentation), that
+    ingests the updates on the `interfaces` collection.
+
+    - `paths`: Paths of the subscription (default: the interfaces state)
+    - `timeout`: Seconds to connect
+    - `read_timeout`: Seconds to wait for the messages (default: no limit, the streams
+    of `ON_CHANGE` paths can be quiet for long)
+
+    `run()` blocks until the stream is closed (or `max_messages`), `start()` runs it on
+    a thread. The errors of the thread are kept on `error`
+    """
+
+    def __init__(
+        self, host, port, interfaces, paths=None, timeout=10, read_timeout=None
+    ):
+        self.host = host
+        self.port = port
+        self.ingester = TelemetryIngester(interfaces)
+        self.paths = paths or DEFAULT_PATHS
+        self.timeout = timeout
+        self.read_timeout = read_timeout
+        self.error = None
+        self._socket = None
+        self._thread = None
+        self._stopping = False
+
+    def subscribe_request(self):
+        "Returns the `SubscribeRequest` sent to the server"
+        return {
+            "subscribe": {
+                "mode": "STREAM",
+                "encoding": "JSON",
+                "subscription": [
+                    {"path": x, "mode": "ON_CHANGE"}
+                    if x.endswith("oper-status")
+                    else {"path": x, "mode": "SAMPLE"}
+                    for x in self.paths
+                ],
+            }
+        }
+
+    def run(self, max_messages=None):
+        "Ingests the messages of the stream. Returns the number of messages received"
+        count = 0
+        with socket.create_connection((self.host, self.port), self.timeout) as conn:
+            self._socket = conn
+            conn.settimeout(self.read_timeout)
+            conn.sendall(json.dumps(self.subscribe_request()).encode() + b"\n")
+            with conn.makefile("rb") as stream:
+                for line in stream:
+                    if not line.strip():
+                        continue
+                    self.ingester.ingest(json.loads(line))
+                    count += 1
+                    if max_messages is not None and count >= max_messages:
+                        break
+        self._socket = None
+        return count
+
+    def _run(self):
+        try:
+            self.run()
+        except (OSError, ValueError) as error:
+            # Closing the stream on `stop()` is not an error
+            if not self._stopping:
+                self.error = error
+
+    def start(self):
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        "Closes the stream and waits for the thread"
+        self._stopping = True
+        if self._socket is not None:
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,188 @@
+"""
+Line driven parser of the CLI text outputs.
+
+The outputs of the platforms without structured outputs (i.e. IOS over netmiko) are
+parsed with `Template` objects, compiled once (at import of the platform modules) into
+a state machine. The rules of each state are compiled into a single regular expression
+(alternation of the rules, the first one matching wins), so each line is matched once
+and the output is never scanned again. The rules capture named fields and can:
+
+- `record`: Start a new record, the previous one is emitted
+- `context`: Set fields inherited by the next records (i.e. the VRF of a table)
+- `item`: Append the fields to a list of the record (i.e. the next hops of a route)
+- `state`: Move to another state. A state without rules ends the parsing
+
+The rest of the rules update the current record. The lines not matched are ignored.
+
+**Example:**
+
+```python
+template = Template(
+    {
+        "start": [
+            Rule(r"^(?P<id>\\d+)\\s+(?P<name>\\S+)\\s+(?P<status>\\S+)", record=True),
+            Rule(r"^VLAN Type", state="end"),
+        ],
+        "end": [],
+    },
+    types={"id": int},
+)
+for record in template.parse(output):
+    print(record)
+# {'id': 1, 'name': 'default', 'status': 'active'}
+```
+"""
+import re
+from typing import Optional
+
+
+__all__ = ["Rule", "Template", "output_lines"]
+
+FIELD_PATTERN = re.compile(r"\(\?P<(\w+)>")
+
+
+def output_lines(raw_data):
+    """
+    Yields the lines of the text outputs of a `run()` (dict of command -> output). The
+    outputs of the failed commands (None or the exception) are skipped
+    """
+    for output in raw_data.values():
+        if isinstance(output, str):
+            yield from output.splitlines()
+
+
+class Rule:
+    """
+    Regular expression (with named groups as fields) of a line of the output, and the
+    action taken when it matches. See the module documentation
+    """
+
+    __slots__ = ("pattern", "record", "context", "item", "state")
+
+    def __init__(
+        self,
+        pattern: str,
+        record: bool = False,
+        context: bool = False,
+        item: Optional[str] = None,
+        state: Optional[str] = None,
+    ):
+        if sum((record, context, item is not None)) > 1:
+            raise ValueError("A rule can only be one of record, context or item")
+        self.pattern = pattern
+        self.record = record
+        self.context = context
+        self.item = item
+        self.state = state
+
+    def __repr__(self):
+        return f"Rule({self.pattern!r})"
+
+
+class Template:
+    """
+    State machine of the rules of an output, compiled on creation.
+
+    - `states`: Dict of state name -> list of `Rule`
+    - `types`: Dict of field -> callable converting the captured strings (the fields
+    not captured are None and not converted)
+    - `items`: Dict of item list -> fields of the items. The rest of the fields of the
+    item rules update the record (i.e. the metric of the next hop lines of a route).
+    Without it all the fields of the item rules are on the items
+    - `start`: Initial state
+    """
+
+    def __init__(self, states, types=None, items=None, start="start"):
+        if start not in states:
+            raise ValueError(f"Start state not defined: {start}")
+        for rules in states.values():
+            for rule in rules:
+                if rule.state is not None and rule.state not in states:
+                    raise ValueError(f"State not defined: {rule.state}")
+        self.types = types or {}
+        self.items = {x: frozenset(y) for x, y in (items or {}).items()}
+        self.start = start
+        self._states = {x: self._compile(y) for x, y in states.items()}
+
+    @staticmethod
+    def _compile(rules):
+        """
+        Returns the `match` of the alternation of the rules (None without rules) and
+        the actions by group name: `(rule, [(group index, field), ...])`
+        """
+        if not rules:
+            return None, {}
+        alternatives = []
+        for position, rule in enumerate(rules):
+            # The fields are prefixed with the rule, the same field can be on many
+            pattern = FIELD_PATTERN.sub(
+                lambda x, y=position: f"(?P<_{y}_{x.group(1)}>", rule.pattern
+            )
+            alternatives.append(f"(?P<_{position}>{pattern})")
+        regex = re.compile("|".join(alternatives))
+
+        actions = {}
+        for position, rule in enumerate(rules):
+            prefix = f"_{position}_"
+            fields = [
+                (index - 1, group[len(prefix) :])
+                for group, index in regex.groupindex.items()
+                if group.startswith(prefix)
+            ]
+            actions[f"_{position}"] = (rule, sorted(fields))
+        return regex.match, actions
+
+    def parse(self, output):
+        """
+        Yields the records (dict of fields) of the output (str or iterable of lines)
+        on a single pass
+        """
+        lines = output.splitlines() if isinstance(output, str) else output
+        types = self.types
+        items = self.items
+        states = self._states
+        match, actions = states[self.start]
+        record = None
+        context = {}
+        for line in lines:
+            if match is None:
+                break
+            found = match(line)
+            if found is None:
+                continue
+            rule, fields = actions[found.lastgroup]
+            groups = found.groups()
+            values = {}
+            for index, name in fields:
+                value = groups[index]
+                if value is not None and name in types:
+                    value = types[name](value)
+                values[name] = value
+
+            if rule.record:
+                if record is not None:
+                    yield record
+                record = dict(context)
+                record.update((x, y) for x, y in values.items() if y is not None)
+            elif rule.context:
+                context.update(values)
+            elif record is not None:
+                if rule.item is not None:
+                    item_fields = items.get(rule.item)
+                    if item_fields is None:
+                        record.setdefault(rule.item, []).append(values)
+                        values = {}
+                    else:
+                        record.setdefault(rule.item, []).append(
+                            {x: y for x, y in values.items() if x in item_fields}
+                        )
+                        values = {
+                            x: y for x, y in values.items() if x not in item_fields
+                        }
+                record.update((x, y) for x, y in values.items() if y is not None)
+
+            if rule.state is not None:
+                match, actions = states[rule.state]
+
+        if record is not None:
+            yield record
@@ -0,0 +1,239 @@
+"""
+Time series of interface counters.
+
+`CounterStore` keeps the last `capacity` counter samples of each interface, keyed by
+`(device, interface)`, on ring buffers of preallocated NumPy arrays: the timestamps
+and a column per counter of `InterfaceCounters` (the `COUNTER_FIELDS`). The memory of
+an interface is fixed (`capacity * (len(COUNTER_FIELDS) + 1)` floats) regardless of
+the number of polls, and each sample is an O(1) write that overwrites the oldest one
+when the buffer is full.
+
+The series are queried by time window (`window()`) and downsampled into fixed
+intervals (`downsample()`). The interfaces collections append their counters on each
+`get()`/`refresh()` when they have a store attached (`timeseries` attribute or
+parameter of the builder).
+
+Requires NumPy.
+
+**Example:**
+
+```python
+from netapi.net import InterfaceBuilder
+from netapi.net.timeseries import CounterStore
+
+store = CounterStore(capacity=288)
+interfaces = InterfaceBuilder().get(connector, entity=False, timeseries=store)
+...
+interfaces.refresh()
+series = store[connector.host, "Ethernet1"]
+timestamps, values = series.window(last=600, fields=["rx_bytes", "tx_bytes"])
+timestamps, values = series.downsample(60, how="max")
+```
+"""
+import time
+from netapi.net.interface import COUNTER_FIELDS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+__all__ = ["CounterStore", "CounterSeries"]
+
+COLUMNS = {x: i for i, x in enumerate(COUNTER_FIELDS)}
+AGGREGATIONS = ("first", "last", "min", "max", "mean")
+
+
+def loaded_counters(interface):
+    """
+    Returns the counters of an interface (entity or compact), None when they were not
+    collected. The counters of the lazy interfaces are not loaded
+    """
+    values = getattr(interface, "__dict__", None)
+    if values is not None:
+        return values.get("counters")
+    return getattr(interface, "counters", None)
+
+
+def counters_row(counters):
+    "Values of the counters on the `COUNTER_FIELDS` order (NaN when not present)"
+    return [
+        np.nan if x is None else float(x)
+        for x in (getattr(counters, y, None) for y in COUNTER_FIELDS)
+    ]
+
+
+class CounterSeries:
+    """
+    Ring buffer of the counter samples of an interface.
+
+    - `timestamps`: Preallocated array with the epoch seconds of the samples
+    - `values`: Preallocated matrix with a row per sample and a column per counter of
+    `COUNTER_FIELDS`
+
+    The samples are stored from the `start` position and wrap around the end of the
+    arrays. They are returned in chronological order by the queries
+    """
+
+    __slots__ = ("capacity", "timestamps", "values", "start", "size")
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError(f"Capacity must be a positive number: {capacity}")
+        self.capacity = capacity
+        self.timestamps = np.empty(capacity)
+        self.values = np.empty((capacity, len(COUNTER_FIELDS)))
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(size={self.size}, capacity={self.capacity})"
+
+    @property
+    def last_timestamp(self):
+        "Time of the newest sample, None when empty"
+        if not self.size:
+            return None
+        return float(self.timestamps[(self.start + self.size - 1) % self.capacity])
+
+    def append(self, timestamp, values):
+        """
+        Adds a sample (values on the `COUNTER_FIELDS` order), overwriting the oldest
+        one when full. The samples must be added in chronological order
+        """
+        last = self.last_timestamp
+        if last is not None and timestamp < last:
+            raise ValueError(f"Sample older than the last one: {timestamp} < {last}")
+        if self.size < self.capacity:
+            position = (self.start + self.size) % self.capacity
+            self.size += 1
+        else:
+            position = self.start
+            self.start = (self.start + 1) % self.capacity
+        self.timestamps[position] = timestamp
+        self.values[position] = values
+
+    def _ordered(self):
+        "Positions of the samples in chronological order"
+        return (np.arange(self.size) + self.start) % self.capacity
+
+    def window(self, start=None, end=None, last=None, fields=None):
+        """
+        Returns the `(timestamps, values)` arrays (copies) of the samples between the
+        `start` and `end` times (both included), or of the `last` seconds before the
+        newest sample. `fields` selects the counter columns (all by default)
+        """
+        positions = self._ordered()
+        timestamps = self.timestamps[positions]
+        if last is not None:
+            start = self.last_timestamp - last if self.size else None
+        low = 0 if start is None else np.searchsorted(timestamps, start, "left")
+        high = self.size if end is None else np.searchsorted(timestamps, end, "right")
+        positions = positions[low:high]
+        values = self.values[positions]
+        if fields is not None:
+            values = values[:, [COLUMNS[x] for x in fields]]
+        return timestamps[low:high], values
+
+    def downsample(self, interval, how="last", **window_params):
+        """
+        Returns the `(timestamps, values)` of the samples aggregated on buckets of
+        `interval` seconds (aligned to the epoch), one row per bucket with samples.
+        The timestamps are the start of the buckets and `how` is the aggregation of
+        the samples of the bucket: `first`, `last` (default, for counters), `min`,
+        `max` or `mean`. Accepts the `window()` parameters
+        """
+        if how not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation: {how}. Valid: {AGGREGATIONS}")
+        timestamps, values = self.window(**window_params)
+        if not len(timestamps):
+            return timestamps, values
+        buckets = np.floor(timestamps / interval)
+        starts = np.flatnonzero(np.diff(buckets, prepend=np.nan) != 0)
+        if how == "first":
+            result = values[starts]
+        elif how == "last":
+            result = values[np.append(starts[1:], len(values)) - 1]
+        elif how == "mean":
+            counts = np.diff(np.append(starts, len(values)))
+            result = np.add.reduceat(values, starts, axis=0) / counts[:, None]
+        else:
+            result = getattr(np, f"{how}imum").reduceat(values, starts, axis=0)
+        return buckets[starts] * interval, result
+
+
+class CounterStore:
+    """
+    Counter time series of many interfaces, a `CounterSeries` of fixed `capacity`
+    per `(device, interface)` key. See the module documentation
+    """
+
+    def __init__(self, capacity=1024):
+        if np is None:
+            raise ImportError("CounterStore requires NumPy")
+        if capacity < 1:
+            raise ValueError(f"Capacity must be a positive number: {capacity}")
+        self.capacity = capacity
+        self.series = {}
+
+    def __len__(self):
+        return len(self.series)
+
+    def __contains__(self, key):
+        return key in self.series
+
+    def __getitem__(self, key):
+        return self.series[key]
+
+    def __iter__(self):
+        return iter(self.series)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(keys={len(self.series)}, "
+            f"capacity={self.capacity})"
+        )
+
+    def keys(self):
+        return self.series.keys()
+
+    def append(self, key, timestamp, values):
+        "Adds a sample (values on the `COUNTER_FIELDS` order) to the series of the key"
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = CounterSeries(self.capacity)
+        series.append(timestamp, values)
+
+    def append_counters(self, key, counters, timestamp=None):
+        "Adds a sample of an `InterfaceCounters` object"
+        self.append(
+            key, time.time() if timestamp is None else timestamp, counters_row(counters)
+        )
+
+    def append_interfaces(self, interfaces, device=None, timestamp=None):
+        """
+        Adds a sample of the counters of each interface of a collection with the
+        `(device, name)` keys, all with the same timestamp (now by default). The
+        device is the host of the collection connector by default. Interfaces without
+        counters collected are skipped. Returns the number of samples added
+        """
+        if device is None:
+            device = getattr(interfaces.connector, "host", None)
+        if timestamp is None:
+            timestamp = time.time()
+        count = 0
+        for name, interface in interfaces.items():
+            counters = loaded_counters(interface)
+            if counters is None:
+                continue
+            self.append((device, name), timestamp, counters_row(counters))
+            count += 1
+        return count
+
+    def remove(self, key):
+        "Removes the series of the key (i.e. of an interface deleted)"
+        self.series.pop(key, None)
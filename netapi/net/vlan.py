@@ -8,7 +8,15 @@ from dataclasses import field
 from typing import Optional, List, Any
 from pydantic import validator
 from pydantic.dataclasses import dataclass
-from netapi.metadata import Metadata, EntityCollections, DataConfig, custom_asdict
+from netapi.metadata import (
+    Metadata,
+    EntityCollections,
+    DataConfig,
+    custom_asdict,
+    trusted_construct,
+    apply_changes,
+    fingerprinted,
+)
 
 
 def status_conversion(raw_status):
@@ -27,6 +35,7 @@ def status_conversion(raw_status):
     return status, status_up
 
 
+@fingerprinted
 @dataclass(unsafe_hash=True, config=DataConfig)  # type: ignore
 class VlanBase:
     """
@@ -80,6 +89,22 @@ class VlanBase:
                     f"It is not a valid connector object: {self.connector}"
                 )
 
+    @classmethod
+    def from_parsed(cls, **data):
+        """
+        Fast creation of the object from data already verified, like the one returned
+        by the parsers or by `to_dict()`. See `netapi.metadata.trusted_construct`
+        """
+        return trusted_construct(cls, data)
+
+    def apply(self, data):
+        """
+        Updates the object with the data passed (i.e. from the parsers) validating all
+        the changes at once. Returns the `(old, new)` values of the changed attributes.
+        See `netapi.metadata.apply_changes`
+        """
+        return apply_changes(self, data)
+
     def to_dict(self):
         # NOTE: Workaround to TypeError: can't pickle SSLContext objects
         return custom_asdict(self, "vlan_api")
@@ -87,6 +112,8 @@ class VlanBase:
 
 class VlansBase(EntityCollections):
     ENTITY = "vlan"
+    INDEXES = ("status",)
+    EVENT_ATTRIBUTES = {"status": "vlan_status"}
 
     def __init__(self, *args, **kwargs):
         super().__init__(entity=self.ENTITY, *args, **kwargs)
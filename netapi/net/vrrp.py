@@ -8,7 +8,15 @@ from dataclasses import field
 from pydantic.dataclasses import dataclass
 from pydantic import validator
 from typing import Optional, Any, List, Dict
-from netapi.metadata import Metadata, EntityCollections, DataConfig, custom_asdict
+from netapi.metadata import (
+    Metadata,
+    EntityCollections,
+    DataConfig,
+    custom_asdict,
+    trusted_construct,
+    apply_changes,
+    fingerprinted,
+)
 from netapi.units import unit_validator
 
 
@@ -28,6 +36,7 @@ def status_conversion(raw_status):
     return status, status_up
 
 
+@fingerprinted
 @dataclass(unsafe_hash=True, config=DataConfig)  # type: ignore
 class VrrpBase:
     """
@@ -116,6 +125,22 @@ class VrrpBase:
                     f"It is not a valid connector object: {self.connector}"
                 )
 
+    @classmethod
+    def from_parsed(cls, **data):
+        """
+        Fast creation of the object from data already verified, like the one returned
+        by the parsers or by `to_dict()`. See `netapi.metadata.trusted_construct`
+        """
+        return trusted_construct(cls, data)
+
+    def apply(self, data):
+        """
+        Updates the object with the data passed (i.e. from the parsers) validating all
+        the changes at once. Returns the `(old, new)` values of the changed attributes.
+        See `netapi.metadata.apply_changes`
+        """
+        return apply_changes(self, data)
+
     def to_dict(self):
         # NOTE: Workaround to TypeError: can't pickle SSLContext objects
         return custom_asdict(self, "vrrp_api")
@@ -123,6 +148,8 @@ class VrrpBase:
 
 class VrrpsBase(EntityCollections):
     ENTITY = "vrrp"
+    INDEXES = ("status", "instance", "interface")
+    EVENT_ATTRIBUTES = {"status": "vrrp_state"}
 
     def __init__(self, *args, **kwargs):
         super().__init__(entity=self.ENTITY, *args, **kwargs)
@@ -0,0 +1,100 @@
+"""
+IOS-XR templates of the CLI outputs.
+
+Compiled at import into the state machines of `netapi.net.textparser`, so the outputs
+of `show interfaces`, `show route` and `show vrrp detail` are parsed on a single pass
+over their lines. The lines shared with IOS use its rules, and the output of a single
+route is the IOS one (see `netapi.net.ios.templates`).
+"""
+from netapi.net.textparser import Rule, Template
+from netapi.net.ios.templates import (
+    INTERFACE_RULES,
+    INTERFACE_TYPES,
+    ROUTE_DETAIL,
+    ROUTE_RULES,
+    ROUTE_TYPES,
+    VRRP_TYPES,
+)
+
+
+__all__ = ["INTERFACES", "ROUTES", "ROUTE_DETAIL", "VRRPS"]
+
+INTERFACES = Template(
+    {
+        "start": INTERFACE_RULES
+        + [
+            Rule(r"^\s+Interface state transitions: (?P<number_status_changes>\d+)"),
+            Rule(r"^\s+Last link flapped (?P<last_status_change>\S+)"),
+            Rule(
+                r"^\s+(?P<update_interval>\d+ (?:minute|second)) input rate "
+                r"(?P<rx_bits_rate>\d+) bits/sec, (?P<rx_pkts_rate>\d+) packets/sec"
+            ),
+            Rule(
+                r"^\s+\d+ (?:minute|second) output rate (?P<tx_bits_rate>\d+) "
+                r"bits/sec, (?P<tx_pkts_rate>\d+) packets/sec"
+            ),
+            Rule(
+                r"^\s+(?P<rx_packets>\d+) packets input, (?P<rx_bytes>\d+) bytes"
+                r"(?:, (?P<rx_discards>\d+) total input drops)?"
+            ),
+            Rule(
+                r"^\s+Received (?P<rx_broadcast_pkts>\d+) broadcast packets, "
+                r"(?P<rx_multicast_pkts>\d+) multicast packets"
+            ),
+            Rule(r"^\s+(?P<rx_errors_runt>\d+) runts, (?P<rx_errors_giant>\d+) giants"),
+            Rule(
+                r"^\s+(?P<rx_errors_general>\d+) input errors, "
+                r"(?P<rx_errors_crc>\d+) CRC"
+            ),
+            Rule(
+                r"^\s+(?P<tx_packets>\d+) packets output, (?P<tx_bytes>\d+) bytes"
+                r"(?:, (?P<tx_discards>\d+) total output drops)?"
+            ),
+            Rule(
+                r"^\s+Output (?P<tx_broadcast_pkts>\d+) broadcast packets, "
+                r"(?P<tx_multicast_pkts>\d+) multicast packets"
+            ),
+            Rule(r"^\s+(?P<tx_errors_general>\d+) output errors"),
+        ]
+    },
+    types=INTERFACE_TYPES,
+)
+
+ROUTES = Template(
+    {"start": [Rule(r"^VRF: (?P<instance>\S+)", context=True)] + ROUTE_RULES},
+    types=ROUTE_TYPES,
+    items={"vias": ("next_hop", "interface")},
+)
+
+VRRPS = Template(
+    {
+        "start": [
+            Rule(
+                r"^(?P<interface>\S+) - (?:IPv4|IPv6) vrID (?P<group_id>\d+)",
+                record=True,
+            ),
+            Rule(r"^  State is (?P<state>\w+)"),
+            # Addresses listed below `Virtual IP address:`, the first one is primary
+            Rule(r"^\s{4}(?P<address>\d+\.\d+\.\d+\.\d+)\s*$", item="virtual_ips"),
+            Rule(r"^\s+Virtual MAC address: (?P<virtual_mac>[0-9a-fA-F.]+)"),
+            Rule(r"^\s+Advertise time: (?P<advertisement_interval>[\d.]+ m?secs?)"),
+            Rule(r"^\s+Master Down Timer (?P<master_down_interval>[\d.]+)"),
+            Rule(r"^\s+Current priority: (?P<priority>\d+)"),
+            Rule(
+                r"^\s+Configured priority: \d+, "
+                r"(?P<preempt>may preempt|may not preempt)"
+            ),
+            Rule(r"^\s+minimum delay (?P<preempt_delay>\d+) sec"),
+            Rule(
+                r"^\s+Master router: (?:local \((?P<local_ip>[\d.]+)\)|"
+                r"(?P<master_ip>[\d.]+))(?:, priority (?P<master_priority>\d+))?"
+            ),
+            Rule(
+                r"^\s+Track object (?P<name>\S+) state (?P<tracked_state>\w+) "
+                r"decrement (?P<decrement>\d+)",
+                item="tracked_objects",
+            ),
+        ]
+    },
+    types={**VRRP_TYPES, "master_down_interval": float},
+)
@@ -1,5 +1,4 @@
 import re
-import pendulum
 from netapi.probe import ping
 
 
@@ -100,7 +99,7 @@ class Ping(ping.PingBase):
         )
 
         if _executed:
-            self.metadata.updated_at = pendulum.now()
+            self.metadata.touch()
             self.metadata.collection_count += 1
 
         return True
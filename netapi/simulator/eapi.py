@@ -0,0 +1,760 @@
+"""
+Local stand-in of the Arista eAPI for load testing.
+
+A single process serves many simulated EOS devices, each one on its own port (or as a
+virtual host sharing a port, selected by the HTTP `Host` header). They answer the
+`runCmds` JSON-RPC requests for the commands used by `netapi.net.eos.pyeapier`,
+generating synthetic outputs at a configurable scale:
+
+- `show hostname`, `show version`
+- `show interfaces [<range>]`, `show ip interface [<range>]`,
+`show interfaces [<range>] transceiver`, `show interfaces [<range>] status`,
+`show interfaces [<range>] counters [errors|rates]`
+- `show vlan [id <range>]`
+- `show vrrp [group <id>] [interface <name>|vrf <name>] all`
+- `show ip route [vrf <name>|vrf all] [<protocol>]`,
+`show ip route [vrf <name>] <address> detail`
+
+Latency, jitter and command errors can be injected on every request.
+
+**Example:**
+
+```python
+from netapi.simulator.eapi import EapiFarm, SyntheticEos
+from netapi.connector.eos.pyeapier import Device
+from netapi.net import RouteBuilder
+
+with EapiFarm(devices=100, profile=SyntheticEos(routes=50000, vrfs=4)) as farm:
+    name, host, port = farm.addresses[0]
+    connector = Device(host=host, port=port, transport="http")
+    routes = RouteBuilder().get(connector, entity=False, vrf_all=True)
+```
+
+It can also be run from the command line:
+`python -m netapi.simulator.eapi --devices 1000 --base-port 9000 --routes 100000`
+"""
+import re
+import json
+import time
+import random
+import asyncio
+import argparse
+import threading
+from collections import OrderedDict
+from ipaddress import IPv4Address, IPv4Network
+from netapi.net.interface import interface_converter
+
+
+PROTOCOLS = ["connected", "static", "ospf", "eBGP", "iBGP"]
+PROTOCOL_FILTERS = {
+    "connected": "connected",
+    "static": "static",
+    "ospf": "ospf",
+    "bgp": ("eBGP", "iBGP"),
+}
+
+COMMAND_PATTERNS = [
+    (re.compile(r"^show hostname$"), "hostname"),
+    (re.compile(r"^show version$"), "version"),
+    (re.compile(r"^show interfaces(?: (?P<intf>.+?))? transceiver$"), "transceiver"),
+    (re.compile(r"^show interfaces(?: (?P<intf>.+?))? status$"), "status"),
+    (
+        re.compile(r"^show interfaces(?: (?P<intf>.+?))? counters errors$"),
+        "counters_errors",
+    ),
+    (
+        re.compile(r"^show interfaces(?: (?P<intf>.+?))? counters rates$"),
+        "counters_rates",
+    ),
+    (re.compile(r"^show interfaces(?: (?P<intf>.+?))? counters$"), "counters"),
+    (re.compile(r"^show ip interface(?: (?P<intf>.+))?$"), "ip_interfaces"),
+    (re.compile(r"^show interfaces(?: (?P<intf>.+))?$"), "interfaces"),
+    (re.compile(r"^show vlan(?: id (?P<vlans>.+))?$"), "vlans"),
+    (
+        re.compile(
+            r"^show vrrp(?: group (?P<group>\d+))?(?: interface (?P<intf>\S+))?"
+            r"(?: vrf (?P<vrf>\S+))? all$"
+        ),
+        "vrrp",
+    ),
+    (
+        re.compile(
+            r"^show ip route(?: vrf (?P<vrf>\S+))?(?: (?P<dest>[\d.]+(?:/\d+)?) detail"
+            r"| (?P<protocol>[a-z]+))?$"
+        ),
+        "routes",
+    ),
+]
+# Outputs that do not change over time and are cached per command
+CACHEABLE = {"transceiver", "ip_interfaces", "vlans", "vrrp", "routes"}
+# Outputs cached per profile, the least recently used are dropped (i.e. the outputs of
+# many different ranges or route lookups)
+CACHE_SIZE = 256
+
+
+class CommandFailure(Exception):
+    "Raised by the simulated device when a command cannot be run"
+
+    def __init__(self, message, code=1002):
+        super().__init__(message)
+        self.code = code
+
+
+def expand_range(expression, default_prefix=None):
+    """
+    Expands an EOS range expression to a list of names. For example:
+    `Ethernet1-3,5` -> `['Ethernet1', 'Ethernet2', 'Ethernet3', 'Ethernet5']`
+    """
+    pattern = re.compile(
+        r"^(?P<prefix>[A-Za-z-]*?)(?P<base>(\d+/)*)(?P<start>\d+)" r"(-(?P<end>\d+))?$"
+    )
+    names = []
+    prefix = default_prefix or ""
+    for token in expression.replace(" ", "").split(","):
+        match = pattern.match(token)
+        if not match:
+            names.append(interface_converter(token))
+            continue
+        if match.group("prefix"):
+            prefix = interface_converter(match.group("prefix") + "0")[:-1]
+        start = int(match.group("start"))
+        end = int(match.group("end") or start)
+        names.extend(f"{prefix}{match.group('base')}{x}" for x in range(start, end + 1))
+    return names
+
+
+class SyntheticEos:
+    """
+    Generates synthetic EOS JSON outputs at a configurable scale. The same profile can
+    be shared by many simulated devices, the static outputs are generated only once.
+
+    Attributes:
+
+    - `ports`: (int) Number of EthernetX interfaces
+    - `vlans`: (int) Number of VLANs, each one with a routed VlanX interface
+    - `vrfs`: (int) Number of VRFs. `default` plus `VRF1`, `VRF2`...
+    - `routes`: (int) Number of /24 routes per VRF
+    - `vrrp_groups`: (int) Number of VRRP groups, spread over the VlanX interfaces
+    (none without VLANs)
+    - `seed`: (int) Seed for the random values generated
+    """
+
+    def __init__(self, ports=48, vlans=10, vrfs=1, routes=1000, vrrp_groups=0, seed=0):
+        self.ports = ports
+        self.vlans = vlans
+        self.vrfs = vrfs
+        self.routes = routes
+        self.vrrp_groups = vrrp_groups
+        self.seed = seed
+        self.boot_time = time.time() - 86400.0
+        self._cache = OrderedDict()
+
+        self.vlan_ids = [10 + x for x in range(vlans)]
+        self.vrf_names = ["default"] + [f"VRF{x}" for x in range(1, vrfs)]
+        self.interface_names = (
+            [f"Ethernet{x}" for x in range(1, ports + 1)]
+            + ["Management1"]
+            + [f"Vlan{x}" for x in self.vlan_ids]
+        )
+        self._interface_set = set(self.interface_names)
+
+    def output(self, command):
+        "Returns the output of the command as a JSON string"
+        if command == "enable":
+            return "{}"
+        for pattern, name in COMMAND_PATTERNS:
+            match = pattern.match(command)
+            if match:
+                break
+        else:
+            raise CommandFailure(f"Invalid input (at token 0: '{command}')")
+
+        if name in CACHEABLE and command in self._cache:
+            self._cache.move_to_end(command)
+            return self._cache[command]
+        result = json.dumps(getattr(self, f"_{name}")(**match.groupdict()))
+        if name in CACHEABLE:
+            self._cache[command] = result
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
+
+    # Helpers
+    def _select(self, expression):
+        if not expression:
+            return self.interface_names
+        names = [x for x in expand_range(expression) if x in self._interface_set]
+        if not names:
+            raise CommandFailure("Interface does not exist")
+        return names
+
+    @staticmethod
+    def _mac(number):
+        value = f"{0x001c73000000 + number:012x}"
+        return ".".join(value[x : x + 4] for x in range(0, 12, 4))
+
+    def _vlan_address(self, vlan_id, host):
+        return f"10.{200 + vlan_id // 256}.{vlan_id % 256}.{host}"
+
+    def _index(self, name):
+        return self.interface_names.index(name)
+
+    # Command outputs
+    def _hostname(self):
+        return {"hostname": "simulated", "fqdn": "simulated"}
+
+    def _version(self):
+        return {
+            "modelName": "vEOS",
+            "internalVersion": "4.21.5F-simulated",
+            "systemMacAddress": self._mac(0),
+            "serialNumber": "SIM00000000",
+            "memTotal": 2017324,
+            "bootupTimestamp": self.boot_time,
+            "memFree": 1223456,
+            "version": "4.21.5F",
+            "architecture": "i386",
+            "isIntlVersion": False,
+            "internalBuildId": "00000000-0000-0000-0000-000000000000",
+            "hardwareRevision": "",
+            "uptime": time.time() - self.boot_time,
+        }
+
+    def _interface(self, name, now):
+        number = self._index(name) + 1
+        rnd = random.Random(self.seed + number)
+        routed = not name.startswith("Ethernet")
+        connected = number % 7 != 0
+        elapsed = now - self.boot_time
+        in_rate = rnd.uniform(1e6, 1e9) if connected else 0.0
+        out_rate = rnd.uniform(1e6, 1e9) if connected else 0.0
+        counters = {
+            "inOctets": int(in_rate * elapsed / 8),
+            "inUcastPkts": int(in_rate * elapsed / 8000),
+            "inMulticastPkts": int(elapsed),
+            "inBroadcastPkts": int(elapsed / 10),
+            "inDiscards": 0,
+            "outOctets": int(out_rate * elapsed / 8),
+            "outUcastPkts": int(out_rate * elapsed / 8000),
+            "outMulticastPkts": int(elapsed),
+            "outBroadcastPkts": int(elapsed / 10),
+            "outDiscards": 0,
+            "totalInErrors": 0,
+            "totalOutErrors": 0,
+            "linkStatusChanges": 2,
+            "lastClear": self.boot_time,
+            "inputErrorsDetail": {
+                "runtFrames": 0,
+                "rxPause": 0,
+                "fcsErrors": 0,
+                "alignmentErrors": 0,
+                "giantFrames": 0,
+                "symbolErrors": 0,
+            },
+            "outputErrorsDetail": {
+                "collisions": 0,
+                "deferredTransmissions": 0,
+                "txPause": 0,
+                "lateCollisions": 0,
+            },
+        }
+        return {
+            "name": name,
+            "forwardingModel": "routed" if routed else "bridged",
+            "lineProtocolStatus": "up" if connected else "down",
+            "interfaceStatus": "connected" if connected else "notconnect",
+            "hardware": "vlan" if name.startswith("Vlan") else "ethernet",
+            "mtu": 1500 if routed else 9214,
+            "physicalAddress": self._mac(number),
+            "description": f"SIMULATED-{name.upper()}",
+            "bandwidth": 10000000000 if not routed else 0,
+            "duplex": "duplexFull",
+            "lastStatusChangeTimestamp": self.boot_time + 60.0,
+            "interfaceCounters": counters,
+            "interfaceStatistics": {
+                "updateInterval": 300.0,
+                "inBitsRate": in_rate,
+                "inPktsRate": in_rate / 8000,
+                "outBitsRate": out_rate,
+                "outPktsRate": out_rate / 8000,
+            },
+        }
+
+    def _interfaces(self, intf=None):
+        now = time.time()
+        return {"interfaces": {x: self._interface(x, now) for x in self._select(intf)}}
+
+    def _status(self, intf=None):
+        statuses = {}
+        for name, data in self._interfaces(intf)["interfaces"].items():
+            statuses[name] = {
+                "description": data["description"],
+                "linkStatus": data["interfaceStatus"],
+                "lineProtocolStatus": data["lineProtocolStatus"],
+                "bandwidth": data["bandwidth"],
+                "duplex": data["duplex"],
+                "interfaceType": "10GBASE-SR" if data["bandwidth"] else "",
+                "vlanInformation": {
+                    "interfaceMode": data["forwardingModel"],
+                    "interfaceForwardingModel": data["forwardingModel"],
+                },
+            }
+        return {"interfaceStatuses": statuses}
+
+    def _counters(self, intf=None):
+        keys = [
+            "inOctets",
+            "inUcastPkts",
+            "inMulticastPkts",
+            "inBroadcastPkts",
+            "inDiscards",
+            "outOctets",
+            "outUcastPkts",
+            "outMulticastPkts",
+            "outBroadcastPkts",
+            "outDiscards",
+        ]
+        interfaces = {}
+        for name, data in self._interfaces(intf)["interfaces"].items():
+            interfaces[name] = {x: data["interfaceCounters"][x] for x in keys}
+        return {"interfaces": interfaces}
+
+    def _counters_errors(self, intf=None):
+        counters = {}
+        for name, data in self._interfaces(intf)["interfaces"].items():
+            errors = data["interfaceCounters"]["inputErrorsDetail"]
+            counters[name] = {
+                "inErrors": data["interfaceCounters"]["totalInErrors"],
+                "outErrors": data["interfaceCounters"]["totalOutErrors"],
+                "fcsErrors": errors["fcsErrors"],
+                "alignmentErrors": errors["alignmentErrors"],
+                "symbolErrors": errors["symbolErrors"],
+                "frameTooShorts": errors["runtFrames"],
+                "frameTooLongs": errors["giantFrames"],
+            }
+        return {"interfaceErrorCounters": counters}
+
+    def _counters_rates(self, intf=None):
+        interfaces = {}
+        for name, data in self._interfaces(intf)["interfaces"].items():
+            statistics = data["interfaceStatistics"]
+            interfaces[name] = {
+                "description": data["description"],
+                "interval": int(statistics["updateInterval"]),
+                "inBpsRate": statistics["inBitsRate"],
+                "inPktsRate": statistics["inPktsRate"],
+                "inPpsRate": statistics["inPktsRate"],
+                "outBpsRate": statistics["outBitsRate"],
+                "outPktsRate": statistics["outPktsRate"],
+                "outPpsRate": statistics["outPktsRate"],
+            }
+        return {"interfaces": interfaces}
+
+    def _ip_interfaces(self, intf=None):
+        interfaces = {}
+        for name in self._select(intf):
+            if name.startswith("Ethernet"):
+                continue
+            if name == "Management1":
+                address, vrf = "192.168.0.2", "default"
+            else:
+                address = self._vlan_address(int(name[4:]), 2)
+                vrf = self.vrf_names[int(name[4:]) % len(self.vrf_names)]
+            interfaces[name] = {
+                "name": name,
+                "vrf": vrf,
+                "interfaceAddress": {
+                    "primaryIp": {"address": address, "maskLen": 24},
+                    "secondaryIpsOrderedList": [],
+                    "dhcp": False,
+                },
+            }
+        return {"interfaces": interfaces}
+
+    def _transceiver(self, intf=None):
+        interfaces = {}
+        for name in self._select(intf):
+            if not name.startswith("Ethernet"):
+                continue
+            rnd = random.Random(self.seed + self._index(name))
+            interfaces[name] = {
+                "txPower": round(rnd.uniform(-3.0, -1.5), 2),
+                "rxPower": round(rnd.uniform(-6.0, -2.0), 2),
+                "vendorSn": f"SIMSN{self._index(name):06d}",
+                "mediaType": "10GBASE-SR",
+            }
+        return {"interfaces": interfaces}
+
+    def _vlans(self, vlans=None):
+        if vlans:
+            selected = set()
+            for token in vlans.replace(" ", "").split(","):
+                start, _, end = token.partition("-")
+                selected.update(range(int(start), int(end or start) + 1))
+        else:
+            selected = set([1] + self.vlan_ids)
+        result = {}
+        for vlan_id in sorted(selected):
+            if vlan_id != 1 and vlan_id not in self.vlan_ids:
+                continue
+            members = self.interface_names[: self.ports][vlan_id % 4 :: 4]
+            result[str(vlan_id)] = {
+                "status": "active",
+                "name": "default" if vlan_id == 1 else f"VLAN{vlan_id:04d}",
+                "interfaces": {x: {"privatePromoted": False} for x in members},
+                "dynamic": False,
+            }
+        if not result:
+            raise CommandFailure("VLAN(s) not found")
+        return {"sourceDetail": "", "vlans": result}
+
+    def _vrrp(self, group=None, intf=None, vrf=None):
+        routers = []
+        if not self.vlan_ids:
+            # The groups are on the VlanX interfaces
+            return {"virtualRouters": routers}
+        for number in range(1, self.vrrp_groups + 1):
+            vlan_id = self.vlan_ids[(number - 1) % len(self.vlan_ids)]
+            interface = f"Vlan{vlan_id}"
+            vrf_name = self.vrf_names[vlan_id % len(self.vrf_names)]
+            if group is not None and int(group) != number:
+                continue
+            if intf is not None and interface_converter(intf) != interface:
+                continue
+            if vrf not in (None, "all") and vrf != vrf_name:
+                continue
+            routers.append(
+                {
+                    "interface": interface,
+                    "groupId": number,
+                    "vrfName": vrf_name,
+                    "description": f"VRRP-{number}",
+                    "state": "master" if number % 2 else "backup",
+                    "version": 2,
+                    "virtualIp": self._vlan_address(vlan_id, 1),
+                    "virtualIpSecondary": [],
+                    "virtualMac": "00:00:5e:00:01:%02x" % (number % 256),
+                    "masterAddr": self._vlan_address(vlan_id, 2),
+                    "priority": 100,
+                    "skewTime": 0.609,
+                    "preempt": True,
+                    "preemptDelay": 0,
+                    "preemptReload": 0,
+                    "macAddressInterval": 30,
+                    "masterInterval": 1,
+                    "masterDownInterval": 3609,
+                    "vrrpAdvertInterval": 1,
+                    "vrIdDisabled": False,
+                    "vrIdDisabledReason": "",
+                    "bfdPeerAddr": "0.0.0.0",
+                    "trackedObjects": [],
+                }
+            )
+        return {"virtualRouters": routers}
+
+    def _route(self, number):
+        protocol = PROTOCOLS[number % len(PROTOCOLS)]
+        port = self.interface_names[number % max(self.ports, 1)]
+        route = {
+            "kernelProgrammed": True,
+            "directlyConnected": protocol == "connected",
+            "routeAction": "forward",
+            "routeLeaked": False,
+            "hardwareProgrammed": True,
+            "routeType": protocol,
+            "vias": [{"interface": port}],
+        }
+        if protocol != "connected":
+            route["vias"][0]["nexthopAddr"] = str(
+                IPv4Address((10 << 24) + (number % 65536 << 8) + 1)
+            )
+            route["metric"] = number % 100
+            route["preference"] = {"static": 1, "ospf": 110}.get(protocol, 200)
+        return route
+
+    @staticmethod
+    def _prefix(number):
+        return f"{IPv4Address((11 << 24) + (number << 8))}/24"
+
+    def _routes(self, vrf=None, dest=None, protocol=None):
+        if vrf == "all":
+            vrfs = self.vrf_names
+        else:
+            vrfs = [vrf or "default"]
+            if vrfs[0] not in self.vrf_names:
+                raise CommandFailure(
+                    f"IP Routing table for VRF {vrfs[0]} does not exist"
+                )
+
+        if dest:
+            network = IPv4Network(dest, strict=False)
+            number = (int(network.network_address) - (11 << 24)) >> 8
+            routes = {}
+            if 0 <= number < self.routes and network.prefixlen >= 24:
+                routes[self._prefix(number)] = self._route(number)
+            return {"vrfs": {vrfs[0]: {"routes": routes}}}
+
+        wanted = PROTOCOL_FILTERS.get(protocol) if protocol else None
+        if protocol and wanted is None:
+            raise CommandFailure(f"Invalid input (at token 3: '{protocol}')")
+        result = {}
+        for vrf_name in vrfs:
+            routes = {}
+            for number in range(self.routes):
+                route = self._route(number)
+                if wanted and route["routeType"] not in wanted:
+                    continue
+                routes[self._prefix(number)] = route
+            result[vrf_name] = {
+                "routes": routes,
+                "allRoutesProgrammedKernel": True,
+                "routingDisabled": False,
+                "allRoutesProgrammedHardware": True,
+                "defaultRouteState": "notSet",
+            }
+        return {"vrfs": result}
+
+
+class SimulatedDevice:
+    """
+    A simulated EOS device served by the `EapiFarm`.
+
+    Attributes:
+
+    - `name`: (str) Hostname of the device. Also used as the virtual host name
+    - `profile`: (SyntheticEos) Generator of the outputs
+    """
+
+    def __init__(self, name, profile):
+        self.name = name
+        self.profile = profile
+
+    def run_cmds(self, commands):
+        "Returns the JSON output (as string) of each command"
+        outputs = []
+        for command in commands:
+            if isinstance(command, dict):
+                command = command.get("cmd")
+            command = " ".join(command.split())
+            if command == "show hostname":
+                outputs.append(json.dumps({"hostname": self.name, "fqdn": self.name}))
+            else:
+                outputs.append(self.profile.output(command))
+        return outputs
+
+
+class EapiFarm:
+    """
+    Serves many `SimulatedDevice` on a single asyncio event loop.
+
+    Attributes:
+
+    - `devices`: (int) Number of simulated devices
+    - `profile`: (SyntheticEos) Profile shared by all the devices
+    - `host`: (str) Address to listen on
+    - `base_port`: (int) First port to use. If 0 every port is chosen by the OS
+    - `ports`: (int) Number of ports to listen on. Defaults to one per device. When
+    there are less ports than devices, the devices share the ports as virtual hosts and
+    are selected by the `Host` header (their names must resolve to `host`)
+    - `latency`: (float) Seconds added before every response
+    - `jitter`: (float) Random extra seconds (up to this value) added to the latency
+    - `error_rate`: (float) Probability (0.0 - 1.0) of a request failing with a command
+    error
+    - `seed`: (int) Seed for the injected errors and jitter
+    """
+
+    def __init__(
+        self,
+        devices=1,
+        profile=None,
+        host="127.0.0.1",
+        base_port=0,
+        ports=None,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        seed=0,
+    ):
+        self.profile = profile or SyntheticEos()
+        self.devices = [
+            SimulatedDevice(f"sim{x:04d}", self.profile) for x in range(devices)
+        ]
+        self.host = host
+        self.base_port = base_port
+        self.ports = ports or devices
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._servers = []
+        self._vhosts = {}
+        self._loop = None
+        self._thread = None
+        self.addresses = []
+
+    # Request handling
+    def respond(self, device, body):
+        "Returns the JSON-RPC response of the request body for the device"
+        request = json.loads(body)
+        commands = request.get("params", {}).get("cmds", [])
+        reqid = json.dumps(request.get("id"))
+        try:
+            if self.error_rate and self._random.random() < self.error_rate:
+                index = self._random.randrange(len(commands)) if commands else 0
+                raise CommandFailure(
+                    f"CLI command {index + 1} of {len(commands)} "
+                    f"'{commands[index] if commands else ''}' failed: "
+                    "simulated error"
+                )
+            outputs = device.run_cmds(commands)
+        except CommandFailure as err:
+            error = json.dumps(
+                {
+                    "code": err.code,
+                    "message": str(err),
+                    "data": [{"errors": [str(err)]}],
+                }
+            )
+            return f'{{"jsonrpc": "2.0", "error": {error}, "id": {reqid}}}'
+
+        return f'{{"jsonrpc": "2.0", "result": [{", ".join(outputs)}], "id": {reqid}}}'
+
+    def _device(self, port, host_header):
+        devices = self._vhosts[port]
+        if len(devices) == 1 or not host_header:
+            return devices[0]
+        name = host_header.rsplit(":", 1)[0]
+        for device in devices:
+            if device.name == name:
+                return device
+        return devices[0]
+
+    async def _handle(self, reader, writer, port):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            headers = {}
+            for line in lines[1:]:
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            payload = self.respond(self._device(port, headers.get("host")), body)
+            if self.latency or self.jitter:
+                await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+            data = payload.encode("utf-8")
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode()
+                + data
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    # Life cycle
+    async def _bind(self):
+        for number in range(self.ports):
+            port = self.base_port + number if self.base_port else 0
+            server = await asyncio.start_server(
+                lambda r, w, n=number: self._handle(r, w, self._port_map[n]),
+                self.host,
+                port,
+            )
+            self._servers.append(server)
+        self._port_map = [x.sockets[0].getsockname()[1] for x in self._servers]
+        for number, device in enumerate(self.devices):
+            port = self._port_map[number % self.ports]
+            self._vhosts.setdefault(port, []).append(device)
+            self.addresses.append((device.name, self.host, port))
+
+    def _run(self, ready):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._bind())
+        ready.set()
+        self._loop.run_forever()
+        for server in self._servers:
+            server.close()
+        self._loop.run_until_complete(
+            asyncio.gather(*[x.wait_closed() for x in self._servers])
+        )
+        self._loop.close()
+
+    def start(self):
+        "Starts serving on a background thread. Returns once all ports are bound"
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        "Stops serving and releases the ports"
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    def serve_forever(self):
+        "Starts serving on the current thread until interrupted"
+        self.start()
+        try:
+            self._thread.join()
+        except KeyboardInterrupt:
+            self.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_ignore):
+        self.stop()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Simulated EOS eAPI device farm")
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=9000)
+    parser.add_argument("--ports", type=int, default=None)
+    parser.add_argument("--interfaces", type=int, default=48)
+    parser.add_argument("--vlans", type=int, default=10)
+    parser.add_argument("--vrfs", type=int, default=1)
+    parser.add_argument("--routes", type=int, default=1000)
+    parser.add_argument("--vrrp-groups", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    opts = parser.parse_args(args)
+
+    profile = SyntheticEos(
+        ports=opts.interfaces,
+        vlans=opts.vlans,
+        vrfs=opts.vrfs,
+        routes=opts.routes,
+        vrrp_groups=opts.vrrp_groups,
+        seed=opts.seed,
+    )
+    farm = EapiFarm(
+        devices=opts.devices,
+        profile=profile,
+        host=opts.host,
+        base_port=opts.base_port,
+        ports=opts.ports,
+        latency=opts.latency,
+        jitter=opts.jitter,
+        error_rate=opts.error_rate,
+        seed=opts.seed,
+    )
+    farm.start()
+    print(f"Serving {opts.devices} devices on {farm.host}: ports {farm._port_map}")
+    try:
+        farm._thread.join()
+    except KeyboardInterrupt:
+        farm.stop()
+
+
+if __name__ == "__main__":
+    main()
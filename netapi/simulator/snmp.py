@@ -0,0 +1,244 @@
+"""
+Local SNMPv2c agent, in the spirit of `snmpsim`.
+
+`SnmpAgent` answers the GET, GETNEXT and GETBULK requests on a local UDP port from
+MIBs in memory (dict of OID -> value, see `netapi.connector.snmp.ber` for the value
+types). Like the data files of `snmpsim`, each community is a different simulated
+device, so a single agent serves a fleet.
+
+The MIBs can be:
+
+- Loaded from `snmpsim` data files (`.snmprec`, `OID|TYPE|VALUE` lines) with
+`read_snmprec()`
+- Generated from a `SyntheticEos` profile with `interfaces_mib()` (IF-MIB of the
+interfaces of `show interfaces`)
+- Callables returning the MIB, called on each request. For example
+`partial(interfaces_mib, profile)` serves counters that grow with time
+
+**Example:**
+
+```python
+profile = SyntheticEos(ports=48)
+mibs = {f"device{x}": partial(interfaces_mib, profile) for x in range(100)}
+with SnmpAgent(mibs) as agent:
+    host, port = agent.address
+    devices = [Device(host=host, port=port, community=x) for x in mibs]
+    fleet = collect_many(devices, fields={"counters"})
+```
+"""
+import json
+import bisect
+import threading
+import socketserver
+from netapi.connector.snmp.ber import (
+    GET,
+    GET_BULK,
+    GET_NEXT,
+    RESPONSE,
+    TOO_BIG,
+    END_OF_MIB_VIEW,
+    NO_SUCH_INSTANCE,
+    Counter32,
+    Counter64,
+    Gauge32,
+    IpAddress,
+    TimeTicks,
+    decode_message,
+    encode_message,
+    oid_tuple,
+)
+
+
+__all__ = ["SnmpAgent", "interfaces_mib", "read_snmprec"]
+
+IF_ENTRY = (1, 3, 6, 1, 2, 1, 2, 2, 1)
+IF_X_ENTRY = (1, 3, 6, 1, 2, 1, 31, 1, 1, 1)
+
+# `.snmprec` types (ASN.1 tags)
+SNMPREC_TYPES = {
+    2: int,
+    4: lambda x: x if isinstance(x, bytes) else x.encode(),
+    6: oid_tuple,
+    64: IpAddress,
+    65: lambda x: Counter32(int(x)),
+    66: lambda x: Gauge32(int(x)),
+    67: lambda x: TimeTicks(int(x)),
+    70: lambda x: Counter64(int(x)),
+}
+
+
+def read_snmprec(path):
+    """
+    Returns the MIB of a `snmpsim` data file. The values of the types with an `x`
+    suffix (i.e. `4x`) are hexadecimal
+    """
+    mib = {}
+    with open(path) as stream:
+        for line in stream:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            oid, kind, value = line.split("|", 2)
+            if kind.endswith("x"):
+                kind, value = kind[:-1], bytes.fromhex(value)
+                if kind != "4":
+                    value = value.decode()
+            mib[oid_tuple(oid)] = SNMPREC_TYPES[int(kind)](value)
+    return mib
+
+
+def interfaces_mib(profile):
+    "Returns the IF-MIB (`ifTable` and `ifXTable`) of the interfaces of the profile"
+    interfaces = json.loads(profile.output("show interfaces"))["interfaces"]
+    mib = {}
+    for if_index, (name, data) in enumerate(interfaces.items(), start=1):
+        counters = data["interfaceCounters"]
+        columns = {
+            IF_ENTRY + (1,): if_index,
+            IF_ENTRY + (2,): name.encode(),
+            IF_ENTRY + (4,): data["mtu"],
+            IF_ENTRY + (6,): bytes.fromhex(data["physicalAddress"].replace(".", "")),
+            IF_ENTRY + (7,): 2 if data["interfaceStatus"] == "disabled" else 1,
+            IF_ENTRY + (8,): 1 if data["lineProtocolStatus"] == "up" else 2,
+            IF_ENTRY + (13,): Counter32(counters["inDiscards"] % 2**32),
+            IF_ENTRY + (14,): Counter32(counters["totalInErrors"] % 2**32),
+            IF_ENTRY + (19,): Counter32(counters["outDiscards"] % 2**32),
+            IF_ENTRY + (20,): Counter32(counters["totalOutErrors"] % 2**32),
+            IF_X_ENTRY + (1,): name.encode(),
+            IF_X_ENTRY + (6,): Counter64(counters["inOctets"]),
+            IF_X_ENTRY + (7,): Counter64(counters["inUcastPkts"]),
+            IF_X_ENTRY + (8,): Counter64(counters["inMulticastPkts"]),
+            IF_X_ENTRY + (9,): Counter64(counters["inBroadcastPkts"]),
+            IF_X_ENTRY + (10,): Counter64(counters["outOctets"]),
+            IF_X_ENTRY + (11,): Counter64(counters["outUcastPkts"]),
+            IF_X_ENTRY + (12,): Counter64(counters["outMulticastPkts"]),
+            IF_X_ENTRY + (13,): Counter64(counters["outBroadcastPkts"]),
+            IF_X_ENTRY + (15,): Gauge32(data["bandwidth"] // 1000000),
+            IF_X_ENTRY + (18,): data["description"].encode(),
+        }
+        for column, value in columns.items():
+            mib[column + (if_index,)] = value
+    return mib
+
+
+class _View:
+    "Sorted OIDs of a MIB, for the GETNEXT lookups"
+
+    def __init__(self, mib):
+        self.mib = mib
+        self.oids = sorted(mib)
+
+    def next(self, oid):
+        position = bisect.bisect_right(self.oids, oid)
+        if position >= len(self.oids):
+            return oid, END_OF_MIB_VIEW
+        oid = self.oids[position]
+        return oid, self.mib[oid]
+
+
+class _AgentHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        data, sock = self.request
+        response = self.server.agent.respond(data)
+        if response is not None:
+            sock.sendto(response, self.client_address)
+
+
+class SnmpAgent:
+    """
+    Answers the SNMPv2c requests of the communities of `mibs` (community -> MIB, or
+    callable returning the MIB). The requests of unknown communities are dropped.
+    `port` 0 (default) assigns a free port, see `address`.
+
+    - `max_size`: Maximum size of the responses, bigger ones are a `tooBig` error
+    - `drop`: Number of requests to drop before answering (to test the retries)
+
+    `requests` counts the requests answered. Used as a context manager it is started
+    and stopped
+    """
+
+    def __init__(self, mibs, host="127.0.0.1", port=0, max_size=65507, drop=0):
+        self.mibs = mibs
+        self.max_size = max_size
+        self.drop = drop
+        self.requests = 0
+        self._views = {}
+        self._server = socketserver.ThreadingUDPServer((host, port), _AgentHandler)
+        self._server.daemon_threads = True
+        self._server.agent = self
+        self.address = self._server.server_address
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def view(self, community):
+        "Returns the `_View` of the MIB of the community, None if not known"
+        mib = self.mibs.get(community)
+        if mib is None:
+            return None
+        if callable(mib):
+            return _View(mib())
+        if community not in self._views:
+            self._views[community] = _View(mib)
+        return self._views[community]
+
+    def respond(self, data):
+        "Returns the response to a request message, None if it is dropped"
+        try:
+            request = decode_message(data)
+        except ValueError:
+            return None
+        with self._lock:
+            if self.drop:
+                self.drop -= 1
+                return None
+        view = self.view(request.community)
+        if view is None or request.pdu_type not in (GET, GET_NEXT, GET_BULK):
+            return None
+
+        oids = [x for x, _ in request.varbinds]
+        if request.pdu_type == GET:
+            varbinds = [(x, view.mib.get(x, NO_SUCH_INSTANCE)) for x in oids]
+        elif request.pdu_type == GET_NEXT:
+            varbinds = [view.next(x) for x in oids]
+        else:
+            non_repeaters = max(request.error_status, 0)
+            varbinds = [view.next(x) for x in oids[:non_repeaters]]
+            repeaters = oids[non_repeaters:]
+            for _ in range(max(request.error_index, 0) if repeaters else 0):
+                row = [view.next(x) for x in repeaters]
+                varbinds.extend(row)
+                repeaters = [x for x, _ in row]
+                if all(x is END_OF_MIB_VIEW for _, x in row):
+                    break
+
+        response = encode_message(
+            request.community, RESPONSE, request.request_id, varbinds
+        )
+        if len(response) > self.max_size:
+            response = encode_message(
+                request.community,
+                RESPONSE,
+                request.request_id,
+                request.varbinds,
+                error_status=TOO_BIG,
+            )
+        with self._lock:
+            self.requests += 1
+        return response
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_ignore):
+        self.stop()
@@ -0,0 +1,88 @@
+"""
+Local stand-in of a streaming telemetry server.
+
+`TelemetryReplay` serves a JSON lines gNMI stream (see `netapi.net.telemetry`) on a
+local TCP port: for each client it reads the `SubscribeRequest` line and replays the
+recorded `SubscribeResponse` messages, with an optional delay between them, and then
+closes the stream. The requests received are kept on `requests`.
+
+The messages can be recorded from a real stream (one JSON message per line) and loaded
+with `from_file()`.
+
+**Example:**
+
+```python
+with TelemetryReplay.from_file("leaf1.jsonl") as server:
+    host, port = server.address
+    TelemetryClient(host, port, interfaces).run()
+```
+"""
+import json
+import time
+import socketserver
+import threading
+
+
+__all__ = ["TelemetryReplay"]
+
+
+class _ReplayHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        replay = self.server.replay
+        request = self.rfile.readline()
+        if not request:
+            return
+        replay.requests.append(json.loads(request))
+        try:
+            for message in replay.messages:
+                if replay.delay:
+                    time.sleep(replay.delay)
+                self.wfile.write(json.dumps(message).encode() + b"\n")
+                self.wfile.flush()
+        except OSError:
+            # The client closed the stream
+            pass
+
+
+class _ReplayServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class TelemetryReplay:
+    """
+    Replays the `messages` to each client. `port` 0 (default) assigns a free port, see
+    `address`. Used as a context manager it is started and stopped
+    """
+
+    def __init__(self, messages, host="127.0.0.1", port=0, delay=0.0):
+        self.messages = list(messages)
+        self.delay = delay
+        self.requests = []
+        self._server = _ReplayServer((host, port), _ReplayHandler)
+        self._server.replay = self
+        self.address = self._server.server_address
+        self._thread = None
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        "Loads the messages recorded on a JSON lines file"
+        with open(path) as stream:
+            return cls([json.loads(x) for x in stream if x.strip()], **kwargs)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_ignore):
+        self.stop()
@@ -0,0 +1,123 @@
+import time
+import pytest
+from dataclasses import dataclass
+from netapi.connector import DeviceBuilder
+from netapi.connector.device import DeviceBase
+from netapi.connector.replay.replayer import Recorder, RecordStore, Device
+from netapi.net import VlanBuilder
+
+
+VLAN_OUTPUTS = [
+    {
+        "show vlan": {
+            "sourceDetail": "",
+            "vlans": {
+                "1": {
+                    "status": "active",
+                    "name": "default",
+                    "interfaces": {},
+                    "dynamic": False,
+                },
+                "7": {
+                    "status": "active",
+                    "name": "TEST_VLAN",
+                    "interfaces": {"Ethernet1": {"privatePromoted": False}},
+                    "dynamic": False,
+                },
+            },
+        }
+    },
+    {
+        "show vlan": {
+            "sourceDetail": "",
+            "vlans": {
+                "7": {
+                    "status": "suspended",
+                    "name": "TEST_VLAN",
+                    "interfaces": {"Ethernet1": {"privatePromoted": False}},
+                    "dynamic": False,
+                }
+            },
+        }
+    },
+]
+
+
+@dataclass
+class FakeDevice(DeviceBase):
+    "Connector returning canned outputs in order"
+
+    def __post_init__(self, **_ignore):
+        super().__post_init__(**_ignore)
+        self.metadata.implementation = "EOS-PYEAPI"
+        self._outputs = list(VLAN_OUTPUTS)
+
+    def run(self, commands, silent=False, **kwargs):
+        return self._outputs.pop(0)
+
+
+@pytest.fixture
+def recordings(tmp_path):
+    recorder = Recorder(FakeDevice(host="lab01"), path=tmp_path)
+    recorder.run(["show vlan"])
+    recorder.run(["show vlan"])
+    return tmp_path
+
+
+class TestRecorder:
+    def test_delegation(self, tmp_path):
+        recorder = Recorder(FakeDevice(host="lab01"), path=tmp_path)
+        assert recorder.host == "lab01"
+        assert recorder.metadata.implementation == "EOS-PYEAPI"
+
+    def test_store(self, recordings):
+        store = RecordStore(recordings)
+        entries = store.index("lab01")
+        assert [x["command"] for x in entries] == ["show vlan", "show vlan"]
+        assert entries[0]["implementation"] == "EOS-PYEAPI"
+        records = store.open("lab01")
+        assert store.load(records, entries[1]) == VLAN_OUTPUTS[1]["show vlan"]
+
+    def test_no_recordings(self, tmp_path):
+        with pytest.raises(ValueError, match="No recordings found for device: lab99"):
+            RecordStore(tmp_path).index("lab99")
+
+
+class TestReplayDevice:
+    def test_instantiation(self, recordings):
+        replay = Device(host="lab01", path=str(recordings))
+        assert replay.metadata.name == "device"
+        assert replay.metadata.implementation == "EOS-PYEAPI"
+        assert replay.commands == ["show vlan"]
+
+    def test_factory(self, recordings):
+        replay = DeviceBuilder().create_device(
+            "replay", host="lab01", path=str(recordings)
+        )
+        assert isinstance(replay, Device)
+
+    @pytest.mark.parametrize("loop,expected", [(True, 2), (False, 1)])
+    def test_run_order(self, recordings, loop, expected):
+        replay = Device(host="lab01", path=str(recordings), loop=loop)
+        assert replay.run("show vlan") == VLAN_OUTPUTS[0]
+        assert replay.run("show vlan") == VLAN_OUTPUTS[1]
+        assert len(replay.run("show vlan")["show vlan"]["vlans"]) == expected
+
+    def test_missing_command(self, recordings):
+        replay = Device(host="lab01", path=str(recordings))
+        assert replay.run(["show version"], silent=True) == {"show version": None}
+        with pytest.raises(ValueError, match="No recording for command: show version"):
+            replay.run(["show version"])
+
+    def test_latency(self, recordings):
+        replay = Device(host="lab01", path=str(recordings), latency=0.05)
+        start = time.monotonic()
+        replay.run("show vlan")
+        assert time.monotonic() - start >= 0.05
+
+    def test_builder(self, recordings):
+        replay = Device(host="lab01", path=str(recordings))
+        vlans = VlanBuilder().get(replay, entity=False)
+        assert sorted(vlans) == [1, 7]
+        assert vlans[7].status == "active"
+        assert vlans.connector is replay
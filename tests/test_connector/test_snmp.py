@@ -0,0 +1,121 @@
+import pytest
+from netapi.connector import DeviceBuilder
+from netapi.connector.snmp import ber
+from netapi.connector.snmp.getbulker import Device, SnmpError, run_many
+from netapi.simulator.snmp import SnmpAgent, read_snmprec
+
+
+IF_NAME = "1.3.6.1.2.1.31.1.1.1.1"
+IF_HC_IN_OCTETS = "1.3.6.1.2.1.31.1.1.1.6"
+MIB = {
+    **{(1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 1, x): f"Ethernet{x}".encode() for x in (1, 2)},
+    **{
+        (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 6, x): ber.Counter64(2**40 * x)
+        for x in (1, 2)
+    },
+    (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 15, 1): ber.Gauge32(10000),
+}
+SNMPREC = """
+# ifName and ifHCInOctets
+1.3.6.1.2.1.31.1.1.1.1.1|4|Ethernet1
+1.3.6.1.2.1.31.1.1.1.1.2|4x|45746865726e657432
+1.3.6.1.2.1.31.1.1.1.6.1|70|1099511627776
+1.3.6.1.2.1.31.1.1.1.6.2|70|2199023255552
+1.3.6.1.2.1.31.1.1.1.15.1|66|10000
+"""
+
+
+@pytest.fixture(scope="module")
+def agent():
+    with SnmpAgent({"public": MIB, "other": {}}) as agent:
+        yield agent
+
+
+def device(agent, **kwargs):
+    host, port = agent.address
+    kwargs.setdefault("community", "public")
+    kwargs.setdefault("timeout", 0.5)
+    return Device(host=host, port=port, **kwargs)
+
+
+class TestBer:
+    @pytest.mark.parametrize(
+        "value",
+        [
+            0,
+            -1,
+            -129,
+            2**31,
+            b"\x00\x1c\x73\x00\x00\x01",
+            ber.Counter32(2**32 - 1),
+            ber.Counter64(2**64 - 1),
+            ber.Gauge32(10),
+            ber.TimeTicks(12345),
+            ber.IpAddress("10.0.0.1"),
+            (1, 3, 6, 1, 4, 1, 30065, 2**31),
+            None,
+            ber.END_OF_MIB_VIEW,
+        ],
+    )
+    def test_round_trip(self, value):
+        message = ber.decode_message(
+            ber.encode_message("public", ber.RESPONSE, 7, [((1, 3, 6, 1), value)])
+        )
+        ((oid, decoded),) = message.varbinds
+        assert oid == (1, 3, 6, 1) and decoded == value
+        assert type(decoded) is type(value)
+        assert message[:6] == (1, "public", ber.RESPONSE, 7, 0, 0)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            ber.decode_message(b"\x30\x10\x02")
+        with pytest.raises(TypeError):
+            ber.encode_value(1.5)
+        assert ber.oid_tuple(".1.3.6.1") == (1, 3, 6, 1) == ber.oid_tuple("1.3.6.1")
+
+
+class TestDevice:
+    def test_run(self, agent):
+        result = device(agent, max_repetitions=1).run([IF_NAME, IF_HC_IN_OCTETS])
+        assert result == {
+            IF_NAME: {"1": b"Ethernet1", "2": b"Ethernet2"},
+            IF_HC_IN_OCTETS: {"1": 2**40, "2": 2**41},
+        }
+        assert isinstance(result[IF_HC_IN_OCTETS]["1"], ber.Counter64)
+        # Tables walked to the end of the MIB and not present
+        assert device(agent).run("1.3.6.1.2.1.31.1.1.1.15") == {
+            "1.3.6.1.2.1.31.1.1.1.15": {"1": 10000}
+        }
+        assert device(agent, community="other").run(IF_NAME) == {IF_NAME: {}}
+
+    def test_device_builder(self, agent):
+        host, port = agent.address
+        snmp = DeviceBuilder().create_device("snmp", "getbulk", host=host, port=port)
+        assert snmp.metadata.implementation == "SNMP-GETBULK"
+        assert snmp.run(IF_NAME)[IF_NAME]["2"] == b"Ethernet2"
+
+    def test_too_big_and_retries(self):
+        with SnmpAgent({"public": MIB}, max_size=100, drop=1) as agent:
+            result = device(agent, max_repetitions=10).run(IF_NAME)
+            assert result[IF_NAME] == {"1": b"Ethernet1", "2": b"Ethernet2"}
+
+        with SnmpAgent({"public": MIB}, max_size=10) as agent:
+            with pytest.raises(SnmpError):
+                device(agent).run(IF_NAME)
+            assert device(agent).run(IF_NAME, silent=True) == {IF_NAME: None}
+
+    def test_timeouts(self, agent):
+        with pytest.raises(TimeoutError):
+            device(agent, community="unknown", timeout=0.1, retries=1).run(IF_NAME)
+
+    def test_run_many(self, agent):
+        jobs = [(device(agent), IF_NAME) for _ in range(20)]
+        jobs.append((device(agent, community="unknown", timeout=0.1), IF_NAME))
+        results = run_many(jobs, concurrency=8)
+        assert results[:20] == [{IF_NAME: {"1": b"Ethernet1", "2": b"Ethernet2"}}] * 20
+        assert isinstance(results[20], TimeoutError)
+
+    def test_snmprec(self, tmp_path):
+        path = tmp_path / "device.snmprec"
+        path.write_text(SNMPREC)
+        assert read_snmprec(path) == MIB
@@ -7,3 +7,24 @@ def test_metadata():
     m1 = Metadata(name="m1", type="test")
     m2 = Metadata(name="m2", type="test")
     assert m1.id != m2.id
+
+
+@pytest.mark.unico
+def test_metadata_lazy_values():
+    m1 = Metadata(name="m1", type="test")
+    assert m1.id == m1.id
+    assert m1.created_at is m1.created_at
+    assert m1.updated_at is None
+    m1.touch()
+    assert m1.updated_at >= m1.created_at
+    assert m1.to_dict()["id"] == str(m1.id)
+
+
+@pytest.mark.unico
+def test_metadata_shared_values():
+    m1 = Metadata(name="interface", type="entity")
+    m2 = Metadata(name="interface", type="entity")
+    m1.implementation = "EOS-PYEAPI"
+    assert m2.implementation is None
+    m2.implementation = "EOS-PYEAPI"
+    assert m1._shared is m2._shared
@@ -1,7 +1,9 @@
 import re
 import pytest
+import bitmath
 import pendulum
 import netapi.net as net
+from netapi.net.compact import compact_class
 from netapi.net.interface import (
     InterfaceBase,
     InterfacesBase,
@@ -9,6 +11,10 @@ from netapi.net.interface import (
     InterfaceIP,
     InterfaceOptical,
     InterfacePhysical,
+    commands_fields,
+    field_commands,
+    interface_range,
+    project_fields,
 )
 from pydantic import ValidationError
 
@@ -1001,6 +1007,37 @@ class TestInterfaceBase:
         del interface_base_obj.metadata
         assert interface_base_obj.to_dict() == INTERFACE_BASE_ASDICT[intf_type]
 
+    def test_apply(self):
+        intf = InterfaceBase(**INTERFACE_BASE_ARGS["eth_up"])
+        physical = intf.physical
+        changes = intf.apply(
+            dict(
+                status="disabled",
+                physical=dict(mtu=1500, bandwidth=1000000000000, mac="28993af85de8"),
+            )
+        )
+        assert sorted(changes) == ["enabled", "physical", "status", "status_up"]
+        assert (intf.status, intf.status_up, intf.enabled) == ("disabled", False, False)
+        assert intf.physical.mtu == bitmath.Byte(1500)
+        # The previous nested object is not modified
+        assert physical.mtu == bitmath.Byte(9000)
+        assert intf.apply(dict(status="disabled")) == {}
+
+    def test_apply_invalid(self):
+        intf = InterfaceBase(**INTERFACE_BASE_ARGS["eth_up"])
+        with pytest.raises(ValidationError, match="Unknown forwarding model: dummy"):
+            intf.apply(dict(description="NEW", forwarding_model="dummy"))
+        assert intf.description is None
+
+    def test_from_partial(self):
+        intf = InterfaceBase.from_partial(name="Eth1", status="connected")
+        assert intf.name == "Ethernet1"
+        assert (intf.status_up, intf.enabled) == (True, True)
+        assert "optical=<not loaded>" in repr(intf)
+        assert "description" not in intf.__dict__
+        with pytest.raises(NotImplementedError):
+            intf.description
+
 
 class TestInterfacesBase:
     "Tests the collection object"
@@ -1028,6 +1065,53 @@ class TestInterfacesBase:
         ):
             InterfacesBase({"eth1": "some_data_structure"})
 
+    def test_interface_range(self):
+        names = ["Eth3", "Ethernet1", "Ethernet2", "Eth49/1", "Ethernet49/2", "Vlan10"]
+        assert interface_range(names + ["Ethernet5", "Po10", "Ethernet1.100"]) == [
+            "Ethernet1-3",
+            "Ethernet5",
+            "Ethernet49/1-2",
+            "Vlan10",
+            "Port-Channel10",
+            "Ethernet1.100",
+        ]
+
+    def test_field_commands(self):
+        commands_map = {
+            "status": [["show status"], ["show all"]],
+            "counters": [["show counters", "show errors"], ["show all"]],
+            "physical": [["show all"]],
+        }
+        assert field_commands(commands_map, {"status", "counters"}) == [
+            "show status",
+            "show counters",
+            "show errors",
+        ]
+        assert field_commands(commands_map, {"status", "physical"}) == ["show all"]
+        assert commands_fields(commands_map, ["show all"]) == set(commands_map)
+        with pytest.raises(ValueError, match="Interface fields not known"):
+            field_commands(commands_map, {"optical"})
+
+    def test_field_projection(self):
+        parsed_data = dict(name="Ethernet1", status="connected", counters=None)
+        assert project_fields(parsed_data, None) is parsed_data
+        assert project_fields(parsed_data, {"status"}) == {
+            "name": "Ethernet1",
+            "status": "connected",
+        }
+        # The sections of the fields not requested are not parsed
+        data = {
+            "interfaceStatus": "connected",
+            "interfaceCounters": {"inputErrorsDetail": "not parsed"},
+        }
+        parser = net.eos.pyeapier.ParseInterface
+        assert parser.data_constructor("Ethernet1", data, fields={"status"}) == {
+            "name": "Ethernet1",
+            "status": "connected",
+        }
+        with pytest.raises(AttributeError):
+            parser.data_constructor("Ethernet1", data)
+
 
 class InterfaceTester:
     "Performs checks on the interface object of each implementation"
@@ -1066,6 +1150,49 @@ class InterfaceTester:
         parsed_dict.pop("metadata")
         assert parsed_dict == INTERFACE_DATA_PARSED[get_os][intf_type]
 
+    @pytest.mark.parametrize(
+        "intf_type", ["l3_vlan", "l2_eth_optical", "l3_portchannel"]
+    )
+    def test_from_parsed(
+        self, get_os, get_implementation, module, intf_imp_parser, intf_type
+    ):
+        raw_data = INTERFACE_DATA[get_os][intf_type]
+        parsed_data = intf_imp_parser.parse(raw_data=raw_data[0])
+        trusted_obj = module.Interface.from_parsed(**parsed_data)
+        assert trusted_obj.metadata.implementation == get_implementation
+
+        # Same result as the validated creation, also when rehydrating from a dict
+        parsed_dict = trusted_obj.to_dict()
+        parsed_dict.pop("metadata")
+        assert parsed_dict == INTERFACE_DATA_PARSED[get_os][intf_type]
+        rehydrated_dict = module.Interface.from_parsed(**parsed_dict).to_dict()
+        rehydrated_dict.pop("metadata")
+        assert rehydrated_dict == parsed_dict
+
+    @pytest.mark.parametrize(
+        "intf_type", ["l3_vlan", "l2_eth_optical", "l3_portchannel"]
+    )
+    def test_compact(
+        self, get_os, get_implementation, module, intf_imp_parser, intf_type
+    ):
+        raw_data = INTERFACE_DATA[get_os][intf_type]
+        parsed_data = intf_imp_parser.parse(raw_data=raw_data[0])
+        compact_intf = compact_class(module.Interface, get_implementation)
+        compact_obj = compact_intf(**parsed_data)
+        assert compact_obj == compact_intf(**parsed_data)
+        assert compact_obj.metadata is compact_intf(**parsed_data).metadata
+        assert compact_obj.metadata.implementation == get_implementation
+        assert compact_obj.name == INTERFACE_DATA_PARSED[get_os][intf_type]["name"]
+        assert compact_obj.status_up is not None
+
+        compact_dict = compact_obj.to_dict()
+        compact_dict.pop("metadata")
+        assert compact_dict == INTERFACE_DATA_PARSED[get_os][intf_type]
+
+        # Compatible with the collections and their indexes
+        interfaces = module.Interfaces({compact_obj.name: compact_obj})
+        assert interfaces.find(status=compact_obj.status) == [compact_obj]
+
 
 @pytest.mark.eos
 class TestInterfaceEos(InterfaceTester):
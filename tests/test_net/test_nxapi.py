@@ -0,0 +1,495 @@
+import time
+import pytest
+import netapi.net as net
+from dataclasses import dataclass
+from netapi.connector.device import DeviceBase
+from netapi.net.nxos.nxapier import (
+    ParseInterface,
+    ParseRoute,
+    ParseVlan,
+    ParseVrrp,
+    table_rows,
+    vlan_ports,
+)
+
+
+# Single rows are dicts, multiple rows are lists
+SHOW_INTERFACE = {
+    "TABLE_interface": {
+        "ROW_interface": [
+            {
+                "interface": "Ethernet1/1",
+                "state": "up",
+                "admin_state": "up",
+                "desc": "UPLINK",
+                "eth_hw_addr": "5254.0012.3456",
+                "eth_ip_addr": "10.0.0.1",
+                "eth_ip_mask": 30,
+                "eth_mtu": "9216",
+                "eth_bw": 10000000,
+                "eth_duplex": "full",
+                "eth_link_flapped": "1d02h",
+                "eth_clear_counters": "never",
+                "eth_load_interval1_rx": 30,
+                "eth_inrate1_bits": "1000",
+                "eth_inrate1_pkts": "1",
+                "eth_outrate1_bits": "2000",
+                "eth_outrate1_pkts": "2",
+                "eth_inucast": 970,
+                "eth_inmcast": 20,
+                "eth_inbcast": 10,
+                "eth_inbytes": 64000,
+                "eth_outucast": 1980,
+                "eth_outmcast": 15,
+                "eth_outbcast": 5,
+                "eth_outbytes": 128000,
+                "eth_inerr": 2,
+                "eth_crc": 1,
+                "eth_runts": 1,
+                "eth_giants": 0,
+                "eth_indiscard": 5,
+                "eth_outdiscard": 6,
+                "eth_outerr": 3,
+            },
+            {
+                "interface": "Ethernet1/2",
+                "state": "down",
+                "state_rsn_desc": "Administratively down",
+                "admin_state": "down",
+                "eth_hw_addr": "5254.0012.3457",
+                "eth_mtu": "1500",
+                "eth_bw": 10000000,
+                "eth_inbytes": 0,
+                "eth_outbytes": 0,
+            },
+            {
+                "interface": "Ethernet1/3",
+                "state": "down",
+                "state_rsn_desc": "XCVR not inserted",
+                "admin_state": "up",
+                "eth_mtu": "1500",
+                "eth_bw": 10000000,
+            },
+            {
+                "interface": "port-channel10",
+                "state": "down",
+                "state_rsn_desc": "No operational members",
+                "admin_state": "up",
+                "eth_mtu": "1500",
+                "eth_bw": 20000000,
+                "eth_members": "Eth1/5, Eth1/6",
+            },
+            {
+                "interface": "Vlan10",
+                "svi_admin_state": "up",
+                "svi_line_proto": "up",
+                "svi_mac": "5254.0012.0010",
+                "svi_ip_addr": "10.0.10.2",
+                "svi_ip_mask": 24,
+                "svi_mtu": 1500,
+                "svi_bw": 1000000,
+            },
+        ]
+    }
+}
+
+SHOW_VLAN_BRIEF = {
+    "TABLE_vlanbriefxbrief": {
+        "ROW_vlanbriefxbrief": [
+            {
+                "vlanshowbr-vlanid": 1,
+                "vlanshowbr-vlanname": "default",
+                "vlanshowbr-vlanstate": "active",
+                "vlanshowbr-shutstate": "noshutdown",
+                "vlanshowplist-ifidx": "Ethernet1/1-3,Ethernet1/7,port-channel10",
+            },
+            {
+                "vlanshowbr-vlanid": "20",
+                "vlanshowbr-vlanname": "PARKED",
+                "vlanshowbr-vlanstate": "suspend",
+                "vlanshowbr-shutstate": "noshutdown",
+            },
+        ]
+    }
+}
+
+SHOW_VLAN_ID = {
+    "TABLE_vlanbriefid": {
+        "ROW_vlanbriefid": {
+            "vlanshowbr-vlanid": "10",
+            "vlanshowbr-vlanname": "USERS",
+            "vlanshowbr-vlanstate": "active",
+            "vlanshowbr-shutstate": "shutdown",
+            "vlanshowplist-ifidx": "Ethernet1/9",
+        }
+    },
+    "TABLE_mtuinfoid": {"ROW_mtuinfoid": {"vlanshowinfo-vlanid": "10"}},
+}
+
+SHOW_VRRP_DETAIL = {
+    "TABLE_vrrp_group": {
+        "ROW_vrrp_group": [
+            {
+                "sh_if_index": "Vlan10",
+                "sh_group_id": "1",
+                "sh_group_type": "IPV4",
+                "sh_group_state": "Master",
+                "sh_vip_addr": "10.0.10.1",
+                "sh_priority": "110",
+                "sh_group_preempt": "Enable",
+                "sh_adv_interval": "1",
+                "sh_vmac": "0000.5e00.0101",
+                "sh_master_addr": "10.0.10.2",
+            },
+            {
+                "sh_if_index": "Vlan20",
+                "sh_group_id": 2,
+                "sh_group_state": "Backup",
+                "sh_vip_addr": "10.0.20.1",
+                "sh_priority": 100,
+                "sh_group_preempt": "Disable",
+                "sh_adv_interval": 1,
+                "sh_master_addr": "10.0.20.3",
+            },
+        ]
+    }
+}
+
+SHOW_IP_ROUTE_VRF_ALL = {
+    "TABLE_vrf": {
+        "ROW_vrf": [
+            {
+                "vrf-name-out": "default",
+                "TABLE_addrf": {
+                    "ROW_addrf": {
+                        "addrf": "ipv4",
+                        "TABLE_prefix": {
+                            "ROW_prefix": [
+                                {
+                                    "ipprefix": "0.0.0.0/0",
+                                    "TABLE_path": {
+                                        "ROW_path": {
+                                            "ipnexthop": "10.0.0.2",
+                                            "pref": "1",
+                                            "metric": "0",
+                                            "clientname": "static",
+                                            "ubest": "true",
+                                        }
+                                    },
+                                },
+                                {
+                                    "ipprefix": "10.0.0.0/30",
+                                    "attached": "true",
+                                    "TABLE_path": {
+                                        "ROW_path": {
+                                            "ipnexthop": "10.0.0.1",
+                                            "ifname": "Eth1/1",
+                                            "pref": "0",
+                                            "metric": "0",
+                                            "clientname": "direct",
+                                            "ubest": "true",
+                                        }
+                                    },
+                                },
+                                {
+                                    "ipprefix": "10.1.1.0/24",
+                                    "TABLE_path": {
+                                        "ROW_path": [
+                                            {
+                                                "ipnexthop": "10.0.0.2",
+                                                "ifname": "Eth1/1",
+                                                "pref": "110",
+                                                "metric": "41",
+                                                "clientname": "ospf-1",
+                                                "type": "intra",
+                                                "ubest": "true",
+                                            },
+                                            {
+                                                "ipnexthop": "10.0.0.6",
+                                                "ifname": "Eth1/2",
+                                                "pref": "110",
+                                                "metric": "41",
+                                                "clientname": "ospf-1",
+                                                "type": "intra",
+                                                "ubest": "true",
+                                            },
+                                        ]
+                                    },
+                                },
+                            ]
+                        },
+                    }
+                },
+            },
+            {
+                "vrf-name-out": "red",
+                "TABLE_addrf": {
+                    "ROW_addrf": {
+                        "addrf": "ipv4",
+                        "TABLE_prefix": {
+                            "ROW_prefix": {
+                                "ipprefix": "172.16.0.0/16",
+                                "TABLE_path": {
+                                    "ROW_path": {
+                                        "ipnexthop": "192.168.1.1",
+                                        "pref": "20",
+                                        "metric": "0",
+                                        "clientname": "bgp-65000",
+                                        "type": "external",
+                                        "ubest": "true",
+                                    }
+                                },
+                            }
+                        },
+                    }
+                },
+            },
+        ]
+    }
+}
+
+SHOW_IP_ROUTE_NOT_FOUND = {"TABLE_vrf": {"ROW_vrf": {"vrf-name-out": "default"}}}
+
+
+def raw(output):
+    return {"command": output}
+
+
+@dataclass(unsafe_hash=True)
+class NxapiDevice(DeviceBase):
+    "Device answering the commands with the NX-API outputs of `OUTPUTS`"
+
+    def __post_init__(self, **_ignore):
+        super().__post_init__(**_ignore)
+        self.metadata.implementation = "NXOS-NXAPI"
+        self.commands = []
+
+    def run(self, commands, silent=False, **_ignore):
+        self.commands.extend(commands)
+        return {x: OUTPUTS.get(x, {}) for x in commands}
+
+
+OUTPUTS = {
+    "show interface": SHOW_INTERFACE,
+    "show vlan brief": SHOW_VLAN_BRIEF,
+    "show vlan id 10": SHOW_VLAN_ID,
+    "show vrrp detail": SHOW_VRRP_DETAIL,
+    "show ip route vrf all": SHOW_IP_ROUTE_VRF_ALL,
+    "show ip route 10.9.9.0/24": SHOW_IP_ROUTE_NOT_FOUND,
+}
+
+
+def route_outputs(routes, vrfs=2, paths=2):
+    "Returns a `show ip route vrf all` output with `routes` /32 routes per VRF"
+    return {
+        "TABLE_vrf": {
+            "ROW_vrf": [
+                {
+                    "vrf-name-out": f"vrf{vrf}",
+                    "TABLE_addrf": {
+                        "ROW_addrf": {
+                            "addrf": "ipv4",
+                            "TABLE_prefix": {
+                                "ROW_prefix": [
+                                    {
+                                        "ipprefix": (
+                                            f"10.{x >> 16 & 255}.{x >> 8 & 255}."
+                                            f"{x & 255}/32"
+                                        ),
+                                        "TABLE_path": {
+                                            "ROW_path": [
+                                                {
+                                                    "ipnexthop": f"192.168.0.{y}",
+                                                    "ifname": f"Ethernet1/{y}",
+                                                    "pref": "110",
+                                                    "metric": "20",
+                                                    "clientname": "ospf-1",
+                                                    "ubest": "true",
+                                                }
+                                                for y in range(1, paths + 1)
+                                            ]
+                                            if paths > 1
+                                            else {
+                                                "ipnexthop": "192.168.0.1",
+                                                "pref": "1",
+                                                "metric": "0",
+                                                "clientname": "static",
+                                                "ubest": "true",
+                                            }
+                                        },
+                                    }
+                                    for x in range(routes)
+                                ]
+                            },
+                        }
+                    },
+                }
+                for vrf in range(vrfs)
+            ]
+        }
+    }
+
+
+class TestTableRows:
+    def test_table_rows(self):
+        single = {"TABLE_x": {"ROW_x": {"a": 1}}}
+        rows = [{"a": 1}, {"a": 2}]
+        assert table_rows(single, "TABLE_x", "ROW_x") == ({"a": 1},)
+        assert table_rows(single, "TABLE_x", "ROW_x")[0] is single["TABLE_x"]["ROW_x"]
+        # The lists of rows are not copied
+        assert table_rows({"TABLE_x": {"ROW_x": rows}}, "TABLE_x", "ROW_x") is rows
+        assert table_rows({}, "TABLE_x", "ROW_x") == ()
+        assert table_rows({"TABLE_x": ""}, "TABLE_x", "ROW_x") == ()
+
+    def test_vlan_ports(self):
+        assert vlan_ports("Ethernet1/1-3, Eth1/7,port-channel10") == [
+            "Ethernet1/1",
+            "Ethernet1/2",
+            "Ethernet1/3",
+            "Ethernet1/7",
+            "Port-Channel10",
+        ]
+
+
+class TestNxapiParsers:
+    def test_interfaces(self):
+        rdata = ParseInterface.data_validation(raw(SHOW_INTERFACE), entity=False)
+        assert list(rdata) == [
+            "Ethernet1/1",
+            "Ethernet1/2",
+            "Ethernet1/3",
+            "Port-Channel10",
+            "Vlan10",
+        ]
+        eth1 = ParseInterface.parse(raw(SHOW_INTERFACE), name="Eth1/1")
+        assert eth1["status"] == "connected" and eth1["description"] == "UPLINK"
+        assert eth1["physical"] == dict(
+            mac="5254.0012.3456", mtu=9216, duplex="full", bandwidth=10000000000
+        )
+        assert eth1["addresses"]["ipv4"] == "10.0.0.1/30"
+        assert eth1["counters"]["rx_unicast_pkts"] == 970
+        assert eth1["counters"]["rx_bits_rate"] == 1000
+        assert eth1["update_interval"] == 30.0
+        assert eth1["last_status_change"] is not None and eth1["last_clear"] is None
+
+        statuses = {
+            k: ParseInterface.data_constructor(k, v)["status"] for k, v in rdata.items()
+        }
+        assert statuses == {
+            "Ethernet1/1": "connected",
+            "Ethernet1/2": "disabled",
+            "Ethernet1/3": "notpresent",
+            "Port-Channel10": "notconnect",
+            "Vlan10": "connected",
+        }
+        po10 = ParseInterface.parse(raw(SHOW_INTERFACE), name="Po10")
+        assert po10["members"] == ["Ethernet1/5", "Ethernet1/6"]
+        assert po10["counters"] is None
+        vlan10 = ParseInterface.parse(raw(SHOW_INTERFACE), name="Vlan10")
+        assert vlan10["addresses"]["ipv4"] == "10.0.10.2/24"
+        assert vlan10["physical"]["bandwidth"] == 1000000000
+
+    def test_vlans(self):
+        vlans = {
+            k: v
+            for x in ParseVlan.collector_parse(raw(SHOW_VLAN_BRIEF))
+            for k, v in x.items()
+        }
+        assert list(vlans) == [1, 20]
+        assert len(vlans[1]["interfaces"]) == 5
+        assert vlans[20] == dict(
+            id=20, name="PARKED", dynamic=False, interfaces=None, status="suspended"
+        )
+        vlan = ParseVlan.parse(raw(SHOW_VLAN_ID))
+        assert vlan["id"] == 10 and vlan["status"] == "active"
+        assert vlan["interfaces"] == ["Ethernet1/9"]
+
+    def test_vrrps(self):
+        vrrp = ParseVrrp.parse(raw(SHOW_VRRP_DETAIL), group_id=1, interface="Vlan10")
+        assert vrrp["status"] == "master" and vrrp["priority"] == 110
+        assert vrrp["preempt"] is True and vrrp["virtual_ip"] == "10.0.10.1"
+        assert vrrp["extra_attributes"] == dict(vrrp_advertisement_interval=1.0)
+        vrrp = ParseVrrp.parse(raw(SHOW_VRRP_DETAIL), group_id=2)
+        assert vrrp["status"] == "backup" and vrrp["preempt"] is False
+        assert vrrp["master_ip"] == "10.0.20.3"
+
+    def test_routes(self):
+        routes = {
+            k: v
+            for x in ParseRoute.collector_parse(raw(SHOW_IP_ROUTE_VRF_ALL))
+            for k, v in x.items()
+        }
+        assert list(routes) == [
+            ("default", "0.0.0.0/0"),
+            ("default", "10.0.0.0/30"),
+            ("default", "10.1.1.0/24"),
+            ("red", "172.16.0.0/16"),
+        ]
+        assert routes[("default", "0.0.0.0/0")]["protocol"] == "static"
+        assert routes[("default", "10.0.0.0/30")]["protocol"] == "connected"
+        ospf = routes[("default", "10.1.1.0/24")]
+        assert (ospf["preference"], ospf["metric"], ospf["active"]) == (110, 41, True)
+        assert ospf["vias"] == [
+            dict(interface="Eth1/1", next_hop="10.0.0.2"),
+            dict(interface="Eth1/2", next_hop="10.0.0.6"),
+        ]
+        assert ospf["extra_attributes"] == dict(
+            client_name="ospf-1", route_type="intra"
+        )
+        assert routes[("red", "172.16.0.0/16")]["protocol"] == "ebgp"
+
+        not_found = ParseRoute.parse(raw(SHOW_IP_ROUTE_NOT_FOUND), dest="10.9.9.0/24")
+        assert not_found == dict(
+            dest="10.9.9.0/24", active=False, inactive_reason="Route not found"
+        )
+
+
+class TestNxapiBuilders:
+    def test_interfaces(self):
+        device = NxapiDevice()
+        interfaces = net.InterfaceBuilder().get(device, entity=False)
+        assert device.commands == ["show interface"]
+        assert interfaces["Ethernet1/1"].status == "connected"
+        assert interfaces["Ethernet1/2"].enabled is False
+        assert float(interfaces["Ethernet1/1"].counters.rx_bytes) == 64000
+
+    def test_vlans(self):
+        vlans = net.VlanBuilder().get(NxapiDevice(), entity=False)
+        assert vlans[1].interfaces[0] == "Ethernet1/1"
+        assert vlans[20].status_up is False
+        vlan = net.VlanBuilder().get(NxapiDevice(), id=10)
+        assert vlan.name == "USERS"
+
+    def test_vrrps(self):
+        vrrps = net.VrrpBuilder().get(NxapiDevice(), entity=False)
+        assert list(vrrps) == [(1, "Vlan10"), (2, "Vlan20")]
+
+    def test_routes(self):
+        routes = net.RouteBuilder().get(NxapiDevice(), entity=False, vrf_all=True)
+        assert routes[("red", "172.16.0.0/16")].protocol == "ebgp"
+        assert len(routes[("default", "10.1.1.0/24")].vias) == 2
+        route = net.RouteBuilder().get(NxapiDevice(), dest="10.9.9.0/24")
+        assert route.active is False
+
+
+@pytest.mark.slow
+def test_routes_benchmark():
+    "Parses 100k routes (2 VRFs, half of them with 2 paths) on a single pass"
+    output = route_outputs(25000, vrfs=2, paths=2)
+    static = route_outputs(25000, vrfs=2, paths=1)
+    output["TABLE_vrf"]["ROW_vrf"].extend(
+        dict(x, **{"vrf-name-out": f"static{n}"})
+        for n, x in enumerate(static["TABLE_vrf"]["ROW_vrf"])
+    )
+
+    start = time.perf_counter()
+    routes = ParseRoute.collector_parse(raw(output))
+    elapsed = time.perf_counter() - start
+    print(f"\n[BENCHMARK]: 100000 routes parsed in {elapsed:.3f}s")
+
+    assert len(routes) == 100000
+    ((key, data),) = routes[-1].items()
+    assert key == ("static1", "10.0.97.167/32")
+    assert data["protocol"] == "static" and len(data["vias"]) == 1
+    ((key, data),) = routes[0].items()
+    assert data["protocol"] == "ospf" and len(data["vias"]) == 2
@@ -0,0 +1,105 @@
+import math
+import pytest
+import pendulum
+from netapi.net.interface import (
+    COUNTER_FIELDS,
+    InterfaceBase,
+    InterfaceCounters,
+    InterfacePhysical,
+)
+from netapi.net.rates import RateEngine
+
+np = pytest.importorskip("numpy")
+
+CLEAR = pendulum.datetime(2020, 1, 1)
+
+
+def interface(name="Ethernet1", last_clear=CLEAR, bandwidth=1_000_000_000, **counters):
+    return InterfaceBase(
+        name=name,
+        last_clear=last_clear,
+        counters=InterfaceCounters(**counters),
+        physical=InterfacePhysical(bandwidth=bandwidth),
+    )
+
+
+def sample(engine, seconds, **counters):
+    "Sample of the counters `seconds` after the `CLEAR` time"
+    return engine.update(
+        [(("r1", "Ethernet1"), interface(**counters))], CLEAR.timestamp() + seconds
+    )
+
+
+class TestRateEngine:
+    def test_rates(self):
+        engine = RateEngine()
+        rates = sample(engine, 100, rx_bytes=1000, rx_unicast_pkts=10)
+        assert not rates.valid[0] and math.isnan(rates["r1", "Ethernet1"]["rx_bps"])
+        rates = sample(
+            engine,
+            110,
+            rx_bytes=1000 + 12_500_000,
+            rx_unicast_pkts=110,
+            rx_multicast_pkts=50,
+            rx_errors_general=5,
+        )
+        result = rates["r1", "Ethernet1"]
+        assert result["valid"] and not result["wrapped"] and not result["cleared"]
+        assert result["rx_bps"] == 10_000_000
+        assert result["rx_pps"] == 15
+        assert result["rx_error_rate"] == 0.5
+        assert result["rx_utilization"] == 1
+        assert result["tx_bps"] == 0
+
+    def test_wraps(self):
+        engine = RateEngine()
+        sample(engine, 0, rx_unicast_pkts=2**32 - 100, tx_bytes=2**64 - 1000)
+        rates = sample(engine, 10, rx_unicast_pkts=100, tx_bytes=3096)
+        assert rates.wrapped[0] and not rates.cleared[0]
+        assert rates.rx_pps[0] == 20
+        assert rates.tx_bps[0] == pytest.approx(4096 * 8 / 10, abs=1e3)
+
+    def test_wraps_64_exact(self):
+        engine = RateEngine()
+        keys = [("r1", "Ethernet1")]
+        counters = np.zeros((1, len(COUNTER_FIELDS)), dtype=np.uint64)
+        tx_bytes = COUNTER_FIELDS.index("tx_bytes")
+        counters[0, tx_bytes] = 2**64 - 1000
+        engine.update_arrays(keys, counters, 0, np.zeros(1), np.full(1, 1e9))
+        counters[0, tx_bytes] = 1000
+        rates = engine.update_arrays(keys, counters, 10, np.zeros(1), np.full(1, 1e9))
+        assert rates.wrapped[0] and not rates.cleared[0]
+        assert rates.tx_bps[0] == 2000 * 8 / 10
+
+    def test_clear_and_reset(self):
+        engine = RateEngine()
+        sample(engine, 50, rx_bytes=10_000)
+        # Cleared 5 seconds before the sample
+        rates = sample(engine, 110, last_clear=CLEAR.add(seconds=105), rx_bytes=500)
+        assert rates.cleared[0] and rates.elapsed[0] == 5
+        assert rates.rx_bps[0] == 800
+
+        # Counters going back on 64 bits without clear are a reset
+        sample(engine, 120, last_clear=CLEAR.add(seconds=105), rx_bytes=2**40)
+        rates = sample(engine, 130, last_clear=CLEAR.add(seconds=105), rx_bytes=1000)
+        assert rates.cleared[0] and not rates.wrapped[0]
+        assert rates.rx_bps[0] == 800
+
+    def test_fleet(self):
+        engine = RateEngine()
+        interfaces = {
+            ("r1", "Ethernet1"): interface(rx_bytes=0),
+            ("r2", "Ethernet1"): interface(rx_bytes=0, bandwidth=None),
+        }
+        engine.update(interfaces.items(), timestamp=0)
+        interfaces["r3", "Ethernet1"] = interface(rx_bytes=0)
+        interfaces["r1", "Ethernet1"] = interface(rx_bytes=1000)
+        interfaces["r2", "Ethernet1"] = interface(rx_bytes=1000, bandwidth=None)
+        rates = engine.update(interfaces.items(), timestamp=[10, 20, 30])
+        assert len(engine) == 3
+        assert list(rates.valid) == [True, True, False]
+        assert list(rates.rx_bps[:2]) == [800, 400]
+        assert rates["r1", "Ethernet1"]["rx_utilization"] == pytest.approx(8e-05)
+        assert math.isnan(rates["r2", "Ethernet1"]["rx_utilization"])
+        with pytest.raises(ValueError):
+            engine.update([(("r1", "Ethernet1"), interface())] * 2)
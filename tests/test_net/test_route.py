@@ -2,6 +2,7 @@ import re
 import copy
 import pytest
 import netapi.net as net
+from netapi.net.compact import compact_class
 from netapi.net.route import RouteBase, Via
 from pydantic import ValidationError
 
@@ -442,6 +443,29 @@ class TestRouteBase:
         del route_base_obj.metadata
         assert route_base_obj.to_dict() == ROUTE_BASE_ASDICT[route_type]
 
+    def test_fingerprint(self):
+        args = ROUTE_BASE_ARGS["route_multiple_vias"]
+        route = RouteBase(**args)
+        fingerprint = route.fingerprint
+        assert re.match(r"^[0-9a-f]{32}$", fingerprint)
+        assert RouteBase.from_parsed(**args).fingerprint == fingerprint
+        assert copy.deepcopy(route).fingerprint == fingerprint
+        assert hash(route) == hash(RouteBase(**args))
+
+        # Only the content is covered, and it is invalidated on changes
+        route.metadata.touch()
+        assert route.fingerprint == fingerprint
+        route.metric = 30
+        assert route.fingerprint != fingerprint
+        route.apply(dict(metric=20))
+        assert route.fingerprint == fingerprint
+        route.apply(dict(vias=[VIA_ARGS["default"]]))
+        assert (
+            route.fingerprint
+            == RouteBase(**dict(args, vias=[VIA_ARGS["default"]])).fingerprint
+        )
+        assert route.fingerprint != fingerprint
+
 
 class RouteTester:
     "Performs checks on the route object of each implementation"
@@ -484,6 +508,41 @@ class RouteTester:
         parsed_dict.pop("metadata")
         assert parsed_dict == ROUTE_DATA_PARSED[get_os][route_type]
 
+    @pytest.mark.parametrize(
+        "route_type", ["route_intf", "route_intf_and_ip", "route_vrf"]
+    )
+    def test_from_parsed(self, get_os, module, route_imp_parser, route_type):
+        raw_data = ROUTE_DATA[get_os][route_type]
+        parsed_data = route_imp_parser.parse(raw_data=raw_data[0])
+
+        parsed_dict = module.Route.from_parsed(**parsed_data).to_dict()
+        parsed_dict.pop("metadata")
+        assert parsed_dict == ROUTE_DATA_PARSED[get_os][route_type]
+        rehydrated_dict = module.Route.from_parsed(**parsed_dict).to_dict()
+        rehydrated_dict.pop("metadata")
+        assert rehydrated_dict == parsed_dict
+
+    @pytest.mark.parametrize(
+        "route_type", ["route_intf", "route_intf_and_ip", "route_vrf"]
+    )
+    def test_compact(self, get_os, module, route_imp_parser, route_type):
+        raw_data = ROUTE_DATA[get_os][route_type]
+        parsed_data = route_imp_parser.parse(raw_data=raw_data[0])
+        compact_obj = compact_class(module.Route)(**parsed_data)
+        assert not hasattr(compact_obj, "__dict__")
+        assert compact_obj.metadata.name == "route"
+        assert compact_obj.dest == parsed_data["dest"]
+        assert compact_obj.vias[0].interface == parsed_data["vias"][0]["interface"]
+
+        # The full entity is created on demand
+        compact_dict = compact_obj.to_dict()
+        compact_dict.pop("metadata")
+        assert compact_dict == ROUTE_DATA_PARSED[get_os][route_type]
+        assert (
+            compact_obj.fingerprint
+            == module.Route.from_parsed(**parsed_data).fingerprint
+        )
+
 
 @pytest.mark.eos
 class TestRouteEos(RouteTester):
@@ -0,0 +1,101 @@
+import random
+import pytest
+from functools import lru_cache
+from ipaddress import ip_address, ip_network as _ip_network
+from netapi.net.eos.pyeapier import Route, Routes
+from netapi.net.route_index import RouteIndex
+
+
+ip_network = lru_cache(maxsize=None)(_ip_network)
+
+
+def random_prefixes(version, count, seed=7):
+    rand = random.Random(seed)
+    bits = 32 if version == 4 else 128
+    base = int(ip_address("10.0.0.0" if version == 4 else "2001:db8::"))
+    prefixes = set()
+    while len(prefixes) < count:
+        prefixlen = rand.choice([8, 12, 16, 20, 24, 28, bits])
+        address = base + rand.getrandbits(24 if version == 4 else 40)
+        prefixes.add(str(ip_network((address, prefixlen), strict=False)))
+    return sorted(prefixes)
+
+
+@pytest.fixture(params=[4, 6])
+def prefixes(request):
+    return random_prefixes(request.param, 300) + (
+        ["0.0.0.0/0"] if request.param == 4 else []
+    )
+
+
+@pytest.fixture
+def routes(prefixes):
+    return Routes(
+        {
+            ("default", x): Route.from_parsed(dest=x, instance="default", network=x)
+            for x in prefixes
+        }
+    )
+
+
+def best_match(prefixes, address):
+    "Reference longest prefix match"
+    address = ip_address(address)
+    matches = [
+        ip_network(x)
+        for x in prefixes
+        if ip_network(x).version == address.version and address in ip_network(x)
+    ]
+    if not matches:
+        return None
+    return str(max(matches, key=lambda x: x.prefixlen))
+
+
+class TestRouteIndex:
+    def test_lookup(self, routes, prefixes):
+        rand = random.Random(3)
+        index = RouteIndex.from_routes(routes)
+        assert len(index) == len(prefixes)
+        for prefix in rand.sample(prefixes, 50):
+            network = ip_network(prefix)
+            address = str(network.network_address + network.num_addresses - 1)
+            expected = best_match(prefixes, address)
+            assert index.lookup(address) == ("default", expected)
+        assert index.lookup("10.1.1.1", instance="VRF1") is None
+
+    def test_covering_and_covered_by(self, routes, prefixes):
+        index = RouteIndex.from_routes(routes)
+        for prefix in prefixes[::10]:
+            network = ip_network(prefix)
+            covering = [
+                x
+                for x in prefixes
+                if ip_network(x).version == network.version
+                and ip_network(x).supernet_of(network)
+            ]
+            covered = [
+                x
+                for x in prefixes
+                if ip_network(x).version == network.version
+                and ip_network(x).subnet_of(network)
+            ]
+            assert [x[1] for x in index.covering(prefix)] == sorted(
+                covering, key=lambda x: ip_network(x).prefixlen
+            )
+            assert sorted(x[1] for x in index.covered_by(prefix)) == sorted(covered)
+
+    def test_routes_collection(self, routes, prefixes):
+        prefix = prefixes[5]
+        address = str(ip_network(prefix).network_address)
+        assert routes.lookup(address).dest == best_match(prefixes, address)
+
+        # Kept updated when the routes change
+        del routes["default", best_match(prefixes, address)]
+        remaining = [x for x in prefixes if x != best_match(prefixes, address)]
+        expected = best_match(remaining, address)
+        assert getattr(routes.lookup(address), "dest", None) == expected
+        host = f"{address}/{32 if ip_network(prefix).version == 4 else 128}"
+        routes["default", host] = Route(dest=host, instance="default", network=host)
+        assert routes.lookup(address).dest == host
+        assert routes.covering(host)[-1].dest == host
+        assert routes.covered_by(host) == [routes["default", host]]
@@ -0,0 +1,106 @@
+import json
+import pytest
+import netapi.net.route_table as route_table
+from netapi.net.eos.pyeapier import ParseRoute, Route
+from netapi.net.route_table import RouteTable
+from netapi.simulator.eapi import SyntheticEos
+
+
+COMMAND = "show ip route vrf all"
+
+
+@pytest.fixture(scope="module")
+def parsed_routes():
+    output = SyntheticEos(vrfs=2, routes=60).output(COMMAND)
+    return ParseRoute.collector_parse({COMMAND: json.loads(output)})
+
+
+@pytest.fixture(params=["numpy", "array"])
+def table(request, parsed_routes, monkeypatch):
+    if request.param == "array":
+        monkeypatch.setattr(route_table, "np", None)
+    return RouteTable.from_parsed(parsed_routes)
+
+
+def routes_data(parsed_routes):
+    return [y for x in parsed_routes for y in x.values()]
+
+
+class TestRouteTable:
+    def test_from_parsed(self, table, parsed_routes):
+        routes = routes_data(parsed_routes)
+        assert len(table) == len(routes) == 120
+        assert table.keys() == [(x["instance"], x["network"]) for x in routes]
+        for position in (0, 1, 100):
+            route = Route(**routes[position])
+            assert table[position]["protocol"] == route.protocol
+            assert table[position]["metric"] == route.metric
+            assert table[position]["vias"] == [
+                dict(interface=x.interface, next_hop=x.next_hop and str(x.next_hop))
+                for x in route.vias
+            ]
+
+    def test_from_routes(self, table, parsed_routes):
+        routes = [Route.from_parsed(**x) for x in routes_data(parsed_routes)]
+        assert list(RouteTable.from_routes(routes)) == list(table)
+
+    def test_where(self, table, parsed_routes):
+        routes = [Route(**x) for x in routes_data(parsed_routes)]
+        expected = [
+            (x.instance, x.dest)
+            for x in routes
+            if x.protocol == "ospf"
+            and x.instance == "VRF1"
+            and any(str(y.next_hop) == "10.0.2.1" for y in x.vias)
+        ]
+        selected = table.where(protocol="OSPF", instance="VRF1", next_hop="10.0.2.1")
+        assert expected and selected.keys() == expected
+        assert list(selected) == [table[table.keys().index(x)] for x in expected]
+        assert len(table.where(instance="VRF1", within="10.0.0.0/8")) == 0
+        assert len(table.where(within="11.0.0.0/16")) == len(table)
+        assert len(table.where(interface="Ethernet1")) > 0
+        assert len(table.where(instance="unknown")) == 0
+        with pytest.raises(ValueError):
+            table.where(vrf="default")
+
+    def test_count_by(self, table, parsed_routes):
+        routes = [Route(**x) for x in routes_data(parsed_routes)]
+        counts = table.count_by("protocol")
+        assert sum(counts.values()) == len(table)
+        assert counts["connected"] == len(
+            [x for x in routes if x.protocol == "connected"]
+        )
+        assert table.count_by("instance") == {"default": 60, "VRF1": 60}
+        assert set(table.count_by("active")) == {True}
+        networks = table.count_by("network")
+        assert sum(networks.values()) == len(table)
+        assert networks[str(routes[0].network.ip)] == 2
+        assert set(table.count_by("prefixlen")) == {x.network.prefixlen for x in routes}
+
+    def test_compare(self, table, parsed_routes):
+        routes = routes_data(parsed_routes)
+        changed = [dict(x) for x in routes[1:]]
+        changed[0] = dict(changed[0], metric=999)
+        changed[1] = dict(changed[1], vias=[dict(interface="Ethernet9")])
+        changed.append(dict(routes[0], instance="VRF9"))
+        diff = table.compare(RouteTable.from_parsed(changed))
+        assert diff == dict(
+            added=[("VRF9", routes[0]["network"])],
+            removed=[("default", routes[0]["network"])],
+            changed=[
+                ("default", routes[1]["network"]),
+                ("default", routes[2]["network"]),
+            ],
+        )
+        assert table.compare(table) == dict(added=[], removed=[], changed=[])
+
+    def test_ipv6(self, table, parsed_routes):
+        routes = routes_data(parsed_routes)
+        ipv6 = [
+            dict(routes[0], network="2001:db8::/64", dest="2001:db8::/64"),
+            dict(routes[1], vias=[dict(interface="Ethernet1", next_hop="fe80::1")]),
+        ]
+        mixed = RouteTable.from_parsed(routes[2:] + ipv6)
+        assert mixed.keys() == table.keys()[2:] + [("default", routes[1]["network"])]
+        last = mixed[len(mixed) - 1]
+        assert last["vias"] == [dict(interface="Ethernet1", next_hop=None)]
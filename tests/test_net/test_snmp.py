@@ -0,0 +1,143 @@
+import time
+import pytest
+from functools import partial
+from netapi.connector.snmp.getbulker import Device
+from netapi.net import InterfaceBuilder
+from netapi.net.rates import RateEngine
+from netapi.net.timeseries import CounterStore
+from netapi.net.snmp.getbulker import (
+    IF_MIB,
+    ParseInterface,
+    collect_many,
+    interface_commands,
+    refresh_many,
+)
+from netapi.simulator.eapi import SyntheticEos
+from netapi.simulator.snmp import SnmpAgent, interfaces_mib
+
+
+@pytest.fixture(scope="module")
+def profile():
+    return SyntheticEos(ports=8, vlans=2, vrfs=1, routes=10)
+
+
+@pytest.fixture(scope="module")
+def agent(profile):
+    mibs = {f"device{x}": partial(interfaces_mib, profile) for x in range(10)}
+    with SnmpAgent(mibs) as agent:
+        yield agent
+
+
+@pytest.fixture
+def devices(agent):
+    host, port = agent.address
+    return [Device(host=host, port=port, community=x) for x in agent.mibs]
+
+
+class TestSnmpInterfaces:
+    def test_commands(self):
+        assert interface_commands({"counters"})[:2] == [
+            IF_MIB["ifName"],
+            IF_MIB["ifDescr"],
+        ]
+        assert len(interface_commands()) == len(IF_MIB)
+        with pytest.raises(ValueError):
+            interface_commands({"optical"})
+
+    def test_parse(self):
+        raw_data = {
+            IF_MIB["ifName"]: {"1": b"Gi0/1", "2": b""},
+            IF_MIB["ifDescr"]: {"1": b"GigabitEthernet0/1", "2": b"Null0"},
+            IF_MIB["ifAdminStatus"]: {"1": 1, "2": 2},
+            IF_MIB["ifOperStatus"]: {"1": 7, "2": 2},
+            IF_MIB["ifHCInOctets"]: {"1": 2**40},
+        }
+        rdata = ParseInterface.data_validation(raw_data)
+        assert list(rdata) == ["GigabitEthernet0/1", "Null0"]
+        assert ParseInterface.parse(raw_data, name="Gi0/1") == dict(
+            name="GigabitEthernet0/1",
+            description=None,
+            status="lowerlayerdown",
+            physical=None,
+            counters=dict(rx_bytes=2**40),
+            if_index=1,
+        )
+        assert ParseInterface.parse(raw_data, name="Null0")["status"] == "disabled"
+
+    def test_builder(self, devices, profile):
+        builder = InterfaceBuilder()
+        interfaces = builder.get(devices[0], entity=False)
+        assert list(interfaces) == profile.interface_names
+        eth1 = interfaces["Ethernet1"]
+        assert eth1.status == "connected" and eth1.enabled
+        assert interfaces["Ethernet7"].status_up is False
+        assert eth1.description == "SIMULATED-ETHERNET1"
+        assert str(eth1.physical.mac) == "00-1C-73-00-00-01"
+        assert float(eth1.physical.bandwidth) == 10e9
+        assert float(eth1.counters.rx_bytes) > 0
+
+        # Counter-only polls, refreshed in place
+        counters = builder.get(devices[0], entity=False, fields={"counters"})
+        assert counters["Ethernet1"].status is None
+        rx_bytes = counters["Ethernet1"].counters.rx_bytes
+        time.sleep(0.01)
+        changes = counters.refresh()
+        assert "Ethernet1" in changes.modified
+        assert counters["Ethernet1"].counters.rx_bytes > rx_bytes
+
+        eth2 = builder.get(devices[0], name="Eth2", fields={"status"})
+        assert eth2.name == "Ethernet2" and eth2.status == "connected"
+        assert eth2.get() and eth2.counters is not None
+        with pytest.raises(NotImplementedError):
+            eth2.enable()
+
+        lazy = builder.get(devices[0], entity=False, lazy=True)
+        assert "counters" not in lazy["Ethernet3"].__dict__
+        assert float(lazy["Ethernet3"].counters.rx_bytes) > 0
+        assert lazy["Ethernet3"].optical is None
+
+        many = builder.get_many(devices[0], names=["Eth1", "Vl10", "Eth99"])
+        assert list(many) == ["Ethernet1", "Vlan10"]
+
+    def test_row_get(self, devices, profile):
+        runs = []
+        device = devices[0]
+        run = device.run
+        device.run = lambda *args, **kwargs: runs.append(kwargs) or run(*args, **kwargs)
+
+        interfaces = InterfaceBuilder().get(device, entity=False, lazy=True)
+        eth3 = interfaces["Ethernet3"]
+        index = profile.interface_names.index("Ethernet3") + 1
+        assert eth3.if_index == index and len(runs) == 1
+        assert float(eth3.counters.rx_bytes) > 0
+        assert runs[-1]["instance"] == index
+        assert eth3.get() and runs[-1]["instance"] == index
+
+        # The row of another interface (i.e. after a reload) walks the columns
+        eth3.if_index = 1
+        assert eth3.get() and eth3.if_index == index
+        assert runs[-2]["instance"] == 1 and "instance" not in runs[-1]
+
+    def test_many_devices(self, devices, agent):
+        pytest.importorskip("numpy")
+        store = CounterStore(capacity=4)
+        fleet = collect_many(devices, fields={"counters"}, timeseries=store)
+        assert all(x.error is None and len(x) == 11 for x in fleet)
+        # The simulated devices share the host, so the same keys
+        assert all(x.timeseries is store for x in fleet) and len(store) == 11
+
+        host, port = agent.address
+        devices.append(
+            Device(host=host, port=port, community="unknown", timeout=0.1, retries=0)
+        )
+        *fleet, failed = collect_many(devices, fields={"counters"})
+        assert isinstance(failed.error, TimeoutError) and not len(failed)
+
+        engine = RateEngine()
+        engine.update_interfaces(fleet[0], device="device0")
+        time.sleep(0.05)
+        results = refresh_many(fleet + [failed])
+        assert all("Ethernet1" in x.modified for x in results[:-1])
+        assert isinstance(results[-1], TimeoutError)
+        rates = engine.update_interfaces(fleet[0], device="device0")
+        assert rates[("device0", "Ethernet1")]["rx_bps"] > 0
@@ -0,0 +1,172 @@
+import socket
+import threading
+import pytest
+from netapi.connector.eos.pyeapier import Device
+from netapi.net import InterfaceBuilder, RouteBuilder
+from netapi.net.syslog import (
+    SyslogListener,
+    SyslogRefresher,
+    SyslogTrigger,
+    parse_message,
+)
+from netapi.simulator.eapi import EapiFarm, SyntheticEos
+
+
+MESSAGES = {
+    "eos_link": (
+        "<187>Oct 19 10:01:02 leaf1 Ebra: %LINEPROTO-5-UPDOWN: Line protocol on "
+        "Interface Ethernet1, changed state to down",
+        ("interface", "leaf1", "Ethernet1"),
+    ),
+    "ios_link": (
+        "<187>12: *Oct 19 10:01:02.123: %LINK-3-UPDOWN: Interface Gi0/1, changed "
+        "state to up",
+        ("interface", "10.0.0.1", "GigabitEthernet0/1"),
+    ),
+    "eos_vrrp": (
+        "<190>1 2026-10-19T10:01:02Z leaf1 Vrrp - - - %VRRP-6-STATECHANGE: Vlan10 "
+        "vrid 1 (ipv4) state changed from Backup to Master",
+        ("vrrp", "leaf1", (1, "Vlan10")),
+    ),
+    "ios_vrrp": (
+        "%VRRP-6-STATECHANGE: Vl20 Grp 3 state Master -> Backup",
+        ("vrrp", "10.0.0.1", (3, "Vlan20")),
+    ),
+    "eos_bgp": (
+        "<189>Oct 19 10:01:02 leaf1 Bgp: %BGP-5-ADJCHANGE: peer 10.1.1.2 (VRF VRF1 "
+        "AS 65001) old state Established event Stop new state Idle",
+        ("routes", "leaf1", "VRF1"),
+    ),
+    "ios_bgp": (
+        "%BGP-5-ADJCHANGE: neighbor 10.1.1.2 Down BGP Notification sent",
+        ("routes", "10.0.0.1", "default"),
+    ),
+    "ios_ospf": (
+        "%OSPF-5-ADJCHG: Process 1, Nbr 1.1.1.1 on Gi0/1 from FULL to DOWN",
+        ("routes", "10.0.0.1", "default"),
+    ),
+    "unknown": ("%SYS-5-CONFIG_I: Configured from console by admin", None),
+}
+
+
+@pytest.fixture(scope="module")
+def farm():
+    profile = SyntheticEos(ports=4, vlans=2, vrfs=1, routes=10)
+    with EapiFarm(devices=1, profile=profile) as farm:
+        yield farm
+
+
+class Recorder:
+    "Handler recording the triggers, `wait()` returns when `count` are received"
+
+    def __init__(self, count=1):
+        self.triggers = []
+        self.count = count
+        self.done = threading.Event()
+
+    def __call__(self, trigger):
+        self.triggers.append(trigger)
+        if len(self.triggers) >= self.count:
+            self.done.set()
+
+    def wait(self):
+        assert self.done.wait(5)
+        return self.triggers
+
+
+class TestParseMessage:
+    @pytest.mark.parametrize("message_type", list(MESSAGES))
+    def test_parse_message(self, message_type):
+        message, expected = MESSAGES[message_type]
+        trigger = parse_message(message, source="10.0.0.1")
+        if expected is None:
+            assert trigger is None
+        else:
+            assert trigger[:3] == expected and trigger.message == message
+
+
+class TestSyslogListener:
+    def test_udp_debounce(self):
+        recorder = Recorder(count=2)
+        with SyslogListener(recorder, port=0, debounce=0.2) as listener:
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            for message_type in ["eos_link", "eos_link", "unknown", "eos_bgp"]:
+                sender.sendto(
+                    MESSAGES[message_type][0].encode(), listener.addresses["udp"]
+                )
+            sender.close()
+            triggers = recorder.wait()
+        # The flaps of the same interface are coalesced
+        assert sorted(x.kind for x in triggers) == ["interface", "routes"]
+        assert not listener.errors
+
+    def test_tcp_framing(self):
+        recorder = Recorder(count=2)
+        with SyslogListener(
+            recorder, port=0, protocols=("tcp",), debounce=0
+        ) as listener:
+            with socket.create_connection(listener.addresses["tcp"]) as sender:
+                counted = MESSAGES["ios_vrrp"][0].encode()
+                sender.sendall(b"%d %s" % (len(counted), counted))
+                sender.sendall(MESSAGES["eos_link"][0].encode() + b"\n")
+            triggers = recorder.wait()
+        assert [x.kind for x in triggers] == ["vrrp", "interface"]
+        assert triggers[0].device == "127.0.0.1"
+
+    def test_handler_errors(self):
+        def failing(trigger):
+            raise ValueError(trigger.key)
+
+        listener = SyslogListener(failing, port=0, debounce=0).start()
+        listener.receive(MESSAGES["eos_link"][0])
+        listener.stop()
+        assert [str(x) for x in listener.errors] == ["Ethernet1"]
+        with pytest.raises(ValueError):
+            SyslogListener(failing, protocols=("icmp",))
+
+
+class TestSyslogRefresher:
+    def test_targeted_refresh(self, farm):
+        _, host, port = farm.addresses[0]
+        device = Device(host=host, port=port, transport="http")
+        interfaces = InterfaceBuilder().get(device, entity=False)
+        routes = RouteBuilder().get(device, entity=False)
+        refresher = SyslogRefresher()
+        refresher.register("leaf1", interfaces=interfaces, routes=routes)
+
+        commands = []
+        run = device.run
+        device.run = lambda cmds, **kwargs: commands.append(cmds) or run(cmds, **kwargs)
+        assert not refresher(parse_message(MESSAGES["eos_link"][0]))
+        assert len(commands) == 1 and commands[0][0] == "show interfaces Ethernet1"
+        assert interfaces.fingerprint is None
+
+        assert refresher(parse_message(MESSAGES["eos_bgp"][0])) is not None
+        assert len(commands) == 2
+        # Devices or entities not registered are ignored
+        assert refresher(SyslogTrigger("interface", "leaf1", "Ethernet99", "")) is None
+        assert refresher(parse_message(MESSAGES["ios_link"][0], "10.0.0.9")) is None
+        assert refresher(parse_message(MESSAGES["eos_vrrp"][0])) is None
+        assert len(commands) == 2
+
+    def test_refresh_fields(self, farm):
+        _, host, port = farm.addresses[0]
+        device = Device(host=host, port=port, transport="http")
+        commands = []
+        run = device.run
+        device.run = lambda cmds, **kwargs: commands.append(cmds) or run(cmds, **kwargs)
+
+        # Only the fields of the lazy collection are refreshed
+        lazy = InterfaceBuilder().get(
+            device, entity=False, lazy=True, fields={"status"}
+        )
+        assert "Ethernet1" in lazy.index("status")["connected"]
+        assert not lazy.refresh_entity("Ethernet1")
+        assert commands[-1] == ["show interfaces Ethernet1 status"]
+        assert "counters" not in lazy["Ethernet1"].__dict__
+
+        # The compact entities have no get(), the collection is refreshed
+        compact = InterfaceBuilder().get(device, entity=False, compact=True)
+        count = len(commands)
+        assert compact.refresh_entity("Ethernet1") is not None
+        assert commands[count:] == [compact.get_cmd]
@@ -0,0 +1,146 @@
+import threading
+import pytest
+from netapi.connector.eos.pyeapier import Device
+from netapi.net import InterfaceBuilder
+from netapi.net.telemetry import (
+    TelemetryClient,
+    TelemetryIngester,
+    parse_path,
+    typed_value,
+)
+from netapi.simulator.eapi import EapiFarm, SyntheticEos
+from netapi.simulator.telemetry import TelemetryReplay
+
+
+NANOSECONDS = 10**9
+MESSAGES = [
+    {
+        "update": {
+            "timestamp": 1571478062 * NANOSECONDS,
+            "prefix": "/interfaces/interface[name=Ethernet1]/state",
+            "update": [
+                {"path": "counters/in-octets", "val": {"uintVal": "1000"}},
+                {"path": "counters/in-unicast-pkts", "val": 10},
+                {"path": "counters/in-unknown-protos", "val": 1},
+                {"path": "oper-status", "val": "DOWN"},
+            ],
+        }
+    },
+    {
+        "update": {
+            "timestamp": 1571478072 * NANOSECONDS,
+            "update": [
+                {
+                    "path": {
+                        "elem": [
+                            {"name": "interfaces"},
+                            {"name": "interface", "key": {"name": "Ethernet2"}},
+                            {"name": "state"},
+                            {"name": "counters"},
+                            {"name": "out-octets"},
+                        ]
+                    },
+                    "val": {"uintVal": "4096"},
+                },
+                {
+                    "path": "/interfaces/interface[name=Ethernet99]/state/oper-status",
+                    "val": "UP",
+                },
+            ],
+        }
+    },
+    {"sync_response": True},
+]
+
+
+@pytest.fixture(scope="module")
+def farm():
+    profile = SyntheticEos(ports=4, vlans=2, vrfs=1, routes=10)
+    with EapiFarm(devices=1, profile=profile) as farm:
+        yield farm
+
+
+@pytest.fixture
+def interfaces(farm):
+    _, host, port = farm.addresses[0]
+    device = Device(host=host, port=port, transport="http")
+    return InterfaceBuilder().get(device, entity=False)
+
+
+class TestTelemetry:
+    def test_parse_path(self):
+        assert parse_path("/interfaces/interface[name=Ethernet1/1]/state") == [
+            ("interfaces", {}),
+            ("interface", {"name": "Ethernet1/1"}),
+            ("state", {}),
+        ]
+        assert typed_value({"uintVal": "12"}) == 12
+        assert typed_value({"jsonVal": '{"a": 1}'}) == {"a": 1}
+        assert typed_value("UP") == "UP"
+
+    def test_ingest(self, interfaces):
+        eth1, eth2 = interfaces["Ethernet1"], interfaces["Ethernet2"]
+        tx_bytes = eth1.counters.tx_bytes
+        assert interfaces.index("status")["connected"]
+        events = []
+        interfaces.subscribe(events.append)
+        ingester = TelemetryIngester(interfaces)
+        changes = ingester.ingest(MESSAGES[0])
+        assert interfaces["Ethernet1"] is eth1
+        assert eth1.status == "notconnect" and eth1.status_up is False
+        assert float(eth1.counters.rx_bytes) == 1000
+        assert eth1.counters.rx_unicast_pkts == 10
+        # Counters not streamed are kept
+        assert eth1.counters.tx_bytes == tx_bytes
+        assert "Ethernet1" in interfaces.index("status")["notconnect"]
+        assert set(changes.modified["Ethernet1"]) >= {"status", "status_up"}
+        assert [(x.type, x.key, x.new) for x in events] == [
+            ("interface_status", "Ethernet1", False)
+        ]
+
+        changes = ingester.ingest(MESSAGES[1])
+        assert list(changes.modified) == ["Ethernet2"]
+        assert float(eth2.counters.tx_bytes) == 4096
+        assert "Ethernet99" not in interfaces
+        assert not ingester.ingest(MESSAGES[2]) and ingester.synced
+        assert ingester.stats == dict(notifications=2, updates=5, ignored=1)
+        with pytest.raises(ConnectionError):
+            ingester.ingest({"error": {"message": "denied"}})
+
+    def test_ingest_during_poll(self, interfaces):
+        ingester = TelemetryIngester(interfaces)
+        with interfaces.lock:
+            thread = threading.Thread(target=ingester.ingest, args=(MESSAGES[0],))
+            thread.start()
+            thread.join(0.1)
+            # The stream waits for the poll
+            assert thread.is_alive()
+            assert interfaces.refresh() is not None
+            assert interfaces["Ethernet1"].status == "connected"
+        thread.join()
+        assert interfaces["Ethernet1"].status == "notconnect"
+        assert "Ethernet1" in interfaces.index("status")["notconnect"]
+
+    def test_client(self, interfaces):
+        with TelemetryReplay(MESSAGES) as server:
+            client = TelemetryClient(*server.address, interfaces)
+            assert client.run() == len(MESSAGES)
+            assert server.requests == [client.subscribe_request()]
+
+            assert client.ingester.synced
+            assert client.run(max_messages=1) == 1
+
+            client = TelemetryClient(*server.address, interfaces).start()
+            client.stop()
+            assert client.error is None
+        assert interfaces["Ethernet1"].status_up is False
+
+    def test_client_quiet_stream(self, interfaces):
+        # The stream is quiet for longer than the connection timeout
+        with TelemetryReplay(MESSAGES, delay=0.2) as server:
+            client = TelemetryClient(*server.address, interfaces, timeout=0.05)
+            assert client.run() == len(MESSAGES)
+
+            client = TelemetryClient(*server.address, interfaces, read_timeout=0.05)
+            with pytest.raises(OSError):
+                client.run()
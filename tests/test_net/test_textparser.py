@@ -0,0 +1,523 @@
+import re
+import pytest
+import netapi.net as net
+from dataclasses import dataclass
+from netapi.connector.device import DeviceBase
+from netapi.net.textparser import Rule, Template, output_lines
+from netapi.net.ios import templates as ios_templates
+from netapi.net.ios.netmikoer import (
+    ParseInterface,
+    ParseRoute,
+    ParseVlan,
+    ParseVrrp,
+    interface_commands,
+)
+from netapi.net.xr.netmikoer import (
+    ParseInterface as XrParseInterface,
+    ParseRoute as XrParseRoute,
+    ParseVrrp as XrParseVrrp,
+)
+
+
+IOS_SHOW_INTERFACES = """\
+GigabitEthernet0/1 is up, line protocol is up (connected)
+  Hardware is Gigabit Ethernet, address is 0011.2233.4455 (bia 0011.2233.4455)
+  Description: UPLINK
+  Internet address is 10.0.0.1/30
+  MTU 1500 bytes, BW 1000000 Kbit/sec, DLY 10 usec,
+     reliability 255/255, txload 1/255, rxload 1/255
+  Encapsulation ARPA, loopback not set
+  Keepalive set (10 sec)
+  Full-duplex, 1000Mb/s, media type is 10/100/1000BaseTX
+  input flow-control is off, output flow-control is unsupported
+  ARP type: ARPA, ARP Timeout 04:00:00
+  Last input 00:00:00, output 00:00:01, output hang never
+  Last clearing of "show interface" counters 1d02h
+  Input queue: 0/75/3/0 (size/max/drops/flushes); Total output drops: 4
+  Queueing strategy: fifo
+  Output queue: 0/40 (size/max)
+  5 minute input rate 1000 bits/sec, 2 packets/sec
+  5 minute output rate 3000 bits/sec, 4 packets/sec
+     1000 packets input, 64000 bytes, 0 no buffer
+     Received 10 broadcasts (20 multicasts)
+     1 runts, 2 giants, 0 throttles
+     5 input errors, 3 CRC, 0 frame, 0 overrun, 0 ignored
+     0 watchdog, 20 multicast, 6 pause input
+     0 input packets with dribble condition detected
+     2000 packets output, 128000 bytes, 0 underruns
+     7 output errors, 8 collisions, 1 interface resets
+     0 unknown protocol drops
+     0 babbles, 9 late collision, 10 deferred
+     0 lost carrier, 0 no carrier, 11 pause output
+     0 output buffer failures, 0 output buffers swapped out
+GigabitEthernet0/2 is administratively down, line protocol is down (disabled)
+  Hardware is Gigabit Ethernet, address is 0011.2233.4456 (bia 0011.2233.4456)
+  MTU 1500 bytes, BW 10000 Kbit/sec, DLY 1000 usec,
+  Auto-duplex, Auto-speed, media type is 10/100/1000BaseTX
+  Last clearing of "show interface" counters never
+  5 minute input rate 0 bits/sec, 0 packets/sec
+  5 minute output rate 0 bits/sec, 0 packets/sec
+     0 packets input, 0 bytes, 0 no buffer
+     0 packets output, 0 bytes, 0 underruns
+Vlan10 is up, line protocol is up
+  Hardware is EtherSVI, address is 0011.2233.4400 (bia 0011.2233.4400)
+  Description: USERS
+  Internet address is 10.0.10.2/24
+  Secondary address 10.0.11.2/24
+  MTU 1500 bytes, BW 1000000 Kbit/sec, DLY 10 usec,
+Port-channel1 is up, line protocol is down (notconnect)
+  Hardware is EtherChannel, address is 0011.2233.4457 (bia 0011.2233.4457)
+  MTU 1500 bytes, BW 2000000 Kbit/sec, DLY 10 usec,
+  Full-duplex, 1000Mb/s, link type is auto, media type is unknown
+  Members in this channel: Gi0/3 Gi0/4
+"""
+
+# Routers count the IP multicasts, i.e. ISR and ASR 1000
+IOS_ROUTER_SHOW_INTERFACES = """\
+GigabitEthernet0/0/0 is up, line protocol is up
+  Hardware is ISR4451-X-4x1GE, address is 0011.2233.4466 (bia 0011.2233.4466)
+  Internet address is 192.0.2.1/30
+  MTU 1500 bytes, BW 1000000 Kbit/sec, DLY 10 usec,
+  5 minute input rate 2000 bits/sec, 3 packets/sec
+  5 minute output rate 1000 bits/sec, 1 packets/sec
+     1000 packets input, 96000 bytes, 0 no buffer
+     Received 10 broadcasts (300 IP multicasts)
+     0 runts, 0 giants, 0 throttles
+     500 packets output, 48000 bytes, 0 underruns
+"""
+
+IOS_SHOW_IP_ROUTE = """\
+Codes: L - local, C - connected, S - static, R - RIP, M - mobile, B - BGP
+       D - EIGRP, EX - EIGRP external, O - OSPF, IA - OSPF inter area
+       N1 - OSPF NSSA external type 1, N2 - OSPF NSSA external type 2
+       E1 - OSPF external type 1, E2 - OSPF external type 2
+       i - IS-IS, su - IS-IS summary, L1 - IS-IS level-1, L2 - IS-IS level-2
+       ia - IS-IS inter area, * - candidate default, U - per-user static route
+       o - ODR, P - periodic downloaded static route, H - NHRP, l - LISP
+       + - replicated route, % - next hop override
+
+Gateway of last resort is 10.0.0.2 to network 0.0.0.0
+
+S*    0.0.0.0/0 [1/0] via 10.0.0.2
+      10.0.0.0/8 is variably subnetted, 5 subnets, 3 masks
+C        10.0.0.0/30 is directly connected, GigabitEthernet0/1
+L        10.0.0.1/32 is directly connected, GigabitEthernet0/1
+O        10.1.1.0/24 [110/2] via 10.0.0.2, 00:01:02, GigabitEthernet0/1
+                     [110/2] via 10.0.0.6, 00:01:02, GigabitEthernet0/2
+O E2     10.3.0.0/24
+           [110/20] via 10.0.0.2, 1d02h, GigabitEthernet0/1
+B        10.2.0.0/16 [20/0] via 192.168.1.1, 1w2d
+      172.16.0.0/24 is subnetted, 2 subnets
+D        172.16.1.0 [90/130816] via 10.0.0.2, 00:10:00, GigabitEthernet0/1
+D EX     172.16.2.0 [170/130816] via 10.0.0.2, 00:10:00, GigabitEthernet0/1
+i L1  192.168.10.0/24 [115/20] via 10.0.0.6, 00:00:10, GigabitEthernet0/2
+"""
+
+IOS_SHOW_IP_ROUTE_DETAIL = """\
+Routing entry for 10.1.1.0/24
+  Known via "ospf 1", distance 110, metric 2, type intra area
+  Last update from 10.0.0.2 on GigabitEthernet0/1, 00:01:02 ago
+  Routing Descriptor Blocks:
+  * 10.0.0.2, from 1.1.1.1, 00:01:02 ago, via GigabitEthernet0/1
+      Route metric is 2, traffic share count is 1
+    10.0.0.6, from 1.1.1.1, 00:01:02 ago, via GigabitEthernet0/2
+      Route metric is 2, traffic share count is 1
+"""
+
+IOS_SHOW_VLAN = """\
+
+VLAN Name                             Status    Ports
+---- -------------------------------- --------- -------------------------------
+1    default                          active    Gi0/3, Gi0/4, Gi0/5, Gi0/6
+                                                Gi0/7, Gi0/8
+10   USERS                            active    Gi0/9
+20   VOICE                            act/lshut
+30   PARKED                           suspended
+1002 fddi-default                     act/unsup
+
+VLAN Type  SAID       MTU   Parent RingNo BridgeNo Stp  BrdgMode Trans1 Trans2
+---- ----- ---------- ----- ------ ------ -------- ---- -------- ------ ------
+1    enet  100001     1500  -      -      -        -    -        0      0
+10   enet  100010     1500  -      -      -        -    -        0      0
+"""
+
+IOS_SHOW_VRRP = """\
+Vlan10 - Group 1
+  Description is "USERS"
+  State is Master
+  Virtual IP address is 10.0.10.1
+  Virtual MAC address is 0000.5e00.0101
+  Advertisement interval is 1.000 sec
+  Preemption enabled, delay min 30 secs
+  Priority is 110
+  Track object 1 state Up decrement 20
+  Master Router is 10.0.10.2 (local), priority is 110
+  Master Advertisement interval is 1.000 sec
+  Master Down interval is 3.570 sec (expires in 2.981 sec)
+
+Vlan20 - Group 2 - Address-Family IPv4
+  State is BACKUP
+  State duration 1 hours 2 mins 3.234 secs
+  Virtual IP address is 10.0.20.1
+  Virtual MAC address is 0000.5E00.0102
+  Advertisement interval is 1000 msec
+  Preemption disabled
+  Priority is 100
+  Master Router is 10.0.20.3, priority is 120
+  Master Advertisement interval is 1000 msec (expires in 292 msec)
+  Master Down interval is 3609 msec (expires in 3300 msec)
+"""
+
+XR_SHOW_INTERFACES = """\
+GigabitEthernet0/0/0/0 is up, line protocol is up
+  Interface state transitions: 3
+  Hardware is GigabitEthernet, address is 5254.0012.3456 (bia 5254.0012.3456)
+  Description: CORE
+  Internet address is 10.0.0.2/30
+  MTU 1514 bytes, BW 1000000 Kbit (Max: 1000000 Kbit)
+     reliability 255/255, txload 0/255, rxload 0/255
+  Encapsulation ARPA,
+  Full-duplex, 1000Mb/s, unknown, link type is force-up
+  output flow control is off, input flow control is off
+  Carrier delay (up) is 10 msec
+  loopback not set,
+  Last link flapped 1d02h
+  ARP type ARPA, ARP timeout 04:00:00
+  Last input 00:00:00, output 00:00:00
+  Last clearing of "show interface" counters never
+  30 second input rate 1000 bits/sec, 1 packets/sec
+  30 second output rate 2000 bits/sec, 2 packets/sec
+     1000 packets input, 64000 bytes, 5 total input drops
+     0 drops for unrecognized upper-level protocol
+     Received 10 broadcast packets, 20 multicast packets
+              1 runts, 0 giants, 0 throttles, 0 parity
+     2 input errors, 1 CRC, 0 frame, 0 overrun, 0 ignored, 0 abort
+     2000 packets output, 128000 bytes, 6 total output drops
+     Output 5 broadcast packets, 15 multicast packets
+     3 output errors, 0 underruns, 0 applique, 0 resets
+     0 output buffer failures, 0 output buffers swapped out
+     1 carrier transitions
+Loopback0 is up, line protocol is up
+  Interface state transitions: 1
+  Hardware is Loopback interface(s)
+  Internet address is 1.1.1.2/32
+  MTU 1500 bytes, BW 0 Kbit
+"""
+
+XR_SHOW_ROUTE = """\
+
+Codes: C - connected, S - static, R - RIP, B - BGP, (>) - Diversion path
+       O - OSPF, IA - OSPF inter area
+       N1 - OSPF NSSA external type 1, N2 - OSPF NSSA external type 2
+       E1 - OSPF external type 1, E2 - OSPF external type 2, E - EGP
+       i - ISIS, L1 - IS-IS level-1, L2 - IS-IS level-2
+       ia - IS-IS inter area, su - IS-IS summary null, * - candidate default
+       U - per-user static route, o - ODR, L - local, G  - DAGR, l - LISP
+       A - access/subscriber, a - Application route
+       M - mobile route, r - RPL, t - Traffic Engineering, (!) - FRR Backup path
+
+Gateway of last resort is 10.0.0.1 to network 0.0.0.0
+
+S*   0.0.0.0/0 [1/0] via 10.0.0.1, 1d02h
+L    1.1.1.2/32 is directly connected, 1d02h, Loopback0
+C    10.0.0.0/30 is directly connected, 1d02h, GigabitEthernet0/0/0/0
+L    10.0.0.2/32 is directly connected, 1d02h, GigabitEthernet0/0/0/0
+O    10.1.1.0/24 [110/2] via 10.0.0.1, 00:01:02, GigabitEthernet0/0/0/0
+               [110/2] via 10.0.0.5, 00:01:02, GigabitEthernet0/0/0/1
+B    10.2.0.0/16 [200/0] via 192.168.1.1, 1d02h
+"""
+
+XR_SHOW_VRRP_DETAIL = """\
+GigabitEthernet0/0/0/1 - IPv4 vrID 1
+  State is Master
+    2 state changes, last state change 1d02h
+  Last resign sent:     Never
+  Last resign received: Never
+  Virtual IP address:
+    10.0.10.1
+    10.0.10.5
+  Virtual MAC address: 0000.5e00.0101
+  Advertise time: 1 secs
+    Master Down Timer 3.609 (3 x 1 + (20 x 1/256))
+  Minimum delay: 1 sec, reload delay: 5 sec
+  Current priority: 110
+    Configured priority: 110, may preempt
+      minimum delay 0 secs
+  Master router: local (10.0.10.2)
+"""
+
+
+def raw(output):
+    return {"command": output}
+
+
+@dataclass(unsafe_hash=True)
+class TextDevice(DeviceBase):
+    "Device answering the commands with the text outputs of `OUTPUTS`"
+
+    implementation: str = "IOS-NETMIKO"
+
+    def __post_init__(self, **_ignore):
+        super().__post_init__(**_ignore)
+        self.metadata.implementation = self.implementation
+        self.commands = []
+
+    def run(self, commands, silent=False, **_ignore):
+        self.commands.extend(commands)
+        return {x: OUTPUTS.get(x, "% Invalid input detected") for x in commands}
+
+
+OUTPUTS = {
+    "show interfaces": IOS_SHOW_INTERFACES,
+    "show ip route": IOS_SHOW_IP_ROUTE,
+    "show ip route 10.1.1.0/24": IOS_SHOW_IP_ROUTE_DETAIL,
+    "show ip route 10.9.9.0/24": "% Network not in table",
+    "show vlan": IOS_SHOW_VLAN,
+    "show vrrp": IOS_SHOW_VRRP,
+    "show route vrf all": XR_SHOW_ROUTE,
+    "show vrrp detail": XR_SHOW_VRRP_DETAIL,
+}
+
+
+class TestTemplate:
+    def test_rule(self):
+        with pytest.raises(ValueError):
+            Rule(r"^x", record=True, context=True)
+        with pytest.raises(ValueError):
+            Template({"start": [Rule(r"^x", state="missing")]})
+        with pytest.raises(ValueError):
+            Template({"other": []})
+
+    def test_parse(self):
+        template = Template(
+            {
+                "start": [
+                    Rule(r"^VRF (?P<vrf>\S+)", context=True),
+                    Rule(r"^(?P<id>\d+) (?P<name>\S+)", record=True),
+                    Rule(
+                        r"^  via (?P<hop>\S+)(?: metric (?P<metric>\d+))?", item="hops"
+                    ),
+                    Rule(r"^  name (?P<name>\S+)"),
+                    Rule(r"^END", state="end"),
+                ],
+                "end": [],
+            },
+            types={"id": int, "metric": int},
+            items={"hops": ("hop",)},
+        )
+        output = [
+            "VRF red",
+            "1 one",
+            "  via 10.0.0.1 metric 5",
+            "  via 10.0.0.2",
+            "ignored line",
+            "VRF blue",
+            "2 two",
+            "  name deux",
+            "END",
+            "3 three",
+        ]
+        assert list(template.parse(output)) == [
+            dict(
+                vrf="red",
+                id=1,
+                name="one",
+                hops=[dict(hop="10.0.0.1"), dict(hop="10.0.0.2")],
+                metric=5,
+            ),
+            dict(vrf="blue", id=2, name="deux"),
+        ]
+        # Same output as a string, the lines before the first record are ignored
+        assert len(list(template.parse("  name none\n" + "\n".join(output)))) == 2
+
+    def test_single_regex(self):
+        "The rules of each state are compiled once, into a single alternation"
+        match, actions = ios_templates.INTERFACES._states["start"]
+        assert isinstance(match.__self__, re.Pattern)
+        assert len(actions) == len(match.__self__.pattern.split("|(?P<_"))
+
+    def test_output_lines(self):
+        raw_data = {"a": "line 1\nline 2", "b": None, "c": ValueError("failed")}
+        assert list(output_lines(raw_data)) == ["line 1", "line 2"]
+
+
+class TestIosParsers:
+    def test_interfaces(self):
+        rdata = ParseInterface.data_validation(raw(IOS_SHOW_INTERFACES), entity=False)
+        assert list(rdata) == [
+            "GigabitEthernet0/1",
+            "GigabitEthernet0/2",
+            "Vlan10",
+            "Port-Channel1",
+        ]
+        gi1 = ParseInterface.parse(raw(IOS_SHOW_INTERFACES), name="Gi0/1")
+        assert gi1["status"] == "connected"
+        assert gi1["description"] == "UPLINK"
+        assert gi1["physical"] == dict(
+            mtu=1500, bandwidth=1000000000, duplex="full", mac="0011.2233.4455"
+        )
+        assert gi1["update_interval"] == 300.0
+        assert gi1["counters"]["rx_unicast_pkts"] == 970
+        assert gi1["counters"]["tx_errors_late_collisions"] == 9
+        assert gi1["last_clear"] is not None
+
+        gi2 = ParseInterface.parse(raw(IOS_SHOW_INTERFACES), name="Gi0/2")
+        assert gi2["status"] == "disabled" and gi2["last_clear"] is None
+        vlan10 = ParseInterface.parse(raw(IOS_SHOW_INTERFACES), name="Vlan10")
+        assert vlan10["addresses"]["secondary_ipv4"] == ["10.0.11.2/24"]
+        po1 = ParseInterface.parse(raw(IOS_SHOW_INTERFACES), name="Po1")
+        assert po1["status"] == "down"
+        assert po1["members"] == ["GigabitEthernet0/3", "GigabitEthernet0/4"]
+
+        gi0 = ParseInterface.parse(raw(IOS_ROUTER_SHOW_INTERFACES), name="Gi0/0/0")
+        assert gi0["counters"]["rx_multicast_pkts"] == 300
+        assert gi0["counters"]["rx_broadcast_pkts"] == 10
+        assert gi0["counters"]["rx_unicast_pkts"] == 690
+
+    def test_interface_commands(self):
+        assert interface_commands("Gi0/1") == ["show interfaces Gi0/1"]
+        assert interface_commands("Gi0/1-2") == ["show interfaces"]
+        with pytest.raises(ValueError):
+            interface_commands(fields={"optical"})
+
+    def test_vlans(self):
+        vlans = {
+            k: v
+            for x in ParseVlan.collector_parse(raw(IOS_SHOW_VLAN))
+            for k, v in x.items()
+        }
+        assert list(vlans) == [1, 10, 20, 30, 1002]
+        assert vlans[1]["interfaces"][-1] == "GigabitEthernet0/8"
+        assert len(vlans[1]["interfaces"]) == 6
+        assert vlans[20]["status"] == "active"
+        assert vlans[30]["status"] == "suspended"
+
+    def test_vrrps(self):
+        vrrp = ParseVrrp.parse(raw(IOS_SHOW_VRRP), group_id=1, interface="Vlan10")
+        assert vrrp["status"] == "master" and vrrp["preempt_delay"] == 30.0
+        assert vrrp["tracked_objects"] == [dict(name="1", state="Up", decrement=20)]
+        vrrp = ParseVrrp.parse(raw(IOS_SHOW_VRRP), group_id=2, interface="Vlan20")
+        assert vrrp["status"] == "backup" and vrrp["version"] == 3
+        assert vrrp["master_ip"] == "10.0.20.3" and vrrp["master_priority"] == 120
+        assert vrrp["master_down_interval"] == 3.609
+
+    def test_routes(self):
+        routes = {
+            k: v
+            for x in ParseRoute.collector_parse(raw(IOS_SHOW_IP_ROUTE))
+            for k, v in x.items()
+        }
+        assert len(routes) == 9
+        connected = routes[("default", "10.0.0.0/30")]
+        assert connected["protocol"] == "connected"
+        assert connected["vias"] == [
+            dict(next_hop=None, interface="GigabitEthernet0/1")
+        ]
+        ospf = routes[("default", "10.1.1.0/24")]
+        assert (ospf["preference"], ospf["metric"]) == (110, 2)
+        assert [x["next_hop"] for x in ospf["vias"]] == ["10.0.0.2", "10.0.0.6"]
+        external = routes[("default", "10.3.0.0/24")]
+        assert external["extra_attributes"]["route_type"] == "E2"
+        assert external["metric"] == 20
+        # Classful network without length, from the `is subnetted` line
+        assert routes[("default", "172.16.2.0/24")]["protocol"] == "eigrp"
+        assert routes[("default", "192.168.10.0/24")]["protocol"] == "is-is"
+
+        detail = ParseRoute.parse(raw(IOS_SHOW_IP_ROUTE_DETAIL))
+        assert detail["protocol"] == "ospf" and detail["network"] == "10.1.1.0/24"
+        assert detail["vias"] == ospf["vias"]
+
+
+class TestXrParsers:
+    def test_interfaces(self):
+        gi0 = XrParseInterface.parse(raw(XR_SHOW_INTERFACES), name="Gi0/0/0/0")
+        assert gi0["number_status_changes"] == 3
+        assert gi0["update_interval"] == 30.0
+        assert gi0["counters"]["rx_discards"] == 5
+        assert gi0["counters"]["tx_unicast_pkts"] == 1980
+        assert gi0["physical"]["mtu"] == 1514
+        lo0 = XrParseInterface.parse(raw(XR_SHOW_INTERFACES), name="Loopback0")
+        assert lo0["addresses"]["ipv4"] == "1.1.1.2/32"
+
+    def test_vrrps(self):
+        vrrp = XrParseVrrp.parse(raw(XR_SHOW_VRRP_DETAIL))
+        assert vrrp["status"] == "master" and vrrp["version"] == 2
+        assert vrrp["virtual_ip"] == "10.0.10.1"
+        assert vrrp["virtual_ip_secondary"] == ["10.0.10.5"]
+        assert vrrp["master_ip"] == "10.0.10.2" and vrrp["preempt"] is True
+
+    def test_routes(self):
+        routes = {
+            k: v
+            for x in XrParseRoute.collector_parse(raw(XR_SHOW_ROUTE))
+            for k, v in x.items()
+        }
+        assert len(routes) == 6
+        assert routes[("default", "1.1.1.2/32")]["vias"][0]["interface"] == "Loopback0"
+        assert routes[("default", "10.2.0.0/16")]["preference"] == 200
+
+
+class TestBuilders:
+    def test_interfaces(self):
+        device = TextDevice()
+        interfaces = net.InterfaceBuilder().get(device, entity=False)
+        assert device.commands == ["show interfaces"]
+        assert interfaces["GigabitEthernet0/1"].status == "connected"
+        assert interfaces["GigabitEthernet0/2"].enabled is False
+        many = net.InterfaceBuilder().get_many(device, names=["Gi0/1", "Vlan10"])
+        assert list(many) == ["GigabitEthernet0/1", "Vlan10"]
+
+    def test_interface_range(self):
+        device = TextDevice()
+        interfaces = net.InterfaceBuilder().get(
+            device, entity=False, interface_range="Gi0/1-2, Po1"
+        )
+        # The ranges are not accepted by `show interfaces`, the output is filtered
+        assert device.commands == ["show interfaces"]
+        assert list(interfaces) == [
+            "GigabitEthernet0/1",
+            "GigabitEthernet0/2",
+            "Port-Channel1",
+        ]
+
+    def test_xe(self):
+        device = TextDevice(implementation="XE-NETMIKO")
+        interfaces = net.InterfaceBuilder().get(device, entity=False)
+        assert interfaces.metadata.implementation == "XE-NETMIKO"
+        gi1 = interfaces["GigabitEthernet0/1"]
+        assert gi1.metadata.implementation == "XE-NETMIKO"
+        assert gi1.status == "connected"
+        vlan = net.VlanBuilder().get(device, entity=False)[10]
+        assert vlan.metadata.implementation == "XE-NETMIKO"
+        with pytest.raises(NotImplementedError, match="XE-NETMIKO"):
+            vlan.enable()
+        # The connectors of other implementations are rejected
+        with pytest.raises(ValueError, match="XE-NETMIKO"):
+            net.xe_netmikoer.Vlan(id=10, connector=TextDevice())
+
+    def test_vlans(self):
+        vlans = net.VlanBuilder().get(TextDevice(), entity=False)
+        assert vlans[10].interfaces == ["GigabitEthernet0/9"]
+        assert vlans[30].status_up is False
+
+    def test_vrrps(self):
+        vrrps = net.VrrpBuilder().get(TextDevice(), entity=False)
+        assert str(vrrps[(2, "Vlan20")].master_ip) == "10.0.20.3"
+
+        device = TextDevice(implementation="XR-NETMIKO")
+        vrrps = net.VrrpBuilder().get(device, entity=False)
+        assert device.commands == ["show vrrp detail"]
+        assert list(vrrps) == [(1, "GigabitEthernet0/0/0/1")]
+
+    def test_routes(self):
+        routes = net.RouteBuilder().get(TextDevice(), entity=False)
+        assert routes[("default", "10.1.1.0/24")].protocol == "ospf"
+        route = net.RouteBuilder().get(TextDevice(), dest="10.1.1.0/24")
+        assert len(route.vias) == 2
+        route = net.RouteBuilder().get(TextDevice(), dest="10.9.9.0/24")
+        assert route.protocol is None
+
+        xr_routes = net.RouteBuilder().get(
+            TextDevice(implementation="XR-NETMIKO"), entity=False, vrf_all=True
+        )
+        assert len(xr_routes) == 6
@@ -0,0 +1,68 @@
+import pytest
+from netapi.net.interface import COUNTER_FIELDS, InterfaceCounters
+from netapi.net.timeseries import CounterSeries, CounterStore
+
+np = pytest.importorskip("numpy")
+
+RX_BYTES = COUNTER_FIELDS.index("rx_bytes")
+
+
+def row(value):
+    return [value] * len(COUNTER_FIELDS)
+
+
+class TestCounterSeries:
+    def test_append(self):
+        series = CounterSeries(4)
+        for x in range(6):
+            series.append(x * 10, row(x))
+        assert len(series) == 4 and series.last_timestamp == 50
+        timestamps, values = series.window()
+        assert list(timestamps) == [20, 30, 40, 50]
+        assert list(values[:, RX_BYTES]) == [2, 3, 4, 5]
+        with pytest.raises(ValueError):
+            series.append(40, row(0))
+
+    def test_window(self):
+        series = CounterSeries(8)
+        for x in range(10):
+            series.append(x * 10, row(x))
+        timestamps, values = series.window(start=40, end=60, fields=["rx_bytes"])
+        assert list(timestamps) == [40, 50, 60]
+        assert values.shape == (3, 1) and list(values[:, 0]) == [4, 5, 6]
+        assert list(series.window(last=15)[0]) == [80, 90]
+        assert len(CounterSeries(2).window(last=10)[0]) == 0
+
+    def test_downsample(self):
+        series = CounterSeries(16)
+        for x in range(10):
+            series.append(100 + x * 15, row(x))
+        # Buckets of a minute: 60 (100-115), 120 (130-175), 180 (190-235)
+        timestamps, values = series.downsample(60, fields=["rx_bytes"])
+        assert list(timestamps) == [60, 120, 180]
+        assert list(values[:, 0]) == [1, 5, 9]
+        assert list(series.downsample(60, how="first")[1][:, RX_BYTES]) == [0, 2, 6]
+        assert list(series.downsample(60, how="max")[1][:, RX_BYTES]) == [1, 5, 9]
+        assert list(series.downsample(60, how="mean")[1][:, RX_BYTES]) == [
+            0.5,
+            3.5,
+            7.5,
+        ]
+        with pytest.raises(ValueError):
+            series.downsample(60, how="median")
+
+
+class TestCounterStore:
+    def test_append_counters(self):
+        store = CounterStore(capacity=2)
+        counters = InterfaceCounters(rx_bytes=1000, tx_unicast_pkts=5)
+        for x in range(3):
+            store.append_counters(("r1", "Ethernet1"), counters, timestamp=x)
+        store.append_counters(("r2", "Ethernet1"), counters, timestamp=0)
+        assert len(store) == 2 and ("r1", "Ethernet1") in store
+        series = store["r1", "Ethernet1"]
+        assert len(series) == 2 and series.capacity == 2
+        _, values = series.window(fields=["rx_bytes", "tx_unicast_pkts"])
+        assert values.tolist() == [[1000, 5], [1000, 5]]
+        store.remove(("r2", "Ethernet1"))
+        assert list(store) == [("r1", "Ethernet1")]
@@ -1,6 +1,8 @@
 import re
+import asyncio
 import pytest
 import netapi.net as net
+from netapi.events import Event
 from netapi.net.vlan import VlanBase, VlansBase
 from pydantic import ValidationError
 
@@ -295,6 +297,98 @@ class TestVlansBase:
         ):
             VlansBase({7: "some_data_structure"})
 
+    def test_precedence(self):
+        vl7 = VlanBase(**VLAN_BASE_ARGS["custom_enabled"])
+        vl70 = VlanBase(**VLAN_BASE_ARGS["custom_disabled"])
+        vlan_collection = VlansBase({7: vl7}, {7: vl70, 70: vl70})
+        assert len(vlan_collection) == 2
+        assert vlan_collection[7] is vl7
+
+    def test_indexes(self):
+        vl7 = VlanBase(**VLAN_BASE_ARGS["custom_enabled"])
+        vl70 = VlanBase(**VLAN_BASE_ARGS["custom_disabled"])
+        vlan_collection = VlansBase({7: vl7, 70: vl70})
+        assert vlan_collection.index("status") == {"active": [7], "suspended": [70]}
+        assert vlan_collection.find(status="suspended") == [vl70]
+        assert vlan_collection.find(status="active", name="TEST_VLAN") == [vl7]
+
+        # Indexes are maintained on updates
+        vlan_collection[70] = VlanBase(**VLAN_BASE_ARGS["custom_enabled"])
+        del vlan_collection[7]
+        assert vlan_collection.index("status") == {"active": [70]}
+
+        with pytest.raises(ValueError, match="Attribute not indexed: name"):
+            vlan_collection.index("name")
+
+    def test_merge(self):
+        vl7 = VlanBase(**VLAN_BASE_ARGS["custom_enabled"])
+        vlan_collection = VlansBase({7: vl7})
+        assert vlan_collection.index("status") == {"active": [7]}
+        data = {
+            7: dict(VLAN_BASE_ARGS["custom_enabled"], status="suspended"),
+            70: VLAN_BASE_ARGS["custom_disabled"],
+        }
+        changes = vlan_collection.merge(data.items(), VlanBase)
+        assert changes.added == [70] and changes.removed == []
+        assert changes.modified == {
+            7: {"status": ("active", "suspended"), "status_up": (True, False)}
+        }
+        # Updated in place, indexes included
+        assert vlan_collection[7] is vl7 and vl7.status == "suspended"
+        assert vlan_collection.index("status") == {"suspended": [7, 70]}
+
+        # Unchanged data is not applied again
+        assert not vlan_collection.merge(data.items(), VlanBase)
+        changes = vlan_collection.merge([(70, data[70])], VlanBase)
+        assert changes.to_dict() == dict(added=[], removed=[7], modified={})
+        assert repr(changes) == "ChangeSet(added=0, removed=1, modified=0)"
+
+    def test_events(self):
+        vlan_collection = VlansBase({7: VlanBase(**VLAN_BASE_ARGS["custom_enabled"])})
+        received, filtered = [], []
+        subscription = vlan_collection.subscribe(received.append)
+        vlan_collection.subscribe(filtered.append, types={"route_added"})
+        data = {7: dict(VLAN_BASE_ARGS["custom_enabled"], status="suspended")}
+        vlan_collection.merge(data.items(), VlanBase)
+        assert received == [Event("vlan_status", 7, "status", "active", "suspended")]
+        assert received[0].entity is vlan_collection[7] and filtered == []
+
+        # A single diff for all the subscribers, none once cancelled
+        subscription.cancel()
+        assert not subscription.active
+        data = {7: VLAN_BASE_ARGS["custom_enabled"]}
+        vlan_collection.merge(data.items(), VlanBase)
+        assert len(received) == 1
+
+    def test_failing_subscriber(self):
+        vlan_collection = VlansBase({7: VlanBase(**VLAN_BASE_ARGS["custom_enabled"])})
+        received = []
+
+        def fail(event):
+            raise RuntimeError("subscriber failed")
+
+        vlan_collection.subscribe(fail)
+        vlan_collection.subscribe(received.append)
+        data = {7: dict(VLAN_BASE_ARGS["custom_enabled"], status="suspended")}
+        changes = vlan_collection.merge(data.items(), VlanBase)
+        assert list(changes.modified) == [7]
+        assert [x.type for x in received] == ["vlan_status"]
+        assert [str(x) for x in vlan_collection.errors] == ["subscriber failed"]
+
+    def test_stream(self):
+        vlan_collection = VlansBase({7: VlanBase(**VLAN_BASE_ARGS["custom_enabled"])})
+
+        async def consume():
+            stream = vlan_collection.stream()
+            data = {7: dict(VLAN_BASE_ARGS["custom_enabled"], status="suspended")}
+            vlan_collection.merge(data.items(), VlanBase)
+            stream.close()
+            return [event async for event in stream]
+
+        events = asyncio.get_event_loop().run_until_complete(consume())
+        assert [(x.type, x.new) for x in events] == [("vlan_status", "suspended")]
+        assert not vlan_collection._subscribers
+
 
 class VlanTester:
     @pytest.mark.parametrize(
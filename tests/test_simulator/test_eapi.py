@@ -0,0 +1,386 @@
+import json
+import pytest
+import pyeapi
+from netapi.connector.eos.pyeapier import Device
+from netapi.net.eos import pyeapier
+from netapi.net import InterfaceBuilder, RouteBuilder, VlanBuilder, VrrpBuilder
+from netapi.net.timeseries import CounterStore
+from netapi.simulator import eapi
+from netapi.simulator.eapi import EapiFarm, SyntheticEos, expand_range
+
+
+@pytest.fixture(scope="module")
+def farm():
+    profile = SyntheticEos(ports=8, vlans=3, vrfs=2, routes=50, vrrp_groups=3)
+    with EapiFarm(devices=2, profile=profile) as farm:
+        yield farm
+
+
+def connect(address):
+    _, host, port = address
+    return Device(host=host, port=port, transport="http")
+
+
+class TestSyntheticEos:
+    def test_expand_range(self):
+        assert expand_range("Ethernet1-3,5") == [
+            "Ethernet1",
+            "Ethernet2",
+            "Ethernet3",
+            "Ethernet5",
+        ]
+        assert expand_range("Eth1/1-2") == ["Ethernet1/1", "Ethernet1/2"]
+
+    def test_scale(self):
+        profile = SyntheticEos(ports=4, vlans=2, vrfs=3, routes=10)
+        interfaces = json.loads(profile.output("show interfaces"))["interfaces"]
+        assert len(interfaces) == 4 + 1 + 2
+        routes = json.loads(profile.output("show ip route vrf all"))["vrfs"]
+        assert sorted(routes) == ["VRF1", "VRF2", "default"]
+        assert len(routes["VRF2"]["routes"]) == 10
+        bgp = json.loads(profile.output("show ip route bgp"))["vrfs"]["default"]
+        assert {x["routeType"] for x in bgp["routes"].values()} == {"eBGP", "iBGP"}
+
+    def test_cache(self, monkeypatch):
+        profile = SyntheticEos()
+        assert profile.output("show vlan") is profile.output("show vlan")
+        monkeypatch.setattr(eapi, "CACHE_SIZE", 2)
+        vlans = profile.output("show vlan")
+        profile.output("show vlan id 10")
+        profile.output("show vlan")
+        profile.output("show vlan id 11")
+        assert list(profile._cache) == ["show vlan", "show vlan id 11"]
+        assert profile.output("show vlan") is vlans
+
+    def test_no_vlans(self):
+        profile = SyntheticEos(vlans=0, vrrp_groups=2)
+        assert json.loads(profile.output("show vrrp all")) == {"virtualRouters": []}
+
+
+class TestEapiFarm:
+    def test_addresses(self, farm):
+        assert [x[0] for x in farm.addresses] == ["sim0000", "sim0001"]
+        assert farm.addresses[0][2] != farm.addresses[1][2]
+
+    def test_run(self, farm):
+        device = connect(farm.addresses[1])
+        result = device.run(["show hostname", "show vlan id 10"])
+        assert result["show hostname"]["hostname"] == "sim0001"
+        assert list(result["show vlan id 10"]["vlans"]) == ["10"]
+
+    def test_silent_run(self, farm):
+        device = connect(farm.addresses[0])
+        result = device.run(
+            ["show interfaces Loopback777", "show hostname"], silent=True
+        )
+        assert result["show interfaces Loopback777"] is None
+        assert result["show hostname"]["hostname"] == "sim0000"
+
+    def test_builders(self, farm):
+        device = connect(farm.addresses[0])
+        interfaces = InterfaceBuilder().get(device, entity=False)
+        assert len(interfaces) == 12
+        assert interfaces["Ethernet7"].status_up is False
+        vlans = VlanBuilder().get(device, entity=False)
+        assert sorted(vlans) == [1, 10, 11, 12]
+        vrrps = VrrpBuilder().get(device, entity=False)
+        assert len(vrrps) == 3
+        routes = RouteBuilder().get(device, entity=False, instance="VRF1")
+        assert len(routes) == 50
+
+    def test_compact_builders(self, farm):
+        device = connect(farm.addresses[0])
+        routes = RouteBuilder().get(device, entity=False, compact=True, instance="VRF1")
+        assert len(routes) == 50
+        route = next(iter(routes.values()))
+        assert type(route).__name__ == "CompactRoute"
+        assert route.metadata.implementation == "EOS-PYEAPI"
+        assert route.to_entity().network is not None
+
+        # Refreshes keep the compact representation
+        routes.get()
+        assert type(routes[route.instance, route.dest]) is type(route)
+
+    def test_get_many(self, farm):
+        device = connect(farm.addresses[0])
+        routes = RouteBuilder().get(device, entity=False, instance="VRF1")
+        dests = [x[1].split("/")[0] for x in routes][:25] + ["192.0.2.1"]
+
+        runs = []
+        run = device.run
+        device.run = lambda commands, **kwargs: runs.append(commands) or run(
+            commands, **kwargs
+        )
+        many = RouteBuilder().get_many(
+            device, dests=dests, instance="VRF1", chunk_size=10
+        )
+        assert [len(x) for x in runs] == [10, 10, 6]
+        assert list(many) == dests
+        single = RouteBuilder().get(device, dest=dests[0], instance="VRF1")
+        assert (many[dests[0]].network, many[dests[0]].vias) == (
+            single.network,
+            single.vias,
+        )
+        assert many["192.0.2.1"].active is False
+
+    def test_get_many_interfaces(self, farm):
+        device = connect(farm.addresses[0])
+        names = ["Eth1", "Ethernet2", "Ethernet3", "Ethernet7", "Vlan10", "Ethernet99"]
+
+        runs = []
+        run = device.run
+        device.run = lambda commands, **kwargs: runs.append(commands) or run(
+            commands, **kwargs
+        )
+        many = InterfaceBuilder().get_many(device, names=names)
+        assert runs == [
+            [
+                "show interfaces Ethernet1-3,Ethernet7,Ethernet99,Vlan10",
+                "show ip interface Ethernet1-3,Ethernet7,Ethernet99,Vlan10",
+                "show interfaces Ethernet1-3,Ethernet7,Ethernet99,Vlan10 transceiver",
+            ]
+        ]
+        assert list(many) == [
+            "Ethernet1",
+            "Ethernet2",
+            "Ethernet3",
+            "Ethernet7",
+            "Vlan10",
+        ]
+        single = InterfaceBuilder().get(device, name="Ethernet2")
+        assert many["Ethernet2"].optical == single.optical
+        assert many["Vlan10"].addresses is not None
+
+    def test_fields_projection(self, farm):
+        device = connect(farm.addresses[0])
+        full = InterfaceBuilder().get(device, entity=False)
+        interfaces = InterfaceBuilder().get(
+            device, entity=False, fields={"status", "counters"}
+        )
+        assert interfaces.get_cmd is None
+        interfaces.get()
+        assert interfaces.get_cmd == [
+            "show interfaces status",
+            "show interfaces counters",
+            "show interfaces counters errors",
+            "show interfaces counters rates",
+        ]
+        assert sorted(interfaces) == sorted(full)
+        for name in ("Ethernet1", "Ethernet7", "Vlan10"):
+            assert interfaces[name].status == full[name].status
+            assert interfaces[name].status_up == full[name].status_up
+            assert interfaces[name].physical is None
+            assert interfaces[name].description is None
+            counters = interfaces[name].counters
+            assert counters.rx_errors_fcs == full[name].counters.rx_errors_fcs
+            assert counters.tx_bits_rate == full[name].counters.tx_bits_rate
+
+        vlan10 = InterfaceBuilder().get(device, name="Vlan10", fields={"addresses"})
+        assert vlan10.get_cmd is None
+        assert vlan10.addresses == full["Vlan10"].addresses
+        assert (
+            InterfaceBuilder()
+            .get_many(device, names=["Ethernet1"], fields={"description"})["Ethernet1"]
+            .description
+            == full["Ethernet1"].description
+        )
+        with pytest.raises(ValueError, match="Interface fields not known"):
+            InterfaceBuilder().get(device, entity=False, fields={"speed"})
+
+    def test_lazy_interfaces(self, farm):
+        device = connect(farm.addresses[0])
+        full = InterfaceBuilder().get(device, entity=False)
+        commands = []
+        run = device.run
+
+        def counted_run(cmds, **kwargs):
+            commands.append(list(cmds))
+            return run(cmds, **kwargs)
+
+        device.run = counted_run
+        interfaces = InterfaceBuilder().get(device, entity=False, lazy=True)
+        assert commands == [["show interfaces status"]]
+        eth1 = interfaces["Ethernet1"]
+        assert eth1.status_up == full["Ethernet1"].status_up
+        assert eth1.description == full["Ethernet1"].description
+        assert "physical=<not loaded>" in repr(eth1)
+        assert len(commands) == 1
+
+        # Targeted collection on first read, then cached
+        assert eth1.optical == full["Ethernet1"].optical
+        assert commands[-1] == ["show interfaces Ethernet1 transceiver"]
+        assert eth1.optical == full["Ethernet1"].optical
+        assert len(commands) == 2
+        assert eth1.physical == full["Ethernet1"].physical
+        assert commands[-1] == ["show interfaces Ethernet1"]
+        assert eth1.counters.rx_errors_fcs == full["Ethernet1"].counters.rx_errors_fcs
+        assert eth1.members == []
+        assert len(commands) == 3
+
+        # Switchports have no `show ip interface` output
+        assert eth1.instance is None
+
+        # The refreshes keep the collection lazy
+        interfaces.get()
+        assert commands[-1] == ["show interfaces status"]
+        assert interfaces["Ethernet1"] is eth1
+        del interfaces["Ethernet1"]
+        interfaces.get()
+        assert "optical" not in interfaces["Ethernet1"].__dict__
+
+        vlan10 = InterfaceBuilder().get(device, name="Vlan10", lazy=True)
+        assert vlan10.addresses == full["Vlan10"].addresses
+        assert commands[-2:] == [
+            ["show interfaces Vlan10 status"],
+            ["show ip interface Vlan10"],
+        ]
+        eth2 = InterfaceBuilder().get_many(device, names=["Eth2"], lazy=True)
+        assert eth2["Ethernet2"].optical == full["Ethernet2"].optical
+
+    def test_lazy_index(self, farm):
+        device = connect(farm.addresses[0])
+        full = InterfaceBuilder().get(device, entity=False)
+        commands = []
+        run = device.run
+
+        def counted_run(cmds, **kwargs):
+            commands.append(list(cmds))
+            return run(cmds, **kwargs)
+
+        device.run = counted_run
+        interfaces = InterfaceBuilder().get(device, entity=False, lazy=True)
+        other = InterfaceBuilder().get(device, entity=False, lazy=True)
+        assert len(commands) == 2
+
+        # Compared without loading the lazy attributes
+        assert interfaces["Ethernet1"] == other["Ethernet1"]
+        assert interfaces["Ethernet1"] != other["Ethernet2"]
+        assert len(commands) == 2
+
+        # The instance of all the interfaces is loaded at once
+        assert interfaces.index("instance") == full.index("instance")
+        assert commands[2:] == [["show ip interface Ethernet1-8,Management1,Vlan10-12"]]
+        assert interfaces["Ethernet1"].instance is None and len(commands) == 3
+
+        # The rebuilt entities are indexed without loading them
+        interfaces.fingerprint = None
+        interfaces.get()
+        assert commands[-1] == ["show interfaces status"] and len(commands) == 4
+        assert interfaces.index("status") == full.index("status")
+        assert interfaces.index("instance") == full.index("instance")
+        assert len(commands) == 5
+
+    @pytest.mark.parametrize(
+        "builder, params",
+        [
+            (InterfaceBuilder, {}),
+            (InterfaceBuilder, {"lazy": True}),
+            (VlanBuilder, {}),
+            (VrrpBuilder, {"trusted": True}),
+            (RouteBuilder, {"vrf_all": True, "trusted": True}),
+            (RouteBuilder, {"instance": "VRF1", "compact": True}),
+        ],
+    )
+    def test_iter(self, farm, builder, params):
+        device = connect(farm.addresses[0])
+        collection = builder().get(device, entity=False, **dict(params))
+        stream = builder().iter(device, **dict(params))
+        assert not isinstance(stream, (list, dict))
+        keys = []
+        for key, entity in stream:
+            keys.append(key)
+            assert type(entity) is type(collection[key])
+            assert repr(entity) == repr(collection[key])
+        assert keys == list(collection)
+
+    def test_refresh(self, farm):
+        device = connect(farm.addresses[0])
+        routes = RouteBuilder().get(device, entity=False, vrf_all=True, trusted=True)
+        route = next(iter(routes.values()))
+        changes = routes.refresh()
+        assert not changes and routes[route.instance, route.dest] is route
+        del routes[route.instance, route.dest]
+        routes[route.instance, "10.99.0.0/16"] = route
+        changes = routes.refresh()
+        assert changes.added == [(route.instance, route.dest)]
+        assert changes.removed == [(route.instance, "10.99.0.0/16")]
+        assert routes.refresh() == routes.refresh()
+
+        # Only the counters change between polls
+        interfaces = InterfaceBuilder().get(device, entity=False)
+        interfaces.refresh()
+        changes = interfaces.refresh()
+        assert not changes.added and not changes.removed
+        assert {y for x in changes.modified.values() for y in x} <= {"counters"}
+
+        compact = VlanBuilder().get(device, entity=False, compact=True)
+        vlan = compact[10]
+        assert not compact.refresh() and compact[10] is vlan
+
+    def test_route_events(self, farm):
+        device = connect(farm.addresses[0])
+        routes = RouteBuilder().get(device, entity=False, vrf_all=True, trusted=True)
+        route = next(iter(routes.values()))
+        events = []
+        routes.subscribe(events.append)
+        del routes[route.instance, route.dest]
+        routes[route.instance, "10.99.0.0/16"] = route
+        routes.refresh()
+        assert [(x.type, x.device, x.key) for x in events] == [
+            ("route_added", device.host, (route.instance, route.dest)),
+            ("route_withdrawn", device.host, (route.instance, "10.99.0.0/16")),
+        ]
+        assert events[0].entity is routes[route.instance, route.dest]
+
+    def test_unchanged_outputs(self, farm, monkeypatch):
+        device = connect(farm.addresses[0])
+        vlans = VlanBuilder().get(device, entity=False)
+        vlan = vlans[10]
+        parsed = []
+        parser = pyeapier.ParseVlan.collector_parse
+        monkeypatch.setattr(
+            pyeapier.ParseVlan,
+            "collector_parse",
+            lambda *args, **kwargs: parsed.append(args) or parser(*args, **kwargs),
+        )
+        assert vlans.get() and not vlans.refresh()
+        assert parsed == [] and vlans[10] is vlan
+        assert vlans.metadata.collection_count == 2
+        assert vlans.metadata.updated_at is not None
+
+        # Local changes are reverted on the next refresh
+        del vlans[10]
+        assert vlans.refresh().added == [10]
+        assert len(parsed) == 1 and vlans.fingerprint is not None
+
+    def test_counters_timeseries(self, farm):
+        pytest.importorskip("numpy")
+        device = connect(farm.addresses[0])
+        store = CounterStore(capacity=2)
+        interfaces = InterfaceBuilder().get(device, entity=False, timeseries=store)
+        interfaces.refresh()
+        interfaces.get()
+        series = store[device.host, "Ethernet1"]
+        assert len(series) == 2 and len(store) == len(interfaces)
+        _, values = series.window(fields=["rx_bytes"])
+        assert values[0, 0] <= values[1, 0]
+
+        # Lazy interfaces without counters collected are not loaded
+        lazy = InterfaceBuilder().get(
+            device, entity=False, lazy=True, timeseries=CounterStore()
+        )
+        assert len(lazy.timeseries) == 0
+        assert "counters" not in vars(lazy["Ethernet1"])
+
+    def test_error_injection(self, farm):
+        with EapiFarm(devices=1, error_rate=1.0) as failing:
+            device = connect(failing.addresses[0])
+            with pytest.raises(pyeapi.eapilib.CommandError):
+                device.run(["show version"])
+
+    def test_virtual_hosts(self):
+        with EapiFarm(devices=3, ports=1) as shared:
+            assert len({x[2] for x in shared.addresses}) == 1
+            _, _, port = shared.addresses[0]
+            device = Device(host="localhost", port=port, transport="http")
+            assert device.run("show hostname")["show hostname"]["hostname"] == "sim0000"